@@ -13,6 +13,9 @@ Depends on:
   - All api/*_routes.py modules (blueprint registration)
   - config.py (Config class)
   - db.py (init_app_data, register_db)
+  - repositories/leaderboard_repo.py (boards loaded at startup)
+  - compression.py (register_compression)
+  - json_provider.py (FastJSONProvider for app.json)
 """
 
 import logging
@@ -34,9 +37,19 @@ from .api.notes_routes import notes_bp
 from .api.projects_routes import projects_bp
 from .api.goals_routes import goals_bp
 from .api.auth_routes import auth_bp
+from .api.batch_routes import batch_bp
+from .api.sync_routes import sync_bp
+from .api.mutations_routes import mutations_bp
+from .api.search_routes import search_bp
+from .api.tags_routes import tags_bp
+from .api.leaderboard_routes import leaderboard_bp
+from .compression import register_compression
 from .config import Config, is_production_env, validate_startup_config
 from .db import init_app_data, register_db
+from .json_provider import FastJSONProvider
 from .middleware import setup_middleware
+from .points_engine import add_progress_listener
+from .repositories.leaderboard_repo import LeaderboardRepository
 
 
 def _is_truthy_env(value):
@@ -115,6 +128,20 @@ def _seed_showcase_users_if_enabled(app, logger):
         logger.exception("[Seed] Showcase user seeding failed: %s", exc)
 
 
+def _init_leaderboards(app, logger):
+    """Load the in-memory leaderboards and keep them fed by progress updates.
+
+    Best effort: on failure the boards load on first use instead.
+    """
+    add_progress_listener(LeaderboardRepository.record_progress)
+    try:
+        with app.app_context():
+            week_start = LeaderboardRepository.rebuild()
+        logger.info("[Leaderboard] Boards loaded (week of %s)", week_start)
+    except Exception as exc:
+        logger.exception("[Leaderboard] Initial load failed: %s", exc)
+
+
 def _get_cors_config():
     """Build CORS configuration based on environment."""
     # Check if running in production (Render, Railway, etc.)
@@ -173,6 +200,7 @@ def create_app(config_class=Config):
         static_url_path="",
     )
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
 
     # Zero cache in dev for instant reload; 1 hour in production
     app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600 if is_production else 0
@@ -199,7 +227,9 @@ def create_app(config_class=Config):
     register_db(app)
     init_app_data(app)
     _seed_showcase_users_if_enabled(app, _log)
+    _init_leaderboards(app, _log)
     setup_middleware(app)
+    register_compression(app)
 
     app.register_blueprint(web_bp)
     app.register_blueprint(auth_bp)
@@ -213,6 +243,12 @@ def create_app(config_class=Config):
     app.register_blueprint(notes_bp)
     app.register_blueprint(projects_bp)
     app.register_blueprint(goals_bp)
+    app.register_blueprint(batch_bp)
+    app.register_blueprint(sync_bp)
+    app.register_blueprint(mutations_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(tags_bp)
+    app.register_blueprint(leaderboard_bp)
 
     return app
 
@@ -18,60 +18,31 @@ import re
 import threading
 import time
 
-# Lazy import of Gemini SDK to prevent startup crash if dependency missing
-_genai_module = None
-_genai_import_error = None
-
-def _get_genai():
-    """Lazily import google.generativeai. Returns None if unavailable."""
-    global _genai_module, _genai_import_error
-    if _genai_module is not None:
-        return _genai_module
-    if _genai_import_error is not None:
-        return None
-    try:
-        import google.generativeai as genai
-        _genai_module = genai
-        return genai
-    except ImportError as e:
-        _genai_import_error = str(e)
-        print(f"[AI Avatar] Gemini SDK not available: {e}. AI features disabled.")
-        return None
-
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
+from .ai_streaming import FakeGeminiStreamer, MessageFieldDecoder
 from .config import Config
+from .food_catalog import get_food_catalog
+from .gemini_client import GeminiUnavailable, get_gemini_manager
+from .phrase_matcher import PhraseMatcher, select_longest, tokenize
 
 GEMINI_API_KEY = Config.GEMINI_API_KEY
 GEMINI_MODEL = Config.GEMINI_MODEL
 
-# Initialize the SDK client (lazy)
+# Shared Gemini client manager (lazy; None when no key / SDK missing)
 _genai_client = None
 _genai_initialized = False
 
 def _init_genai_client():
-    """Initialize Gemini client on first use."""
+    """Resolve the shared Gemini client manager on first use."""
     global _genai_client, _genai_initialized
     if _genai_initialized:
         return _genai_client
     _genai_initialized = True
-    
-    if not GEMINI_API_KEY:
-        _genai_client = None
-        return None
-    
-    genai = _get_genai()
-    if genai is None:
-        return None
-    
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        _genai_client = genai
-    except Exception as e:
-        print(f"[AI Avatar] Failed to configure Gemini: {e}")
-        _genai_client = None
-    
+
+    manager = get_gemini_manager()
+    _genai_client = manager if manager.available() else None
     return _genai_client
 
 # ---------------------------------------------------------------------------
@@ -83,12 +54,6 @@ _gemini_lock = threading.Lock()  # Prevent concurrent in-flight Gemini calls
 _AI_CACHE_TTL_SEC = 600
 _AI_CACHE_MAX = 200
 _ai_response_cache = {}
-_gemini_stats = {
-    "requests": 0,
-    "success": 0,
-    "failed": 0,
-    "rate_limited": 0,
-}
 
 
 def _log_safe(msg):
@@ -311,38 +276,8 @@ JSON schema:
 # Gemini API call  (with rate-limit guard & detailed error handling)
 # ---------------------------------------------------------------------------
 
-def _call_gemini(user_message, context=None, system_prompt_override=None):
-    """
-    Send a message to Google Gemini API using the official SDK.
-
-    Guards:
-      • Skips if no API key / client not initialized
-      • Enforces a cooldown of _GEMINI_COOLDOWN_SEC between calls
-      • Prevents concurrent in-flight requests (_gemini_lock)
-
-    Returns parsed dict on success, None on failure.
-    """
-    global _gemini_last_call_ts
-
-    # --- Guard 1: no client → fail ---
-    _init_genai_client()  # Lazy-init on first use
-    if not _genai_client:
-        _log_safe("[AI Avatar] Gemini client not initialized (no API key?).")
-        return None
-
-    # --- Guard 2: concurrent lock ---
-    lock_acquired = _gemini_lock.acquire(blocking=False)
-    if not lock_acquired:
-        _log_safe("[AI Avatar] Gemini request already in-flight — skipping duplicate.")
-        return None
-
-    # --- Guard 3: cooldown ---
-    elapsed = time.time() - _gemini_last_call_ts
-    if elapsed < _GEMINI_COOLDOWN_SEC:
-        _log_safe(f"[AI Avatar] Gemini cooldown active ({elapsed:.1f}s / {_GEMINI_COOLDOWN_SEC}s) — skipping.")
-        return None
-
-    # --- Build the prompt ---
+def _build_gemini_prompt(user_message, context=None, system_prompt_override=None):
+    """Assemble the full prompt (system prompt + sanitized context + message)."""
     safe_context = _sanitize_context(context)
     safe_message = _sanitize_user_message(user_message)
     user_text = ""
@@ -368,7 +303,67 @@ def _call_gemini(user_message, context=None, system_prompt_override=None):
 
     # Combine system prompt + user message
     active_system_prompt = system_prompt_override or SYSTEM_PROMPT
-    full_prompt = f"{active_system_prompt}\n\n---\nUser message:\n{user_text}"
+    return f"{active_system_prompt}\n\n---\nUser message:\n{user_text}"
+
+
+def _parse_gemini_text(text):
+    """Strip markdown fencing and parse the model's JSON reply."""
+    text = str(text or "").strip()
+    if text.startswith("```"):
+        text = re.sub(r"^```(?:json)?\s*", "", text)
+        text = re.sub(r"\s*```$", "", text)
+    return json.loads(text)
+
+
+def _acquire_gemini_slot():
+    """
+    Take the single in-flight slot if the cooldown has elapsed.
+    Returns True when the caller must release _gemini_lock afterwards.
+    """
+    if not _gemini_lock.acquire(blocking=False):
+        _log_safe("[AI Avatar] Gemini request already in-flight — skipping duplicate.")
+        return False
+
+    elapsed = time.time() - _gemini_last_call_ts
+    if elapsed < _GEMINI_COOLDOWN_SEC:
+        _gemini_lock.release()
+        _log_safe(f"[AI Avatar] Gemini cooldown active ({elapsed:.1f}s / {_GEMINI_COOLDOWN_SEC}s) — skipping.")
+        return False
+    return True
+
+
+def _log_gemini_failure(e):
+    if isinstance(e, GeminiUnavailable):
+        _log_safe(f"[AI Avatar] Gemini skipped: {e}")
+    else:
+        _log_safe(f"[AI Avatar] Gemini error: {type(e).__name__}: {str(e)[:500]}")
+
+
+def _call_gemini(user_message, context=None, system_prompt_override=None):
+    """
+    Send a message to Google Gemini API using the official SDK.
+
+    Guards:
+      • Skips if no API key / client not initialized
+      • Enforces a cooldown of _GEMINI_COOLDOWN_SEC between calls
+      • Prevents concurrent in-flight requests (_gemini_lock)
+      • Deadline, retries and circuit breaker live in gemini_client
+
+    Returns parsed dict on success, None on failure.
+    """
+    global _gemini_last_call_ts
+
+    # --- Guard 1: no client → fail ---
+    _init_genai_client()  # Lazy-init on first use
+    if not _genai_client:
+        _log_safe("[AI Avatar] Gemini client not initialized (no API key?).")
+        return None
+
+    # --- Guards 2 + 3: concurrent lock and cooldown ---
+    if not _acquire_gemini_slot():
+        return None
+
+    full_prompt = _build_gemini_prompt(user_message, context, system_prompt_override)
 
     _log_safe(
         f"[AI Avatar] Gemini SDK request -> model={GEMINI_MODEL}, "
@@ -377,45 +372,33 @@ def _call_gemini(user_message, context=None, system_prompt_override=None):
 
     # --- Fire the request under lock ---
     _gemini_last_call_ts = time.time()
-    _gemini_stats["requests"] += 1
     try:
-        model = _genai_client.GenerativeModel(GEMINI_MODEL)
-        response = model.generate_content(full_prompt)
+        response = _genai_client.generate(full_prompt)
         _log_safe(f"[AI Avatar] Gemini responded; candidate_count={len(getattr(response, 'candidates', []) or [])}")
 
         # Extract text from response
         if not response.text:
             print("[AI Avatar] Gemini returned empty response.")
-            _gemini_stats["failed"] += 1
             return None
 
         text = response.text.strip()
         _log_safe(f"[AI Avatar] Gemini raw response: {text[:200]}...")
 
-        # Clean potential markdown fencing
-        if text.startswith("```"):
-            text = re.sub(r"^```(?:json)?\s*", "", text)
-            text = re.sub(r"\s*```$", "", text)
-
-        parsed = json.loads(text)
-        _gemini_stats["success"] += 1
+        parsed = _parse_gemini_text(text)
         print(f"[AI Avatar] Gemini OK — status={parsed.get('status')}")
         return parsed
 
     except Exception as e:
-        _gemini_stats["failed"] += 1
-        err_str = str(e)
-        _log_safe(f"[AI Avatar] Gemini error: {type(e).__name__}: {err_str[:500]}")
-        # Check for rate limiting in error message
-        if "429" in err_str or "rate" in err_str.lower():
-            _gemini_stats["rate_limited"] += 1
-            _gemini_last_call_ts = time.time() + 5  # extra 5-sec penalty
-            print("[AI Avatar] Rate-limited — extending cooldown by 5s.")
+        _log_gemini_failure(e)
         return None
 
     finally:
-        if lock_acquired:
-            _gemini_lock.release()
+        _gemini_lock.release()
+
+
+def _gemini_text_stream(prompt):
+    """Yield text chunks from Gemini's streaming API."""
+    return _genai_client.stream(prompt)
 
 
 def _norm_confidence(value, default="low"):
@@ -465,15 +448,89 @@ def _safe_float(value, default=0.0):
         return default
 
 
+def food_catalog():
+    """Shared food catalog (packed file if built, else INDIAN_FOOD_ESTIMATES)."""
+    return get_food_catalog(INDIAN_FOOD_ESTIMATES)
+
+
+# Intent keywords, matched as whole words (plurals and -ing/-ed forms folded).
+INTENT_KEYWORDS = {
+    "nutrition": [
+        "ate", "eaten", "had", "log", "food", "meal", "breakfast", "lunch",
+        "dinner", "snack", "calories", "macros", "nutrition", "drink", "drank",
+        "roti", "rice", "dal", "egg", "chicken", "paneer", "dosa", "idli",
+        "biryani", "samosa", "chai", "milk", "banana", "apple", "bread"
+    ],
+    "task": [
+        "task", "todo", "to-do", "to do", "reminder", "remind",
+        "need to", "have to", "gotta", "should", "must", "deadline"
+    ],
+    "project": [
+        "project", "create project", "new project", "start project"
+    ],
+}
+
+_message_matcher = None
+_message_matcher_lock = threading.Lock()
+
+
+def _get_message_matcher():
+    """Build the food + intent phrase matcher once per process."""
+    global _message_matcher
+    if _message_matcher is not None:
+        return _message_matcher
+    with _message_matcher_lock:
+        if _message_matcher is None:
+            matcher = PhraseMatcher()
+            for intent, keywords in INTENT_KEYWORDS.items():
+                for kw in keywords:
+                    matcher.add(kw, ("intent", intent))
+
+            catalog = food_catalog()
+            if len(catalog) <= Config.FOOD_MATCHER_MAX_FOODS:
+                names = catalog.iter_names()
+            else:
+                names = INDIAN_FOOD_ESTIMATES.keys()
+            for name in names:
+                matcher.add(name, ("food", name))
+            _message_matcher = matcher.build()
+    return _message_matcher
+
+
+def _scan_message(text):
+    """
+    One pass over the message.
+    Returns (intents, foods): the set of intent names hit and the
+    leftmost-longest, non-overlapping food matches in order.
+    """
+    intents = set()
+    food_hits = []
+    for match in _get_message_matcher().find_all(text, tokenize(text)):
+        kind, value = match.payload
+        if kind == "intent":
+            intents.add(value)
+        else:
+            food_hits.append(match)
+    return intents, select_longest(food_hits)
+
+
+def _food_estimate(name):
+    return food_catalog().get(name) or INDIAN_FOOD_ESTIMATES.get(name)
+
+
 def _find_local_food_estimate(name):
     food_name = str(name or "").strip().lower()
     if not food_name:
         return None, None
 
-    for key in sorted(INDIAN_FOOD_ESTIMATES.keys(), key=len, reverse=True):
-        if key in food_name or food_name in key:
-            return key, INDIAN_FOOD_ESTIMATES[key]
-    return None, None
+    _, foods = _scan_message(food_name)
+    if foods:
+        best = max(foods, key=lambda m: m.length)
+        key = best.payload[1]
+        estimate = _food_estimate(key)
+        if estimate:
+            return key, estimate
+    return food_catalog().lookup(food_name)
 
 
 def _hydrate_missing_macros(name, quantity, calories, protein, carbs, fats):
@@ -646,13 +703,17 @@ def _set_cached_response(cache_key, value):
 
 
 def get_gemini_analytics():
-    requests = _gemini_stats["requests"]
-    success_rate = 0.0 if requests == 0 else round((_gemini_stats["success"] / requests) * 100, 2)
+    stats = get_gemini_manager().snapshot()
+    requests = stats["requests"]
+    success_rate = 0.0 if requests == 0 else round((stats["success"] / requests) * 100, 2)
     return {
         "requests": requests,
-        "success": _gemini_stats["success"],
-        "failed": _gemini_stats["failed"],
-        "rate_limited": _gemini_stats["rate_limited"],
+        "success": stats["success"],
+        "failed": stats["failed"],
+        "rate_limited": stats["rate_limited"],
+        "retries": stats["retries"],
+        "short_circuited": stats["short_circuited"],
+        "circuit_state": stats["circuit_state"],
         "success_rate": success_rate,
     }
 
@@ -750,28 +811,10 @@ def _classify_intent(user_input, context=None):
     lower = user_input.lower().strip()
     page = (context or {}).get("current_page", "").lower()
 
-    # Nutrition keywords
-    nutrition_kw = [
-        "ate", "eaten", "had", "log", "food", "meal", "breakfast", "lunch",
-        "dinner", "snack", "calories", "macros", "nutrition", "drink", "drank",
-        "roti", "rice", "dal", "egg", "chicken", "paneer", "dosa", "idli",
-        "biryani", "samosa", "chai", "milk", "banana", "apple", "bread"
-    ]
-
-    # Task keywords
-    task_kw = [
-        "task", "todo", "to-do", "to do", "reminder", "remind",
-        "need to", "have to", "gotta", "should", "must", "deadline"
-    ]
-
-    # Project keywords
-    project_kw = [
-        "project", "create project", "new project", "start project"
-    ]
-
-    has_nutrition = any(kw in lower for kw in nutrition_kw)
-    has_task = any(kw in lower for kw in task_kw)
-    has_project = any(kw in lower for kw in project_kw)
+    intents, _ = _scan_message(lower)
+    has_nutrition = "nutrition" in intents
+    has_task = "task" in intents
+    has_project = "project" in intents
 
     if has_nutrition and has_task:
         return "multiple_actions"
@@ -785,6 +828,32 @@ def _classify_intent(user_input, context=None):
     return "general_chat"
 
 
+def _quantity_before(text):
+    """Quantity written just before a food mention ('2', 'two', 'half'), else 1."""
+    for word, _, _ in reversed(tokenize(text)[-3:]):
+        try:
+            return float(word)
+        except ValueError:
+            pass
+        if word in QTY_WORDS:
+            return float(QTY_WORDS[word])
+    return 1.0
+
+
+def _nutrition_item(name, qty, estimate):
+    return {
+        "name": name.title(),
+        "quantity": qty,
+        "unit": estimate["serving"],
+        "calories": round(estimate["calories"] * qty),
+        "protein": round(estimate["protein"] * qty, 1),
+        "carbs": round(estimate["carbs"] * qty, 1),
+        "fats": round(estimate["fats"] * qty, 1),
+        "is_estimate": True,
+        "note": f"~{estimate['grams'] * qty:.0f}g estimated"
+    }
+
+
 def _guess_meal_type(text):
     """Guess meal type from text."""
     lower = text.lower()
@@ -815,39 +884,33 @@ def _local_nutrition(user_input, context=None):
     low_confidence = False
 
     for seg in segments:
+        # Every catalog food in the segment, with the quantity written before it
+        _, foods = _scan_message(seg)
+        matched = False
+        prev_end = 0
+        for food in foods:
+            key = food.payload[1]
+            estimate = _food_estimate(key)
+            if not estimate:
+                continue
+            qty = _quantity_before(seg[prev_end:food.start])
+            prev_end = food.end
+            items.append(_nutrition_item(key, qty, estimate))
+            matched = True
+        if matched:
+            continue
+
         qty, food_text = _parse_quantity_word(seg)
 
         # Strip common modifiers
         food_clean = re.sub(r"\b(cooked|raw|boiled|fried|grilled|baked|steamed|hot|cold|fresh|leftover)\b", "", food_text, flags=re.IGNORECASE).strip()
         food_lower = food_clean.lower()
 
-        # Direct lookup — longest key first to match compound foods
-        match = None
-        for key in sorted(INDIAN_FOOD_ESTIMATES.keys(), key=len, reverse=True):
-            if key in food_lower:
-                match = INDIAN_FOOD_ESTIMATES[key]
-                matched_name = key
-                break
-        # Fallback: try matching the food as a substring of a key (only if multi-word)
-        if not match and len(food_lower.split()) >= 2:
-            for key in sorted(INDIAN_FOOD_ESTIMATES.keys(), key=len, reverse=True):
-                if food_lower in key:
-                    match = INDIAN_FOOD_ESTIMATES[key]
-                    matched_name = key
-                    break
+        # Catalog lookup (prefix fallback / foods outside the in-process matcher)
+        matched_name, match = food_catalog().lookup(food_lower)
 
         if match:
-            items.append({
-                "name": matched_name.title(),
-                "quantity": qty,
-                "unit": match["serving"],
-                "calories": round(match["calories"] * qty),
-                "protein": round(match["protein"] * qty, 1),
-                "carbs": round(match["carbs"] * qty, 1),
-                "fats": round(match["fats"] * qty, 1),
-                "is_estimate": True,
-                "note": f"~{match['grams'] * qty:.0f}g estimated"
-            })
+            items.append(_nutrition_item(matched_name, qty, match))
         else:
             low_confidence = True
             items.append({
@@ -1168,6 +1231,11 @@ def process_avatar_message(user_input, context=None, mode="general"):
     if _genai_client:
         gemini_result = _call_gemini(user_input, context, system_prompt_override=mentor_prompt_override)
 
+    return _finish_avatar_result(user_input, context, mode, gemini_result, should_cache, cache_key)
+
+
+def _finish_avatar_result(user_input, context, mode, gemini_result, should_cache, cache_key):
+    """Validate a Gemini reply, or fall back to the local engine."""
     if gemini_result:
         normalized = _normalize_gemini_payload(gemini_result)
         # If mode is explicit (not general) but Gemini returned a chat_response,
@@ -1198,3 +1266,77 @@ def process_avatar_message(user_input, context=None, mode="general"):
     if should_cache:
         _set_cached_response(cache_key, result)
     return result
+
+
+def stream_avatar_message(user_input, context=None, mode="general", streamer=None):
+    """
+    Streaming variant of process_avatar_message.
+
+    Yields (event, data) tuples:
+        ("delta", {"text": "..."})  — user-facing text as Gemini produces it
+        ("result", {...})           — final validated payload, same shape as
+                                      process_avatar_message (authoritative;
+                                      may differ from the deltas on fallback)
+
+    `streamer(prompt)` replaces the Gemini streaming call when given
+    (e.g. ai_streaming.FakeGeminiStreamer).
+    """
+    global _gemini_last_call_ts
+
+    if not user_input or not user_input.strip():
+        yield "result", {
+            "status": "clarification_needed",
+            "message": "It looks like you sent an empty message. What would you like help with?"
+        }
+        return
+
+    if context is None:
+        context = {}
+    context["mode"] = mode
+
+    is_mentor = user_input.strip().startswith("[MENTOR_MODE]") or (context.get("mentor_mode") is True)
+    mentor_prompt_override = MENTOR_SYSTEM_PROMPT if is_mentor else None
+    should_cache = (mode == "general" and not is_mentor)
+    cache_key = _cache_key(user_input, context, mode) if should_cache else ""
+
+    if should_cache:
+        cached = _get_cached_response(cache_key)
+        if cached:
+            cached["analytics"] = get_gemini_analytics()
+            yield "result", cached
+            return
+
+    use_gemini = streamer is None
+    if use_gemini:
+        _init_genai_client()
+        if not _genai_client and Config.AI_FAKE_STREAM:
+            streamer = FakeGeminiStreamer(delay=0.05)
+            use_gemini = False
+        elif not _genai_client or not _acquire_gemini_slot():
+            # No streaming possible; answer in one piece.
+            yield "result", process_avatar_message(user_input, context, mode=mode)
+            return
+        else:
+            streamer = _gemini_text_stream
+            _gemini_last_call_ts = time.time()
+
+    prompt = _build_gemini_prompt(user_input, context, mentor_prompt_override)
+    decoder = MessageFieldDecoder("message")
+    chunks = []
+    gemini_result = None
+    try:
+        for chunk in streamer(prompt):
+            chunks.append(chunk)
+            delta = decoder.feed(chunk)
+            if delta:
+                yield "delta", {"text": delta}
+        gemini_result = _parse_gemini_text("".join(chunks))
+    except Exception as e:
+        _log_gemini_failure(e)
+    finally:
+        if use_gemini:
+            _gemini_lock.release()
+
+    if gemini_result is not None and not isinstance(gemini_result, dict):
+        gemini_result = None
+    yield "result", _finish_avatar_result(user_input, context, mode, gemini_result, should_cache, cache_key)
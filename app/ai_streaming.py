@@ -0,0 +1,159 @@
+"""
+FILE: app/ai_streaming.py
+
+Responsibility:
+  Helpers for streaming AI replies: Server-Sent Events framing, incremental
+  extraction of the user-facing "message" text from a partially received
+  JSON payload, and a fake Gemini streamer for local runs and tests.
+
+MUST NOT:
+  - Import Flask, db, or route modules
+  - Call the Gemini SDK (ai_avatar.py owns the real client)
+
+Depends on:
+  - json (standard library)
+"""
+
+import json
+import time
+
+
+def sse_event(event, data):
+    """Frame one Server-Sent Event. `data` is JSON-encoded on a single line."""
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class MessageFieldDecoder:
+    """Incrementally decode the string value of one top-level JSON field.
+
+    Gemini replies are JSON objects; only the "message" value is meant for
+    the user. Feed raw chunks as they arrive and get back the newly decoded
+    part of that value, so partial text can be shown before the JSON
+    is complete.
+    """
+
+    def __init__(self, field="message"):
+        self._marker = f'"{field}"'
+        self._buffer = ""
+        self._pos = None      # index of the next undecoded char in the value
+        self._done = False
+        self.text = ""
+
+    def feed(self, chunk):
+        if self._done or not chunk:
+            return ""
+        self._buffer += chunk
+
+        if self._pos is None:
+            self._pos = self._find_value_start()
+            if self._pos is None:
+                return ""
+
+        out = []
+        buf = self._buffer
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self._done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            # Escape sequence: wait for the whole sequence before decoding.
+            if i + 1 >= len(buf):
+                break
+            esc = buf[i + 1]
+            if esc == "u":
+                if i + 6 > len(buf):
+                    break
+                try:
+                    code = int(buf[i + 2:i + 6], 16)
+                except ValueError:
+                    code = None
+                if code is not None and 0xD800 <= code < 0xDC00:
+                    # High surrogate: wait for its low half (\uDC00-\uDFFF).
+                    if i + 12 > len(buf):
+                        break
+                    try:
+                        low = int(buf[i + 8:i + 12], 16) if buf[i + 6:i + 8] == "\\u" else None
+                    except ValueError:
+                        low = None
+                    if low is not None and 0xDC00 <= low < 0xE000:
+                        out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                        i += 12
+                        continue
+                    code = None
+                if code is not None and not 0xDC00 <= code < 0xE000:
+                    out.append(chr(code))
+                i += 6
+            else:
+                out.append(_ESCAPES.get(esc, esc))
+                i += 2
+        self._pos = i
+
+        delta = "".join(out)
+        self.text += delta
+        return delta
+
+    def _find_value_start(self):
+        key_at = self._buffer.find(self._marker)
+        if key_at < 0:
+            return None
+        i = key_at + len(self._marker)
+        buf = self._buffer
+        while i < len(buf) and buf[i] in " \t\r\n":
+            i += 1
+        if i >= len(buf) or buf[i] != ":":
+            return None
+        i += 1
+        while i < len(buf) and buf[i] in " \t\r\n":
+            i += 1
+        if i >= len(buf):
+            return None
+        if buf[i] != '"':
+            # Not a string value; nothing to stream.
+            self._done = True
+            return None
+        return i + 1
+
+
+class FakeGeminiStreamer:
+    """Stand-in for the Gemini streaming API.
+
+    Called with the prompt, it yields the JSON text of `payload` in
+    `chunk_size` pieces, sleeping `delay` seconds between them.
+    """
+
+    DEFAULT_PAYLOAD = {
+        "intent": "general_chat",
+        "intent_confidence": "high",
+        "status": "chat_response",
+        "message": (
+            "This is a streamed reply from the local fake Gemini streamer. "
+            "Set GEMINI_API_KEY to talk to the real model."
+        ),
+    }
+
+    def __init__(self, payload=None, *, chunk_size=12, delay=0.0, fail_after=None):
+        self.payload = payload if payload is not None else dict(self.DEFAULT_PAYLOAD)
+        self.chunk_size = max(1, int(chunk_size))
+        self.delay = max(0.0, float(delay))
+        self.fail_after = fail_after
+        self.prompts = []
+
+    def __call__(self, prompt):
+        self.prompts.append(prompt)
+        text = self.payload if isinstance(self.payload, str) else json.dumps(self.payload)
+        for index, start in enumerate(range(0, len(text), self.chunk_size)):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise RuntimeError("fake stream interrupted")
+            if self.delay and index:
+                time.sleep(self.delay)
+            yield text[start:start + self.chunk_size]
@@ -2,7 +2,7 @@
 FILE: app/api/ai_routes.py
 
 Responsibility:
-  AI Avatar chat endpoint, mentor context endpoint,
+  AI Avatar chat endpoints (JSON and SSE streaming), mentor context endpoint,
   AI analytics endpoint, and action execution endpoint.
 
 MUST NOT:
@@ -10,8 +10,9 @@ MUST NOT:
   - Bypass the confirmation flow for actions
 
 Depends on:
-  - ai_avatar (process_avatar_message, get_gemini_analytics)
-  - points_engine (get_or_create_progress, level_progress)
+  - ai_avatar (process_avatar_message, stream_avatar_message, get_gemini_analytics)
+  - ai_streaming.sse_event
+  - mentor_context (get_mentor_context, invalidate_mentor_context)
   - db.get_db(), mappers.*, utils.*
   - helpers.default_user_id()
 """
@@ -20,13 +21,14 @@ Depends on:
 import json
 from datetime import datetime
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, g, jsonify, request, stream_with_context
 
-from ..ai_avatar import get_gemini_analytics, process_avatar_message
+from ..ai_avatar import get_gemini_analytics, process_avatar_message, stream_avatar_message
+from ..ai_streaming import sse_event
 from ..db import get_db
 from ..middleware import rate_limit
 from ..mappers import map_task
-from ..points_engine import get_or_create_progress, level_progress
+from ..mentor_context import get_mentor_context, invalidate_mentor_context
 from ..repositories.nutrition_repo import NutritionRepository
 from ..repositories.project_repo import ProjectRepository
 from ..repositories.task_repo import TaskRepository
@@ -40,71 +42,21 @@ ai_bp = Blueprint("ai", __name__)
 @ai_bp.route("/api/mentor/context", methods=["GET"])
 @rate_limit(max_requests=30, window_seconds=60)
 def mentor_context():
-    db = get_db()
     user_id = default_user_id()
-    date = today_str()
-
-    task_rows = TaskRepository.get_all(user_id, date_filter=date)
-    tasks_total = len(task_rows)
-    tasks_completed = sum(1 for t in task_rows if t["completed"])
-    tasks_pending = tasks_total - tasks_completed
-
-    overdue_rows = TaskRepository.get_overdue(user_id, before_date=date, limit=10)
-    overdue_tasks = [{"title": r["title"], "date": r["date"], "priority": r["priority"]} for r in overdue_rows]
-
-    upcoming_tasks = [
-        {"title": r["title"], "priority": r["priority"]}
-        for r in task_rows if not r["completed"]
-    ]
-
-    nutrition_rows = NutritionRepository.get_all(user_id, date_filter=date)
-    total_calories = sum(r["calories"] or 0 for r in nutrition_rows)
-    total_protein = sum(r["protein"] or 0 for r in nutrition_rows)
-    total_carbs = sum(r["carbs"] or 0 for r in nutrition_rows)
-    total_fats = sum(r["fats"] or 0 for r in nutrition_rows)
-    total_meals = len(nutrition_rows)
-
-    workout_rows = WorkoutRepository.get_all(user_id, date_filter=date)
-    workouts_total = len(workout_rows)
-    workouts_completed = sum(1 for w in workout_rows if w["completed"])
-    workout_names = [w["name"] for w in workout_rows if not w["completed"]]
-
-    progress = get_or_create_progress(db, user_id)
-    lp = level_progress(progress["total_points"])
-
-    context = {
-        "date": date,
-        "tasks": {
-            "total": tasks_total,
-            "completed": tasks_completed,
-            "pending": tasks_pending,
-            "overdue": overdue_tasks,
-            "upcoming": upcoming_tasks,
-        },
-        "nutrition": {
-            "meals_logged": total_meals,
-            "calories_consumed": round(total_calories),
-            "protein_consumed": round(total_protein, 1),
-            "carbs_consumed": round(total_carbs, 1),
-            "fats_consumed": round(total_fats, 1),
-        },
-        "workouts": {
-            "total": workouts_total,
-            "completed": workouts_completed,
-            "pending_names": workout_names,
-        },
-        "progress": {
-            "current_streak": progress["current_streak"],
-            "longest_streak": progress["longest_streak"],
-            "total_points": progress["total_points"],
-            "level": lp[0],
-            "level_pct": round(lp[3]),
-        },
-    }
-
+    context = get_mentor_context(get_db(), user_id, today_str())
     return jsonify(context), 200
 
 
+@ai_bp.after_app_request
+def _invalidate_mentor_context_on_write(response):
+    """Any successful write by a user may change their mentor context."""
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        user_id = getattr(g, "current_user_id", None) or getattr(g, "user_id", None)
+        if user_id:
+            invalidate_mentor_context(user_id)
+    return response
+
+
 @ai_bp.route("/api/ai/chat", methods=["POST"])
 @rate_limit(max_requests=20, window_seconds=60)
 def ai_avatar_chat():
@@ -125,6 +77,38 @@ def ai_avatar_chat():
     return jsonify(result), 200
 
 
+@ai_bp.route("/api/ai/chat/stream", methods=["POST"])
+@rate_limit(max_requests=20, window_seconds=60)
+def ai_avatar_chat_stream():
+    """
+    Same request body as /api/ai/chat, answered as Server-Sent Events:
+      event: delta   data: {"text": "..."}  (repeated, partial reply text)
+      event: result  data: {...}            (final payload, as /api/ai/chat)
+    """
+    user_id = default_user_id()  # Require auth
+    req_data = request.get_json(silent=True) or {}
+    message = (req_data.get("message") or "").strip()
+    if not message:
+        return jsonify({"status": "clarification_needed", "message": "Please type a message."}), 400
+
+    context = req_data.get("context", {})
+    context["today"] = today_str()
+    context["user_id"] = user_id
+    mode = (req_data.get("mode") or "general").strip().lower()
+
+    def generate():
+        for event, data in stream_avatar_message(message, context, mode=mode):
+            if event == "result" and isinstance(data, dict) and data.get("error"):
+                data = {"status": "manual_fallback", "message": "AI service is temporarily unavailable."}
+            yield sse_event(event, data)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @ai_bp.route("/api/ai/analytics", methods=["GET"])
 @rate_limit(max_requests=30, window_seconds=60)
 def ai_avatar_analytics():
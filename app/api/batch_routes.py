@@ -0,0 +1,121 @@
+"""
+FILE: app/api/batch_routes.py
+
+Responsibility:
+  POST /api/batch — run several GET sub-requests in one round trip.
+  Sub-requests are dispatched in-process through the normal routing,
+  middleware and error handlers, sharing the caller's app context: the
+  session is validated once (g.current_user_id) and every sub-request uses
+  the same DB connection (g.db).
+
+MUST NOT:
+  - Dispatch anything other than GET (no writes through the batch)
+  - Import or call other route modules directly (go through the URL map)
+
+Depends on:
+  - middleware.rate_limit, middleware.validate_json
+  - helpers.default_user_id()
+  - config.py (BATCH_MAX_REQUESTS)
+
+Request:
+  {"requests": ["/api/tasks", {"id": "goals", "path": "/api/goals", "etag": "..."}]}
+
+Response (same order; body is omitted for 304 and non-JSON responses):
+  {"responses": [{"id": ..., "path": ..., "status": 200, "etag": "...", "body": {...}}]}
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.test import EnvironBuilder
+
+from ..middleware import rate_limit, validate_json
+from .helpers import default_user_id
+
+batch_bp = Blueprint("batch", __name__)
+
+BATCH_PATH = "/api/batch"
+
+
+def _parse_item(index, item):
+    """Return (id, path, etag) or raise ValueError with a client message."""
+    if isinstance(item, str):
+        item = {"path": item}
+    if not isinstance(item, dict):
+        raise ValueError(f"requests[{index}] must be a path or an object")
+    path = item.get("path")
+    if not isinstance(path, str) or not path.startswith("/api/"):
+        raise ValueError(f"requests[{index}].path must start with /api/")
+    if path.split("?", 1)[0].rstrip("/") == BATCH_PATH:
+        raise ValueError(f"requests[{index}] cannot be a batch")
+    method = str(item.get("method", "GET")).upper()
+    if method != "GET":
+        raise ValueError(f"requests[{index}]: only GET is supported")
+    etag = item.get("etag")
+    return item.get("id", index), path, etag if isinstance(etag, str) else None
+
+
+def _dispatch(path, etag):
+    """Run one GET through the app; return (status, etag, body)."""
+    headers = {"Cookie": request.headers.get("Cookie", "")}
+    if etag:
+        headers["If-None-Match"] = etag
+    builder = EnvironBuilder(
+        path=path,
+        base_url=request.root_url,
+        method="GET",
+        headers=headers,
+        environ_base={"REMOTE_ADDR": request.remote_addr or ""},
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    app = current_app._get_current_object()
+    # The caller's app context is still active, so this request context
+    # reuses it (and g with it) instead of pushing a new one.
+    with app.request_context(environ) as ctx:
+        try:
+            response = app.full_dispatch_request()
+        except Exception as exc:
+            response = app.make_response(app.handle_exception(exc))
+        try:
+            if response.status_code == 200 and response.is_json and not response.is_streamed:
+                if not response.get_etag()[0]:
+                    response.add_etag()
+                response.make_conditional(ctx.request)
+            body = None
+            if response.status_code != 304 and response.is_json:
+                body = response.get_json(silent=True)
+            return response.status_code, response.get_etag()[0], body
+        finally:
+            response.close()
+
+
+@batch_bp.route(BATCH_PATH, methods=["POST"])
+@rate_limit(max_requests=60, window_seconds=60)
+@validate_json("requests")
+def run_batch():
+    default_user_id()  # authenticate once; sub-requests reuse g.current_user_id
+    items = request.get_json()["requests"]
+    max_requests = current_app.config.get("BATCH_MAX_REQUESTS", 20)
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "requests must be a non-empty list"}), 400
+    if len(items) > max_requests:
+        return jsonify({"error": f"At most {max_requests} requests per batch"}), 400
+
+    try:
+        parsed = [_parse_item(i, item) for i, item in enumerate(items)]
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    responses = []
+    for item_id, path, etag in parsed:
+        status, item_etag, body = _dispatch(path, etag)
+        responses.append({
+            "id": item_id,
+            "path": path,
+            "status": status,
+            "etag": item_etag,
+            "body": body,
+        })
+    return jsonify({"responses": responses})
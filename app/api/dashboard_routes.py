@@ -2,8 +2,9 @@
 FILE: app/api/dashboard_routes.py
 
 Responsibility:
-  Serves the static index.html (web_bp) and provides
-  the /api/data summary endpoint (dashboard_bp).
+  Serves the static index.html, the service worker and built assets
+  (web_bp) and provides the /api/data summary and /api/metrics
+  endpoints (dashboard_bp).
 
 MUST NOT:
   - Contain CRUD logic for individual resources
@@ -12,15 +13,21 @@ MUST NOT:
 Depends on:
   - db.get_db(), mappers.*, utils.today_str
   - helpers.default_user_id()
+  - static_assets (build manifest, precompressed variants)
+  - compression, shared_goal_cache (process counters for /api/metrics)
 """
 
-from flask import Blueprint, current_app, jsonify, send_from_directory
+from flask import Blueprint, abort, current_app, jsonify, request, send_file, send_from_directory
+from werkzeug.security import safe_join
 
+from ..compression import get_compression_stats
 from ..db import get_db
-from ..mappers import map_meal, map_task, map_workout
+from ..mappers import map_meals, map_tasks, map_workouts
 from ..repositories.nutrition_repo import NutritionRepository
 from ..repositories.task_repo import TaskRepository
 from ..repositories.workout_repo import WorkoutRepository
+from ..shared_goal_cache import get_shared_goal_cache
+from ..static_assets import MUTABLE_BUILD_FILES, build_dir, guess_mimetype, load_manifest, pick_precompressed
 from ..utils import today_str
 from .helpers import default_user_id
 
@@ -28,15 +35,61 @@ web_bp = Blueprint("web", __name__)
 dashboard_bp = Blueprint("dashboard", __name__)
 
 
+def _send_built(filename):
+    """Send a file from static/dist, preferring a precompressed variant.
+
+    Hashed assets never change, so they get a year-long immutable lifetime;
+    index.html, sw.js and the manifest are revalidated on every use.
+    """
+    path = safe_join(str(build_dir(current_app.config["STATIC_DIR"])), filename)
+    if path is None:
+        abort(404)
+    file_path, encoding = pick_precompressed(path, lambda enc: request.accept_encodings[enc])
+    try:
+        response = send_file(file_path, mimetype=guess_mimetype(filename), conditional=True)
+    except FileNotFoundError:
+        abort(404)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    if filename in MUTABLE_BUILD_FILES:
+        response.headers["Cache-Control"] = "no-cache"
+    else:
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+def _send_index(max_age=None):
+    if load_manifest(current_app.config["STATIC_DIR"]) is not None:
+        response = _send_built("index.html")
+        if max_age:
+            response.headers["Cache-Control"] = f"public, max-age={int(max_age)}"
+        return response
+    return send_from_directory(str(current_app.config["STATIC_DIR"]), "index.html", max_age=max_age)
+
+
 @web_bp.route("/")
 def index():
-    return send_from_directory(str(current_app.config["STATIC_DIR"]), "index.html")
+    return _send_index()
 
 
 @web_bp.route("/shared/goal/<share_token>")
 def shared_goal(share_token):
-    """Serve shared goal page"""
-    return send_from_directory(str(current_app.config["STATIC_DIR"]), "index.html")
+    """Serve shared goal page (the same shell for every token, so it is cacheable)"""
+    return _send_index(max_age=current_app.config.get("SHARED_GOAL_MAX_AGE_SECONDS", 30))
+
+
+@web_bp.route("/sw.js")
+def service_worker():
+    """Service worker; the built copy lists the hashed shell files."""
+    if load_manifest(current_app.config["STATIC_DIR"]) is not None:
+        return _send_built("sw.js")
+    return send_from_directory(str(current_app.config["STATIC_DIR"]), "sw.js", max_age=0)
+
+
+@web_bp.route("/dist/<path:filename>")
+def built_asset(filename):
+    return _send_built(filename)
 
 
 @web_bp.route("/music/<path:filename>")
@@ -59,9 +112,9 @@ def get_data_summary():
     meal_rows = NutritionRepository.get_all(uid, date_filter)
     workout_rows = WorkoutRepository.get_all(uid, date_filter)
 
-    tasks = [map_task(r) for r in task_rows]
-    meals = [map_meal(r) for r in meal_rows]
-    workouts = [map_workout(r) for r in workout_rows]
+    tasks = map_tasks(task_rows)
+    meals = map_meals(meal_rows)
+    workouts = map_workouts(workout_rows)
     total_calories = sum(m.get("calories", 0) for m in meals)
 
     user_row = db.execute(
@@ -97,3 +150,13 @@ def get_data_summary():
             },
         },
     })
+
+
+@dashboard_bp.route("/api/metrics", methods=["GET"])
+def get_metrics():
+    """Counters for this worker process (each gunicorn worker has its own)."""
+    default_user_id()
+    return jsonify({
+        "compression": get_compression_stats().snapshot(),
+        "shared_goal_cache": dict(get_shared_goal_cache().stats),
+    })
@@ -12,17 +12,20 @@ MUST NOT:
 
 Depends on:
   - FocusRepository (data access layer)
+  - mappers.map_focus_sessions
   - utils.today_str()
   - helpers.default_user_id()
+  - helpers.page_request(), helpers.list_response() (?limit=&cursor=&fields=)
 """
 
 
 from flask import Blueprint, jsonify, request
 
+from ..mappers import map_focus_sessions
 from ..middleware import rate_limit
 from ..repositories.focus_repo import FocusRepository
 from ..utils import today_str
-from .helpers import default_user_id
+from .helpers import default_user_id, list_response, page_request, requested_fields
 
 focus_bp = Blueprint("focus", __name__)
 
@@ -31,25 +34,16 @@ focus_bp = Blueprint("focus", __name__)
 def get_focus_sessions():
     user_id = default_user_id()
     date_filter = request.args.get("date", today_str())
-    rows = FocusRepository.get_all(user_id, date_filter=date_filter)
-    sessions = []
-    for r in rows:
-        sessions.append({
-            "id": r["id"],
-            "mode": r["mode"],
-            "durationPlanned": r["duration_planned"],
-            "durationActual": r["duration_actual"],
-            "completed": bool(r["completed"]),
-            "label": r["label"],
-            "date": r["date"],
-            "startedAt": r["started_at"],
-            "endedAt": r["ended_at"],
-            "taskId": dict(r).get("task_id"),
-            "projectId": dict(r).get("project_id"),
-            "taskTitle": dict(r).get("task_title"),
-            "projectName": dict(r).get("project_name"),
-        })
-    return jsonify(sessions)
+    try:
+        page = page_request()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if page is None:
+        rows, next_cursor = FocusRepository.get_all(user_id, date_filter=date_filter), None
+    else:
+        rows, next_cursor = FocusRepository.get_page(user_id, page, date_filter=date_filter)
+    sessions = map_focus_sessions(rows)
+    return list_response(sessions, page, next_cursor, requested_fields())
 
 
 @focus_bp.route("/api/focus/sessions", methods=["POST"])
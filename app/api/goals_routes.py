@@ -5,8 +5,21 @@ Handles all goal-related endpoints
 from flask import Blueprint, current_app, request, jsonify, send_file
 from app.repositories.goals_repo import GoalsRepository
 from app.auth import get_current_user_id
+from app.api.helpers import page_request, requested_fields
+from app.pagination import project
+from app.blob_store import (
+    BlobTooLarge,
+    blob_digest_from_ref,
+    blob_url,
+    decode_data_url,
+    get_blob_store,
+    is_valid_digest,
+    sniff_content_type,
+)
+from app.card_render_cache import RENDER_FIELDS, get_card_render_cache
+from app.shared_goal_cache import SharedGoalBudgetExceeded, get_shared_goal_cache
+from app.image_pipeline import ImagePipelineBusy, get_image_pipeline, render_variants
 import io
-import base64
 import logging
 from datetime import datetime
 
@@ -17,19 +30,12 @@ try:
 except ImportError:
     HAS_PIL = False
 
-# Try to import Gemini API (might not be installed or available)
-try:
-    import google.generativeai as genai
-    HAS_GENAI = True
-except (ImportError, AttributeError):
-    HAS_GENAI = False
+from app.gemini_client import get_gemini_manager
 
 
 goals_bp = Blueprint('goals', __name__, url_prefix='/api/goals')
 logger = logging.getLogger(__name__)
 
-_GENAI_CONFIGURED_KEY = None
-
 
 def get_user_id():
     """Get user ID from session cookie - will abort with 401 if not authenticated"""
@@ -41,23 +47,91 @@ def _safe_error(message='Internal server error'):
     return jsonify({'error': message}), 500
 
 
-def _ensure_genai_configured():
-    """Configure Gemini lazily from centralized app config."""
-    global _GENAI_CONFIGURED_KEY  # pylint: disable=global-statement
-    if not HAS_GENAI:
-        return False
-    api_key = (current_app.config.get('GEMINI_API_KEY') or '').strip()
-    if not api_key:
+def _image_limit():
+    return int(current_app.config.get('GOAL_IMAGE_MAX_BYTES', 10 * 1024 * 1024))
+
+
+def _store_card_image(value):
+    """Swap an inline `data:` image for a blob reference before it reaches the row.
+
+    Returns (value, error_response); other values (references, URLs, None)
+    pass through unchanged.
+    """
+    if not isinstance(value, str) or not value.startswith('data:'):
+        return value, None
+    image_data = decode_data_url(value)
+    if not image_data or not sniff_content_type(image_data[:16]).startswith('image/'):
+        return None, (jsonify({'error': 'Invalid image data'}), 400)
+    if len(image_data) > _image_limit():
+        return None, (jsonify({'error': 'Image is too large'}), 413)
+    return blob_url(get_blob_store().put_bytes(image_data)), None
+
+
+def _process_card_image(app, goal_id, user_id, source_url):
+    """Pipeline job: render display/thumbnail variants and point the goal at them."""
+    digest = blob_digest_from_ref(source_url)
+    try:
+        variants = render_variants(get_blob_store().path(digest))
+        with app.app_context():
+            GoalsRepository.set_card_variants(
+                goal_id, user_id, source_url,
+                blob_url(variants['display']), blob_url(variants['thumb']),
+            )
+    except Exception:
+        logger.exception("Goal image processing failed for goal_id=%s", goal_id)
+        raise
+
+
+def _schedule_card_processing(goal_id, user_id, source_url):
+    """Queue resizing for a freshly stored image; True when queued.
+
+    Without Pillow, or while the pipeline is saturated, the original upload
+    simply stays as the card image.
+    """
+    if not HAS_PIL or not blob_digest_from_ref(source_url):
         return False
-    if _GENAI_CONFIGURED_KEY == api_key:
-        return True
     try:
-        genai.configure(api_key=api_key)
-        _GENAI_CONFIGURED_KEY = api_key
+        get_image_pipeline().submit(
+            _process_card_image, current_app._get_current_object(), goal_id, user_id, source_url
+        )
         return True
+    except ImagePipelineBusy:
+        logger.warning("Image pipeline saturated; keeping original image for goal_id=%s", goal_id)
+        return False
+
+
+def _card_png(goal):
+    """Render the downloadable card for `goal` as PNG bytes."""
+    img_bytes = io.BytesIO()
+    generate_card_image(goal).save(img_bytes, format='PNG')
+    return img_bytes.getvalue()
+
+
+def _render_card_job(goal):
+    try:
+        get_card_render_cache().render(goal, _card_png)
     except Exception:
-        logger.exception("Gemini configuration failed")
+        logger.exception("Goal card pre-render failed for goal_id=%s", goal.get('id'))
+        raise
+
+
+def _schedule_card_render(goal):
+    """Pre-render the download card in the background after a change.
+
+    Best effort: when the pool is saturated the download renders on demand.
+    """
+    if not HAS_PIL or not goal:
         return False
+    try:
+        get_image_pipeline().submit(_render_card_job, dict(goal))
+        return True
+    except ImagePipelineBusy:
+        return False
+
+
+def _ensure_genai_configured():
+    """True when the shared Gemini client is configured."""
+    return get_gemini_manager().available()
 
 
 @goals_bp.route('', methods=['GET'])
@@ -68,13 +142,26 @@ def get_goals():
         return jsonify({'error': 'Unauthorized'}), 401
     
     status = request.args.get('status')  # Filter by status if provided
-    goals = GoalsRepository.get_all_goals(user_id, status)
-    
-    return jsonify({
+    try:
+        page = page_request()
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    fields = requested_fields()
+
+    if page is None:
+        goals, next_cursor = GoalsRepository.get_all_goals(user_id, status, fields), None
+    else:
+        goals, next_cursor = GoalsRepository.get_goals_page(user_id, page, status, fields)
+    goals = [project(goal, fields) for goal in goals]
+
+    body = {
         'success': True,
         'goals': goals,
         'count': len(goals)
-    }), 200
+    }
+    if page is not None:
+        body['next_cursor'] = next_cursor
+    return jsonify(body), 200
 
 
 @goals_bp.route('/<int:goal_id>', methods=['GET'])
@@ -118,6 +205,10 @@ def create_goal():
             except (ValueError, TypeError):
                 target_progress = 100.0
 
+        card_image_url, error = _store_card_image(data.get('card_image_url'))
+        if error:
+            return error
+
         goal_id = GoalsRepository.create_goal(
             user_id=user_id,
             title=data['title'],
@@ -125,9 +216,11 @@ def create_goal():
             category=data['category'],
             target_progress=target_progress,
             time_limit=data.get('time_limit'),
-            card_image_url=data.get('card_image_url'),
+            card_image_url=card_image_url,
             ai_prompt=data.get('ai_prompt')
         )
+        if card_image_url != data.get('card_image_url'):
+            _schedule_card_processing(goal_id, user_id, card_image_url)
         
         goal = GoalsRepository.get_goal_by_id(goal_id, user_id)
         
@@ -167,6 +260,10 @@ def update_goal(goal_id):
     # Update other fields
     update_fields = {k: v for k, v in data.items() 
                     if k != 'current_progress' and k not in ['id', 'user_id', 'created_at', 'updated_at', 'completed_at']}
+    if 'card_image_url' in update_fields:
+        update_fields['card_image_url'], error = _store_card_image(update_fields['card_image_url'])
+        if error:
+            return error
     
     if update_fields:
         try:
@@ -174,8 +271,12 @@ def update_goal(goal_id):
         except Exception:
             logger.exception("Goal update failed for goal_id=%s", goal_id)
             return _safe_error('Failed to update goal')
+        if update_fields.get('card_image_url') != data.get('card_image_url'):
+            _schedule_card_processing(goal_id, user_id, update_fields['card_image_url'])
     
     goal = GoalsRepository.get_goal_by_id(goal_id, user_id)
+    if progress_result is not None or any(k in update_fields for k in RENDER_FIELDS):
+        _schedule_card_render(goal)
     
     return jsonify({
         'success': True,
@@ -198,6 +299,7 @@ def delete_goal(goal_id):
     
     try:
         GoalsRepository.delete_goal(goal_id, user_id)
+        get_card_render_cache().purge(goal_id)
         return jsonify({
             'success': True,
             'message': 'Goal deleted successfully'
@@ -261,13 +363,11 @@ def revoke_share(goal_id):
         return _safe_error('Failed to revoke share link')
 
 
-@goals_bp.route('/shared/<share_token>', methods=['GET'])
-def get_shared_goal(share_token):
-    """Get a public shared goal"""
+def _shared_goal_payload(share_token):
+    """Build the public payload for a share token, or None if not shared."""
     goal = GoalsRepository.get_goal_by_share_token(share_token)
-    
     if not goal:
-        return jsonify({'error': 'Goal not found or not shared'}), 404
+        return None
     
     # Calculate unlock segments (4 milestones: 25%, 50%, 75%, 100%)
     unlocked_from_progress = GoalsRepository.get_unlock_segments(goal['current_progress'], num_segments=4)
@@ -275,12 +375,38 @@ def get_shared_goal(share_token):
     unlocked_count = max(len(unlocked_from_progress), snippets_collected)
     unlocked = list(range(unlocked_count))
     
-    return jsonify({
+    return {
         'success': True,
         'goal': goal,
         'unlocked_segments': unlocked,
         'total_segments': 4
-    }), 200
+    }
+
+
+@goals_bp.route('/shared/<share_token>', methods=['GET'])
+def get_shared_goal(share_token):
+    """Get a public shared goal (cached; repeat views revalidate by ETag)"""
+    cache = get_shared_goal_cache()
+    found, payload, etag = cache.get(share_token)
+    if not found:
+        try:
+            cache.charge_lookup(share_token)
+        except SharedGoalBudgetExceeded as e:
+            response = jsonify({'error': 'Too many requests for this shared goal'})
+            response.status_code = 429
+            response.headers['Retry-After'] = str(max(1, int(e.retry_after)))
+            return response
+        payload = _shared_goal_payload(share_token)
+        etag = cache.set(share_token, payload['goal']['id'] if payload else None, payload)
+    
+    if payload is None:
+        return jsonify({'error': 'Goal not found or not shared'}), 404
+    
+    response = jsonify(payload)
+    response.set_etag(etag)
+    max_age = int(current_app.config.get('SHARED_GOAL_MAX_AGE_SECONDS', 30))
+    response.headers['Cache-Control'] = f'public, max-age={max_age}, must-revalidate'
+    return response.make_conditional(request)
 
 
 @goals_bp.route('/<int:goal_id>/image', methods=['POST'])
@@ -303,17 +429,25 @@ def upload_or_generate_image(goal_id):
             if file.filename == '':
                 return jsonify({'error': 'No file selected'}), 400
             
-            # Read and encode image
-            image_data = file.read()
-            encoded_image = base64.b64encode(image_data).decode('utf-8')
-            image_url = f"data:image/png;base64,{encoded_image}"
+            # Check the format, then stream the upload into the blob store
+            head = file.stream.read(16)
+            file.stream.seek(0)
+            if not sniff_content_type(head).startswith('image/'):
+                return jsonify({'error': 'Unsupported image format'}), 400
+            try:
+                digest = get_blob_store().put_stream(file.stream, max_bytes=_image_limit())
+            except BlobTooLarge:
+                return jsonify({'error': 'Image is too large'}), 413
+            image_url = blob_url(digest)
             
             GoalsRepository.update_goal(goal_id, user_id, card_image_url=image_url)
+            processing = _schedule_card_processing(goal_id, user_id, image_url)
             
             return jsonify({
                 'success': True,
                 'message': 'Image uploaded successfully',
-                'card_image_url': image_url
+                'card_image_url': image_url,
+                'processing': processing
             }), 200
         
         elif 'ai_prompt' in data and _ensure_genai_configured():
@@ -324,10 +458,10 @@ def upload_or_generate_image(goal_id):
             
             try:
                 model_name = current_app.config.get('GEMINI_MODEL', 'gemini-2.5-flash')
-                model = genai.GenerativeModel(model_name)
-                response = model.generate_content([
-                    f"Create a professional achievement card design for a goal: {goal['title']}. {prompt}"
-                ])
+                get_gemini_manager().generate(
+                    [f"Create a professional achievement card design for a goal: {goal['title']}. {prompt}"],
+                    model=model_name,
+                )
                 
                 # For now, store the prompt and we'll generate the image client-side
                 # In production, you'd use DALL-E or Stable Diffusion
@@ -369,6 +503,29 @@ def upload_or_generate_image(goal_id):
         return jsonify({'error': 'Image processing failed'}), 500
 
 
+@goals_bp.route('/images/<digest>', methods=['GET'])
+def get_goal_image(digest):
+    """Stream a stored card image.
+
+    Blobs are addressed by the SHA-256 of their content, so a URL always
+    maps to the same bytes and can be cached forever. The digest is not
+    guessable, which lets shared-goal pages load it without a session.
+    """
+    store = get_blob_store()
+    if not is_valid_digest(digest) or not store.exists(digest):
+        return jsonify({'error': 'Image not found'}), 404
+    
+    response = send_file(
+        store.path(digest),
+        mimetype=store.content_type(digest),
+        conditional=True,
+        etag=digest,
+        max_age=31536000,
+    )
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
 @goals_bp.route('/<int:goal_id>/download', methods=['GET'])
 def download_card(goal_id):
     """Download goal card as image"""
@@ -384,22 +541,24 @@ def download_card(goal_id):
         return jsonify({'error': 'Goal not found'}), 404
     
     try:
-        # Generate card image
-        card_image = generate_card_image(goal)
-        
-        # Convert to bytes and send
-        img_bytes = io.BytesIO()
-        card_image.save(img_bytes, format='PNG')
-        img_bytes.seek(0)
+        # Serve the cached render for the goal's current state, rendering on a miss
+        cache = get_card_render_cache()
+        cached = cache.lookup(goal)
+        card_path, render_key = cached if cached else cache.render(goal, _card_png)
         
         filename = f"goal_{goal_id}_{datetime.now().strftime('%Y%m%d')}.png"
         
-        return send_file(
-            img_bytes,
+        response = send_file(
+            card_path,
             mimetype='image/png',
             as_attachment=True,
-            download_name=filename
+            download_name=filename,
+            conditional=True,
+            etag=render_key,
         )
+        # The same URL yields a new card after edits, so clients must revalidate.
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
     
     except Exception:
         logger.exception("Goal card download failed for goal_id=%s", goal_id)
@@ -3,7 +3,7 @@ FILE: app/api/helpers.py
 
 Responsibility:
   Shared utility functions for all route modules.
-  default_user_id(), normalize_tags().
+  default_user_id(), normalize_tags(), page_request(), list_response().
 
 MUST NOT:
   - Import from route modules or AI modules
@@ -11,10 +11,15 @@ MUST NOT:
 
 Depends on:
   - auth.get_current_user_id (session-based auth)
+  - pagination (keyset pages and ?fields= projection)
+  - config.py (LIST_PAGE_SIZE, LIST_MAX_PAGE_SIZE)
 """
 
 
+from flask import current_app, jsonify, request
+
 from ..auth import get_current_user_id
+from ..pagination import parse_fields, parse_page_args, project
 
 
 def default_user_id():
@@ -37,3 +42,27 @@ def normalize_tags(value):
         seen.add(tag)
         out.append(tag)
     return out
+
+
+def page_request():
+    """pagination.PageRequest from ?limit=&cursor=, or None for the full list.
+    Raises ValueError with a client message."""
+    return parse_page_args(
+        request.args,
+        current_app.config.get("LIST_PAGE_SIZE", 50),
+        current_app.config.get("LIST_MAX_PAGE_SIZE", 200),
+    )
+
+
+def requested_fields():
+    """Keys requested with ?fields=a,b (always including id), or None for all."""
+    return parse_fields(request.args)
+
+
+def list_response(items, page, next_cursor=None, fields=None):
+    """JSON list body: a bare array, or {"items", "next_cursor"} for a page."""
+    if fields is not None:
+        items = [project(item, fields) for item in items]
+    if page is None:
+        return jsonify(items)
+    return jsonify({"items": items, "next_cursor": next_cursor})
@@ -0,0 +1,92 @@
+"""
+FILE: app/api/leaderboard_routes.py
+
+Responsibility:
+  GET /api/leaderboard?board=points|streak&period=global|weekly&limit=&offset=
+  — a page of the current leaderboard plus the caller's rank, served from
+  the in-memory boards.
+  GET /api/leaderboard/history?week=YYYY-MM-DD&board=&limit=&offset= — an
+  archived weekly board (any day of the week selects it; default: last week).
+
+MUST NOT:
+  - Contain raw SQL (use LeaderboardRepository)
+
+Depends on:
+  - repositories.leaderboard_repo (LeaderboardRepository, week_bounds,
+    previous_week_start)
+  - leaderboard (BOARDS, PERIODS)
+  - middleware.rate_limit
+  - helpers.default_user_id()
+  - config.py (LEADERBOARD_MAX_LIMIT)
+
+Response:
+  {"board": "points", "period": "weekly", "week_start": "2026-03-02",
+   "total": 812,
+   "entries": [{"rank": 1, "user_id": 7, "display_name": "Sam", "score": 940,
+                "is_me": false}, ...],
+   "me": {"rank": 37, "score": 410}}
+  Ties share a rank; users with a score of 0 are not ranked (rank null).
+  week_start is null for global boards.
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, request
+
+from ..leaderboard import BOARDS, PERIODS
+from ..middleware import rate_limit
+from ..repositories.leaderboard_repo import (
+    LeaderboardRepository,
+    previous_week_start,
+    week_bounds,
+)
+from ..utils import safe_int, today_str
+from .helpers import default_user_id
+
+leaderboard_bp = Blueprint("leaderboard", __name__)
+
+
+def _page_args():
+    max_limit = current_app.config.get("LEADERBOARD_MAX_LIMIT", 100)
+    limit = max(1, min(safe_int(request.args.get("limit"), 10), max_limit))
+    offset = max(0, safe_int(request.args.get("offset"), 0))
+    return limit, offset
+
+
+def _board_arg():
+    board = (request.args.get("board") or "points").strip().lower()
+    return board if board in BOARDS else None
+
+
+@leaderboard_bp.route("/api/leaderboard", methods=["GET"])
+@rate_limit(max_requests=120, window_seconds=60)
+def get_leaderboard():
+    uid = default_user_id()
+    board = _board_arg()
+    if board is None:
+        return jsonify({"error": f"board must be one of: {', '.join(BOARDS)}"}), 400
+    period = (request.args.get("period") or "global").strip().lower()
+    if period not in PERIODS:
+        return jsonify({"error": f"period must be one of: {', '.join(PERIODS)}"}), 400
+    limit, offset = _page_args()
+    return jsonify(LeaderboardRepository.board(board, period, uid, limit, offset))
+
+
+@leaderboard_bp.route("/api/leaderboard/history", methods=["GET"])
+@rate_limit(max_requests=60, window_seconds=60)
+def get_leaderboard_history():
+    uid = default_user_id()
+    board = _board_arg()
+    if board is None:
+        return jsonify({"error": f"board must be one of: {', '.join(BOARDS)}"}), 400
+    week = (request.args.get("week") or "").strip()
+    if week:
+        try:
+            datetime.strptime(week, "%Y-%m-%d")
+        except ValueError:
+            return jsonify({"error": "week must use YYYY-MM-DD format"}), 400
+        week_start, _ = week_bounds(week)
+    else:
+        week_start = previous_week_start(today_str())
+    limit, offset = _page_args()
+    return jsonify(LeaderboardRepository.history(week_start, board, uid, limit, offset))
@@ -0,0 +1,167 @@
+"""
+FILE: app/api/mutations_routes.py
+
+Responsibility:
+  POST /api/mutations — replay an ordered list of queued writes (the
+  offline queue) in one request and one transaction. Each mutation is
+  dispatched in-process to its normal route, so validation and response
+  bodies are unchanged, inside its own savepoint: a rejected mutation is
+  undone and reported while the others still apply. Mutations carrying an
+  idempotency key are applied at most once; replaying a key returns the
+  stored result.
+
+MUST NOT:
+  - Dispatch outside MUTATION_PREFIXES (no auth, AI or batch endpoints)
+  - Import or call other route modules directly (go through the URL map)
+
+Depends on:
+  - db.single_transaction()
+  - repositories.idempotency_repo.IdempotencyRepository
+  - middleware.rate_limit, middleware.validate_json
+  - helpers.default_user_id()
+  - config.py (MUTATIONS_MAX_OPS, IDEMPOTENCY_TTL_SECONDS)
+
+Request:
+  {"mutations": [
+    {"key": "q1", "method": "POST", "path": "/api/tasks", "body": {...}, "tempId": "offline_1"},
+    {"key": "q2", "method": "PATCH", "path": "/api/tasks/offline_1/toggle"}
+  ]}
+  tempId names the row a POST creates; later path segments and body values
+  equal to it are rewritten to the real id.
+
+Response (same order; 5xx results are not stored and are safe to retry):
+  {"results": [{"key": "q1", "status": 201, "body": {...}, "replayed": false}, ...]}
+"""
+
+from flask import Blueprint, current_app, g, jsonify, request
+from werkzeug.test import EnvironBuilder
+
+from ..db import single_transaction
+from ..middleware import rate_limit, validate_json
+from ..repositories.idempotency_repo import IdempotencyRepository
+from .helpers import default_user_id
+
+mutations_bp = Blueprint("mutations", __name__)
+
+MUTATION_PREFIXES = ("/api/tasks", "/api/meals", "/api/workouts", "/api/notes", "/api/focus/sessions")
+MUTATION_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_KEY_LENGTH = 200
+
+
+def _is_mutation_path(path):
+    base = path.split("?", 1)[0]
+    return any(base == prefix or base.startswith(prefix + "/") for prefix in MUTATION_PREFIXES)
+
+
+def _parse_item(index, item):
+    """Return (key, method, path, body, temp_id) or raise ValueError with a client message."""
+    if not isinstance(item, dict):
+        raise ValueError(f"mutations[{index}] must be an object")
+    method = str(item.get("method") or "").upper()
+    if method not in MUTATION_METHODS:
+        raise ValueError(f"mutations[{index}].method must be POST, PUT, PATCH or DELETE")
+    path = item.get("path")
+    if not isinstance(path, str) or not _is_mutation_path(path):
+        raise ValueError(f"mutations[{index}].path is not a replayable endpoint")
+    key = item.get("key")
+    if key is not None and (not isinstance(key, str) or not key or len(key) > MAX_KEY_LENGTH):
+        raise ValueError(f"mutations[{index}].key must be a string of 1-{MAX_KEY_LENGTH} characters")
+    temp_id = item.get("tempId")
+    return key, method, path, item.get("body"), temp_id if isinstance(temp_id, str) and temp_id else None
+
+
+def _resolve_path(path, id_map):
+    if not id_map:
+        return path
+    base, sep, query = path.partition("?")
+    segments = [str(id_map.get(segment, segment)) for segment in base.split("/")]
+    return "/".join(segments) + sep + query
+
+
+def _resolve_body(value, id_map):
+    if not id_map:
+        return value
+    if isinstance(value, str):
+        return id_map.get(value, value)
+    if isinstance(value, list):
+        return [_resolve_body(item, id_map) for item in value]
+    if isinstance(value, dict):
+        return {key: _resolve_body(item, id_map) for key, item in value.items()}
+    return value
+
+
+def _dispatch(method, path, body):
+    """Run one write through the app; return (status, body)."""
+    builder = EnvironBuilder(
+        path=path,
+        base_url=request.root_url,
+        method=method,
+        headers={"Cookie": request.headers.get("Cookie", "")},
+        json=body,
+        environ_base={"REMOTE_ADDR": request.remote_addr or ""},
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    app = current_app._get_current_object()
+    # Same app context as the caller: g.db is the transaction's connection.
+    with app.request_context(environ):
+        try:
+            response = app.full_dispatch_request()
+        except Exception as exc:
+            response = app.make_response(app.handle_exception(exc))
+        try:
+            return response.status_code, response.get_json(silent=True) if response.is_json else None
+        finally:
+            response.close()
+
+
+@mutations_bp.route("/api/mutations", methods=["POST"])
+@rate_limit(max_requests=30, window_seconds=60)
+@validate_json("mutations")
+def apply_mutations():
+    uid = default_user_id()
+    items = request.get_json()["mutations"]
+    max_ops = current_app.config.get("MUTATIONS_MAX_OPS", 100)
+    ttl_seconds = current_app.config.get("IDEMPOTENCY_TTL_SECONDS", 86400)
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "mutations must be a non-empty list"}), 400
+    if len(items) > max_ops:
+        return jsonify({"error": f"At most {max_ops} mutations per request"}), 400
+
+    try:
+        parsed = [_parse_item(i, item) for i, item in enumerate(items)]
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    results = []
+    id_map = {}
+    g.rate_limit_exempt = True  # this request was counted once above
+    try:
+        with single_transaction() as conn:
+            IdempotencyRepository.purge_expired()
+            for key, method, path, body, temp_id in parsed:
+                stored = IdempotencyRepository.get(uid, key) if key else None
+                if stored is not None:
+                    status, response_body = stored
+                    replayed = True
+                else:
+                    replayed = False
+                    with conn.savepoint():
+                        status, response_body = _dispatch(
+                            method, _resolve_path(path, id_map), _resolve_body(body, id_map)
+                        )
+                        if status >= 400:
+                            conn.rollback()
+                        if key and status < 500:
+                            IdempotencyRepository.store(uid, key, status, response_body, ttl_seconds)
+
+                if temp_id and status < 300 and isinstance(response_body, dict) and response_body.get("id") is not None:
+                    id_map[temp_id] = response_body["id"]
+                results.append({"key": key, "status": status, "body": response_body, "replayed": replayed})
+    finally:
+        g.pop("rate_limit_exempt", None)
+
+    return jsonify({"results": results})
@@ -12,6 +12,7 @@ MUST NOT:
 Depends on:
   - repositories.notes_repo.NoteRepository
   - helpers.default_user_id(), helpers.normalize_tags
+  - helpers.page_request(), helpers.list_response() (?limit=&cursor=&fields=)
 """
 
 
@@ -21,7 +22,7 @@ from flask import Blueprint, jsonify, request
 
 from ..repositories.notes_repo import NoteRepository
 from ..middleware import rate_limit
-from .helpers import default_user_id, normalize_tags
+from .helpers import default_user_id, list_response, normalize_tags, page_request, requested_fields
 
 notes_bp = Blueprint("notes", __name__)
 
@@ -32,14 +33,23 @@ def get_notes():
     source_type = request.args.get("source_type")
     search = request.args.get("search", "").strip()
     tag = request.args.get("tag", "").strip().lower()
-
-    notes = NoteRepository.get_all(
-        uid,
-        source_type=source_type if source_type in ("manual", "task") else None,
-        search=search or None,
-        tag=tag or None,
-    )
-    return jsonify(notes)
+    try:
+        page = page_request()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    fields = requested_fields()
+
+    filters = {
+        "source_type": source_type if source_type in ("manual", "task") else None,
+        "search": search or None,
+        "tag": tag or None,
+        "light": fields is not None and "content" not in fields,
+    }
+    if page is None:
+        notes, next_cursor = NoteRepository.get_all(uid, **filters), None
+    else:
+        notes, next_cursor = NoteRepository.get_page(uid, page, **filters)
+    return list_response(notes, page, next_cursor, fields)
 
 
 @notes_bp.route("/api/notes", methods=["POST"])
@@ -13,6 +13,7 @@ Depends on:
   - db.get_db(), mappers.map_meal, utils.*
   - nutrition_ai.detect_foods, process_confirmed_foods, search_foods
   - helpers.default_user_id()
+  - helpers.page_request(), helpers.list_response() (?limit=&cursor=&fields=)
 """
 
 
@@ -25,7 +26,7 @@ from ..mappers import map_meal
 from ..nutrition_ai import detect_foods, process_confirmed_foods, search_foods
 from ..repositories.nutrition_repo import NutritionRepository
 from ..utils import safe_float, safe_int, today_str
-from .helpers import default_user_id
+from .helpers import default_user_id, list_response, page_request, requested_fields
 
 nutrition_bp = Blueprint("nutrition", __name__)
 VALID_MEAL_TYPES = frozenset({"breakfast", "lunch", "dinner", "snack", "other"})
@@ -38,9 +39,17 @@ def _normalize_meal_type(value):
 
 @nutrition_bp.route("/api/meals", methods=["GET"])
 def get_meals():
+    uid = default_user_id()
     date_filter = request.args.get("date")
-    rows = NutritionRepository.get_all(default_user_id(), date_filter)
-    return jsonify([map_meal(r) for r in rows])
+    try:
+        page = page_request()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if page is None:
+        rows, next_cursor = NutritionRepository.get_all(uid, date_filter), None
+    else:
+        rows, next_cursor = NutritionRepository.get_page(uid, page, date_filter)
+    return list_response([map_meal(r) for r in rows], page, next_cursor, requested_fields())
 
 
 @nutrition_bp.route("/api/meals", methods=["POST"])
@@ -13,11 +13,13 @@ MUST NOT:
 
 Depends on:
   - ProjectRepository (data access layer)
+  - mappers.map_project
   - helpers.default_user_id()
 """
 
 from flask import Blueprint, jsonify, request
 
+from ..mappers import map_project
 from ..repositories.project_repo import ProjectRepository
 from ..middleware import rate_limit, validate_json
 from .helpers import default_user_id
@@ -35,24 +37,7 @@ def get_projects():
     projects = []
     for r in rows:
         subtasks = subtask_map.get(r["id"], [])
-        projects.append({
-            "id": r["id"],
-            "name": r["name"],
-            "description": r["description"],
-            "status": r["status"],
-            "dueDate": r["due_date"],
-            "createdAt": r["created_at"],
-            "updatedAt": r["updated_at"],
-            "subtasks": [
-                {
-                    "id": s["id"],
-                    "title": s["title"],
-                    "completed": bool(s["completed"]),
-                    "sortOrder": s["sort_order"],
-                }
-                for s in subtasks
-            ],
-        })
+        projects.append(map_project(r, subtasks))
     return jsonify(projects)
 
 
@@ -76,24 +61,7 @@ def create_project():
         subtasks=data.get("subtasks", []),
     )
     
-    return jsonify({
-        "id": project_row["id"],
-        "name": project_row["name"],
-        "description": project_row["description"],
-        "status": project_row["status"],
-        "dueDate": project_row["due_date"],
-        "createdAt": project_row["created_at"],
-        "updatedAt": project_row["updated_at"],
-        "subtasks": [
-            {
-                "id": s["id"],
-                "title": s["title"],
-                "completed": bool(s["completed"]),
-                "sortOrder": s["sort_order"],
-            }
-            for s in subtask_rows
-        ],
-    }), 201
+    return jsonify(map_project(project_row, subtask_rows)), 201
 
 
 @projects_bp.route("/api/projects/<int:project_id>", methods=["GET"])
@@ -107,24 +75,7 @@ def get_project(project_id):
         return jsonify({"error": "Project not found"}), 404
     
     subtasks = ProjectRepository.get_subtasks(project_id, user_id)
-    return jsonify({
-        "id": project_row["id"],
-        "name": project_row["name"],
-        "description": project_row["description"],
-        "status": project_row["status"],
-        "dueDate": project_row["due_date"],
-        "createdAt": project_row["created_at"],
-        "updatedAt": project_row["updated_at"],
-        "subtasks": [
-            {
-                "id": s["id"],
-                "title": s["title"],
-                "completed": bool(s["completed"]),
-                "sortOrder": s["sort_order"],
-            }
-            for s in subtasks
-        ],
-    })
+    return jsonify(map_project(project_row, subtasks))
 
 
 @projects_bp.route("/api/projects/<int:project_id>", methods=["PUT"])
@@ -153,24 +104,7 @@ def update_project(project_id):
         return jsonify({"error": "Project not found"}), 404
 
     subtasks = ProjectRepository.get_subtasks(project_id, user_id)
-    return jsonify({
-        "id": updated["id"],
-        "name": updated["name"],
-        "description": updated["description"],
-        "status": updated["status"],
-        "dueDate": updated["due_date"],
-        "createdAt": updated["created_at"],
-        "updatedAt": updated["updated_at"],
-        "subtasks": [
-            {
-                "id": s["id"],
-                "title": s["title"],
-                "completed": bool(s["completed"]),
-                "sortOrder": s["sort_order"],
-            }
-            for s in subtasks
-        ],
-    })
+    return jsonify(map_project(updated, subtasks))
 
 
 @projects_bp.route("/api/projects/<int:project_id>", methods=["DELETE"])
@@ -0,0 +1,65 @@
+"""
+FILE: app/api/search_routes.py
+
+Responsibility:
+  GET /api/search?q=<text>&types=note,task&limit=<n> — ranked full-text
+  search across the user's notes and tasks, with highlighted snippets.
+
+MUST NOT:
+  - Contain raw SQL (use SearchRepository)
+
+Depends on:
+  - repositories.search_repo (SearchRepository, search_terms)
+  - middleware.rate_limit
+  - helpers.default_user_id()
+  - config.py (SEARCH_MAX_RESULTS)
+
+Response:
+  {"query": "...", "results": [
+    {"type": "note", "id": 1, "title": "...", "snippet": "... <mark>word</mark> ...",
+     "score": 3.2, "updated_at": "..."},
+    {"type": "task", "id": 7, "title": "...", "snippet": "...", "score": 1.1,
+     "date": "2026-01-01", "completed": false}
+  ]}
+  Snippets are HTML-escaped apart from the <mark> tags. Results are
+  ordered by score, highest first.
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+
+from ..middleware import rate_limit
+from ..repositories.search_repo import SearchRepository, search_terms
+from ..utils import safe_int
+from .helpers import default_user_id
+
+search_bp = Blueprint("search", __name__)
+
+_SEARCHERS = {
+    "note": SearchRepository.search_notes,
+    "task": SearchRepository.search_tasks,
+}
+
+
+@search_bp.route("/api/search", methods=["GET"])
+@rate_limit(max_requests=120, window_seconds=60)
+def search():
+    uid = default_user_id()
+    query = (request.args.get("q") or "").strip()
+    terms = search_terms(query)
+    if not terms:
+        return jsonify({"query": query, "results": []})
+
+    requested = request.args.get("types")
+    types = [t.strip() for t in requested.split(",")] if requested else list(_SEARCHERS)
+    unknown = [t for t in types if t not in _SEARCHERS]
+    if unknown:
+        return jsonify({"error": f"Unknown search type: {', '.join(unknown)}"}), 400
+
+    max_results = current_app.config.get("SEARCH_MAX_RESULTS", 50)
+    limit = max(1, min(safe_int(request.args.get("limit"), 20), max_results))
+
+    results = []
+    for entity_type in dict.fromkeys(types):
+        results.extend(_SEARCHERS[entity_type](uid, terms, limit))
+    results.sort(key=lambda item: item["score"], reverse=True)
+    return jsonify({"query": query, "results": results[:limit]})
@@ -2,8 +2,9 @@
 FILE: app/api/streaks_routes.py
 
 Responsibility:
-  Streak evaluation, progress reporting, achievement checking,
-  analytics summary, and weekly analytics endpoints.
+  Streak evaluation (single day or bulk date-range recompute), progress
+  reporting, achievement checking,
+  analytics summary, weekly analytics, and points history endpoints.
 
 MUST NOT:
   - Handle CRUD for tasks/meals/workouts
@@ -12,6 +13,7 @@ MUST NOT:
 Depends on:
   - repositories.streaks_repo.StreaksRepository, AnalyticsRepository
   - utils.safe_float, utils.today_str
+  - middleware.rate_limit
   - helpers.default_user_id()
 
 ⚠️ Points constants are duplicated in script.js §9.
@@ -22,12 +24,14 @@ from datetime import datetime, timedelta
 
 from flask import Blueprint, jsonify, request
 
+from ..middleware import rate_limit
 from ..utils import safe_float, today_str
 from ..repositories.streaks_repo import AnalyticsRepository, StreaksRepository
 from .helpers import default_user_id
 
 streaks_bp = Blueprint("streaks", __name__)
 VALID_ANALYTICS_GRANULARITY = frozenset({"daily", "weekly", "monthly"})
+MAX_RECOMPUTE_DAYS = 366
 
 
 def _parse_ymd(value):
@@ -48,6 +52,28 @@ def streaks_evaluate():
     return jsonify(result), 200
 
 
+@streaks_bp.route("/api/streaks/recompute", methods=["POST"])
+@rate_limit(max_requests=5, window_seconds=60)
+def streaks_recompute():
+    """Re-evaluate every day in [start_date, end_date] and refresh progress."""
+    user_id = default_user_id()
+    req_data = request.get_json(silent=True) or {}
+    start_date = str(req_data.get("start_date") or "").strip()
+    end_date = str(req_data.get("end_date") or "").strip()
+    start_obj = _parse_ymd(start_date)
+    end_obj = _parse_ymd(end_date)
+    if not start_obj or not end_obj:
+        return jsonify({"error": "start_date and end_date are required (YYYY-MM-DD)"}), 400
+    if start_obj > end_obj:
+        return jsonify({"error": "start_date must be <= end_date"}), 400
+    if (end_obj - start_obj).days >= MAX_RECOMPUTE_DAYS:
+        return jsonify({"error": f"Date range must be at most {MAX_RECOMPUTE_DAYS} days"}), 400
+    protein_goal = safe_float(req_data.get("protein_goal"), 140)
+
+    result = StreaksRepository.recompute(user_id, start_date, end_date, protein_goal)
+    return jsonify(result), 200
+
+
 @streaks_bp.route("/api/streaks/progress", methods=["GET"])
 def streaks_progress():
     user_id = default_user_id()
@@ -120,3 +146,39 @@ def get_weekly_stats():
         granularity=granularity,
     )
     return jsonify(trend_data)
+
+
+@streaks_bp.route("/api/analytics/points", methods=["GET"])
+def get_points_history():
+    """Points per day/week/month from the daily snapshots (default: last 30 days)."""
+    user_id = default_user_id()
+    start_date = (request.args.get("start_date") or "").strip()
+    end_date = (request.args.get("end_date") or "").strip()
+    granularity = (request.args.get("granularity") or "daily").strip().lower()
+    if granularity not in VALID_ANALYTICS_GRANULARITY:
+        granularity = "daily"
+
+    if (start_date and not end_date) or (end_date and not start_date):
+        return jsonify({"error": "start_date and end_date must be provided together"}), 400
+
+    if start_date and end_date:
+        start_obj = _parse_ymd(start_date)
+        end_obj = _parse_ymd(end_date)
+        if not start_obj or not end_obj:
+            return jsonify({"error": "Dates must use YYYY-MM-DD format"}), 400
+        if start_obj > end_obj:
+            return jsonify({"error": "start_date must be <= end_date"}), 400
+        if (end_obj - start_obj).days > 366:
+            return jsonify({"error": "Date range must be at most 366 days"}), 400
+    else:
+        end_obj = datetime.now().date()
+        start_date = (end_obj - timedelta(days=29)).strftime("%Y-%m-%d")
+        end_date = end_obj.strftime("%Y-%m-%d")
+
+    history = AnalyticsRepository.points_history(
+        user_id,
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
+    )
+    return jsonify(history)
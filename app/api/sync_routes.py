@@ -0,0 +1,125 @@
+"""
+FILE: app/api/sync_routes.py
+
+Responsibility:
+  GET /api/sync?since=<cursor>&limit=<n> — delta feed for the offline-first
+  client. Returns the tasks, meals, workouts, notes and projects that
+  changed after `cursor` (current data for upserts, tombstones for deletes),
+  oldest first, plus the cursor to resume from.
+
+MUST NOT:
+  - Contain raw SQL (use ChangeLogRepository)
+  - Write data (the repositories record changes as they write)
+
+Depends on:
+  - repositories.change_log_repo.ChangeLogRepository
+  - repositories.project_repo.ProjectRepository (subtasks for projects)
+  - repositories.notes_repo.NoteRepository.map_note, mappers.*
+  - helpers.default_user_id()
+
+Protocol:
+  - No `since` (or a cursor this database never issued): nothing to replay;
+    the response carries the current cursor and full_sync=true, so the
+    client reloads the lists once and keeps the cursor.
+  - has_more=true: call again with the returned cursor straight away.
+  - Each change: {"entity", "id", "op": "upsert"|"delete", "version", "data"}.
+    `version` is the change's position in the feed; data is null for deletes.
+"""
+
+from flask import Blueprint, current_app, jsonify, request
+
+from ..mappers import map_meals, map_project, map_tasks, map_workouts
+from ..middleware import rate_limit
+from ..repositories.change_log_repo import OP_DELETE, ChangeLogRepository
+from ..repositories.notes_repo import NoteRepository
+from ..repositories.project_repo import ProjectRepository
+from .helpers import default_user_id
+
+sync_bp = Blueprint("sync", __name__)
+
+# entity -> list mapper (one compiled row mapper per result set)
+_MAPPERS = {
+    "task": map_tasks,
+    "meal": map_meals,
+    "workout": map_workouts,
+    "note": NoteRepository.map_notes,
+}
+
+
+def _parse_cursor(value):
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError):
+        return None
+    return cursor if cursor >= 0 else None
+
+
+def _hydrate(user_id, entries):
+    """Current data for each upsert entry, keyed by (entity, id)."""
+    wanted = {}
+    for entry in entries:
+        if entry["op"] != OP_DELETE:
+            wanted.setdefault(entry["entity"], []).append(entry["entity_id"])
+
+    data = {}
+    for entity, ids in wanted.items():
+        rows = ChangeLogRepository.load_rows(user_id, entity, ids)
+        if entity == "project":
+            subtasks = ProjectRepository.get_subtasks_for_projects(list(rows), user_id)
+            mapped = {pid: map_project(row, subtasks.get(pid, [])) for pid, row in rows.items()}
+        else:
+            mapped = dict(zip(rows, _MAPPERS[entity](list(rows.values()))))
+        for rid, value in mapped.items():
+            data[(entity, rid)] = value
+    return data
+
+
+@sync_bp.route("/api/sync", methods=["GET"])
+@rate_limit(max_requests=120, window_seconds=60)
+def get_changes():
+    user_id = default_user_id()
+    raw_since = request.args.get("since")
+    if raw_since in (None, ""):
+        return jsonify({
+            "changes": [],
+            "cursor": str(ChangeLogRepository.head(user_id)),
+            "has_more": False,
+            "full_sync": True,
+        })
+
+    since = _parse_cursor(raw_since)
+    if since is None:
+        return jsonify({"error": "since must be a cursor returned by /api/sync"}), 400
+    head = ChangeLogRepository.head(user_id)
+    if since > head:
+        # Cursor from another database (restore, reset): start over.
+        return jsonify({"changes": [], "cursor": str(head), "has_more": False, "full_sync": True})
+
+    max_limit = current_app.config.get("SYNC_PAGE_SIZE", 200)
+    limit = request.args.get("limit", type=int) or max_limit
+    limit = max(1, min(limit, max_limit))
+
+    entries, has_more = ChangeLogRepository.changes_since(user_id, since, limit)
+    data = _hydrate(user_id, entries)
+
+    changes = []
+    for entry in entries:
+        key = (entry["entity"], entry["entity_id"])
+        value = data.get(key)
+        # A row deleted while this page was being read is reported as deleted.
+        op = entry["op"] if entry["op"] == OP_DELETE or value is not None else OP_DELETE
+        changes.append({
+            "entity": entry["entity"],
+            "id": entry["entity_id"],
+            "op": op,
+            "version": entry["seq"],
+            "data": value if op != OP_DELETE else None,
+        })
+
+    cursor = entries[-1]["seq"] if entries else since
+    return jsonify({
+        "changes": changes,
+        "cursor": str(cursor),
+        "has_more": has_more,
+        "full_sync": False,
+    })
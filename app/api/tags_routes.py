@@ -0,0 +1,38 @@
+"""
+FILE: app/api/tags_routes.py
+
+Responsibility:
+  GET /api/tags?entity=note|task — the user's tags with usage counts,
+  computed in SQL from the entity_tags index (for tag pickers and facets).
+
+MUST NOT:
+  - Contain raw SQL (use TagRepository)
+
+Depends on:
+  - repositories.tag_repo (TagRepository, ENTITIES)
+  - middleware.rate_limit
+  - helpers.default_user_id()
+
+Response:
+  {"tags": [{"tag": "work", "count": 5, "notes": 2, "tasks": 3}, ...]}
+  Ordered by count, highest first, then by tag. With ?entity= only that
+  entity's rows are counted.
+"""
+
+from flask import Blueprint, jsonify, request
+
+from ..middleware import rate_limit
+from ..repositories.tag_repo import ENTITIES, TagRepository
+from .helpers import default_user_id
+
+tags_bp = Blueprint("tags", __name__)
+
+
+@tags_bp.route("/api/tags", methods=["GET"])
+@rate_limit(max_requests=120, window_seconds=60)
+def get_tags():
+    uid = default_user_id()
+    entity = (request.args.get("entity") or "").strip().lower() or None
+    if entity is not None and entity not in ENTITIES:
+        return jsonify({"error": f"entity must be one of: {', '.join(ENTITIES)}"}), 400
+    return jsonify({"tags": TagRepository.counts(uid, entity)})
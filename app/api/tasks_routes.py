@@ -2,7 +2,7 @@
 FILE: app/api/tasks_routes.py
 
 Responsibility:
-  Full CRUD for tasks: GET/POST /api/tasks,
+  Full CRUD for tasks: GET/POST /api/tasks (GET filters: ?date=, ?tag=),
   PUT/DELETE /api/tasks/<id>, PATCH /api/tasks/<id>/toggle.
   Also syncs note_content/note_saved_to_notes on create/update.
 
@@ -11,8 +11,9 @@ MUST NOT:
   - Handle nutrition, workout, or streak logic
 
 Depends on:
-  - db.get_db(), mappers.map_task, utils.*
+  - db.get_db(), mappers.map_task / map_tasks, utils.*
   - helpers.default_user_id(), helpers.normalize_tags()
+  - helpers.page_request(), helpers.list_response() (?limit=&cursor=&fields=)
 """
 
 
@@ -21,11 +22,11 @@ import json
 from flask import Blueprint, jsonify, request
 
 from ..middleware import rate_limit
-from ..mappers import map_task
+from ..mappers import map_task, map_tasks
 from ..repositories.project_repo import ProjectRepository
 from ..utils import safe_int, today_str
 from ..repositories.task_repo import TaskRepository, NoteLinker
-from .helpers import default_user_id, normalize_tags
+from .helpers import default_user_id, list_response, normalize_tags, page_request, requested_fields
 
 tasks_bp = Blueprint("tasks", __name__)
 VALID_TASK_CATEGORIES = frozenset({"general", "work", "personal", "health", "study", "finance"})
@@ -42,9 +43,17 @@ def _normalize_recurrence(value):
 def get_tasks():
     uid = default_user_id()
     date_filter = request.args.get("date")
+    tag = request.args.get("tag")
+    try:
+        page = page_request()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
     TaskRepository.materialize_recurring_for_date(uid, date_filter or today_str())
-    rows = TaskRepository.get_all(uid, date_filter)
-    return jsonify([map_task(r) for r in rows])
+    if page is None:
+        rows, next_cursor = TaskRepository.get_all(uid, date_filter, tag), None
+    else:
+        rows, next_cursor = TaskRepository.get_page(uid, page, date_filter, tag)
+    return list_response(map_tasks(rows), page, next_cursor, requested_fields())
 
 
 @tasks_bp.route("/api/tasks", methods=["POST"])
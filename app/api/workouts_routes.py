@@ -13,6 +13,7 @@ Depends on:
   - repositories.workout_repo.WorkoutRepository
   - mappers.map_workout, utils.safe_int, utils.today_str
   - helpers.default_user_id()
+  - helpers.page_request(), helpers.list_response() (?limit=&cursor=&fields=)
 """
 
 
@@ -22,11 +23,11 @@ from datetime import datetime
 from flask import Blueprint, jsonify, request
 
 from ..middleware import rate_limit
-from ..mappers import map_workout, map_workout_template
+from ..mappers import map_workout, map_workout_template, map_workouts
 from ..repositories.workout_template_repo import WorkoutTemplateRepository
 from ..utils import safe_int, today_str
 from ..repositories.workout_repo import WorkoutRepository
-from .helpers import default_user_id
+from .helpers import default_user_id, list_response, page_request, requested_fields
 
 workouts_bp = Blueprint("workouts", __name__)
 VALID_WORKOUT_TYPES = frozenset({"cardio", "strength", "flexibility", "sports", "other"})
@@ -48,9 +49,19 @@ def _normalize_intensity(value, fallback="medium"):
 
 @workouts_bp.route("/api/workouts", methods=["GET"])
 def get_workouts():
+    uid = default_user_id()
     date_filter = request.args.get("date")
-    rows = WorkoutRepository.get_all(default_user_id(), date_filter=date_filter)
-    return jsonify([map_workout(r) for r in rows])
+    try:
+        page = page_request()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    fields = requested_fields()
+    light = fields is not None and "exercises" not in fields
+    if page is None:
+        rows, next_cursor = WorkoutRepository.get_all(uid, date_filter=date_filter, light=light), None
+    else:
+        rows, next_cursor = WorkoutRepository.get_page(uid, page, date_filter=date_filter, light=light)
+    return list_response(map_workouts(rows), page, next_cursor, fields)
 
 
 @workouts_bp.route("/api/workouts", methods=["POST"])
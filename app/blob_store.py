@@ -0,0 +1,198 @@
+"""
+FILE: app/blob_store.py
+
+Responsibility:
+  Content-addressed storage for binary uploads (goal card images) on local
+  disk. Blobs are keyed by the SHA-256 of their bytes, so identical uploads
+  are stored once and a stored blob never changes. Database rows keep only
+  a short reference URL (see blob_url / blob_digest_from_ref).
+
+MUST NOT:
+  - Import Flask, db, or route modules
+  - Decide who may read a blob (routes own access rules)
+
+Depends on:
+  - config.py (BLOB_STORE_DIR)
+
+Layout:
+  <BLOB_STORE_DIR>/ab/cd/abcd...<64 hex chars>
+  Two levels of two-character shards keep directories small.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+
+from .config import Config
+
+BLOB_URL_PREFIX = "/api/goals/images/"
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+_DATA_URL_RE = re.compile(r"^data:([\w.+-]+/[\w.+-]+)?(;[^,]*)?,", re.IGNORECASE)
+_CHUNK_SIZE = 64 * 1024
+
+# Magic-byte prefixes for the formats we accept as images.
+_MAGIC_TYPES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+class BlobTooLarge(ValueError):
+    """The blob exceeds the size limit passed to put_stream()."""
+
+
+def is_valid_digest(digest):
+    return isinstance(digest, str) and bool(_DIGEST_RE.match(digest))
+
+
+def sniff_content_type(head):
+    """Guess an image content type from the first bytes of a blob."""
+    for magic, content_type in _MAGIC_TYPES:
+        if head.startswith(magic):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+def blob_url(digest):
+    """Reference stored in database rows for a blob."""
+    return f"{BLOB_URL_PREFIX}{digest}"
+
+
+def blob_digest_from_ref(value):
+    """Digest for a reference produced by blob_url(), else None."""
+    if not isinstance(value, str) or not value.startswith(BLOB_URL_PREFIX):
+        return None
+    digest = value[len(BLOB_URL_PREFIX):].split("?", 1)[0]
+    return digest if is_valid_digest(digest) else None
+
+
+def decode_data_url(value):
+    """Return the decoded bytes of a base64 `data:` URL, or None."""
+    if not isinstance(value, str):
+        return None
+    match = _DATA_URL_RE.match(value)
+    if not match or "base64" not in (match.group(2) or "").lower():
+        return None
+    try:
+        return base64.b64decode(value[match.end():], validate=False)
+    except (binascii.Error, ValueError):
+        return None
+
+
+class BlobStore:
+    """SHA-256 keyed, write-once file store."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path(self, digest):
+        if not is_valid_digest(digest):
+            raise ValueError(f"invalid blob digest: {digest!r}")
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def exists(self, digest):
+        return is_valid_digest(digest) and self.path(digest).is_file()
+
+    def content_type(self, digest):
+        with open(self.path(digest), "rb") as fh:
+            return sniff_content_type(fh.read(16))
+
+    def put_bytes(self, data):
+        """Store `data` and return its digest. Existing blobs are reused."""
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.exists(digest):
+            self._commit(digest, lambda fh: fh.write(data))
+        return digest
+
+    def put_stream(self, stream, max_bytes=None):
+        """Copy a file-like object into the store in chunks; return its digest.
+
+        The bytes are hashed while they are written to a temporary file in
+        the store, so memory use stays at one chunk regardless of size.
+        Raises BlobTooLarge once more than `max_bytes` have been read.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(prefix=".upload-", dir=self.root)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                while True:
+                    chunk = stream.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise BlobTooLarge(f"blob exceeds {max_bytes} bytes")
+                    hasher.update(chunk)
+                    fh.write(chunk)
+            digest = hasher.hexdigest()
+            self._place(tmp_name, digest)
+            return digest
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    def _commit(self, digest, write):
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".upload-", dir=self.root)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                write(fh)
+            self._place(tmp_name, digest)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    def _place(self, tmp_name, digest):
+        target = self.path(digest)
+        if target.is_file():
+            return  # deduplicated: same content is already stored
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            # os.replace is atomic, so readers never see a partial blob.
+            os.replace(tmp_name, target)
+
+    def delete(self, digest):
+        """Remove a blob. Callers must know no row still references it."""
+        try:
+            self.path(digest).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store():
+    """Return the process-wide BlobStore rooted at BLOB_STORE_DIR."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BlobStore(Config.BLOB_STORE_DIR)
+    return _store
+
+
+def migrate_data_url(value, store=None):
+    """Move a base64 `data:` URL into the store; return the new reference.
+
+    Values that are not data URLs (references, http URLs, None) are
+    returned unchanged.
+    """
+    data = decode_data_url(value)
+    if data is None:
+        return value
+    return blob_url((store or get_blob_store()).put_bytes(data))
@@ -0,0 +1,116 @@
+"""
+FILE: app/card_render_cache.py
+
+Responsibility:
+  Disk cache for rendered goal card PNGs. A render is keyed by the goal id
+  and a hash of the fields the card renderer reads, so an unchanged goal
+  is served from disk and any relevant edit produces a new key.
+
+MUST NOT:
+  - Import Flask, db, or route modules
+  - Draw cards itself (callers pass the renderer)
+
+Depends on:
+  - config.py (CARD_RENDER_DIR)
+
+Layout:
+  <CARD_RENDER_DIR>/<goal_id>-<key>.png
+  Older renders of the same goal are removed when a new one is written.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from .config import Config
+
+# Bump when generate_card_image() changes its output so stale renders miss.
+RENDER_VERSION = 1
+# Fields of the goal row that affect the rendered card.
+RENDER_FIELDS = ("title", "current_progress", "status", "completed_at")
+
+
+def card_render_key(goal):
+    """Stable hash of the goal fields the renderer uses."""
+    material = [RENDER_VERSION] + [goal.get(field) for field in RENDER_FIELDS]
+    encoded = json.dumps(material, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+class CardRenderCache:
+    """Write-once PNG files per (goal id, render key)."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "renders": 0}
+
+    def path(self, goal_id, key):
+        return self.root / f"{int(goal_id)}-{key}.png"
+
+    def lookup(self, goal):
+        """(path, key) of an existing render for the goal's current state, else None."""
+        key = card_render_key(goal)
+        path = self.path(goal["id"], key)
+        with self._lock:
+            if path.is_file():
+                self.stats["hits"] += 1
+                return path, key
+            self.stats["misses"] += 1
+        return None
+
+    def render(self, goal, render_png):
+        """Render unless cached; return (path, key).
+
+        `render_png(goal)` must return PNG bytes. The file is written to a
+        temp name and renamed into place, so readers never see partial data.
+        """
+        key = card_render_key(goal)
+        path = self.path(goal["id"], key)
+        if path.is_file():
+            return path, key
+
+        data = render_png(goal)
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".render-", dir=self.root)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_name, path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+        with self._lock:
+            self.stats["renders"] += 1
+        self._drop_stale(goal["id"], keep=path)
+        return path, key
+
+    def _drop_stale(self, goal_id, keep):
+        for old in self.root.glob(f"{int(goal_id)}-*.png"):
+            if old != keep:
+                try:
+                    old.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def purge(self, goal_id):
+        """Remove every render of a goal (e.g. after it is deleted)."""
+        self._drop_stale(goal_id, keep=None)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_card_render_cache():
+    """Return the process-wide CardRenderCache rooted at CARD_RENDER_DIR."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CardRenderCache(Config.CARD_RENDER_DIR)
+    return _cache
@@ -0,0 +1,209 @@
+"""
+FILE: app/compression.py
+
+Responsibility:
+  After-request gzip/brotli compression of dynamic responses (JSON API
+  payloads, HTML). Negotiates on Accept-Encoding, skips bodies below a size
+  threshold, and compresses very large or streamed bodies chunk by chunk.
+  Keeps process-wide byte counters for /api/metrics.
+
+MUST NOT:
+  - Import db, repositories, or route modules
+  - Touch file responses (send_file) or event streams: static/dist ships
+    precompressed files and SSE needs every event flushed as it is sent
+
+Depends on:
+  - config.py (COMPRESSION_* settings)
+  - zlib (standard library); brotli (optional, `pip install Brotli`)
+"""
+
+import threading
+import zlib
+
+from flask import request
+
+from .config import Config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset({
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+})
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class CompressionStats:
+    """Thread-safe counters: bytes before/after compression and skip reasons."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {
+            "responses": 0,
+            "streamed": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "gzip": 0,
+            "br": 0,
+            "skipped_small": 0,
+            "skipped_unaccepted": 0,
+        }
+
+    def add(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self._counts[key] += value
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        counts["ratio"] = round(counts["bytes_out"] / counts["bytes_in"], 4) if counts["bytes_in"] else None
+        return counts
+
+
+_stats = CompressionStats()
+
+
+def get_compression_stats():
+    return _stats
+
+
+def choose_encoding(accept_encodings):
+    """Pick "br", "gzip" or None from the client's Accept-Encoding.
+
+    Brotli wins ties (it is smaller at comparable CPU cost); an explicit
+    q=0 rules an encoding out.
+    """
+    gzip_q = accept_encodings["gzip"]
+    br_q = accept_encodings["br"] if brotli is not None else 0
+    if br_q and br_q >= gzip_q:
+        return "br"
+    if gzip_q:
+        return "gzip"
+    return None
+
+
+class _GzipStream:
+    def __init__(self, level):
+        # wbits=31: zlib stream with a gzip header and trailer.
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._obj.process(data)
+
+    def finish(self):
+        return self._obj.finish()
+
+
+def _compressor(encoding):
+    if encoding == "br":
+        return _BrotliStream(Config.COMPRESSION_BROTLI_QUALITY)
+    return _GzipStream(Config.COMPRESSION_LEVEL)
+
+
+def _compress_chunks(chunks, encoding, stats):
+    """Yield the compressed form of an iterable of byte chunks."""
+    stream = _compressor(encoding)
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            stats.add(bytes_in=len(chunk))
+            out = stream.compress(chunk)
+            if out:
+                stats.add(bytes_out=len(out))
+                yield out
+        tail = stream.finish()
+        stats.add(bytes_out=len(tail))
+        yield tail
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _slices(data, size=STREAM_CHUNK_BYTES):
+    view = memoryview(data)
+    for start in range(0, len(view), size):
+        yield bytes(view[start:start + size])
+
+
+def _is_candidate(response):
+    if request.method == "HEAD" or response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return False
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    cache_control = response.headers.get("Cache-Control", "")
+    return "no-transform" not in cache_control
+
+
+def compress_response(response, stats=None):
+    """Compress `response` in place when the client accepts it; return it."""
+    stats = stats or _stats
+    if not Config.COMPRESSION_ENABLED or not _is_candidate(response):
+        return response
+
+    streamed = response.is_streamed
+    size = None if streamed else response.calculate_content_length()
+    if size is not None and size < Config.COMPRESSION_MIN_BYTES:
+        stats.add(skipped_small=1)
+        return response
+
+    # The representation now depends on Accept-Encoding, compressed or not.
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        stats.add(skipped_unaccepted=1)
+        return response
+
+    stats.add(responses=1, **{encoding: 1})
+    if streamed or size >= Config.COMPRESSION_STREAM_MIN_BYTES:
+        # Streaming mode: emit compressed chunks as they are produced
+        # instead of holding the whole compressed body in memory.
+        chunks = response.response if streamed else _slices(response.get_data())
+        response.response = _compress_chunks(chunks, encoding, stats)
+        response.headers.pop("Content-Length", None)
+        stats.add(streamed=1)
+    else:
+        data = response.get_data()
+        stream = _compressor(encoding)
+        body = stream.compress(data) + stream.finish()
+        response.set_data(body)
+        stats.add(bytes_in=len(data), bytes_out=len(body))
+
+    response.headers["Content-Encoding"] = encoding
+    # Compressed bytes differ from the identity body: the validator is weak.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def register_compression(app):
+    """Compress responses after every other after_request hook has run."""
+    # after_request hooks run in reverse registration order, so inserting at
+    # the front makes this the last one to see the response.
+    app.after_request_funcs.setdefault(None, []).insert(0, compress_response)
@@ -11,7 +11,8 @@ MUST NOT:
 
 Depends on:
   - Environment variables: DATABASE_URL,
-    GEMINI_API_KEY, GEMINI_MODEL, DEFAULT_USER_ID
+    GEMINI_API_KEY, GEMINI_MODEL, DEFAULT_USER_ID,
+    FOOD_CATALOG_PATH, BLOB_STORE_PATH, CARD_RENDER_PATH
 """
 
 import os
@@ -151,6 +152,84 @@ class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret-change-in-production")
     GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")  # None if not set; never hardcode real keys
     GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.5-flash")
+    # Gemini client resilience (see app/gemini_client.py). GEMINI_API_ENDPOINT
+    # points the SDK at another host, e.g. scripts/gemini_stub_server.py.
+    GEMINI_API_ENDPOINT = os.environ.get("GEMINI_API_ENDPOINT", "").strip()
+    GEMINI_TIMEOUT_SECONDS = _get_int_env("GEMINI_TIMEOUT_SECONDS", 20, minimum=1)
+    GEMINI_MAX_RETRIES = _get_int_env("GEMINI_MAX_RETRIES", 2, minimum=0)
+    GEMINI_BREAKER_FAILURES = _get_int_env("GEMINI_BREAKER_FAILURES", 5, minimum=1)
+    GEMINI_BREAKER_RESET_SECONDS = _get_int_env("GEMINI_BREAKER_RESET_SECONDS", 60, minimum=1)
+    # Serve /api/ai/chat/stream from a local fake streamer when no API key is set.
+    AI_FAKE_STREAM = _is_truthy_env(os.environ.get("AI_FAKE_STREAM"))
+
+    # Mentor context cache (per process) and prompt size budget.
+    MENTOR_CONTEXT_TTL_SECONDS = _get_int_env("MENTOR_CONTEXT_TTL_SECONDS", 60, minimum=0)
+    MENTOR_CONTEXT_MAX_CHARS = _get_int_env("MENTOR_CONTEXT_MAX_CHARS", 2000, minimum=200)
+
+    # Packed food catalog (built by scripts/build_food_catalog.py). When the
+    # file is missing, the built-in INDIAN_FOOD_ESTIMATES are used instead.
+    FOOD_CATALOG_FILE = ROOT_DIR / (
+        os.environ.get("FOOD_CATALOG_PATH", "").strip() or "data/food_catalog.sqlite"
+    )
+    FOOD_CATALOG_MMAP_BYTES = _get_int_env("FOOD_CATALOG_MMAP_BYTES", 256 * 1024 * 1024, minimum=0)
+    # Catalogs larger than this keep only the built-in names in the in-process
+    # phrase matcher; other foods are resolved through catalog lookups.
+    FOOD_MATCHER_MAX_FOODS = _get_int_env("FOOD_MATCHER_MAX_FOODS", 50000, minimum=0)
+
+    # Content-addressed store for goal card images (see app/blob_store.py).
+    BLOB_STORE_DIR = ROOT_DIR / (os.environ.get("BLOB_STORE_PATH", "").strip() or "data/blobs")
+    GOAL_IMAGE_MAX_BYTES = _get_int_env("GOAL_IMAGE_MAX_BYTES", 10 * 1024 * 1024, minimum=1024)
+    # Goal image renditions (see app/image_pipeline.py): longest edge in pixels,
+    # encoder quality, and the bounded worker pool that produces them.
+    GOAL_IMAGE_DISPLAY_EDGE = _get_int_env("GOAL_IMAGE_DISPLAY_EDGE", 1600, minimum=64)
+    GOAL_IMAGE_THUMB_EDGE = _get_int_env("GOAL_IMAGE_THUMB_EDGE", 640, minimum=32)
+    GOAL_IMAGE_QUALITY = _get_int_env("GOAL_IMAGE_QUALITY", 82, minimum=1)
+    IMAGE_PIPELINE_WORKERS = _get_int_env("IMAGE_PIPELINE_WORKERS", 2, minimum=1)
+    IMAGE_PIPELINE_MAX_PENDING = _get_int_env("IMAGE_PIPELINE_MAX_PENDING", 16, minimum=1)
+    # Rendered goal card PNGs served by /api/goals/<id>/download.
+    CARD_RENDER_DIR = ROOT_DIR / (os.environ.get("CARD_RENDER_PATH", "").strip() or "data/card_renders")
+
+    # Public shared-goal endpoint: per-process payload cache, browser/CDN
+    # max-age, and database lookups allowed per share token per minute.
+    SHARED_GOAL_CACHE_TTL_SECONDS = _get_int_env("SHARED_GOAL_CACHE_TTL_SECONDS", 60, minimum=0)
+    SHARED_GOAL_MAX_AGE_SECONDS = _get_int_env("SHARED_GOAL_MAX_AGE_SECONDS", 30, minimum=0)
+    SHARED_GOAL_LOOKUPS_PER_MINUTE = _get_int_env("SHARED_GOAL_LOOKUPS_PER_MINUTE", 30, minimum=0)
+
+    # @rate_limit state: "memory" (per process) or "sqlite" (one file shared
+    # by every worker on the host, so limits are not multiplied by workers).
+    RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory").strip().lower() or "memory"
+    RATE_LIMIT_SQLITE_PATH = ROOT_DIR / (
+        os.environ.get("RATE_LIMIT_SQLITE_PATH", "").strip() or "data/rate_limits.sqlite"
+    )
+    RATE_LIMIT_MAX_KEYS = _get_int_env("RATE_LIMIT_MAX_KEYS", 10000, minimum=1)
+
+    # Response compression (see app/compression.py): bodies smaller than
+    # COMPRESSION_MIN_BYTES are sent as-is; bodies of at least
+    # COMPRESSION_STREAM_MIN_BYTES are compressed chunk by chunk.
+    COMPRESSION_ENABLED = _is_truthy_env(os.environ.get("COMPRESSION_ENABLED", "1"))
+    COMPRESSION_MIN_BYTES = _get_int_env("COMPRESSION_MIN_BYTES", 1024, minimum=0)
+    COMPRESSION_LEVEL = min(9, _get_int_env("COMPRESSION_LEVEL", 6, minimum=1))
+    COMPRESSION_BROTLI_QUALITY = min(11, _get_int_env("COMPRESSION_BROTLI_QUALITY", 4, minimum=0))
+    COMPRESSION_STREAM_MIN_BYTES = _get_int_env("COMPRESSION_STREAM_MIN_BYTES", 1024 * 1024, minimum=1)
+
+    # Sub-requests accepted by one POST /api/batch.
+    BATCH_MAX_REQUESTS = _get_int_env("BATCH_MAX_REQUESTS", 20, minimum=1)
+    # Largest page of changes returned by GET /api/sync.
+    SYNC_PAGE_SIZE = _get_int_env("SYNC_PAGE_SIZE", 200, minimum=1)
+    # Default and largest ?limit= for paginated list endpoints.
+    LIST_PAGE_SIZE = _get_int_env("LIST_PAGE_SIZE", 50, minimum=1)
+    LIST_MAX_PAGE_SIZE = _get_int_env("LIST_MAX_PAGE_SIZE", 200, minimum=1)
+    # Largest ?limit= for GET /api/search.
+    SEARCH_MAX_RESULTS = _get_int_env("SEARCH_MAX_RESULTS", 50, minimum=1)
+    # Writes accepted by one POST /api/mutations, and how long their
+    # idempotency keys are remembered.
+    MUTATIONS_MAX_OPS = _get_int_env("MUTATIONS_MAX_OPS", 100, minimum=1)
+    IDEMPOTENCY_TTL_SECONDS = _get_int_env("IDEMPOTENCY_TTL_SECONDS", 86400, minimum=60)
+    # In-memory leaderboards: seconds before a worker reloads them from the
+    # database (0 = only on boot and at the start of a week), and the
+    # largest ?limit= for GET /api/leaderboard.
+    LEADERBOARD_REBUILD_SECONDS = _get_int_env("LEADERBOARD_REBUILD_SECONDS", 600, minimum=0)
+    LEADERBOARD_MAX_LIMIT = _get_int_env("LEADERBOARD_MAX_LIMIT", 100, minimum=1)
     
     # Legacy: kept for backwards compatibility with old code
     DB_FILE = DB_CONFIG.get("path") if DB_CONFIG["type"] == "sqlite" else None
@@ -13,6 +13,8 @@ MUST NOT:
 Depends on:
   - config.py (DB_CONFIG, SCHEMA_FILE, DEFAULT_USER_ID, DATA_FILE)
   - utils.py (now_iso, safe_int, today_str)
+  - blob_store.py (moving goal image data URLs out of the goals table)
+  - points_engine.py (stats_snapshots typed columns, for the backfill)
   - db/schema.sql (DDL)
 """
 
@@ -26,6 +28,8 @@ from contextlib import contextmanager
 
 from flask import current_app, g
 
+from .blob_store import migrate_data_url
+from .points_engine import SNAPSHOT_COLUMNS, snapshot_values_from_payload
 from .utils import now_iso, safe_int, today_str
 
 # Try to import psycopg2 for PostgreSQL support (optional)
@@ -291,6 +295,16 @@ def _return_postgres_connection(pool, conn):
             pass
 
 
+def discard_inherited_pool(app):
+    """Forget a PostgreSQL pool inherited through fork() so this process opens its own.
+
+    For worker processes (scripts/nightly_evaluate.py). The inherited
+    connections are dropped, not closed: their sockets are shared with the
+    parent, and closing them here would close them there too.
+    """
+    app.extensions.pop(_POSTGRES_POOL_KEY, None)
+
+
 def _checkout_postgres_connection(pool):
     raw_conn = pool.getconn()
     raw_conn.autocommit = False
@@ -370,6 +384,105 @@ def db_transaction(conn=None):
         raise
 
 
+class SavepointConnection:
+    """Connection proxy installed as g.db by single_transaction().
+
+    commit() is a no-op and rollback() only undoes the current savepoint, so
+    repository methods that commit (or roll back) on their own can run as
+    steps of one outer transaction. Side effects that must wait for the real
+    commit are queued with after_commit().
+    """
+
+    def __init__(self, conn):
+        self._inner = conn
+        self._savepoint = None
+        self._counter = 0
+        self._after_commit = {}
+        self._queued_before_step = {}
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+    def execute(self, sql, params=None):
+        if params is None:
+            return self._inner.execute(sql)
+        return self._inner.execute(sql, params)
+
+    def commit(self):
+        """Deferred to the end of single_transaction()."""
+
+    def rollback(self):
+        """Undo the current step only (no-op outside savepoint())."""
+        if self._savepoint:
+            self._inner.execute(f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+            self._after_commit = dict(self._queued_before_step)
+
+    def after_commit(self, key, callback):
+        """Run callback() once the outer transaction has committed.
+
+        A later callback with the same key replaces the earlier one; callbacks
+        queued by a step that is rolled back are dropped with it, and nothing
+        runs if the whole transaction rolls back.
+        """
+        self._after_commit[key] = callback
+
+    def _run_after_commit(self):
+        callbacks = list(self._after_commit.values())
+        self._after_commit = {}
+        for callback in callbacks:
+            callback()
+
+    @contextmanager
+    def savepoint(self):
+        """Run one step; an exception undoes the step and propagates."""
+        self._counter += 1
+        name = f"step_{self._counter}"
+        self._inner.execute(f"SAVEPOINT {name}")
+        self._savepoint = name
+        self._queued_before_step = dict(self._after_commit)
+        try:
+            yield self
+        except Exception:
+            self._inner.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            self._after_commit = self._queued_before_step
+            raise
+        finally:
+            self._savepoint = None
+            self._inner.execute(f"RELEASE SAVEPOINT {name}")
+
+
+@contextmanager
+def single_transaction():
+    """Run several repository writes in one transaction.
+
+    Installs a SavepointConnection as g.db for the duration of the block and
+    commits once at the end (everything is rolled back if the block raises).
+    Wrap each independent step in conn.savepoint() so one failing step can be
+    undone without losing the others.
+    """
+    conn = get_db()
+    if isinstance(conn, SavepointConnection):
+        raise RuntimeError("single_transaction() cannot be nested")
+    if isinstance(conn, sqlite3.Connection) and not conn.in_transaction:
+        # Take the write lock up front; releasing the outermost SAVEPOINT
+        # outside an explicit transaction would also commit it.
+        conn.execute("BEGIN IMMEDIATE")
+    proxy = SavepointConnection(conn)
+    g.db = proxy
+    try:
+        yield proxy
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        g.db = conn
+    proxy._run_after_commit()
+
+
 def init_schema(conn):
     """Initialize database schema.
 
@@ -765,6 +878,55 @@ def ensure_focus_sessions_columns(conn):
             conn.execute("ALTER TABLE focus_sessions ADD COLUMN project_id INTEGER REFERENCES projects(id) ON DELETE SET NULL")
 
 
+def ensure_stats_snapshot_columns(conn, batch_size=500):
+    """Add the typed stats_snapshots columns and backfill them from payload_json.
+
+    Runs before init_schema() on existing databases so the indexes on the
+    new columns can be created. Rows are backfilled once, when the columns
+    are first added.
+    """
+    config = _db_config()
+    if not table_exists(conn, "stats_snapshots"):
+        return
+
+    if config["type"] == "postgresql":
+        cols = conn.execute(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name='stats_snapshots'
+            """
+        ).fetchall()
+        names = {row["column_name"] for row in cols}
+    else:
+        cols = conn.execute("PRAGMA table_info(stats_snapshots)").fetchall()
+        names = {row["name"] for row in cols}
+
+    missing = [(name, kind) for name, kind in SNAPSHOT_COLUMNS if name not in names]
+    if not missing:
+        return
+    for name, kind in missing:
+        sql_type = "REAL" if kind is float else "INTEGER"
+        conn.execute(f"ALTER TABLE stats_snapshots ADD COLUMN {name} {sql_type} NOT NULL DEFAULT 0")
+
+    assignments = ", ".join(f"{name} = ?" for name, _ in SNAPSHOT_COLUMNS)
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, payload_json FROM stats_snapshots WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            last_id = row["id"]
+            conn.execute(
+                f"UPDATE stats_snapshots SET {assignments} WHERE id = ?",
+                (*snapshot_values_from_payload(row["payload_json"]), row["id"]),
+            )
+    if last_id:
+        print(f"[DB] Backfilled typed stats_snapshots columns through id {last_id}")
+
+
 def ensure_goals_columns(conn):
     """Add missing columns to goals table if needed."""
     config = _db_config()
@@ -784,6 +946,8 @@ def ensure_goals_columns(conn):
             conn.execute("ALTER TABLE goals ADD COLUMN snippets_collected INTEGER NOT NULL DEFAULT 0")
             conn.execute("ALTER TABLE goals ADD CONSTRAINT goals_snippets_collected_check CHECK (snippets_collected >= 0 AND snippets_collected <= 4)")
             conn.execute("UPDATE goals SET snippets_collected = LEAST(4, GREATEST(0, FLOOR((current_progress / 100.0) * 4)))")
+        if "card_thumb_url" not in names:
+            conn.execute("ALTER TABLE goals ADD COLUMN card_thumb_url TEXT")
     else:
         cols = conn.execute("PRAGMA table_info(goals)").fetchall()
         names = {row["name"] for row in cols}
@@ -791,6 +955,42 @@ def ensure_goals_columns(conn):
         if "snippets_collected" not in names:
             conn.execute("ALTER TABLE goals ADD COLUMN snippets_collected INTEGER NOT NULL DEFAULT 0")
             conn.execute("UPDATE goals SET snippets_collected = MIN(4, MAX(0, CAST((current_progress / 100.0) * 4 AS INTEGER)))")
+        if "card_thumb_url" not in names:
+            conn.execute("ALTER TABLE goals ADD COLUMN card_thumb_url TEXT")
+
+
+def ensure_goal_image_blobs(conn, store=None, batch_size=50):
+    """Move base64 `data:` card images out of goals rows into the blob store.
+
+    Each row keeps only the blob reference. Safe to run repeatedly: once a
+    row is migrated it no longer matches the `data:` filter. Returns the
+    number of rows rewritten.
+    """
+    if not table_exists(conn, "goals"):
+        return 0
+
+    migrated = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT id, card_image_url FROM goals
+            WHERE id > ? AND card_image_url LIKE ?
+            ORDER BY id
+            LIMIT ?
+            """,
+            (last_id, "data:%", batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            last_id = row["id"]
+            ref = migrate_data_url(row["card_image_url"], store)
+            if ref != row["card_image_url"]:
+                conn.execute("UPDATE goals SET card_image_url = ? WHERE id = ?", (ref, row["id"]))
+                migrated += 1
+        conn.commit()
+    return migrated
 
 
 def ensure_notes_task_link_triggers(conn):
@@ -842,6 +1042,89 @@ def ensure_notes_task_link_triggers(conn):
         cur.close()
 
 
+# SQLite full-text index for /api/search. External-content FTS5 tables read
+# title/content from the base tables; the triggers keep them in sync.
+_SQLITE_SEARCH_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+  title, content, content='notes', content_rowid='id',
+  tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+  title, description, content='tasks', content_rowid='id',
+  tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_fts_insert AFTER INSERT ON notes BEGIN
+  INSERT INTO notes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notes_fts_delete AFTER DELETE ON notes BEGIN
+  INSERT INTO notes_fts(notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notes_fts_update AFTER UPDATE OF title, content ON notes BEGIN
+  INSERT INTO notes_fts(notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+  INSERT INTO notes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert AFTER INSERT ON tasks BEGIN
+  INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete AFTER DELETE ON tasks BEGIN
+  INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+  INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+  INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+"""
+
+
+def ensure_search_index(conn):
+    """Create the SQLite FTS5 search index and backfill it on first run.
+
+    PostgreSQL uses GIN indexes on tsvector expressions from
+    schema_postgres.sql; this function is a no-op there. SQLite builds
+    without FTS5 keep working: search_backend() falls back to LIKE.
+    """
+    config = _db_config()
+    if config["type"] == "postgresql":
+        return
+
+    is_new = not table_exists(conn, "notes_fts")
+    try:
+        conn.executescript(_SQLITE_SEARCH_DDL)
+    except sqlite3.OperationalError as exc:
+        print(f"[DB] FTS5 unavailable, search will use LIKE: {exc}")
+        return
+    if is_new:
+        conn.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def ensure_entity_tags(conn):
+    """Backfill entity_tags from tags_json for rows written before it existed.
+
+    Runs while the table is still empty. Rewriting tags_json to itself fires
+    the same triggers (schema.sql / schema_postgres.sql) that keep the index
+    in step afterwards, so both dialects share one code path.
+    """
+    if conn.execute("SELECT 1 FROM entity_tags LIMIT 1").fetchone():
+        return
+    for table in ("notes", "tasks"):
+        conn.execute(f"UPDATE {table} SET tags_json = tags_json WHERE tags_json <> '[]'")
+
+
+def is_postgres():
+    """True when the app runs on PostgreSQL."""
+    return _db_config()["type"] == "postgresql"
+
+
+def search_backend(conn):
+    """'tsvector' on PostgreSQL, 'fts5' when the SQLite index exists, else 'like'."""
+    if _db_config()["type"] == "postgresql":
+        return "tsvector"
+    return "fts5" if table_exists(conn, "notes_fts") else "like"
+
+
 def ensure_default_user(conn):
     """Seed the default user (only during JSON migration)."""
     config = _db_config()
@@ -1037,6 +1320,7 @@ def init_app_data(app):
                     # schema file doesn't target missing columns.
                     ensure_tasks_tags_column(conn)
                     ensure_tasks_recurrence_columns(conn)
+                    ensure_stats_snapshot_columns(conn)
                     init_schema(conn)
                     ensure_tasks_tags_column(conn)
                     ensure_tasks_recurrence_columns(conn)
@@ -1044,7 +1328,9 @@ def init_app_data(app):
                     ensure_auth_columns(conn)
                     ensure_focus_sessions_columns(conn)
                     ensure_goals_columns(conn)
+                    ensure_goal_image_blobs(conn)
                     ensure_notes_task_link_triggers(conn)
+                    ensure_entity_tags(conn)
                 conn.commit()
                 app.logger.info("[DB] PostgreSQL initialization complete")
             except Exception:
@@ -1078,6 +1364,7 @@ def init_app_data(app):
                 # missing columns on old local databases.
                 ensure_tasks_tags_column(conn)
                 ensure_tasks_recurrence_columns(conn)
+                ensure_stats_snapshot_columns(conn)
                 init_schema(conn)
                 ensure_tasks_tags_column(conn)
                 ensure_tasks_recurrence_columns(conn)
@@ -1085,6 +1372,9 @@ def init_app_data(app):
                 ensure_auth_columns(conn)
                 ensure_focus_sessions_columns(conn)
                 ensure_goals_columns(conn)
+                ensure_goal_image_blobs(conn)
+                ensure_search_index(conn)
+                ensure_entity_tags(conn)
                 if should_migrate_json(conn):
                     migrate_json_to_sqlite(conn)
             conn.commit()
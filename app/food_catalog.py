@@ -0,0 +1,311 @@
+"""
+FILE: app/food_catalog.py
+
+Responsibility:
+  Read-only food catalog backing local nutrition estimates.
+  Loads a packed SQLite catalog file (built by scripts/build_food_catalog.py)
+  or falls back to an in-memory catalog seeded from the built-in estimates.
+
+MUST NOT:
+  - Import Flask, db, or any route/AI module
+  - Write to the catalog file at request time
+
+Depends on:
+  - config.py (FOOD_CATALOG_FILE, FOOD_CATALOG_MMAP_BYTES)
+  - sqlite3 (standard library)
+
+Notes:
+  The catalog file is opened read-only with SQLite memory-mapped I/O, so
+  every gunicorn worker reads the same pages from the OS page cache instead
+  of holding its own copy of the food table.
+"""
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from .config import Config
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS foods (
+  id INTEGER PRIMARY KEY,
+  name TEXT NOT NULL,
+  match_key TEXT NOT NULL UNIQUE,
+  calories REAL NOT NULL DEFAULT 0,
+  protein REAL NOT NULL DEFAULT 0,
+  carbs REAL NOT NULL DEFAULT 0,
+  fats REAL NOT NULL DEFAULT 0,
+  serving TEXT NOT NULL DEFAULT '1 serving',
+  grams REAL NOT NULL DEFAULT 100
+);
+
+CREATE TABLE IF NOT EXISTS food_terms (
+  term TEXT NOT NULL,
+  food_id INTEGER NOT NULL,
+  PRIMARY KEY (term, food_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS catalog_meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+"""
+
+_FOOD_COLUMNS = "name, calories, protein, carbs, fats, serving, grams"
+_MAX_QUERY_WORDS = 12
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_food_name(value):
+    """Lowercase and collapse whitespace so names compare consistently."""
+    return " ".join(str(value or "").strip().lower().split())
+
+
+def food_match_key(value):
+    """Reduce a name to its lowercase words so punctuation never blocks a match."""
+    return " ".join(_WORD_RE.findall(str(value or "").lower()))
+
+
+def food_terms(name):
+    """Return the distinct search terms (words) of a food name."""
+    seen = []
+    for word in food_match_key(name).split():
+        if word not in seen:
+            seen.append(word)
+    return seen
+
+
+def _singular(word):
+    if len(word) > 3 and word.endswith("es") and word[:-2].endswith(("ch", "sh", "s", "x", "o")):
+        return word[:-2]
+    if len(word) > 2 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _row_to_estimate(row):
+    return {
+        "calories": row["calories"],
+        "protein": row["protein"],
+        "carbs": row["carbs"],
+        "fats": row["fats"],
+        "serving": row["serving"],
+        "grams": row["grams"],
+    }
+
+
+def write_catalog(conn, foods):
+    """Insert (name, estimate) pairs into an open catalog connection.
+
+    Later duplicates of the same normalized name replace earlier ones.
+    Returns the number of rows written.
+    """
+    conn.executescript(CATALOG_SCHEMA)
+    written = 0
+    for raw_name, est in foods:
+        name = normalize_food_name(raw_name)
+        key = food_match_key(name)
+        if not key or not isinstance(est, dict):
+            continue
+        conn.execute(
+            f"""
+            INSERT INTO foods (match_key, {_FOOD_COLUMNS})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(match_key) DO UPDATE SET
+              name = excluded.name,
+              calories = excluded.calories,
+              protein = excluded.protein,
+              carbs = excluded.carbs,
+              fats = excluded.fats,
+              serving = excluded.serving,
+              grams = excluded.grams
+            """,
+            (
+                key,
+                name,
+                max(0.0, float(est.get("calories") or 0)),
+                max(0.0, float(est.get("protein") or 0)),
+                max(0.0, float(est.get("carbs") or 0)),
+                max(0.0, float(est.get("fats") or 0)),
+                str(est.get("serving") or "1 serving"),
+                max(1.0, float(est.get("grams") or 100)),
+            ),
+        )
+        food_id = conn.execute("SELECT id FROM foods WHERE match_key = ?", (key,)).fetchone()[0]
+        conn.executemany(
+            "INSERT OR IGNORE INTO food_terms (term, food_id) VALUES (?, ?)",
+            [(term, food_id) for term in key.split()],
+        )
+        written += 1
+    return written
+
+
+class FoodCatalog:
+    """Read-only lookups over a packed food catalog.
+
+    Connections are per-thread; all of them point at the same file (or the
+    same shared in-memory database for the built-in fallback).
+    """
+
+    def __init__(self, uri, *, source, keepalive=None, mmap_bytes=0):
+        self._uri = uri
+        self._mmap_bytes = int(mmap_bytes or 0)
+        self._local = threading.local()
+        # Shared in-memory databases vanish when their last connection closes.
+        self._keepalive = keepalive
+        self.source = source
+
+    @classmethod
+    def open_file(cls, path, *, mmap_bytes=None):
+        path = Path(path).resolve()
+        if mmap_bytes is None:
+            mmap_bytes = Config.FOOD_CATALOG_MMAP_BYTES
+        uri = f"{path.as_uri()}?mode=ro&immutable=1"
+        return cls(uri, source=str(path), mmap_bytes=mmap_bytes)
+
+    @classmethod
+    def from_mapping(cls, mapping, *, name="builtin_foods"):
+        uri = f"file:{name}_{id(mapping)}?mode=memory&cache=shared"
+        keepalive = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        with keepalive:
+            write_catalog(keepalive, mapping.items())
+        return cls(uri, source="builtin", keepalive=keepalive)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            if self._mmap_bytes > 0:
+                conn.execute(f"PRAGMA mmap_size = {self._mmap_bytes}")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM foods").fetchone()[0]
+
+    def get(self, name):
+        """Exact lookup by normalized name. Returns the estimate dict or None."""
+        row = self._conn().execute(
+            f"SELECT {_FOOD_COLUMNS} FROM foods WHERE match_key = ?",
+            (food_match_key(name),),
+        ).fetchone()
+        return _row_to_estimate(row) if row else None
+
+    def iter_names(self):
+        """Yield every catalog name (streamed, not materialized)."""
+        for row in self._conn().execute("SELECT name FROM foods"):
+            yield row["name"]
+
+    def lookup(self, text):
+        """Find the best catalog entry for free text.
+
+        Prefers the longest catalog name that appears as a whole-word phrase
+        in the text (so "chicken biryani" wins over "chicken"), tolerating
+        simple plurals. Falls back to the shortest name starting with the
+        text. Returns (name, estimate) or (None, None).
+        """
+        query = food_match_key(text)
+        if not query:
+            return None, None
+
+        words = query.split()[:_MAX_QUERY_WORDS]
+        candidates = set()
+        for start in range(len(words)):
+            for end in range(start + 1, len(words) + 1):
+                span = words[start:end]
+                candidates.add(" ".join(span))
+                candidates.add(" ".join(span[:-1] + [_singular(span[-1])]))
+
+        conn = self._conn()
+        if candidates:
+            placeholders = ",".join("?" for _ in candidates)
+            row = conn.execute(
+                f"""
+                SELECT {_FOOD_COLUMNS} FROM foods
+                WHERE match_key IN ({placeholders})
+                ORDER BY length(match_key) DESC, match_key ASC
+                LIMIT 1
+                """,
+                tuple(candidates),
+            ).fetchone()
+            if row:
+                return row["name"], _row_to_estimate(row)
+
+        if len(query) >= 3:
+            row = conn.execute(
+                f"""
+                SELECT {_FOOD_COLUMNS} FROM foods
+                WHERE match_key >= ? AND match_key < ?
+                ORDER BY length(match_key) ASC, match_key ASC
+                LIMIT 1
+                """,
+                (query, query + "\uffff"),
+            ).fetchone()
+            if row:
+                return row["name"], _row_to_estimate(row)
+
+        return None, None
+
+    def search(self, text, limit=8):
+        """Ranked prefix/word search. Returns a list of (name, estimate).
+
+        Names containing the whole query rank first (closest length first),
+        then foods by how many query terms prefix-match their words. Scoring
+        and ordering run in SQL over every matching food before the limit
+        applies, so a common prefix never crowds out the exact name.
+        """
+        query = food_match_key(text)
+        terms = food_terms(query)[:_MAX_QUERY_WORDS]
+        if not terms:
+            return []
+
+        hits = " UNION ALL ".join(
+            "SELECT food_id FROM food_terms WHERE term >= ? AND term < ?" for _ in terms
+        )
+        params = [bound for term in terms for bound in (term, term + "\uffff")]
+        rows = self._conn().execute(
+            f"""
+            WITH hits(food_id) AS ({hits}),
+            overlap AS (SELECT food_id, COUNT(*) AS terms FROM hits GROUP BY food_id)
+            SELECT {_FOOD_COLUMNS},
+                   CASE WHEN instr(f.match_key, ?) > 0
+                        THEN 100 - abs(length(f.name) - ?)
+                        ELSE o.terms * 10
+                   END AS score
+            FROM overlap o JOIN foods f ON f.id = o.food_id
+            ORDER BY score DESC, f.name ASC
+            LIMIT ?
+            """,
+            (*params, query, len(query), max(1, int(limit or 8))),
+        ).fetchall()
+        return [(row["name"], _row_to_estimate(row)) for row in rows]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_food_catalog(builtin=None):
+    """Return the process-wide catalog, opening it on first use.
+
+    Uses Config.FOOD_CATALOG_FILE when it exists; otherwise builds an
+    in-memory catalog from the `builtin` mapping.
+    """
+    global _catalog
+    if _catalog is not None:
+        return _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            path = Config.FOOD_CATALOG_FILE
+            if path and Path(path).is_file():
+                try:
+                    _catalog = FoodCatalog.open_file(path)
+                    print(f"[FoodCatalog] Loaded {len(_catalog)} foods from {path}")
+                except sqlite3.Error as e:
+                    print(f"[FoodCatalog] Failed to open {path}: {e}. Using built-in estimates.")
+                    _catalog = None
+            if _catalog is None:
+                _catalog = FoodCatalog.from_mapping(builtin or {})
+    return _catalog
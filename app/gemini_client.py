@@ -0,0 +1,365 @@
+"""
+FILE: app/gemini_client.py
+
+Responsibility:
+  One shared Gemini client per process. Configures the SDK once, caches
+  GenerativeModel handles, applies a per-call deadline, retries transient
+  errors with jittered exponential backoff, and trips a circuit breaker
+  while Gemini keeps failing so callers can go straight to local fallbacks.
+
+MUST NOT:
+  - Import Flask, db, or route modules
+  - Build prompts or interpret model output (callers own that)
+
+Depends on:
+  - config.py (GEMINI_* settings)
+  - google.generativeai (optional; imported lazily)
+"""
+
+import random
+import threading
+import time
+
+from .config import Config
+
+# HTTP statuses worth retrying (timeouts, throttling, upstream hiccups).
+_TRANSIENT_STATUS = {408, 429, 500, 502, 503, 504}
+_TRANSIENT_ERROR_NAMES = {
+    "DeadlineExceeded",
+    "ServiceUnavailable",
+    "ResourceExhausted",
+    "TooManyRequests",
+    "InternalServerError",
+    "BadGateway",
+    "GatewayTimeout",
+    "RetryError",
+}
+
+
+class GeminiUnavailable(Exception):
+    """Gemini is not configured, or the circuit breaker is open."""
+
+
+def _error_status(exc):
+    code = getattr(exc, "code", None)
+    if callable(code):
+        # gRPC errors expose code() instead of an HTTP status.
+        return None
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limit_error(exc):
+    status = _error_status(exc)
+    if status == 429:
+        return True
+    return type(exc).__name__ in ("ResourceExhausted", "TooManyRequests")
+
+
+def is_transient_error(exc):
+    """True for errors a retry can plausibly fix."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = _error_status(exc)
+    if status is not None:
+        return status in _TRANSIENT_STATUS
+    return type(exc).__name__ in _TRANSIENT_ERROR_NAMES
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    closed    -> calls flow; `failure_threshold` failures in a row open it
+    open      -> calls are refused until `reset_timeout` seconds pass
+    half_open -> one trial call; success closes, failure re-opens
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = max(0.0, float(reset_timeout))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+    def allow(self):
+        """Return True if a call may proceed now."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+    def release_trial(self):
+        """Give back a half-open trial abandoned without a verdict."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def seconds_until_retry(self):
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+
+class GeminiClientManager:
+    """Process-wide Gemini access with deadlines, retries and a breaker."""
+
+    def __init__(
+        self,
+        api_key=None,
+        *,
+        model_name=None,
+        timeout=None,
+        max_retries=None,
+        backoff_base=0.5,
+        backoff_cap=8.0,
+        api_endpoint=None,
+        breaker=None,
+        sleep=time.sleep,
+        model_factory=None,
+    ):
+        self.api_key = (api_key if api_key is not None else Config.GEMINI_API_KEY) or ""
+        self.model_name = model_name or Config.GEMINI_MODEL
+        self.timeout = float(timeout if timeout is not None else Config.GEMINI_TIMEOUT_SECONDS)
+        self.max_retries = int(max_retries if max_retries is not None else Config.GEMINI_MAX_RETRIES)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.api_endpoint = api_endpoint if api_endpoint is not None else Config.GEMINI_API_ENDPOINT
+        self.breaker = breaker or CircuitBreaker(
+            Config.GEMINI_BREAKER_FAILURES, Config.GEMINI_BREAKER_RESET_SECONDS
+        )
+        self._sleep = sleep
+        # model_factory(name) -> object with generate_content(); replaces the SDK
+        # (used by scripts/gemini_stub_server.py --self-check).
+        self._model_factory = model_factory
+        self._lock = threading.Lock()
+        self._genai = None
+        self._configured = False
+        self._import_error = None
+        self._models = {}
+        self.stats = {
+            "requests": 0,
+            "success": 0,
+            "failed": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "short_circuited": 0,
+        }
+
+    # -- setup -------------------------------------------------------------
+
+    def _configure(self):
+        if self._configured:
+            return self._genai
+        with self._lock:
+            if not self._configured:
+                self._genai = self._load_sdk()
+                self._configured = True
+            return self._genai
+
+    def _load_sdk(self):
+        if self._model_factory is not None:
+            return self._model_factory
+        if not self.api_key:
+            return None
+        try:
+            import google.generativeai as genai
+        except ImportError as e:
+            self._import_error = str(e)
+            print(f"[Gemini] SDK not available: {e}. AI features disabled.")
+            return None
+        try:
+            kwargs = {"api_key": self.api_key}
+            if self.api_endpoint:
+                # Point the SDK at another endpoint (e.g. scripts/gemini_stub_server.py).
+                kwargs["transport"] = "rest"
+                kwargs["client_options"] = {"api_endpoint": self.api_endpoint}
+            genai.configure(**kwargs)
+            return genai
+        except Exception as e:
+            print(f"[Gemini] Failed to configure SDK: {e}")
+            return None
+
+    def available(self):
+        """True when the SDK is importable and an API key is configured."""
+        return self._configure() is not None
+
+    def model(self, name=None):
+        """Cached GenerativeModel handle for `name` (default GEMINI_MODEL)."""
+        genai = self._configure()
+        if genai is None:
+            raise GeminiUnavailable("Gemini is not configured")
+        name = name or self.model_name
+        handle = self._models.get(name)
+        if handle is None:
+            with self._lock:
+                handle = self._models.get(name)
+                if handle is None:
+                    factory = self._model_factory or genai.GenerativeModel
+                    handle = factory(name)
+                    self._models[name] = handle
+        return handle
+
+    # -- calls -------------------------------------------------------------
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _before_call(self):
+        if not self.breaker.allow():
+            self.stats["short_circuited"] += 1
+            raise GeminiUnavailable(
+                f"Gemini circuit open; retry in {self.breaker.seconds_until_retry():.0f}s"
+            )
+
+    def _record_error(self, exc):
+        self.stats["failed"] += 1
+        if is_rate_limit_error(exc):
+            self.stats["rate_limited"] += 1
+        self.breaker.record_failure()
+
+    def _record_success(self):
+        self.stats["success"] += 1
+        self.breaker.record_success()
+
+    def _run(self, call, timeout, *, settle=True):
+        """Run `call(remaining_seconds)` with retries inside one overall deadline.
+
+        The breaker sees one failure per call, once retries are used up.
+        With settle=False the caller records the outcome itself (streams
+        only succeed once fully consumed).
+        """
+        self._before_call()
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        settled = False
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                self.stats["requests"] += 1
+                try:
+                    if remaining <= 0:
+                        raise TimeoutError(f"Gemini deadline of {timeout:.1f}s exceeded")
+                    result = call(remaining)
+                except Exception as e:
+                    if is_transient_error(e) and attempt < self.max_retries:
+                        delay = self._backoff(attempt)
+                        if time.monotonic() + delay < deadline and self.breaker.allow():
+                            self.stats["retries"] += 1
+                            attempt += 1
+                            self._sleep(delay)
+                            continue
+                    settled = True
+                    self._record_error(e)
+                    raise
+                settled = True
+                if settle:
+                    self._record_success()
+                return result
+        finally:
+            if not settled:
+                # Interrupted by a BaseException: no verdict, but free the trial.
+                self.breaker.release_trial()
+
+    def generate(self, contents, *, model=None, timeout=None, **kwargs):
+        """generate_content() with deadline, retries and breaker.
+
+        Raises GeminiUnavailable when not configured or short-circuited;
+        otherwise re-raises the last SDK error.
+        """
+        handle = self.model(model)
+        return self._run(
+            lambda remaining: handle.generate_content(
+                contents, request_options={"timeout": remaining}, **kwargs
+            ),
+            self.timeout if timeout is None else float(timeout),
+        )
+
+    def stream(self, contents, *, model=None, timeout=None, **kwargs):
+        """Yield text chunks from the streaming API.
+
+        Opening the stream is retried like generate(); once text has been
+        yielded, errors propagate (a retry would repeat text already sent).
+        """
+        handle = self.model(model)
+        response = self._run(
+            lambda remaining: handle.generate_content(
+                contents, stream=True, request_options={"timeout": remaining}, **kwargs
+            ),
+            self.timeout if timeout is None else float(timeout),
+            settle=False,
+        )
+        try:
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except (ValueError, AttributeError):
+                    # Chunks without text parts (e.g. safety metadata) raise on .text
+                    continue
+                if text:
+                    yield text
+        except Exception as e:
+            self._record_error(e)
+            raise
+        except BaseException:
+            # GeneratorExit when the client disconnects mid-stream: no verdict
+            # on Gemini, but a half-open trial must not stay taken forever.
+            self.breaker.release_trial()
+            raise
+        self._record_success()
+
+    def snapshot(self):
+        """Stats plus breaker state, for analytics endpoints."""
+        return {**self.stats, "circuit_state": self.breaker.state}
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_gemini_manager():
+    """Return the process-wide GeminiClientManager."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = GeminiClientManager()
+    return _manager
@@ -0,0 +1,154 @@
+"""
+FILE: app/image_pipeline.py
+
+Responsibility:
+  Turn uploaded goal images into web-sized variants off the request thread.
+  The request streams the upload into the blob store under a size cap
+  (BlobStore.put_stream); a bounded worker pool then decodes it with Pillow,
+  downscales to a display size and a thumbnail size, re-encodes to WebP
+  (JPEG when WebP is unavailable), and stores the results as new blobs.
+
+MUST NOT:
+  - Import Flask, db, or route modules (callers persist the references)
+  - Queue unbounded work: submit() refuses jobs once the pool is saturated
+
+Depends on:
+  - blob_store.py (get_blob_store)
+  - config.py (GOAL_IMAGE_* and IMAGE_PIPELINE_* settings)
+  - Pillow (optional; without it uploads are stored as-is)
+"""
+
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .blob_store import get_blob_store
+from .config import Config
+
+try:
+    from PIL import Image, ImageOps, features
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+# Refuse images that would decode to more than this many pixels (~50 MP).
+MAX_IMAGE_PIXELS = 50_000_000
+
+
+class ImagePipelineBusy(Exception):
+    """Every worker is busy and the pending queue is full."""
+
+
+def _output_format():
+    if HAS_PIL and features.check("webp"):
+        return "WEBP"
+    return "JPEG"
+
+
+def _encode(img, max_edge, fmt, quality):
+    variant = img.copy()
+    variant.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    if fmt == "JPEG" and variant.mode != "RGB":
+        # JPEG has no alpha: flatten transparent areas onto white.
+        rgba = variant.convert("RGBA")
+        variant = Image.new("RGB", rgba.size, (255, 255, 255))
+        variant.paste(rgba, mask=rgba.split()[-1])
+    elif fmt == "WEBP" and variant.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in variant.getbands() or "transparency" in variant.info
+        variant = variant.convert("RGBA" if has_alpha else "RGB")
+    out = io.BytesIO()
+    if fmt == "WEBP":
+        variant.save(out, format=fmt, quality=quality, method=4)
+    else:
+        variant.save(out, format=fmt, quality=quality, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def render_variants(source_path, store=None, *, display_edge=None, thumb_edge=None, quality=None):
+    """Decode `source_path` and store display + thumbnail renditions.
+
+    Returns {"display": digest, "thumb": digest, "format": "WEBP"|"JPEG"}.
+    Raises ValueError for files Pillow cannot decode or that are too large.
+    """
+    if not HAS_PIL:
+        raise RuntimeError("Pillow is not installed")
+    store = store or get_blob_store()
+    display_edge = display_edge or Config.GOAL_IMAGE_DISPLAY_EDGE
+    thumb_edge = thumb_edge or Config.GOAL_IMAGE_THUMB_EDGE
+    quality = quality or Config.GOAL_IMAGE_QUALITY
+    fmt = _output_format()
+
+    try:
+        with Image.open(source_path) as img:
+            width, height = img.size
+            if width * height > MAX_IMAGE_PIXELS:
+                raise ValueError(f"image is {width}x{height}; too many pixels")
+            # JPEG can decode at a reduced scale, far cheaper than a full decode.
+            img.draft("RGB", (display_edge, display_edge))
+            img = ImageOps.exif_transpose(img)
+            img.load()
+            display = _encode(img, display_edge, fmt, quality)
+            thumb = _encode(img, thumb_edge, fmt, quality)
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"cannot decode image: {e}") from e
+
+    return {
+        "display": store.put_bytes(display),
+        "thumb": store.put_bytes(thumb),
+        "format": fmt,
+    }
+
+
+class ImagePipeline:
+    """Fixed-size worker pool with a bounded number of queued jobs."""
+
+    def __init__(self, max_workers=2, max_pending=16):
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(self.max_workers, int(max_pending))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="image-pipeline"
+        )
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the pool; raise ImagePipelineBusy when full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats["rejected"] += 1
+            raise ImagePipelineBusy("image pipeline is saturated")
+        with self._lock:
+            self.stats["submitted"] += 1
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        self._slots.release()
+        with self._lock:
+            self.stats["failed" if future.exception() else "completed"] += 1
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_image_pipeline():
+    """Return the process-wide ImagePipeline."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = ImagePipeline(
+                    Config.IMAGE_PIPELINE_WORKERS, Config.IMAGE_PIPELINE_MAX_PENDING
+                )
+    return _pipeline
+
@@ -0,0 +1,88 @@
+"""
+FILE: app/json_provider.py
+
+Responsibility:
+  Flask JSON provider (app.json) used by every jsonify() call. Encodes
+  with orjson when it is installed and with the standard library otherwise;
+  both paths emit the same values for date/datetime (ISO 8601) and Decimal
+  (number) columns returned by PostgreSQL's RealDictCursor.
+
+MUST NOT:
+  - Import db, repositories, or route modules
+  - Change payload shapes (mappers.py owns those)
+
+Depends on:
+  - flask.json.provider (DefaultJSONProvider)
+  - orjson (optional, `pip install orjson`)
+"""
+
+import datetime
+import decimal
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+_flask_default = DefaultJSONProvider.default  # dataclasses, UUID, __html__, ...
+
+
+def _decimal_value(value):
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+def _orjson_default(value):
+    """Types orjson does not encode natively."""
+    if isinstance(value, decimal.Decimal):
+        return _decimal_value(value)
+    return _flask_default(value)
+
+
+def _stdlib_default(value):
+    if isinstance(value, decimal.Decimal):
+        return _decimal_value(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        # Flask's default would send dates as RFC 822 strings; match orjson.
+        return value.isoformat()
+    return _flask_default(value)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with an orjson fast path.
+
+    Keys are not sorted (clients never rely on key order, and sorting is a
+    large share of encode time). Pretty-printing in debug mode and payloads
+    orjson rejects (e.g. integers beyond 64 bits) use the stdlib encoder.
+    """
+
+    default = staticmethod(_stdlib_default)
+    sort_keys = False
+
+    def _dumps_bytes(self, obj, option=0):
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=_orjson_default, option=option | orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                pass  # orjson.JSONEncodeError; retry with the stdlib encoder
+        return json.dumps(obj, default=self.default, ensure_ascii=self.ensure_ascii,
+                          sort_keys=self.sort_keys, separators=(",", ":")).encode("utf-8")
+
+    def dumps(self, obj, **kwargs):
+        if kwargs or orjson is None:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs or orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
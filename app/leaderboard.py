@@ -0,0 +1,286 @@
+"""
+FILE: app/leaderboard.py
+
+Responsibility:
+  In-memory leaderboards over user_progress and the current week's
+  stats_snapshots: global and weekly boards for points and streaks, each
+  kept in rank order so top-N and "my rank" are O(log n) lookups.
+  repositories.leaderboard_repo loads them on boot and feeds every
+  user_progress update through record().
+
+MUST NOT:
+  - Import Flask, db, or route modules
+  - Hold anything beyond user ids and scores (names are joined per request)
+
+Depends on:
+  - config.py (LEADERBOARD_REBUILD_SECONDS)
+
+Notes:
+  Boards are per process. Updates reach the worker that saved the snapshot
+  immediately; other workers (and writes from scripts/nightly_evaluate.py)
+  are picked up by the periodic rebuild, and a new week always rebuilds.
+  Ties share a rank ("1, 2, 2, 4"); users with a score of 0 are not ranked.
+"""
+
+import random
+import threading
+import time
+
+from .config import Config
+
+BOARDS = ("points", "streak")
+PERIODS = ("global", "weekly")
+
+_MAX_HEIGHT = 32
+_HEIGHT_P = 0.25
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, height):
+        self.key = key
+        self.next = [None] * height
+        # width[level]: positions skipped by next[level] (meaningless when it is None)
+        self.width = [1] * height
+
+
+class RankedSet:
+    """Sorted set of keys with O(log n) insert, remove, rank and index lookup.
+
+    An indexable skip list: each link records how many positions it
+    skips, so counting the keys below a key (its rank) or walking to the
+    k-th key costs the same as a search.
+    """
+
+    def __init__(self, keys=(), seed=None):
+        self._random = random.Random(seed).random
+        self._head = _Node(None, _MAX_HEIGHT)
+        self._height = 1
+        self._size = 0
+        if keys:
+            self._build(keys)
+
+    def __len__(self):
+        return self._size
+
+    def _random_height(self):
+        height = 1
+        while height < _MAX_HEIGHT and self._random() < _HEIGHT_P:
+            height += 1
+        return height
+
+    def _build(self, sorted_keys):
+        """Link already sorted, distinct keys in O(n)."""
+        last = [self._head] * _MAX_HEIGHT
+        last_pos = [0] * _MAX_HEIGHT
+        position = 0
+        for position, key in enumerate(sorted_keys, 1):
+            height = self._random_height()
+            node = _Node(key, height)
+            for level in range(height):
+                last[level].next[level] = node
+                last[level].width[level] = position - last_pos[level]
+                last[level] = node
+                last_pos[level] = position
+            self._height = max(self._height, height)
+        self._size = position
+
+    def count_less(self, key):
+        """Number of keys strictly below `key`."""
+        node, position = self._head, 0
+        for level in reversed(range(self._height)):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                position += node.width[level]
+                node, nxt = nxt, nxt.next[level]
+        return position
+
+    def add(self, key):
+        height = self._random_height()
+        self._height = max(self._height, height)
+        chain = [None] * self._height
+        steps = [0] * self._height
+        node, position = self._head, 0
+        for level in reversed(range(self._height)):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                position += node.width[level]
+                node, nxt = nxt, nxt.next[level]
+            chain[level], steps[level] = node, position
+
+        new = _Node(key, height)
+        for level in range(height):
+            prev = chain[level]
+            skipped = position - steps[level]
+            new.next[level] = prev.next[level]
+            new.width[level] = prev.width[level] - skipped
+            prev.next[level] = new
+            prev.width[level] = skipped + 1
+        for level in range(height, self._height):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key):
+        chain = [None] * self._height
+        node = self._head
+        for level in reversed(range(self._height)):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                node, nxt = nxt, nxt.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for level in range(self._height):
+            prev = chain[level]
+            if prev.next[level] is target:
+                prev.width[level] += target.width[level] - 1
+                prev.next[level] = target.next[level]
+            else:
+                prev.width[level] -= 1
+        self._size -= 1
+
+    def iter_from(self, index):
+        """Yield keys in order starting at position `index` (0-based)."""
+        if index >= self._size:
+            return
+        node, remaining = self._head, index + 1
+        for level in reversed(range(self._height)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+
+class RankedBoard:
+    """user_id -> score, ordered by score (highest first), then user id."""
+
+    def __init__(self, scores=None):
+        self._scores = {}
+        keys = []
+        for user_id, score in (scores or {}).items():
+            if score > 0:
+                self._scores[user_id] = score
+                keys.append((-score, user_id))
+        keys.sort()
+        self._order = RankedSet(keys)
+
+    def __len__(self):
+        return len(self._order)
+
+    def set(self, user_id, score):
+        old = self._scores.get(user_id)
+        if old == score or (old is None and score <= 0):
+            return
+        if old is not None:
+            self._order.remove((-old, user_id))
+            del self._scores[user_id]
+        if score > 0:
+            self._scores[user_id] = score
+            self._order.add((-score, user_id))
+
+    def rank(self, user_id):
+        """(rank, score); rank is None for unranked users."""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None, 0
+        # Keys sort as (-score, user_id): everything below (-score, -inf) scores higher.
+        return self._order.count_less((-score, float("-inf"))) + 1, score
+
+    def top(self, limit, offset=0):
+        """[(rank, user_id, score)] for positions offset .. offset + limit - 1."""
+        entries = []
+        previous_score, rank = None, None
+        for position, (neg_score, user_id) in enumerate(self._order.iter_from(offset), offset):
+            if len(entries) >= limit:
+                break
+            score = -neg_score
+            if score != previous_score:
+                rank = position + 1 if previous_score is not None else self.rank(user_id)[0]
+                previous_score = score
+            entries.append((rank, user_id, score))
+        return entries
+
+
+class Leaderboards:
+    """The four boards plus the week they were built for.
+
+    Global boards rank user_progress.total_points / current_streak; weekly
+    boards rank the current week's summed snapshot points and its number
+    of valid days (a week's streak). load() swaps in freshly built boards,
+    record() applies one user's new scores.
+    """
+
+    def __init__(self, rebuild_seconds=600, clock=time.monotonic):
+        self.rebuild_seconds = rebuild_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._boards = {(board, period): RankedBoard() for board in BOARDS for period in PERIODS}
+        self._built_at = None
+        self.week_start = None
+        self.stats = {"rebuilds": 0, "updates": 0}
+
+    def is_stale(self, week_start):
+        """True when never built, built for another week, or older than rebuild_seconds."""
+        with self._lock:
+            if self._built_at is None or self.week_start != week_start:
+                return True
+            return bool(self.rebuild_seconds) and self._clock() - self._built_at >= self.rebuild_seconds
+
+    def load(self, week_start, progress_rows, weekly_rows):
+        """Replace all boards.
+
+        progress_rows: (user_id, total_points, current_streak)
+        weekly_rows:   (user_id, week_points, valid_days)
+        """
+        points, streaks = {}, {}
+        for user_id, total_points, current_streak in progress_rows:
+            points[user_id] = int(total_points or 0)
+            streaks[user_id] = int(current_streak or 0)
+        week_points, week_days = {}, {}
+        for user_id, total_points, valid_days in weekly_rows:
+            week_points[user_id] = int(total_points or 0)
+            week_days[user_id] = int(valid_days or 0)
+        boards = {
+            ("points", "global"): RankedBoard(points),
+            ("streak", "global"): RankedBoard(streaks),
+            ("points", "weekly"): RankedBoard(week_points),
+            ("streak", "weekly"): RankedBoard(week_days),
+        }
+        with self._lock:
+            self._boards = boards
+            self.week_start = week_start
+            self._built_at = self._clock()
+            self.stats["rebuilds"] += 1
+
+    def record(self, user_id, *, total_points, current_streak, week_start, week_points, valid_days):
+        with self._lock:
+            self._boards[("points", "global")].set(user_id, int(total_points))
+            self._boards[("streak", "global")].set(user_id, int(current_streak))
+            if week_start == self.week_start:
+                self._boards[("points", "weekly")].set(user_id, int(week_points))
+                self._boards[("streak", "weekly")].set(user_id, int(valid_days))
+            self.stats["updates"] += 1
+
+    def top(self, board, period, limit, offset=0):
+        with self._lock:
+            return self._boards[(board, period)].top(limit, offset)
+
+    def rank(self, board, period, user_id):
+        with self._lock:
+            return self._boards[(board, period)].rank(user_id)
+
+    def size(self, board, period):
+        with self._lock:
+            return len(self._boards[(board, period)])
+
+
+_leaderboards = Leaderboards(rebuild_seconds=Config.LEADERBOARD_REBUILD_SECONDS)
+
+
+def get_leaderboards():
+    return _leaderboards
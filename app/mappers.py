@@ -2,7 +2,8 @@
 FILE: app/mappers.py
 
 Responsibility:
-  SQLite row → dict mappers for tasks, meals, and workouts.
+  SQLite row → dict mappers for tasks, meals, workouts, focus sessions,
+  and projects.
   Handles JSON column parsing, missing fields, and type coercion.
 
 MUST NOT:
@@ -16,72 +17,111 @@ Depends on:
 Note:
   Frontend (script.js) expects the exact shape these return.
   Any field changes require frontend updates too.
+
+Compiled mappers:
+  Task, workout, and focus-session rows come from several queries whose
+  column sets differ (list queries add focus_time_spent or the joined
+  task/project names; older databases lack some columns). Instead of
+  probing each row with try/except, *_mapper(columns) inspects the column
+  set once and returns a mapping function specialised for it (cached per
+  column set). map_rows() picks the mapper from the first row of a result
+  and applies it to every row; the single-row map_* helpers remain for
+  one-off rows.
 """
 
 import json
+from functools import lru_cache
 
 
-def map_task(row):
-    date_value = row["date"]
-    completed = bool(row["completed"])
-    completed_at = row["updated_at"] if completed else None
-    tags = []
+def row_columns(row):
+    """Column names of a sqlite3.Row or psycopg2 RealDictRow, as a hashable tuple."""
+    return tuple(row.keys())
+
+
+def map_rows(mapper_factory, rows):
+    """Map every row of one result set with a mapper compiled for its columns."""
+    if not rows:
+        return []
+    mapper = mapper_factory(row_columns(rows[0]))
+    return [mapper(row) for row in rows]
+
+
+@lru_cache(maxsize=1024)
+def _tag_tuple(raw):
     try:
-        tags = json.loads(row["tags_json"] or "[]")
-    except (TypeError, ValueError, KeyError):
-        tags = []
+        tags = json.loads(raw)
+    except (TypeError, ValueError):
+        return ()
     if not isinstance(tags, list):
-        tags = []
-    tags = [str(t).strip().lower() for t in tags if str(t).strip()]
-    # note fields (may not exist in older DBs)
-    try:
-        note_content = row["note_content"] or ""
-    except (IndexError, KeyError):
-        note_content = ""
-    try:
-        note_saved = bool(row["note_saved_to_notes"])
-    except (IndexError, KeyError):
-        note_saved = False
-    try:
-        recurrence = row["recurrence"] or "none"
-    except (IndexError, KeyError):
-        recurrence = "none"
-    try:
-        recurrence_parent_id = row["recurrence_parent_id"]
-    except (IndexError, KeyError):
-        recurrence_parent_id = None
+        return ()
+    return tuple(tag for tag in (str(t).strip().lower() for t in tags) if tag)
+
+
+def parse_tags(raw):
+    """Normalised tag list from a tags_json value ([] for empty or malformed).
+
+    Users reuse a handful of tag combinations, so parsing is memoised on
+    the raw string; each call still returns a fresh list.
+    """
+    if not raw or raw == "[]":
+        return []
+    return list(_tag_tuple(raw))
 
-    try:
-        project_id = row["project_id"]
-    except (IndexError, KeyError):
-        project_id = None
 
+def _parse_exercises(raw):
     try:
-        focus_time = dict(row).get("focus_time_spent", 0)
-    except (IndexError, KeyError, TypeError):
-        focus_time = 0
+        return json.loads(raw or "[]")
+    except (TypeError, ValueError):
+        return []
+
+
+@lru_cache(maxsize=32)
+def task_mapper(columns):
+    """Row -> task dict for rows with exactly `columns`."""
+    # note/recurrence/project fields may not exist in older DBs;
+    # focus_time_spent only comes from the list queries.
+    has_tags = "tags_json" in columns
+    has_note_content = "note_content" in columns
+    has_note_saved = "note_saved_to_notes" in columns
+    has_recurrence = "recurrence" in columns
+    has_parent = "recurrence_parent_id" in columns
+    has_project = "project_id" in columns
+    has_focus = "focus_time_spent" in columns
+
+    def map_task_row(row):
+        completed = bool(row["completed"])
+        completed_at = row["updated_at"] if completed else None
+        return {
+            "id": row["id"],
+            "project_id": row["project_id"] if has_project else None,
+            "focus_time_spent": row["focus_time_spent"] if has_focus else 0,
+            "title": row["title"],
+            "description": row["description"],
+            "tags": parse_tags(row["tags_json"]) if has_tags else [],
+            "category": row["category"],
+            "priority": row["priority"],
+            "completed": completed,
+            "date": row["date"],
+            "completed_at": completed_at,
+            "completedAt": completed_at,
+            "time_spent": row["time_spent"],
+            "note_content": (row["note_content"] or "") if has_note_content else "",
+            "note_saved_to_notes": bool(row["note_saved_to_notes"]) if has_note_saved else False,
+            "recurrence": (row["recurrence"] or "none") if has_recurrence else "none",
+            "recurrence_parent_id": row["recurrence_parent_id"] if has_parent else None,
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    return map_task_row
+
+
+def map_task(row):
+    return task_mapper(row_columns(row))(row)
 
-    return {
-        "id": row["id"],
-        "project_id": project_id,
-        "focus_time_spent": focus_time,
-        "title": row["title"],
-        "description": row["description"],
-        "tags": tags,
-        "category": row["category"],
-        "priority": row["priority"],
-        "completed": completed,
-        "date": date_value,
-        "completed_at": completed_at,
-        "completedAt": completed_at,
-        "time_spent": row["time_spent"],
-        "note_content": note_content,
-        "note_saved_to_notes": note_saved,
-        "recurrence": recurrence,
-        "recurrence_parent_id": recurrence_parent_id,
-        "created_at": row["created_at"],
-        "updated_at": row["updated_at"],
-    }
+
+def map_tasks(rows):
+    return map_rows(task_mapper, rows)
 
 
 def map_meal(row):
@@ -100,42 +140,98 @@ def map_meal(row):
     }
 
 
+def map_meals(rows):
+    return [map_meal(row) for row in rows]
+
+
+@lru_cache(maxsize=32)
+def workout_mapper(columns):
+    """Row -> workout dict for rows with exactly `columns`."""
+    # completed may not exist in older DBs
+    has_completed = "completed" in columns
+
+    def map_workout_row(row):
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "type": row["type"],
+            "duration": row["duration"],
+            "calories_burned": row["calories_burned"],
+            "exercises": _parse_exercises(row["exercises_json"]),
+            "notes": row["notes"],
+            "intensity": row["intensity"],
+            "completed": bool(row["completed"]) if has_completed else False,
+            "date": row["date"],
+            "time": row["time"],
+            "created_at": row["created_at"],
+        }
+
+    return map_workout_row
+
+
 def map_workout(row):
-    exercises = []
-    try:
-        exercises = json.loads(row["exercises_json"] or "[]")
-    except (TypeError, ValueError):
-        exercises = []
+    return workout_mapper(row_columns(row))(row)
 
-    # Handle completed column (may not exist in older DBs)
-    try:
-        completed = bool(row["completed"])
-    except (IndexError, KeyError):
-        completed = False
 
+def map_workouts(rows):
+    return map_rows(workout_mapper, rows)
+
+
+@lru_cache(maxsize=32)
+def focus_session_mapper(columns):
+    """Row -> focus session dict; task/project names come from the list query's joins."""
+    has_task = "task_id" in columns
+    has_project = "project_id" in columns
+    has_task_title = "task_title" in columns
+    has_project_name = "project_name" in columns
+
+    def map_focus_session_row(row):
+        return {
+            "id": row["id"],
+            "mode": row["mode"],
+            "durationPlanned": row["duration_planned"],
+            "durationActual": row["duration_actual"],
+            "completed": bool(row["completed"]),
+            "label": row["label"],
+            "date": row["date"],
+            "startedAt": row["started_at"],
+            "endedAt": row["ended_at"],
+            "taskId": row["task_id"] if has_task else None,
+            "projectId": row["project_id"] if has_project else None,
+            "taskTitle": row["task_title"] if has_task_title else None,
+            "projectName": row["project_name"] if has_project_name else None,
+        }
+
+    return map_focus_session_row
+
+
+def map_focus_sessions(rows):
+    return map_rows(focus_session_mapper, rows)
+
+
+def map_project(row, subtasks):
     return {
         "id": row["id"],
         "name": row["name"],
-        "type": row["type"],
-        "duration": row["duration"],
-        "calories_burned": row["calories_burned"],
-        "exercises": exercises,
-        "notes": row["notes"],
-        "intensity": row["intensity"],
-        "completed": completed,
-        "date": row["date"],
-        "time": row["time"],
-        "created_at": row["created_at"],
+        "description": row["description"],
+        "status": row["status"],
+        "dueDate": row["due_date"],
+        "createdAt": row["created_at"],
+        "updatedAt": row["updated_at"],
+        "subtasks": [
+            {
+                "id": s["id"],
+                "title": s["title"],
+                "completed": bool(s["completed"]),
+                "sortOrder": s["sort_order"],
+            }
+            for s in subtasks
+        ],
     }
 
 
 def map_workout_template(row):
-    exercises = []
-    try:
-        exercises = json.loads(row["exercises_json"] or "[]")
-    except (TypeError, ValueError):
-        exercises = []
-
+    exercises = _parse_exercises(row["exercises_json"])
     return {
         "id": row["id"],
         "name": row["name"],
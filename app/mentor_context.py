@@ -0,0 +1,283 @@
+"""
+FILE: app/mentor_context.py
+
+Responsibility:
+  Build the mentor-mode context (today's tasks, overdue tasks, nutrition
+  totals, workouts, progress) from a single aggregate query, cache it per
+  user, and compact it so the prompt sent to Gemini stays small.
+
+MUST NOT:
+  - Import Flask or route modules
+  - Write to the database (this backs a GET endpoint)
+
+Depends on:
+  - points_engine.level_progress
+  - utils (safe_float, safe_int)
+  - config.py (MENTOR_CONTEXT_TTL_SECONDS, MENTOR_CONTEXT_MAX_CHARS)
+
+Notes:
+  The cache is per process. Writes made through this worker invalidate it
+  immediately (see invalidate_mentor_context); writes handled by another
+  worker become visible after MENTOR_CONTEXT_TTL_SECONDS at most.
+"""
+
+import json
+import threading
+import time
+
+from .config import Config
+from .points_engine import level_progress
+from .utils import safe_float, safe_int
+
+OVERDUE_FETCH_LIMIT = 10
+_PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+# One round trip: every branch returns the same column shape, tagged by `kind`.
+#   ref  — row id (ordering)       flag — completed / count / level
+#   n1..n4 — numeric payload (nutrition sums, progress counters)
+_CONTEXT_SQL = """
+    SELECT 'task' AS kind, id AS ref, title AS label, date AS day, priority, completed AS flag,
+           0.0 AS n1, 0.0 AS n2, 0.0 AS n3, 0.0 AS n4
+    FROM tasks WHERE user_id = ? AND date = ?
+    UNION ALL
+    SELECT 'overdue', id, title, date, priority, 0, 0.0, 0.0, 0.0, 0.0
+    FROM (
+        SELECT id, title, date, priority FROM tasks
+        WHERE user_id = ? AND date < ? AND completed = 0
+        ORDER BY date ASC LIMIT ?
+    ) overdue
+    UNION ALL
+    SELECT 'overdue_count', 0, NULL, NULL, NULL, COUNT(*), 0.0, 0.0, 0.0, 0.0
+    FROM tasks WHERE user_id = ? AND date < ? AND completed = 0
+    UNION ALL
+    SELECT 'nutrition', 0, NULL, NULL, NULL, COUNT(*),
+           COALESCE(SUM(calories), 0), COALESCE(SUM(protein), 0),
+           COALESCE(SUM(carbs), 0), COALESCE(SUM(fats), 0)
+    FROM nutrition_entries WHERE user_id = ? AND date = ?
+    UNION ALL
+    SELECT 'workout', id, name, date, NULL, completed, 0.0, 0.0, 0.0, 0.0
+    FROM workouts WHERE user_id = ? AND date = ?
+    UNION ALL
+    SELECT 'progress', 0, NULL, NULL, NULL, level, total_points, current_streak, longest_streak, 0.0
+    FROM user_progress WHERE user_id = ?
+"""
+
+
+def build_mentor_context(db, user_id, date):
+    """Assemble the full (uncompacted) mentor context with one query."""
+    rows = db.execute(
+        _CONTEXT_SQL,
+        (
+            user_id, date,
+            user_id, date, OVERDUE_FETCH_LIMIT,
+            user_id, date,
+            user_id, date,
+            user_id, date,
+            user_id,
+        ),
+    ).fetchall()
+
+    tasks = []
+    overdue = []
+    workouts = []
+    overdue_count = 0
+    nutrition = {"meals": 0, "calories": 0.0, "protein": 0.0, "carbs": 0.0, "fats": 0.0}
+    progress = {"total_points": 0, "current_streak": 0, "longest_streak": 0}
+
+    for row in rows:
+        kind = row["kind"]
+        if kind == "task":
+            tasks.append(row)
+        elif kind == "overdue":
+            overdue.append(row)
+        elif kind == "workout":
+            workouts.append(row)
+        elif kind == "overdue_count":
+            overdue_count = safe_int(row["flag"])
+        elif kind == "nutrition":
+            nutrition = {
+                "meals": safe_int(row["flag"]),
+                "calories": safe_float(row["n1"]),
+                "protein": safe_float(row["n2"]),
+                "carbs": safe_float(row["n3"]),
+                "fats": safe_float(row["n4"]),
+            }
+        elif kind == "progress":
+            progress = {
+                "total_points": safe_int(row["n1"]),
+                "current_streak": safe_int(row["n2"]),
+                "longest_streak": safe_int(row["n3"]),
+            }
+
+    tasks.sort(key=lambda r: safe_int(r["ref"]), reverse=True)
+    overdue.sort(key=lambda r: (str(r["day"] or ""), safe_int(r["ref"])))
+    workouts.sort(key=lambda r: safe_int(r["ref"]), reverse=True)
+
+    tasks_completed = sum(1 for t in tasks if safe_int(t["flag"]))
+    lp = level_progress(progress["total_points"])
+
+    return {
+        "date": date,
+        "tasks": {
+            "total": len(tasks),
+            "completed": tasks_completed,
+            "pending": len(tasks) - tasks_completed,
+            "overdue": [
+                {"title": r["label"], "date": r["day"], "priority": r["priority"]} for r in overdue
+            ],
+            "overdue_count": max(overdue_count, len(overdue)),
+            "upcoming": [
+                {"title": r["label"], "priority": r["priority"]}
+                for r in tasks if not safe_int(r["flag"])
+            ],
+        },
+        "nutrition": {
+            "meals_logged": nutrition["meals"],
+            "calories_consumed": round(nutrition["calories"]),
+            "protein_consumed": round(nutrition["protein"], 1),
+            "carbs_consumed": round(nutrition["carbs"], 1),
+            "fats_consumed": round(nutrition["fats"], 1),
+        },
+        "workouts": {
+            "total": len(workouts),
+            "completed": sum(1 for w in workouts if safe_int(w["flag"])),
+            "pending_names": [w["label"] for w in workouts if not safe_int(w["flag"])],
+        },
+        "progress": {
+            "current_streak": progress["current_streak"],
+            "longest_streak": progress["longest_streak"],
+            "total_points": progress["total_points"],
+            "level": lp[0],
+            "level_pct": round(lp[3]),
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+def _clip(text, limit):
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[: max(1, limit - 1)].rstrip() + "…"
+
+
+def _context_size(context):
+    return len(json.dumps(context, separators=(",", ":"), ensure_ascii=False))
+
+
+def compact_mentor_context(context, max_chars=None):
+    """
+    Bound the context for prompting.
+
+    Lists keep their most relevant items (high priority first, oldest
+    overdue first) and record how many were dropped in *_more fields.
+    Titles are clipped; if the result is still over `max_chars`, lists
+    are shortened further until it fits or only counts remain.
+    """
+    max_chars = int(max_chars or Config.MENTOR_CONTEXT_MAX_CHARS)
+    tasks = context["tasks"]
+    workouts = context["workouts"]
+
+    upcoming = sorted(tasks["upcoming"], key=lambda t: _PRIORITY_ORDER.get(t.get("priority"), 3))
+    full = {
+        "overdue": [
+            {"title": t["title"], "date": t.get("date"), "priority": t.get("priority")}
+            for t in tasks["overdue"]
+        ],
+        "upcoming": [{"title": t["title"], "priority": t.get("priority")} for t in upcoming],
+        "pending_names": list(workouts["pending_names"]),
+    }
+    totals = {
+        "overdue": tasks.get("overdue_count", len(full["overdue"])),
+        "upcoming": len(full["upcoming"]),
+        "pending_names": len(full["pending_names"]),
+    }
+
+    def render(limit, title_chars):
+        overdue = [dict(t, title=_clip(t["title"], title_chars)) for t in full["overdue"][:limit]]
+        upcoming_items = [dict(t, title=_clip(t["title"], title_chars)) for t in full["upcoming"][:limit]]
+        pending = [_clip(name, title_chars) for name in full["pending_names"][:limit]]
+        return {
+            **context,
+            "tasks": {
+                **tasks,
+                "overdue": overdue,
+                "overdue_count": totals["overdue"],
+                "overdue_more": max(0, totals["overdue"] - len(overdue)),
+                "upcoming": upcoming_items,
+                "upcoming_more": max(0, totals["upcoming"] - len(upcoming_items)),
+            },
+            "workouts": {
+                **workouts,
+                "pending_names": pending,
+                "pending_more": max(0, totals["pending_names"] - len(pending)),
+            },
+        }
+
+    limit = 5
+    title_chars = 60
+    compact = render(limit, title_chars)
+    while _context_size(compact) > max_chars and (limit > 0 or title_chars > 24):
+        if title_chars > 24:
+            title_chars -= 12
+        else:
+            limit -= 1
+        compact = render(limit, title_chars)
+    return compact
+
+
+# ---------------------------------------------------------------------------
+# Per-user cache
+# ---------------------------------------------------------------------------
+class MentorContextCache:
+    """Small TTL cache keyed by user; entries also expire when the date rolls."""
+
+    def __init__(self, ttl_seconds=60, max_entries=1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id, date):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if not entry:
+                return None
+            expires_at, cached_date, value = entry
+            if cached_date != date or expires_at <= time.monotonic():
+                self._entries.pop(user_id, None)
+                return None
+            return value
+
+    def set(self, user_id, date, value):
+        with self._lock:
+            if user_id not in self._entries and len(self._entries) >= self.max_entries:
+                # Drop the entry closest to expiry.
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                self._entries.pop(oldest, None)
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, date, value)
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+_cache = MentorContextCache(ttl_seconds=Config.MENTOR_CONTEXT_TTL_SECONDS)
+
+
+def get_mentor_context(db, user_id, date):
+    """Cached, compacted mentor context for `user_id` on `date`."""
+    cached = _cache.get(user_id, date)
+    if cached is not None:
+        return cached
+    context = compact_mentor_context(build_mentor_context(db, user_id, date))
+    _cache.set(user_id, date, context)
+    return context
+
+
+def invalidate_mentor_context(user_id=None):
+    """Drop cached context after a domain write (None clears every user)."""
+    _cache.invalidate(user_id)
@@ -3,6 +3,8 @@ FILE: app/middleware.py
 
 Responsibility:
   Request/response middleware for validation, rate limiting, security, and auth context.
+  Requests are classified as static, public or authenticated; the session
+  user is resolved lazily, only when g.user_id is read.
 
 MUST NOT:
   - Contain business logic or route handlers
@@ -12,53 +14,47 @@ Depends on:
   - flask (request, jsonify, g)
   - functools (wraps)
   - auth (optional session validation)
+  - rate_limiter (RateLimiter, GCRA state backends)
 """
 
 import functools
-import time
+import math
 
-from flask import g, jsonify, request
+from flask import g, has_request_context, jsonify, request
+from flask.ctx import _AppCtxGlobals
 
-
-class RateLimiter:
-    """Simple in-memory rate limiter (per IP, non-persistent)."""
-    
-    def __init__(self, max_requests=100, window_seconds=60):
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.requests: dict = {}
-    
-    def is_allowed(self, client_id):
-        """Check if request is allowed for client. Returns True if within limit."""
-        now = time.time()
-        # Prune timestamps outside the window
-        calls = [t for t in self.requests.get(client_id, []) if now - t < self.window_seconds]
-        if len(calls) < self.max_requests:
-            calls.append(now)
-            self.requests[client_id] = calls
-            return True
-        # Keep pruned list (may be empty if all expired but we're still over limit)
-        if calls:
-            self.requests[client_id] = calls
-        elif client_id in self.requests:
-            del self.requests[client_id]
-        return False
+from .rate_limiter import RateLimiter
 
 
 def rate_limit(max_requests=100, window_seconds=60):
     """Decorator to rate limit a route by client IP.
 
-    Each decorated endpoint gets its own RateLimiter instance so that the
-    configured max_requests/window_seconds values are actually respected.
-    """
-    limiter = RateLimiter(max_requests=max_requests, window_seconds=window_seconds)
+    Each decorated endpoint gets its own RateLimiter (keyed by the view's
+    qualified name) so that the configured max_requests/window_seconds
+    values are actually respected. State lives in the shared backend
+    chosen by RATE_LIMIT_BACKEND (see rate_limiter.py).
 
+    Sub-requests dispatched by an endpoint that was itself rate limited
+    set g.rate_limit_exempt and are not counted again.
+    """
     def decorator(f):
+        limiter = RateLimiter(
+            max_requests=max_requests,
+            window_seconds=window_seconds,
+            name=f"{f.__module__}.{f.__qualname__}",
+        )
+
         @functools.wraps(f)
         def decorated_function(*args, **kwargs):
+            if g.get("rate_limit_exempt"):
+                return f(*args, **kwargs)
             client_ip = request.remote_addr or "unknown"
-            if not limiter.is_allowed(client_ip):
-                return jsonify({"error": "Rate limit exceeded. Try again later."}), 429
+            allowed, retry_after = limiter.check(client_ip)
+            if not allowed:
+                response = jsonify({"error": "Rate limit exceeded. Try again later."})
+                response.status_code = 429
+                response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+                return response
             return f(*args, **kwargs)
         return decorated_function
     return decorator
@@ -114,35 +110,99 @@ def validate_json_optional(*allowed_fields):
     return decorator
 
 
-def inject_client_info():
-    """Inject client info (IP, user-agent) into request context."""
-    g.client_ip = request.remote_addr or "unknown"
-    g.user_agent = request.headers.get("User-Agent", "unknown")
-    g.user_id = None  # Will be set by auth middleware if logged in
-
-
-def inject_user_context():
-    """Middleware to inject user_id into request context (optional auth)."""
-    inject_client_info()
-    
-    # Optional: attempt to get user_id from auth if session exists
-    # This won't fail if no session — just leaves g.user_id as None
+# Request classes decide how much per-request work the middleware does:
+#   static        — files and page shells: no client info, never touches the DB
+#   public        — no session required; user resolved only if a view asks
+#   authenticated — everything else; user still resolved lazily
+STATIC = "static"
+PUBLIC = "public"
+AUTHENTICATED = "authenticated"
+
+STATIC_ENDPOINTS = frozenset({
+    "static",
+    "web.index",
+    "web.shared_goal",
+    "web.serve_music",
+    "web.service_worker",
+    "web.built_asset",
+})
+PUBLIC_ENDPOINTS = frozenset({
+    "auth.signup",
+    "auth.login",
+    "auth.request_password_reset",
+    "auth.confirm_password_reset",
+    "goals.get_shared_goal",
+    "goals.get_goal_image",
+})
+
+
+def classify_endpoint(endpoint):
+    """Map a Flask endpoint name to STATIC, PUBLIC or AUTHENTICATED."""
+    if endpoint in STATIC_ENDPOINTS:
+        return STATIC
+    if endpoint is None or endpoint in PUBLIC_ENDPOINTS:
+        # endpoint is None for unmatched URLs (404s).
+        return PUBLIC
+    return AUTHENTICATED
+
+
+def _resolve_user_id():
+    """Look up the session user for the current request (None if anonymous)."""
+    if g.get("route_class") == STATIC:
+        return None
+    current = g.get("current_user_id")
+    if current is not None:
+        # auth.get_current_user_id() already validated this request's session.
+        return current
     try:
         from .auth import validate_session, SESSION_COOKIE_NAME
-        from .db import get_db
-        
+
         token = request.cookies.get(SESSION_COOKIE_NAME)
         if token:
             session_row = validate_session(token)
             if session_row:
-                g.user_id = session_row["user_id"]
+                return session_row["user_id"]
     except Exception:
         # If auth check fails, continue without user_id
         pass
+    return None
+
+
+class RequestGlobals(_AppCtxGlobals):
+    """flask.g whose `user_id` is resolved on first read.
+
+    Reading g.user_id (or getattr(g, "user_id", None)) validates the session
+    once and caches the result; requests that never read it skip the
+    cookie hash and the sessions query entirely.
+    """
+
+    def __getattr__(self, name):
+        if name == "user_id" and has_request_context():
+            value = _resolve_user_id()
+            self.user_id = value
+            return value
+        raise AttributeError(name)
+
+
+def inject_client_info():
+    """Inject client info (IP, user-agent) into request context."""
+    g.client_ip = request.remote_addr or "unknown"
+    g.user_agent = request.headers.get("User-Agent", "unknown")
+
+
+def inject_user_context():
+    """Classify the request and set up its context (optional auth).
+
+    g.user_id is not set here: RequestGlobals resolves it lazily.
+    """
+    g.route_class = classify_endpoint(request.endpoint)
+    if g.route_class != STATIC:
+        inject_client_info()
 
 
 def setup_middleware(app):
     """Register all middleware with Flask app."""
+    app.app_ctx_globals_class = RequestGlobals
     
     @app.before_request
     def before_request():
@@ -9,7 +9,7 @@ fallback handled inside `ai_avatar.process_avatar_message`).
 
 import re
 
-from .ai_avatar import INDIAN_FOOD_ESTIMATES, process_avatar_message
+from .ai_avatar import food_catalog, process_avatar_message
 
 VALID_MEAL_TYPES = {"breakfast", "lunch", "dinner", "snack", "other"}
 
@@ -68,10 +68,10 @@ def _estimate_quantity_g(name, quantity, unit, note=""):
 
     # Try local estimate DB by food name
     name_lower = str(name or "").strip().lower()
-    for key in sorted(INDIAN_FOOD_ESTIMATES.keys(), key=len, reverse=True):
-        if key in name_lower or name_lower in key:
-            grams = _safe_float(INDIAN_FOOD_ESTIMATES[key].get("grams"), 100.0)
-            return round(max(1.0, qty * grams), 1)
+    _, estimate = food_catalog().lookup(name_lower)
+    if estimate:
+        grams = _safe_float(estimate.get("grams"), 100.0)
+        return round(max(1.0, qty * grams), 1)
 
     # Last resort default
     return round(qty * 100.0, 1)
@@ -247,18 +247,8 @@ def search_foods(query, limit=8):
     if not text:
         return []
 
-    scored = []
-    for name, nutrition in INDIAN_FOOD_ESTIMATES.items():
-        name_l = name.lower()
-        if text in name_l:
-            score = 100 - abs(len(name_l) - len(text))
-        else:
-            words = text.split()
-            overlap = sum(1 for w in words if w and w in name_l)
-            if overlap == 0:
-                continue
-            score = overlap * 10
-
+    results = []
+    for name, nutrition in food_catalog().search(text, limit):
         grams = max(1.0, _safe_float(nutrition.get("grams"), 100.0))
         calories = _safe_float(nutrition.get("calories"), 0.0)
         protein = _safe_float(nutrition.get("protein"), 0.0)
@@ -266,23 +256,18 @@ def search_foods(query, limit=8):
         fats = _safe_float(nutrition.get("fats"), 0.0)
         factor = 100.0 / grams
 
-        scored.append(
-            (
-                score,
-                {
-                    "fdc_id": None,
-                    "description": name.title(),
-                    "data_type": "Gemini Estimate",
-                    "serving": str(nutrition.get("serving") or "1 serving"),
-                    "per_100g": {
-                        "calories": round(calories * factor, 1),
-                        "protein": round(protein * factor, 1),
-                        "carbs": round(carbs * factor, 1),
-                        "fats": round(fats * factor, 1),
-                    },
+        results.append(
+            {
+                "fdc_id": None,
+                "description": name.title(),
+                "data_type": "Gemini Estimate",
+                "serving": str(nutrition.get("serving") or "1 serving"),
+                "per_100g": {
+                    "calories": round(calories * factor, 1),
+                    "protein": round(protein * factor, 1),
+                    "carbs": round(carbs * factor, 1),
+                    "fats": round(fats * factor, 1),
                 },
-            )
+            }
         )
-
-    scored.sort(key=lambda row: row[0], reverse=True)
-    return [row[1] for row in scored[: max(1, int(limit or 8))]]
+    return results
@@ -0,0 +1,100 @@
+"""
+FILE: app/pagination.py
+
+Responsibility:
+  Keyset pagination and field projection shared by the list endpoints.
+  A page is requested with ?limit=<n> and continued with ?cursor=<token>;
+  rows are ordered by (sort column DESC, id DESC) and each page resumes
+  strictly after the last row of the previous one, so deep pages cost the
+  same as the first. ?fields=a,b,c trims each item to the named keys.
+
+MUST NOT:
+  - Import db, repositories, or route modules
+  - Know entity column names (callers pass them in)
+
+Depends on:
+  - config.py (LIST_PAGE_SIZE, LIST_MAX_PAGE_SIZE via the caller)
+"""
+
+import base64
+import json
+from collections import namedtuple
+
+# limit: rows per page; after: (sort_value, id) of the last row already seen, or None.
+PageRequest = namedtuple("PageRequest", "limit after")
+
+
+def encode_cursor(sort_value, row_id):
+    raw = json.dumps([str(sort_value), int(row_id)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """(sort_value, id) from a cursor token; raises ValueError if malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(sort_value), int(row_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("cursor is not valid") from None
+
+
+def parse_page_args(args, default_limit, max_limit):
+    """PageRequest from ?limit=&cursor=, or None when the caller wants the full list.
+
+    Raises ValueError with a client message for a bad limit or cursor.
+    """
+    raw_limit = args.get("limit")
+    raw_cursor = args.get("cursor")
+    if raw_limit in (None, "") and raw_cursor in (None, ""):
+        return None
+    limit = default_limit
+    if raw_limit not in (None, ""):
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise ValueError("limit must be an integer") from None
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+    after = decode_cursor(raw_cursor) if raw_cursor else None
+    return PageRequest(min(limit, max_limit), after)
+
+
+def keyset_sql(sort_column, id_column, page):
+    """SQL fragments (where, order, limit) and their params for a page.
+
+    `where` is "" on the first page; otherwise it is an AND clause that
+    resumes after page.after. One extra row is fetched to detect a next page.
+    """
+    where, params = "", []
+    if page.after is not None:
+        # Row-value comparison: both SQLite and PostgreSQL serve it as one
+        # range scan on a (user_id, sort_column, id) index.
+        where = f" AND ({sort_column}, {id_column}) < (?, ?)"
+        params = [page.after[0], page.after[1]]
+    order = f" ORDER BY {sort_column} DESC, {id_column} DESC LIMIT ?"
+    return where, order, params, [page.limit + 1]
+
+
+def split_page(rows, page, sort_key, id_key="id"):
+    """(rows for this page, next cursor or None) from a keyset_sql() result."""
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[:page.limit]
+    last = rows[-1]
+    return rows, encode_cursor(last[sort_key], last[id_key])
+
+
+def parse_fields(args):
+    """Set of requested keys from ?fields=a,b (always including id), or None."""
+    raw = args.get("fields")
+    if not raw:
+        return None
+    fields = {name.strip() for name in raw.split(",") if name.strip()}
+    return (fields | {"id"}) if fields else None
+
+
+def project(item, fields):
+    if fields is None:
+        return item
+    return {key: value for key, value in item.items() if key in fields}
@@ -0,0 +1,205 @@
+"""
+FILE: app/phrase_matcher.py
+
+Responsibility:
+  Multi-phrase matcher (Aho-Corasick over words). Finds every occurrence of
+  a fixed phrase set in a message with one left-to-right pass, regardless of
+  how many phrases are registered.
+
+MUST NOT:
+  - Import Flask, db, or any route/AI module
+  - Know what the phrases mean (callers attach their own payloads)
+
+Depends on:
+  - re (standard library)
+
+Notes:
+  The automaton is built over normalized words rather than characters, so
+  a large phrase set costs one trie node per distinct word prefix instead
+  of one per character, and matches always land on word boundaries
+  ("rice" never fires inside "price").
+"""
+
+import re
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+
+# Look inflected but are not, or fold onto an unrelated word ("evening" -> "even").
+_FOLD_EXCEPTIONS = frozenset({"bedding", "evening", "morning", "padding", "pudding", "wedding"})
+# Shortest stem left after stripping -ing/-ed ("string", "shred" stay whole).
+_MIN_STEM = 4
+
+
+def _fold_plural(word):
+    # "glasses" -> "glass", but "cheeses" -> "cheese"
+    if len(word) > 3 and word.endswith("es") and word[:-2].endswith(("ch", "sh", "ss", "x", "o")):
+        return word[:-2]
+    if len(word) > 2 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def normalize_word(word):
+    """Fold simple plurals, then -ing/-ed forms, so "eggs"/"egg" and
+    "logged"/"logging"/"log" share a token.
+
+    Phrases and messages go through the same folding, so the stem only has
+    to be consistent, not a real word. The plural goes first so "puddings"
+    and "pudding" (or "rowings" and "rowing") always end up equal.
+    """
+    word = _fold_plural(word)
+    if word in _FOLD_EXCEPTIONS or word.endswith("eed"):
+        return word
+    for suffix in ("ing", "ed"):
+        stem = word[:-len(suffix)]
+        if word.endswith(suffix) and len(stem) >= _MIN_STEM:
+            # Undo the doubled consonant: "logged" -> "log", "shopping" -> "shop".
+            if stem[-1] == stem[-2] and stem[-1] not in "aeiouls":
+                stem = stem[:-1]
+            return stem
+    return word
+
+
+def tokenize(text):
+    """Return [(normalized_word, char_start, char_end), ...] for `text`."""
+    return [
+        (normalize_word(m.group(0)), m.start(), m.end())
+        for m in _TOKEN_RE.finditer(str(text or "").lower())
+    ]
+
+
+class PhraseMatch:
+    """One phrase occurrence. Token indices are half-open [start_token, end_token)."""
+
+    __slots__ = ("phrase", "payload", "start_token", "end_token", "start", "end")
+
+    def __init__(self, phrase, payload, start_token, end_token, start, end):
+        self.phrase = phrase
+        self.payload = payload
+        self.start_token = start_token
+        self.end_token = end_token
+        self.start = start
+        self.end = end
+
+    @property
+    def length(self):
+        return self.end_token - self.start_token
+
+    def __repr__(self):
+        return f"PhraseMatch({self.phrase!r}, {self.payload!r}, {self.start}:{self.end})"
+
+
+class PhraseMatcher:
+    """Word-level Aho-Corasick automaton.
+
+    Usage:
+        matcher = PhraseMatcher()
+        matcher.add("chicken biryani", ("food", "chicken biryani"))
+        matcher.add("remind me", ("intent", "task"))
+        matcher.build()
+        matcher.find_all("remind me to eat chicken biryani")
+
+    A phrase may be added more than once with different payloads; every
+    payload is reported.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._phrases = []
+        self._built = False
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def add(self, phrase, payload=None):
+        words = [tok for tok, _, _ in tokenize(phrase)]
+        if not words:
+            return False
+        if self._built:
+            raise RuntimeError("PhraseMatcher.add() called after build()")
+
+        node = 0
+        for word in words:
+            nxt = self._goto[node].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][word] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(len(self._phrases))
+        self._phrases.append((" ".join(words), payload, len(words)))
+        return True
+
+    def build(self):
+        """Compute failure links (BFS). Must be called once before matching."""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(word, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit the suffix outputs so matching never walks fail chains.
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+        return self
+
+    def find_all(self, text, tokens=None):
+        """Every phrase occurrence in `text`, ordered by end position.
+
+        Pass pre-computed `tokens` (from tokenize) to share one tokenization
+        between several matchers.
+        """
+        if not self._built:
+            self.build()
+        if tokens is None:
+            tokens = tokenize(text)
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        phrases = self._phrases
+        matches = []
+        node = 0
+        for index, (word, _, end) in enumerate(tokens):
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            for phrase_id in out[node]:
+                phrase, payload, length = phrases[phrase_id]
+                first = index - length + 1
+                matches.append(PhraseMatch(phrase, payload, first, index + 1, tokens[first][1], end))
+        return matches
+
+    def find_longest(self, text, tokens=None, accept=None):
+        """Leftmost-longest non-overlapping matches (e.g. for extraction)."""
+        return select_longest(self.find_all(text, tokens), accept)
+
+
+def select_longest(matches, accept=None):
+    """Reduce matches to leftmost-longest, non-overlapping ones.
+
+    `accept(match)` can filter candidates before overlap resolution.
+    """
+    candidates = [m for m in matches if accept is None or accept(m)]
+    candidates.sort(key=lambda m: (m.start_token, -m.length))
+
+    chosen = []
+    taken_until = 0
+    for match in candidates:
+        if match.start_token < taken_until:
+            continue
+        chosen.append(match)
+        taken_until = match.end_token
+    return chosen
@@ -22,6 +22,7 @@ Level System:
 """
 
 import json
+import logging
 from datetime import datetime, timedelta
 
 # ---------------------------------------------------------------------------
@@ -35,6 +36,22 @@ MAX_DAILY_POINTS = 200
 DEFAULT_PROTEIN_GOAL = 140  # grams — used if no user profile is set
 STREAK_GRACE_DAYS = 1
 
+# stats_snapshots typed columns -> Python type, in evaluate_day() key order.
+# Booleans are stored as 0/1 integers (like tasks.completed).
+SNAPSHOT_COLUMNS = (
+    ("task_points", int),
+    ("tasks_completed", int),
+    ("total_tasks", int),
+    ("protein_met", bool),
+    ("total_protein", float),
+    ("protein_goal", float),
+    ("workout_done", bool),
+    ("total_workouts", int),
+    ("completed_workout_count", int),
+    ("total_points", int),
+    ("valid_day", bool),
+)
+
 
 # ---------------------------------------------------------------------------
 # Level Helpers
@@ -76,49 +93,18 @@ def level_progress(total_xp):
 # ---------------------------------------------------------------------------
 # Day Evaluation (Core Engine)
 # ---------------------------------------------------------------------------
-def evaluate_day(db, user_id, date_str, protein_goal=None):
+def score_day(date_str, *, task_points, tasks_completed, total_tasks, total_protein,
+              total_workouts, completed_workouts, protein_goal):
     """
-    Evaluate a single day for points & streak eligibility.
+    Apply the point and streak rules to one day's aggregates.
 
-    Reads from tasks, nutrition_entries, workouts tables.
-    Returns a dict with all computed values.
+    `task_points` is the uncapped sum of TASK_POINTS over completed tasks.
+    Shared by evaluate_day() and evaluate_range() so both score identically.
     """
-    if protein_goal is None:
-        protein_goal = DEFAULT_PROTEIN_GOAL
-
-    # --- Task Points ---
-    task_rows = db.execute(
-        "SELECT priority, completed FROM tasks WHERE user_id = ? AND date = ?",
-        (user_id, date_str),
-    ).fetchall()
-
-    task_points = 0
-    tasks_completed = 0
-    for row in task_rows:
-        if row["completed"]:
-            tasks_completed += 1
-            pts = TASK_POINTS.get(row["priority"], 25)
-            task_points += pts
     task_points = min(task_points, DAILY_TASK_CAP)
-
-    # --- Nutrition (Protein Goal) ---
-    nutrition_row = db.execute(
-        "SELECT COALESCE(SUM(protein), 0) as total_protein FROM nutrition_entries WHERE user_id = ? AND date = ?",
-        (user_id, date_str),
-    ).fetchone()
-    total_protein = float(nutrition_row["total_protein"]) if nutrition_row else 0.0
     protein_met = total_protein >= protein_goal
 
-    # --- Workout Completion ---
-    workout_rows = db.execute(
-        "SELECT id, completed FROM workouts WHERE user_id = ? AND date = ?",
-        (user_id, date_str),
-    ).fetchall()
-
-    total_workouts = len(workout_rows)
-    completed_workouts = 0
     if total_workouts > 0:
-        completed_workouts = sum(1 for w in workout_rows if w["completed"])
         workout_done = completed_workouts == total_workouts
     else:
         # No workouts scheduled = "not applicable" — treat as done (don't penalise rest days)
@@ -141,7 +127,7 @@ def evaluate_day(db, user_id, date_str, protein_goal=None):
         "date": date_str,
         "task_points": task_points,
         "tasks_completed": tasks_completed,
-        "total_tasks": len(task_rows),
+        "total_tasks": total_tasks,
         "protein_met": protein_met,
         "total_protein": round(total_protein, 1),
         "protein_goal": protein_goal,
@@ -153,67 +139,225 @@ def evaluate_day(db, user_id, date_str, protein_goal=None):
     }
 
 
-# ---------------------------------------------------------------------------
-# Persistence: Save daily snapshot & update user progress
-# ---------------------------------------------------------------------------
-def save_daily_snapshot(db, user_id, day_eval):
+def evaluate_day(db, user_id, date_str, protein_goal=None):
     """
-    Write/update the stats_snapshots row for this day.
-    Also recompute current_streak, longest_streak, total_points, and level.
-    Returns the updated user_progress dict.
+    Evaluate a single day for points & streak eligibility.
+
+    Reads from tasks, nutrition_entries, workouts tables.
+    Returns a dict with all computed values.
     """
-    date_str = day_eval["date"]
-
-    # Upsert daily snapshot
-    payload = json.dumps({
-        "task_points": day_eval["task_points"],
-        "tasks_completed": day_eval["tasks_completed"],
-        "total_tasks": day_eval["total_tasks"],
-        "protein_met": day_eval["protein_met"],
-        "total_protein": day_eval["total_protein"],
-        "protein_goal": day_eval["protein_goal"],
-        "workout_done": day_eval["workout_done"],
-        "total_workouts": day_eval["total_workouts"],
-        "completed_workout_count": day_eval.get("completed_workout_count", 0),
-        "total_points": day_eval["total_points"],
-        "valid_day": day_eval["valid_day"],
-    })
-
-    existing = db.execute(
-        "SELECT id, payload_json FROM stats_snapshots WHERE user_id = ? AND snapshot_date = ?",
+    if protein_goal is None:
+        protein_goal = DEFAULT_PROTEIN_GOAL
+
+    # --- Task Points ---
+    task_rows = db.execute(
+        "SELECT priority, completed FROM tasks WHERE user_id = ? AND date = ?",
+        (user_id, date_str),
+    ).fetchall()
+
+    task_points = 0
+    tasks_completed = 0
+    for row in task_rows:
+        if row["completed"]:
+            tasks_completed += 1
+            task_points += TASK_POINTS.get(row["priority"], 25)
+
+    # --- Nutrition (Protein Goal) ---
+    nutrition_row = db.execute(
+        "SELECT COALESCE(SUM(protein), 0) as total_protein FROM nutrition_entries WHERE user_id = ? AND date = ?",
         (user_id, date_str),
     ).fetchone()
+    total_protein = float(nutrition_row["total_protein"]) if nutrition_row else 0.0
 
-    if existing:
-        db.execute(
-            "UPDATE stats_snapshots SET streak_days = ?, payload_json = ? WHERE id = ?",
-            (1 if day_eval["valid_day"] else 0, payload, existing["id"]),
+    # --- Workout Completion ---
+    workout_rows = db.execute(
+        "SELECT id, completed FROM workouts WHERE user_id = ? AND date = ?",
+        (user_id, date_str),
+    ).fetchall()
+
+    return score_day(
+        date_str,
+        task_points=task_points,
+        tasks_completed=tasks_completed,
+        total_tasks=len(task_rows),
+        total_protein=total_protein,
+        total_workouts=len(workout_rows),
+        completed_workouts=sum(1 for w in workout_rows if w["completed"]),
+        protein_goal=protein_goal,
+    )
+
+
+def _date_span(start_date, end_date):
+    """Every YYYY-MM-DD from start_date to end_date inclusive (ValueError if reversed)."""
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    if start > end:
+        raise ValueError("start_date must be <= end_date")
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days + 1)]
+
+
+def evaluate_range(db, user_id, start_date, end_date, protein_goal=None):
+    """
+    Re-evaluate every day from start_date to end_date (inclusive) in bulk.
+
+    Per-day task, protein and workout aggregates come from three grouped
+    queries; each day is scored with score_day(), all snapshots are
+    upserted in batches, and streak/totals/level are recomputed once at
+    the end. Used for backfills and for recomputing history after a rule
+    change. Raises ValueError for malformed or reversed dates.
+
+    Returns {"days": [day evaluation, ...], "progress": user_progress dict}.
+    """
+    if protein_goal is None:
+        protein_goal = DEFAULT_PROTEIN_GOAL
+    days = _date_span(start_date, end_date)
+    params = (user_id, start_date, end_date)
+
+    # --- Task Points (per day and priority) ---
+    task_points = dict.fromkeys(days, 0)
+    tasks_completed = dict.fromkeys(days, 0)
+    total_tasks = dict.fromkeys(days, 0)
+    for row in db.execute(
+        """SELECT date, priority, COUNT(*) AS total,
+                  SUM(CASE WHEN completed = 1 THEN 1 ELSE 0 END) AS done
+           FROM tasks WHERE user_id = ? AND date BETWEEN ? AND ?
+           GROUP BY date, priority""",
+        params,
+    ).fetchall():
+        day = row["date"]
+        if day not in total_tasks:
+            continue
+        done = int(row["done"] or 0)
+        total_tasks[day] += int(row["total"] or 0)
+        tasks_completed[day] += done
+        task_points[day] += done * TASK_POINTS.get(row["priority"], 25)
+
+    # --- Nutrition (Protein Goal) ---
+    protein = dict.fromkeys(days, 0.0)
+    for row in db.execute(
+        """SELECT date, COALESCE(SUM(protein), 0) AS total_protein
+           FROM nutrition_entries WHERE user_id = ? AND date BETWEEN ? AND ?
+           GROUP BY date""",
+        params,
+    ).fetchall():
+        if row["date"] in protein:
+            protein[row["date"]] = float(row["total_protein"] or 0)
+
+    # --- Workout Completion ---
+    total_workouts = dict.fromkeys(days, 0)
+    completed_workouts = dict.fromkeys(days, 0)
+    for row in db.execute(
+        """SELECT date, COUNT(*) AS total,
+                  SUM(CASE WHEN completed = 1 THEN 1 ELSE 0 END) AS done
+           FROM workouts WHERE user_id = ? AND date BETWEEN ? AND ?
+           GROUP BY date""",
+        params,
+    ).fetchall():
+        if row["date"] in total_workouts:
+            total_workouts[row["date"]] = int(row["total"] or 0)
+            completed_workouts[row["date"]] = int(row["done"] or 0)
+
+    evaluations = [
+        score_day(
+            day,
+            task_points=task_points[day],
+            tasks_completed=tasks_completed[day],
+            total_tasks=total_tasks[day],
+            total_protein=protein[day],
+            total_workouts=total_workouts[day],
+            completed_workouts=completed_workouts[day],
+            protein_goal=protein_goal,
         )
-    else:
+        for day in days
+    ]
+
+    _upsert_snapshots(db, user_id, evaluations)
+    latest = db.execute(
+        "SELECT MAX(snapshot_date) AS latest FROM stats_snapshots WHERE user_id = ?",
+        (user_id,),
+    ).fetchone()
+    as_of = (latest and latest["latest"]) or end_date
+    # Day-by-day saves ratchet longest_streak at every date; match that here.
+    longest = _longest_streak_between(db, user_id, start_date, max(as_of, end_date), STREAK_GRACE_DAYS)
+    progress = _refresh_progress(db, user_id, as_of, longest_streak_floor=longest)
+    return {"days": evaluations, "progress": progress}
+
+
+# ---------------------------------------------------------------------------
+# Persistence: Save daily snapshot & update user progress
+# ---------------------------------------------------------------------------
+# SQLite builds before 3.32 reject statements binding more than 999 parameters;
+# each multi-row upsert is sized from the column count to stay under that.
+SQLITE_MAX_PARAMS = 999
+
+
+def _upsert_snapshots(db, user_id, evaluations):
+    """
+    Insert or update the stats_snapshots rows for day evaluations.
+
+    Typed columns feed SQL aggregates; payload_json keeps the full
+    evaluation for fields added later.
+    """
+    columns = ["user_id", "snapshot_date", "streak_days", "payload_json"]
+    columns += [name for name, _ in SNAPSHOT_COLUMNS]
+    row_sql = "(" + ", ".join("?" for _ in columns) + ")"
+    updates = ", ".join(f"{name} = excluded.{name}" for name in columns[2:])
+    batch = SQLITE_MAX_PARAMS // len(columns)
+
+    for start in range(0, len(evaluations), batch):
+        chunk = evaluations[start:start + batch]
+        params = []
+        for day_eval in chunk:
+            params.extend((
+                user_id,
+                day_eval["date"],
+                1 if day_eval["valid_day"] else 0,
+                json.dumps({key: value for key, value in day_eval.items() if key != "date"}),
+                *snapshot_values(day_eval),
+            ))
         db.execute(
-            "INSERT INTO stats_snapshots (user_id, snapshot_date, streak_days, payload_json) VALUES (?, ?, ?, ?)",
-            (user_id, date_str, 1 if day_eval["valid_day"] else 0, payload),
+            f"""INSERT INTO stats_snapshots ({", ".join(columns)})
+                VALUES {", ".join(row_sql for _ in chunk)}
+                ON CONFLICT(user_id, snapshot_date) DO UPDATE SET {updates}""",
+            params,
         )
 
+
+# Callables run as listener(db, user_id, progress) each time user_progress
+# is rewritten and committed (repositories.leaderboard_repo registers one in
+# create_app).
+_progress_listeners = []
+
+
+def add_progress_listener(listener):
+    if listener not in _progress_listeners:
+        _progress_listeners.append(listener)
+
+
+def _refresh_progress(db, user_id, as_of_date, longest_streak_floor=0):
+    """
+    Recompute current_streak (as of `as_of_date`), longest_streak,
+    total_points, and level from the snapshots; upsert user_progress and
+    commit. Returns the updated user_progress dict.
+    """
     # Recompute streak with a one-day grace window.
     current_streak, grace_days_used = _compute_current_streak(
-        db, user_id, date_str, grace_days=STREAK_GRACE_DAYS
+        db, user_id, as_of_date, grace_days=STREAK_GRACE_DAYS
     )
 
-    # Recompute total points from all snapshots.
-    # Summing in Python keeps this path dialect-neutral (SQLite + PostgreSQL).
-    snapshot_rows = db.execute(
-        "SELECT payload_json FROM stats_snapshots WHERE user_id = ?",
+    # Recompute total points from all snapshots (covering index on user_id).
+    total_row = db.execute(
+        "SELECT COALESCE(SUM(total_points), 0) AS total FROM stats_snapshots WHERE user_id = ?",
         (user_id,),
-    ).fetchall()
-    total_points = _sum_total_points_from_payloads(snapshot_rows)
+    ).fetchone()
+    total_points = int(total_row["total"] or 0)
 
     # Compute level
     level = level_from_xp(total_points)
 
     # Get or compute longest streak
     progress = get_or_create_progress(db, user_id)
-    longest_streak = max(progress["longest_streak"], current_streak)
+    longest_streak = max(progress["longest_streak"], current_streak, longest_streak_floor)
 
     # Upsert user_progress
     db.execute(
@@ -229,7 +373,7 @@ def save_daily_snapshot(db, user_id, day_eval):
     )
     db.commit()
 
-    return {
+    progress = {
         "total_points": total_points,
         "current_streak": current_streak,
         "longest_streak": longest_streak,
@@ -237,31 +381,62 @@ def save_daily_snapshot(db, user_id, day_eval):
         "grace_days_allowed": STREAK_GRACE_DAYS,
         "grace_days_used": grace_days_used,
     }
+    after_commit = getattr(db, "after_commit", None)
+    if after_commit is not None:
+        # Inside db.single_transaction() the commit above is deferred; tell
+        # listeners only once the outer transaction has really committed.
+        after_commit(("progress", user_id), lambda: _notify_progress(db, user_id, progress))
+    else:
+        _notify_progress(db, user_id, progress)
+    return progress
 
 
-def _sum_total_points_from_payloads(rows):
-    """Return total points across snapshot payloads, tolerant of malformed JSON."""
-    total = 0
-    for row in rows or []:
+def _notify_progress(db, user_id, progress):
+    for listener in _progress_listeners:
         try:
-            payload_raw = row["payload_json"]
-        except Exception:
-            payload_raw = None
+            listener(db, user_id, progress)
+        except Exception:  # the snapshot is saved; a listener must not undo that
+            logging.getLogger(__name__).exception("[points] progress listener failed for user %s", user_id)
+
+
+def save_daily_snapshot(db, user_id, day_eval):
+    """
+    Write/update the stats_snapshots row for this day.
+    Also recompute current_streak, longest_streak, total_points, and level.
+    Returns the updated user_progress dict.
+    """
+    _upsert_snapshots(db, user_id, [day_eval])
+    return _refresh_progress(db, user_id, day_eval["date"])
 
-        try:
-            payload = json.loads(payload_raw or "{}")
-        except (TypeError, ValueError):
-            payload = {}
 
-        points = 0
-        if isinstance(payload, dict):
-            points = payload.get("total_points", 0)
+def snapshot_values(day_eval):
+    """Typed column values for a day evaluation, in SNAPSHOT_COLUMNS order.
 
+    Tolerates missing keys and malformed values (older payloads), which
+    become 0.
+    """
+    if not isinstance(day_eval, dict):
+        day_eval = {}
+    values = []
+    for name, kind in SNAPSHOT_COLUMNS:
+        raw = day_eval.get(name)
+        if kind is bool:
+            values.append(1 if raw else 0)
+            continue
         try:
-            total += int(float(points))
+            values.append(kind(float(raw)))
         except (TypeError, ValueError):
-            continue
-    return total
+            values.append(kind())
+    return tuple(values)
+
+
+def snapshot_values_from_payload(payload_raw):
+    """snapshot_values() for a stored payload_json string (used by the backfill)."""
+    try:
+        payload = json.loads(payload_raw or "{}")
+    except (TypeError, ValueError):
+        payload = {}
+    return snapshot_values(payload)
 
 
 def _compute_current_streak(db, user_id, from_date_str, grace_days=1):
@@ -276,13 +451,20 @@ def _compute_current_streak(db, user_id, from_date_str, grace_days=1):
     d = datetime.strptime(from_date_str, "%Y-%m-%d").date()
     max_lookback = 1000
 
+    # One query for the whole lookback window instead of one per day.
+    earliest = d - timedelta(days=max_lookback + grace_allowed)
+    valid_dates = {
+        row["snapshot_date"]
+        for row in db.execute(
+            """SELECT snapshot_date FROM stats_snapshots
+               WHERE user_id = ? AND snapshot_date BETWEEN ? AND ? AND streak_days = 1""",
+            (user_id, earliest.strftime("%Y-%m-%d"), from_date_str),
+        ).fetchall()
+    }
+
     while streak < max_lookback:
         ds = d.strftime("%Y-%m-%d")
-        row = db.execute(
-            "SELECT streak_days FROM stats_snapshots WHERE user_id = ? AND snapshot_date = ?",
-            (user_id, ds),
-        ).fetchone()
-        if row and row["streak_days"] == 1:
+        if ds in valid_dates:
             streak += 1
             d -= timedelta(days=1)
             continue
@@ -297,6 +479,41 @@ def _compute_current_streak(db, user_id, from_date_str, grace_days=1):
     return streak, grace_used
 
 
+def _longest_streak_between(db, user_id, start_date, end_date, grace_days=1):
+    """
+    Highest _compute_current_streak() value for any date in the range,
+    from one query over the valid snapshot dates.
+    """
+    max_lookback = 1000
+    grace_allowed = max(0, int(grace_days or 0))
+    first = datetime.strptime(start_date, "%Y-%m-%d").date()
+    last = datetime.strptime(end_date, "%Y-%m-%d").date()
+    earliest = first - timedelta(days=max_lookback + grace_allowed)
+    valid = {
+        datetime.strptime(row["snapshot_date"], "%Y-%m-%d").date().toordinal()
+        for row in db.execute(
+            """SELECT snapshot_date FROM stats_snapshots
+               WHERE user_id = ? AND snapshot_date BETWEEN ? AND ? AND streak_days = 1""",
+            (user_id, earliest.strftime("%Y-%m-%d"), end_date),
+        ).fetchall()
+    }
+
+    # run[day] = consecutive valid days ending at day.
+    run = {}
+    for day in sorted(valid):
+        run[day] = run.get(day - 1, 0) + 1
+
+    longest = 0
+    for day in range(first.toordinal(), last.toordinal() + 1):
+        streak, pos = 0, day
+        for _ in range(grace_allowed + 1):
+            length = run.get(pos, 0)
+            streak += length
+            pos -= length + 1  # skip the run, then spend one grace day
+        longest = max(longest, min(streak, max_lookback))
+    return longest
+
+
 def get_or_create_progress(db, user_id):
     """Get user_progress row, creating it if it doesn't exist."""
     row = db.execute(
@@ -0,0 +1,192 @@
+"""
+FILE: app/rate_limiter.py
+
+Responsibility:
+  GCRA (generic cell rate algorithm) rate limiting: one float per key, O(1)
+  per check. State lives in a pluggable backend — an in-process LRU, or a
+  local SQLite file shared by every worker process on the host so one limit
+  is enforced regardless of the gunicorn worker count.
+
+MUST NOT:
+  - Import Flask, db, or route modules (middleware.py owns the decorator)
+  - Block requests when the shared backend fails (limits fail open)
+
+Depends on:
+  - config.py (RATE_LIMIT_BACKEND, RATE_LIMIT_SQLITE_PATH, RATE_LIMIT_MAX_KEYS)
+  - sqlite3 (standard library; only for the shared backend)
+
+GCRA in brief:
+  A limit of N requests per W seconds emits one "cell" every T = W / N
+  seconds. Each key stores its theoretical arrival time (TAT). A request
+  at time `now` is allowed when TAT + T - W <= now, and then moves TAT
+  forward by T. Keys whose TAT is in the past are idle (a full bucket), so
+  they can be evicted without changing any decision.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def gcra_decide(tat, now, emission_interval, window_seconds):
+    """Apply one GCRA step. Returns (allowed, new_tat, retry_after)."""
+    tat = max(tat if tat is not None else now, now)
+    new_tat = tat + emission_interval
+    allow_at = new_tat - window_seconds
+    if now < allow_at:
+        return False, tat, allow_at - now
+    return True, new_tat, 0.0
+
+
+class MemoryBackend:
+    """Per-process state: an LRU of key -> TAT, capped at `max_keys`."""
+
+    shared = False
+
+    def __init__(self, max_keys=10000, clock=time.monotonic):
+        self.max_keys = max(1, int(max_keys))
+        self.clock = clock
+        self._tats = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key, emission_interval, window_seconds):
+        now = self.clock()
+        with self._lock:
+            allowed, new_tat, retry_after = gcra_decide(
+                self._tats.get(key), now, emission_interval, window_seconds
+            )
+            if allowed:
+                self._tats[key] = new_tat
+                self._tats.move_to_end(key)
+                self._evict(now)
+            return allowed, retry_after
+
+    def _evict(self, now):
+        # Oldest entries first: idle keys (TAT in the past) carry no state,
+        # and past the size cap even active keys are dropped LRU-first.
+        while self._tats:
+            key, tat = next(iter(self._tats.items()))
+            if tat > now and len(self._tats) <= self.max_keys:
+                break
+            self._tats.popitem(last=False)
+
+    def __len__(self):
+        return len(self._tats)
+
+
+class SQLiteBackend:
+    """State in a local SQLite file, shared by all processes on the host.
+
+    Each check is one short IMMEDIATE transaction (read TAT, write TAT).
+    Idle keys are purged every `purge_every` checks.
+    """
+
+    shared = True
+
+    def __init__(self, path, purge_every=1000, clock=time.time):
+        self.path = str(path)
+        self.purge_every = max(1, int(purge_every))
+        self.clock = clock  # wall clock: must agree across processes
+        self._local = threading.local()
+        self._calls = 0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def acquire(self, key, emission_interval, window_seconds):
+        conn = self._connect()
+        now = self.clock()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            allowed, new_tat, retry_after = gcra_decide(
+                row[0] if row else None, now, emission_interval, window_seconds
+            )
+            if allowed:
+                conn.execute(
+                    "INSERT INTO rate_limits (key, tat) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat",
+                    (key, new_tat),
+                )
+            self._calls += 1
+            if self._calls % self.purge_every == 0:
+                conn.execute("DELETE FROM rate_limits WHERE tat < ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, retry_after
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_rate_limit_backend():
+    """Process-wide backend selected by RATE_LIMIT_BACKEND (memory|sqlite)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if Config.RATE_LIMIT_BACKEND == "sqlite":
+                    try:
+                        _backend = SQLiteBackend(Config.RATE_LIMIT_SQLITE_PATH)
+                    except sqlite3.Error:
+                        logger.exception("Shared rate-limit store unavailable; using in-process limits")
+                if _backend is None:
+                    _backend = MemoryBackend(Config.RATE_LIMIT_MAX_KEYS)
+    return _backend
+
+
+class RateLimiter:
+    """N requests per window per client, enforced with GCRA.
+
+    Bursts of up to `max_requests` are allowed; after that requests are
+    admitted at the sustained rate of max_requests / window_seconds.
+    """
+
+    def __init__(self, max_requests=100, window_seconds=60, *, name="", backend=None):
+        self.max_requests = max(1, int(max_requests))
+        self.window_seconds = float(window_seconds)
+        self.emission_interval = self.window_seconds / self.max_requests
+        self.name = name
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = get_rate_limit_backend()
+        return self._backend
+
+    def check(self, client_id):
+        """Return (allowed, retry_after_seconds)."""
+        key = f"{self.name}:{client_id}" if self.name else str(client_id)
+        try:
+            return self.backend.acquire(key, self.emission_interval, self.window_seconds)
+        except sqlite3.Error:
+            logger.warning("Rate-limit store error; allowing request", exc_info=True)
+            return True, 0.0
+
+    def is_allowed(self, client_id):
+        """Check if request is allowed for client. Returns True if within limit."""
+        return self.check(client_id)[0]
@@ -0,0 +1,145 @@
+"""
+FILE: app/repositories/change_log_repo.py
+
+Responsibility:
+  Data-access layer for the change_log table: a per-user change feed read
+  by GET /api/sync. Repositories call ChangeLogRepository.record() in the
+  same transaction as their write (before commit); deletes are recorded as
+  tombstones.
+
+MUST NOT:
+  - Import Flask request/response objects
+  - Commit (the calling repository owns the transaction)
+
+Depends on:
+  - db.get_db()
+  - utils (now_iso)
+
+Notes:
+  The log is compacted: each (user, entity, id) keeps only its latest
+  entry, so a feed holds at most one row per entity and a reconnecting
+  client receives each changed row once. seq is AUTOINCREMENT (never
+  reused), so a compacted entry always moves past every cursor handed out
+  before it.
+
+  /api/sync hands out the last seq it returned as the cursor, which is only
+  safe if a user's entries become visible in seq order. SQLite guarantees
+  that (one writer at a time). PostgreSQL allocates BIGSERIAL values when
+  rows are inserted, not when transactions commit, so record() first takes
+  a per-user transaction-scoped advisory lock: a second writer for the
+  same user waits until the first commits before drawing its seq, and no
+  lower seq can appear behind a cursor already returned.
+"""
+
+from ..db import get_db, is_postgres
+from ..utils import now_iso
+
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+
+# entity name -> SELECT used to hydrate upserts (ids are appended as IN (...)).
+_ENTITY_QUERIES = {
+    "task": """
+        SELECT t.*, COALESCE(f.total_focus, 0) AS focus_time_spent
+        FROM tasks t
+        LEFT JOIN (
+            SELECT task_id, user_id, SUM(duration_actual) AS total_focus
+            FROM focus_sessions
+            WHERE completed = 1
+            GROUP BY task_id, user_id
+        ) f ON t.id = f.task_id AND f.user_id = t.user_id
+        WHERE t.user_id = ? AND t.id IN ({ids})
+    """,
+    "meal": "SELECT * FROM nutrition_entries WHERE user_id = ? AND id IN ({ids})",
+    "workout": "SELECT * FROM workouts WHERE user_id = ? AND id IN ({ids})",
+    "note": """
+        SELECT n.*, t.title AS linked_task_title
+        FROM notes n
+        LEFT JOIN tasks t
+          ON n.source_type = 'task'
+         AND n.source_id = t.id
+         AND t.user_id = n.user_id
+        WHERE n.user_id = ? AND n.id IN ({ids})
+    """,
+    "project": "SELECT * FROM projects WHERE user_id = ? AND id IN ({ids})",
+}
+ENTITIES = frozenset(_ENTITY_QUERIES)
+
+# First key of pg_advisory_xact_lock(key, user_id); keeps these locks apart
+# from any other advisory locks.
+_PG_LOCK_NAMESPACE = 0x6368  # "ch"
+
+
+def _clean_ids(entity_ids):
+    seen = []
+    for value in entity_ids:
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            continue
+        if value not in seen:
+            seen.append(value)
+    return seen
+
+
+class ChangeLogRepository:
+    """Data-access object for the change_log table."""
+
+    @staticmethod
+    def record(user_id, entity, entity_ids, op=OP_UPSERT, db=None):
+        """Log a change to each id (an int or an iterable of ints). Does not commit."""
+        if entity not in ENTITIES:
+            raise ValueError(f"Unknown change_log entity: {entity}")
+        if isinstance(entity_ids, int):
+            entity_ids = (entity_ids,)
+        db = db or get_db()
+        ids = _clean_ids(entity_ids)
+        if not ids:
+            return
+        if is_postgres():
+            # Held until commit/rollback: serializes this user's seq allocation.
+            db.execute("SELECT pg_advisory_xact_lock(?, ?)", (_PG_LOCK_NAMESPACE, int(user_id)))
+        now = now_iso()
+        for entity_id in ids:
+            db.execute(
+                "DELETE FROM change_log WHERE user_id = ? AND entity = ? AND entity_id = ?",
+                (user_id, entity, entity_id),
+            )
+            db.execute(
+                "INSERT INTO change_log (user_id, entity, entity_id, op, changed_at) VALUES (?, ?, ?, ?, ?)",
+                (user_id, entity, entity_id, op, now),
+            )
+
+    @staticmethod
+    def head(user_id):
+        """Latest seq for the user (0 when nothing has been logged)."""
+        row = get_db().execute(
+            "SELECT MAX(seq) AS seq FROM change_log WHERE user_id = ?",
+            (user_id,),
+        ).fetchone()
+        return int(row["seq"] or 0) if row else 0
+
+    @staticmethod
+    def changes_since(user_id, since, limit):
+        """Up to `limit` entries with seq > since, oldest first, plus a has_more flag."""
+        rows = get_db().execute(
+            """
+            SELECT seq, entity, entity_id, op, changed_at
+            FROM change_log
+            WHERE user_id = ? AND seq > ?
+            ORDER BY seq
+            LIMIT ?
+            """,
+            (user_id, since, limit + 1),
+        ).fetchall()
+        return rows[:limit], len(rows) > limit
+
+    @staticmethod
+    def load_rows(user_id, entity, entity_ids):
+        """Current rows for `entity_ids`, keyed by id (missing ids are absent)."""
+        ids = _clean_ids(entity_ids)
+        if not ids:
+            return {}
+        query = _ENTITY_QUERIES[entity].format(ids=",".join("?" for _ in ids))
+        rows = get_db().execute(query, [user_id] + ids).fetchall()
+        return {row["id"]: row for row in rows}
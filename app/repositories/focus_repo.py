@@ -12,11 +12,27 @@ MUST NOT:
 
 Depends on:
   - db.get_db()
+  - change_log_repo (a session's linked task carries focus_time_spent,
+    so session writes log that task for GET /api/sync)
+  - pagination (keyset pages for GET /api/focus/sessions?limit=)
   - utils (now_iso, safe_int, today_str)
 """
 
 from ..db import get_db
+from ..pagination import keyset_sql, split_page
 from ..utils import now_iso, safe_int, today_str
+from .change_log_repo import ChangeLogRepository
+
+# Sessions with their linked task/project names; callers append filters and ORDER BY.
+_SESSION_LIST_QUERY = """
+    SELECT f.*,
+           t.title as task_title,
+           p.name as project_name
+    FROM focus_sessions f
+    LEFT JOIN tasks t ON f.task_id = t.id AND t.user_id = f.user_id
+    LEFT JOIN projects p ON f.project_id = p.id AND p.user_id = f.user_id
+    WHERE f.user_id = ?
+"""
 
 
 class FocusRepository:
@@ -53,15 +69,7 @@ class FocusRepository:
     def get_all(user_id, date_filter=None):
         """Get all focus sessions, optionally filtered by date. Includes linked task/project info."""
         db = get_db()
-        query = """
-            SELECT f.*, 
-                   t.title as task_title, 
-                   p.name as project_name
-            FROM focus_sessions f
-            LEFT JOIN tasks t ON f.task_id = t.id AND t.user_id = f.user_id
-            LEFT JOIN projects p ON f.project_id = p.id AND p.user_id = f.user_id
-            WHERE f.user_id = ?
-        """
+        query = _SESSION_LIST_QUERY
         params = [user_id]
         
         if date_filter:
@@ -72,6 +80,17 @@ class FocusRepository:
         
         return db.execute(query, params).fetchall()
 
+    @staticmethod
+    def get_page(user_id, page, date_filter=None):
+        """One keyset page ordered by (date, id) DESC: (rows, next_cursor)."""
+        where, order, params, tail = keyset_sql("f.date", "f.id", page)
+        date_cond = " AND f.date = ?" if date_filter else ""
+        rows = get_db().execute(
+            _SESSION_LIST_QUERY + date_cond + where + order,
+            [user_id] + ([date_filter] if date_filter else []) + params + tail,
+        ).fetchall()
+        return split_page(rows, page, "date")
+
     @staticmethod
     def get_by_id(session_id, user_id):
         """Get a focus session by ID."""
@@ -117,6 +136,7 @@ class FocusRepository:
                 now,
             ),
         )
+        ChangeLogRepository.record(user_id, "task", [valid_task_id], db=db)
         db.commit()
         return db.execute(
             "SELECT * FROM focus_sessions WHERE id = ? AND user_id = ?", (cursor.lastrowid, user_id)
@@ -169,6 +189,9 @@ class FocusRepository:
                 user_id,
             ),
         )
+        ChangeLogRepository.record(
+            user_id, "task", {existing_data.get("task_id"), valid_task_id}, db=db
+        )
         db.commit()
         return db.execute(
             "SELECT * FROM focus_sessions WHERE id = ? AND user_id = ?", (session_id, user_id)
@@ -178,10 +201,16 @@ class FocusRepository:
     def delete(session_id, user_id):
         """Delete a focus session."""
         db = get_db()
+        linked = db.execute(
+            "SELECT task_id FROM focus_sessions WHERE id = ? AND user_id = ?",
+            (session_id, user_id),
+        ).fetchone()
         result = db.execute(
             "DELETE FROM focus_sessions WHERE id = ? AND user_id = ?",
             (session_id, user_id),
         )
+        if linked:
+            ChangeLogRepository.record(user_id, "task", [linked["task_id"]], db=db)
         db.commit()
         return result.rowcount > 0
 
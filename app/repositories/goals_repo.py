@@ -5,8 +5,33 @@ Handles all database operations for user goals
 from typing import List, Dict, Any, Optional
 import secrets
 from app.db import get_db
+from app.pagination import keyset_sql, split_page
+from app.shared_goal_cache import invalidate_shared_goal
 from app.utils import now_iso
 
+# card_image_url / card_thumb_url hold blob references (/api/goals/images/<sha256>),
+# never image bytes. Detail views get the display image; list views also get
+# card_thumb_url, falling back to the display image until the thumbnail exists.
+_GOAL_COLUMNS = """
+    id, user_id, title, description, category, target_progress, current_progress,
+    snippets_collected, time_limit, notes, card_image_url, ai_prompt, status,
+    is_shared, share_token, created_at, updated_at, completed_at
+"""
+_GOAL_LIST_COLUMNS = _GOAL_COLUMNS + """,
+    COALESCE(card_thumb_url, card_image_url) AS card_thumb_url
+"""
+# List column name -> SELECT expression, for ?fields= projections.
+_GOAL_LIST_EXPRESSIONS = {name.strip(): name.strip() for name in _GOAL_COLUMNS.split(",")}
+_GOAL_LIST_EXPRESSIONS["card_thumb_url"] = "COALESCE(card_thumb_url, card_image_url) AS card_thumb_url"
+
+
+def _goal_list_columns(fields):
+    """SELECT list for `fields` (id and updated_at always included), or every list column."""
+    if not fields:
+        return _GOAL_LIST_COLUMNS
+    wanted = set(fields) | {"id", "updated_at"}
+    return ", ".join(expr for name, expr in _GOAL_LIST_EXPRESSIONS.items() if name in wanted)
+
 
 def _row_dict(row):
     if row is None:
@@ -45,31 +70,46 @@ class GoalsRepository:
     def get_goal_by_id(goal_id: int, user_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific goal by ID (verify ownership)"""
         conn = get_db()
-        row = conn.execute("""
-            SELECT * FROM goals 
+        row = conn.execute(f"""
+            SELECT {_GOAL_COLUMNS} FROM goals
             WHERE id = ? AND user_id = ?
         """, (goal_id, user_id)).fetchone()
 
         return _row_dict(row)
     
     @staticmethod
-    def get_all_goals(user_id: int, status: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_all_goals(user_id: int, status: Optional[str] = None,
+                      fields: Optional[set] = None) -> List[Dict[str, Any]]:
         """Get all goals for a user, optionally filtered by status"""
         conn = get_db()
+        columns = _goal_list_columns(fields)
         if status:
-            rows = conn.execute("""
-                SELECT * FROM goals 
+            rows = conn.execute(f"""
+                SELECT {columns} FROM goals
                 WHERE user_id = ? AND status = ?
                 ORDER BY updated_at DESC
             """, (user_id, status)).fetchall()
         else:
-            rows = conn.execute("""
-                SELECT * FROM goals 
+            rows = conn.execute(f"""
+                SELECT {columns} FROM goals
                 WHERE user_id = ?
                 ORDER BY updated_at DESC
             """, (user_id,)).fetchall()
 
         return [_row_dict(row) for row in rows]
+
+    @staticmethod
+    def get_goals_page(user_id: int, page, status: Optional[str] = None,
+                       fields: Optional[set] = None):
+        """One keyset page ordered by (updated_at, id) DESC: (goals, next_cursor)."""
+        where, order, params, tail = keyset_sql("updated_at", "id", page)
+        status_cond = " AND status = ?" if status else ""
+        rows = get_db().execute(
+            f"SELECT {_goal_list_columns(fields)} FROM goals WHERE user_id = ?" + status_cond + where + order,
+            [user_id] + ([status] if status else []) + params + tail,
+        ).fetchall()
+        rows, next_cursor = split_page(rows, page, "updated_at")
+        return [_row_dict(row) for row in rows], next_cursor
     
     @staticmethod
     def update_progress(goal_id: int, user_id: int, current_progress: float) -> Dict[str, Any]:
@@ -109,6 +149,7 @@ class GoalsRepository:
                 """, (current_progress, snippets_collected, now_iso(), goal_id, user_id))
             
             conn.commit()
+            invalidate_shared_goal(goal_id)
             return {
                 "updated": result.rowcount > 0,
                 "snippets_collected": 4 if current_progress >= 100 else snippets_collected,
@@ -141,7 +182,7 @@ class GoalsRepository:
             existing_row = conn.execute(
                 """
                 SELECT title, description, category, target_progress, time_limit,
-                       card_image_url, ai_prompt, notes, status
+                       card_image_url, card_thumb_url, ai_prompt, notes, status
                 FROM goals
                 WHERE id = ? AND user_id = ?
                 """,
@@ -162,6 +203,12 @@ class GoalsRepository:
                 target_progress = existing.get("target_progress", 100)
             target_progress = max(0.1, min(100.0, target_progress))
 
+            # A new image invalidates the old thumbnail until the pipeline makes one.
+            card_image_url = update_fields.get("card_image_url", existing.get("card_image_url"))
+            card_thumb_url = existing.get("card_thumb_url")
+            if card_image_url != existing.get("card_image_url"):
+                card_thumb_url = None
+
             result = conn.execute(
                 """
                 UPDATE goals
@@ -171,6 +218,7 @@ class GoalsRepository:
                     target_progress = ?,
                     time_limit = ?,
                     card_image_url = ?,
+                    card_thumb_url = ?,
                     ai_prompt = ?,
                     notes = ?,
                     status = ?,
@@ -183,7 +231,8 @@ class GoalsRepository:
                     update_fields.get("category", existing.get("category")),
                     target_progress,
                     update_fields.get("time_limit", existing.get("time_limit")),
-                    update_fields.get("card_image_url", existing.get("card_image_url")),
+                    card_image_url,
+                    card_thumb_url,
                     update_fields.get("ai_prompt", existing.get("ai_prompt")),
                     update_fields.get("notes", existing.get("notes")),
                     status_val,
@@ -194,6 +243,31 @@ class GoalsRepository:
             )
 
             conn.commit()
+            invalidate_shared_goal(goal_id)
+            return result.rowcount > 0
+        except Exception as e:
+            conn.rollback()
+            raise e
+    
+    @staticmethod
+    def set_card_variants(goal_id: int, user_id: int, source_url: str,
+                          display_url: str, thumb_url: str) -> bool:
+        """Swap in processed image renditions.
+
+        Only applies while the goal still points at `source_url`, so a slow
+        job never overwrites an image the user replaced in the meantime.
+        """
+        conn = get_db()
+
+        try:
+            result = conn.execute("""
+                UPDATE goals
+                SET card_image_url = ?, card_thumb_url = ?
+                WHERE id = ? AND user_id = ? AND card_image_url = ?
+            """, (display_url, thumb_url, goal_id, user_id, source_url))
+
+            conn.commit()
+            invalidate_shared_goal(goal_id)
             return result.rowcount > 0
         except Exception as e:
             conn.rollback()
@@ -211,6 +285,7 @@ class GoalsRepository:
             """, (goal_id, user_id))
             
             conn.commit()
+            invalidate_shared_goal(goal_id)
             return result.rowcount > 0
         except Exception as e:
             conn.rollback()
@@ -231,6 +306,7 @@ class GoalsRepository:
             """, (share_token, now_iso(), goal_id, user_id))
             
             conn.commit()
+            invalidate_shared_goal(goal_id)
             
             if result.rowcount > 0:
                 return share_token
@@ -266,6 +342,7 @@ class GoalsRepository:
             """, (now_iso(), goal_id, user_id))
             
             conn.commit()
+            invalidate_shared_goal(goal_id)
             return result.rowcount > 0
         except Exception as e:
             conn.rollback()
@@ -0,0 +1,72 @@
+"""
+FILE: app/repositories/idempotency_repo.py
+
+Responsibility:
+  Data-access layer for the idempotency_keys table: the stored result of
+  each mutation replayed through POST /api/mutations, so a retried replay
+  returns the original result instead of applying the mutation twice.
+
+MUST NOT:
+  - Import Flask request/response objects
+  - Commit (the calling route owns the transaction)
+
+Depends on:
+  - db.get_db()
+  - utils (now_iso)
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from ..db import get_db
+from ..utils import now_iso
+
+
+class IdempotencyRepository:
+    """Data-access object for the idempotency_keys table."""
+
+    @staticmethod
+    def get(user_id, key):
+        """Stored (status, body) for an unexpired key, or None."""
+        row = get_db().execute(
+            """
+            SELECT status, response_json
+            FROM idempotency_keys
+            WHERE user_id = ? AND idempotency_key = ? AND expires_at > ?
+            """,
+            (user_id, key, now_iso()),
+        ).fetchone()
+        if not row:
+            return None
+        body = json.loads(row["response_json"]) if row["response_json"] else None
+        return int(row["status"]), body
+
+    @staticmethod
+    def store(user_id, key, status, body, ttl_seconds):
+        """Remember the result for `key` (replacing an expired entry). Does not commit."""
+        now = datetime.now(timezone.utc)
+        db = get_db()
+        db.execute(
+            "DELETE FROM idempotency_keys WHERE user_id = ? AND idempotency_key = ?",
+            (user_id, key),
+        )
+        db.execute(
+            """
+            INSERT INTO idempotency_keys
+                (user_id, idempotency_key, status, response_json, created_at, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                user_id,
+                key,
+                status,
+                json.dumps(body) if body is not None else None,
+                now.isoformat(),
+                (now + timedelta(seconds=ttl_seconds)).isoformat(),
+            ),
+        )
+
+    @staticmethod
+    def purge_expired():
+        """Delete expired keys for every user. Does not commit."""
+        get_db().execute("DELETE FROM idempotency_keys WHERE expires_at <= ?", (now_iso(),))
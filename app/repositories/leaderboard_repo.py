@@ -0,0 +1,233 @@
+"""
+FILE: app/repositories/leaderboard_repo.py
+
+Responsibility:
+  Database side of the leaderboards: loads the in-memory boards
+  (leaderboard.py) from user_progress and the current week's
+  stats_snapshots, keeps them current from points_engine progress
+  updates, and writes/reads the archived weekly boards in
+  leaderboard_weekly.
+
+MUST NOT:
+  - Import Flask request/response objects
+  - Contain HTTP/validation logic
+
+Depends on:
+  - db.get_db()
+  - leaderboard.get_leaderboards(), BOARDS
+  - utils.today_str, utils.now_iso
+
+Notes:
+  Weeks run Monday..Sunday (UTC dates, like utils.today_str). The weekly
+  points board sums the week's snapshot points; the weekly streak board
+  counts the week's valid days. Global boards read user_progress.
+"""
+
+from datetime import datetime, timedelta
+
+from ..db import get_db
+from ..leaderboard import BOARDS, get_leaderboards
+from ..utils import now_iso, today_str
+
+# Rows per multi-row insert into leaderboard_weekly (6 parameters each).
+ARCHIVE_INSERT_BATCH = 500
+
+_WEEK_SCORES_QUERY = """
+    SELECT user_id,
+           COALESCE(SUM(total_points), 0) AS points,
+           COALESCE(SUM(valid_day), 0) AS valid_days
+    FROM stats_snapshots
+    WHERE snapshot_date BETWEEN ? AND ?
+"""
+
+
+def week_bounds(day_str):
+    """(monday, sunday) as YYYY-MM-DD for the week containing `day_str`."""
+    day = datetime.strptime(day_str, "%Y-%m-%d").date()
+    monday = day - timedelta(days=day.weekday())
+    return monday.strftime("%Y-%m-%d"), (monday + timedelta(days=6)).strftime("%Y-%m-%d")
+
+
+def previous_week_start(day_str):
+    """Monday of the week before the one containing `day_str`."""
+    monday, _ = week_bounds(day_str)
+    return (datetime.strptime(monday, "%Y-%m-%d") - timedelta(days=7)).strftime("%Y-%m-%d")
+
+
+def _competition_ranks(scores):
+    """[(rank, user_id, score)] for {user_id: score}, best first; ties share a rank."""
+    ordered = sorted(((score, user_id) for user_id, score in scores.items() if score > 0),
+                     key=lambda item: (-item[0], item[1]))
+    ranked, rank, previous = [], 0, None
+    for position, (score, user_id) in enumerate(ordered, 1):
+        if score != previous:
+            rank, previous = position, score
+        ranked.append((rank, user_id, score))
+    return ranked
+
+
+class LeaderboardRepository:
+    """Loads, updates and archives the leaderboards."""
+
+    @staticmethod
+    def rebuild(db=None):
+        """Reload every board; archives last week first if nothing has yet."""
+        db = db or get_db()
+        boards = get_leaderboards()
+        week_start, week_end = week_bounds(today_str())
+        LeaderboardRepository.archive_week(previous_week_start(week_start), db=db, overwrite=False)
+
+        progress_rows = db.execute(
+            """SELECT user_id, total_points, current_streak FROM user_progress
+               WHERE total_points > 0 OR current_streak > 0"""
+        ).fetchall()
+        weekly_rows = db.execute(
+            _WEEK_SCORES_QUERY + " GROUP BY user_id", (week_start, week_end)
+        ).fetchall()
+        boards.load(
+            week_start,
+            [(r["user_id"], r["total_points"], r["current_streak"]) for r in progress_rows],
+            [(r["user_id"], r["points"], r["valid_days"]) for r in weekly_rows],
+        )
+        return week_start
+
+    @staticmethod
+    def ensure_fresh():
+        """Rebuild when the boards are missing, from another week, or due for a reload."""
+        week_start, _ = week_bounds(today_str())
+        if get_leaderboards().is_stale(week_start):
+            LeaderboardRepository.rebuild()
+
+    @staticmethod
+    def record_progress(db, user_id, progress):
+        """points_engine progress listener: apply one user's new scores."""
+        boards = get_leaderboards()
+        week_start, week_end = week_bounds(today_str())
+        if boards.week_start != week_start:
+            return  # boards not loaded (scripts) or from last week: the next rebuild covers it
+        row = db.execute(
+            _WEEK_SCORES_QUERY + " AND user_id = ? GROUP BY user_id",
+            (week_start, week_end, user_id),
+        ).fetchone()
+        boards.record(
+            user_id,
+            total_points=progress["total_points"],
+            current_streak=progress["current_streak"],
+            week_start=week_start,
+            week_points=row["points"] if row else 0,
+            valid_days=row["valid_days"] if row else 0,
+        )
+
+    @staticmethod
+    def board(board, period, user_id, limit, offset=0):
+        """Current board page plus the caller's own rank."""
+        LeaderboardRepository.ensure_fresh()
+        boards = get_leaderboards()
+        entries = boards.top(board, period, limit, offset)
+        my_rank, my_score = boards.rank(board, period, user_id)
+        return {
+            "board": board,
+            "period": period,
+            "week_start": boards.week_start if period == "weekly" else None,
+            "total": boards.size(board, period),
+            "entries": LeaderboardRepository._with_names(entries, user_id),
+            "me": {"rank": my_rank, "score": my_score},
+        }
+
+    @staticmethod
+    def history(week_start, board, user_id, limit, offset=0):
+        """An archived weekly board from leaderboard_weekly, in rank order."""
+        db = get_db()
+        rows = db.execute(
+            """SELECT rank, user_id, score FROM leaderboard_weekly
+               WHERE week_start = ? AND board = ?
+               ORDER BY rank, user_id LIMIT ? OFFSET ?""",
+            (week_start, board, limit, offset),
+        ).fetchall()
+        total = db.execute(
+            "SELECT COUNT(*) AS n FROM leaderboard_weekly WHERE week_start = ? AND board = ?",
+            (week_start, board),
+        ).fetchone()
+        mine = db.execute(
+            "SELECT rank, score FROM leaderboard_weekly WHERE week_start = ? AND board = ? AND user_id = ?",
+            (week_start, board, user_id),
+        ).fetchone()
+        entries = [(r["rank"], r["user_id"], r["score"]) for r in rows]
+        return {
+            "board": board,
+            "period": "weekly",
+            "week_start": week_start,
+            "total": int(total["n"] or 0),
+            "entries": LeaderboardRepository._with_names(entries, user_id),
+            "me": {"rank": mine["rank"], "score": mine["score"]} if mine else {"rank": None, "score": 0},
+        }
+
+    @staticmethod
+    def archive_week(week_start, db=None, overwrite=True):
+        """Write both weekly boards for the week starting `week_start`.
+
+        overwrite=False leaves an already archived week alone (rebuild()
+        archives last week that way, and several workers may race); the
+        nightly job overwrites so the final Sunday evaluation is reflected.
+        Commits; returns the number of rows written.
+        """
+        db = db or get_db()
+        if not overwrite:
+            exists = db.execute(
+                "SELECT 1 FROM leaderboard_weekly WHERE week_start = ? LIMIT 1", (week_start,)
+            ).fetchone()
+            if exists:
+                return 0
+        _, week_end = week_bounds(week_start)
+        rows = db.execute(
+            _WEEK_SCORES_QUERY + " GROUP BY user_id", (week_start, week_end)
+        ).fetchall()
+        if not rows and not overwrite:
+            return 0
+        scores = {
+            "points": {r["user_id"]: int(r["points"] or 0) for r in rows},
+            "streak": {r["user_id"]: int(r["valid_days"] or 0) for r in rows},
+        }
+
+        db.execute("DELETE FROM leaderboard_weekly WHERE week_start = ?", (week_start,))
+        created_at = now_iso()
+        written = 0
+        for board in BOARDS:
+            ranked = _competition_ranks(scores[board])
+            for start in range(0, len(ranked), ARCHIVE_INSERT_BATCH):
+                chunk = ranked[start:start + ARCHIVE_INSERT_BATCH]
+                params = []
+                for rank, user_id, score in chunk:
+                    params.extend((week_start, board, user_id, rank, score, created_at))
+                db.execute(
+                    f"""INSERT INTO leaderboard_weekly (week_start, board, user_id, rank, score, created_at)
+                        VALUES {", ".join("(?, ?, ?, ?, ?, ?)" for _ in chunk)}
+                        ON CONFLICT(week_start, board, user_id) DO UPDATE SET
+                          rank = excluded.rank, score = excluded.score, created_at = excluded.created_at""",
+                    params,
+                )
+            written += len(ranked)
+        db.commit()
+        return written
+
+    @staticmethod
+    def _with_names(entries, user_id):
+        """Attach display names to [(rank, user_id, score)] (one query per page)."""
+        ids = [entry_user for _, entry_user, _ in entries]
+        names = {}
+        if ids:
+            rows = get_db().execute(
+                f"SELECT id, display_name FROM users WHERE id IN ({', '.join('?' for _ in ids)})",
+                ids,
+            ).fetchall()
+            names = {r["id"]: r["display_name"] for r in rows}
+        return [
+            {
+                "rank": rank,
+                "user_id": entry_user,
+                "display_name": names.get(entry_user, ""),
+                "score": score,
+                "is_me": entry_user == user_id,
+            }
+            for rank, entry_user, score in entries
+        ]
@@ -11,13 +11,24 @@ MUST NOT:
 
 Depends on:
   - db.get_db()
+  - mappers (compiled row mappers, parse_tags)
+  - pagination (keyset pages for GET /api/notes?limit=)
+  - search_repo (full-text match for ?search=)
+  - tag_repo (entity_tags index for ?tag=)
   - utils.now_iso
+  - change_log_repo (records every write for /api/sync)
 """
 
 import json
+from functools import lru_cache
 
 from ..db import get_db
+from ..mappers import map_rows, parse_tags, row_columns
+from ..pagination import keyset_sql, split_page
 from ..utils import now_iso
+from .change_log_repo import OP_DELETE, ChangeLogRepository
+from .search_repo import note_match_clause, search_terms
+from .tag_repo import tag_filter_clause
 
 
 def _escape_like(value):
@@ -26,65 +37,108 @@ def _escape_like(value):
     return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
+@lru_cache(maxsize=16)
+def _note_mapper(columns):
+    """Row -> JSON-safe note dict for rows with exactly `columns`."""
+    has_linked_title = "linked_task_title" in columns
+
+    def map_note_row(row):
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "content": row["content"],
+            "source_type": row["source_type"],
+            "source_id": row["source_id"],
+            "tags": parse_tags(row["tags_json"]),
+            "linked_task_title": row["linked_task_title"] if has_linked_title else None,
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    return map_note_row
+
+
 def _map_note(row):
     """Convert a DB row to a JSON-safe note dict."""
-    tags = []
-    try:
-        tags = json.loads(row["tags_json"] or "[]")
-    except (TypeError, ValueError):
-        tags = []
-    if not isinstance(tags, list):
-        tags = []
-    tags = [str(t).strip().lower() for t in tags if str(t).strip()]
-
-    return {
-        "id": row["id"],
-        "title": row["title"],
-        "content": row["content"],
-        "source_type": row["source_type"],
-        "source_id": row["source_id"],
-        "tags": tags,
-        "linked_task_title": row["linked_task_title"] if "linked_task_title" in row.keys() else None,
-        "created_at": row["created_at"],
-        "updated_at": row["updated_at"],
-    }
+    return _note_mapper(row_columns(row))(row)
 
 
-class NoteRepository:
-    """Data-access object for the notes table."""
+def _map_notes(rows):
+    return map_rows(_note_mapper, rows)
 
-    map_note = staticmethod(_map_note)
 
-    @staticmethod
-    def get_all(user_id, *, source_type=None, search=None, tag=None):
-        db = get_db()
-        query = """
-            SELECT n.*, t.title AS linked_task_title
-            FROM notes n
-            LEFT JOIN tasks t
-              ON n.source_type = 'task'
-             AND n.source_id = t.id
-             AND t.user_id = n.user_id
-            WHERE n.user_id = ?
-        """
-        params = [user_id]
+_NOTE_LIGHT_COLUMNS = """
+    n.id, n.user_id, n.title, '' AS content, n.source_type, n.source_id,
+    n.tags_json, n.created_at, n.updated_at
+"""
 
-        if source_type in ("manual", "task"):
-            query += " AND n.source_type = ?"
-            params.append(source_type)
 
-        if search:
+def _list_query(user_id, source_type, search, tag, columns="n.*"):
+    """Filtered note SELECT (without ORDER BY) and its params."""
+    query = f"""
+        SELECT {columns}, t.title AS linked_task_title
+        FROM notes n
+        LEFT JOIN tasks t
+          ON n.source_type = 'task'
+         AND n.source_id = t.id
+         AND t.user_id = n.user_id
+        WHERE n.user_id = ?
+    """
+    params = [user_id]
+
+    if source_type in ("manual", "task"):
+        query += " AND n.source_type = ?"
+        params.append(source_type)
+
+    if search:
+        # Full-text index when available (see search_repo); LIKE otherwise.
+        terms = search_terms(search)
+        match = note_match_clause(get_db(), terms) if terms else None
+        if match is not None:
+            query += " AND " + match[0]
+            params.extend(match[1])
+        else:
             query += " AND (n.title LIKE ? ESCAPE '\\' OR n.content LIKE ? ESCAPE '\\')"
             like = f"%{_escape_like(search)}%"
             params.extend([like, like])
 
-        if tag:
-            query += " AND n.tags_json LIKE ? ESCAPE '\\'"
-            params.append(f'%"{_escape_like(tag)}"%')
+    if tag:
+        clause, tag_params = tag_filter_clause("note", "n.id", user_id, tag)
+        query += " AND " + clause
+        params.extend(tag_params)
+
+    return query, params
+
+
+class NoteRepository:
+    """Data-access object for the notes table."""
+
+    map_note = staticmethod(_map_note)
+    map_notes = staticmethod(_map_notes)
 
+    @staticmethod
+    def get_all(user_id, *, source_type=None, search=None, tag=None, light=False):
+        """light=True skips note content (notes carry an empty string instead)."""
+        db = get_db()
+        query, params = _list_query(
+            user_id, source_type, search, tag,
+            columns=_NOTE_LIGHT_COLUMNS if light else "n.*",
+        )
         query += " ORDER BY n.updated_at DESC"
         rows = db.execute(query, params).fetchall()
-        return [_map_note(r) for r in rows]
+        return _map_notes(rows)
+
+    @staticmethod
+    def get_page(user_id, page, *, source_type=None, search=None, tag=None, light=False):
+        """One keyset page ordered by (updated_at, id) DESC: (notes, next_cursor)."""
+        query, params = _list_query(
+            user_id, source_type, search, tag,
+            columns=_NOTE_LIGHT_COLUMNS if light else "n.*",
+        )
+        where, order, page_params, tail = keyset_sql("n.updated_at", "n.id", page)
+        rows = get_db().execute(query + where + order, params + page_params + tail).fetchall()
+        rows, next_cursor = split_page(rows, page, "updated_at")
+        return _map_notes(rows), next_cursor
 
     @staticmethod
     def get_by_id(note_id, user_id):
@@ -133,19 +187,23 @@ class NoteRepository:
             (user_id, title, content, source_type, source_id,
              json.dumps(tags), now, now),
         )
+        note_id = cursor.lastrowid
+        ChangeLogRepository.record(user_id, "note", note_id, db=db)
         db.commit()
         return db.execute(
-            "SELECT * FROM notes WHERE id = ? AND user_id = ?", (cursor.lastrowid, user_id)
+            "SELECT * FROM notes WHERE id = ? AND user_id = ?", (note_id, user_id)
         ).fetchone()
 
     @staticmethod
     def update(note_id, user_id, *, title, content, tags):
         db = get_db()
-        db.execute(
+        result = db.execute(
             """UPDATE notes SET title = ?, content = ?, tags_json = ?, updated_at = ?
                WHERE id = ? AND user_id = ?""",
             (title, content, json.dumps(tags), now_iso(), note_id, user_id),
         )
+        if result.rowcount:
+            ChangeLogRepository.record(user_id, "note", note_id, db=db)
         db.commit()
         return db.execute(
             "SELECT * FROM notes WHERE id = ? AND user_id = ?", (note_id, user_id)
@@ -167,10 +225,12 @@ class NoteRepository:
                 "UPDATE tasks SET note_saved_to_notes = 0 WHERE id = ? AND user_id = ?",
                 (note_row["source_id"], user_id),
             )
+            ChangeLogRepository.record(user_id, "task", note_row["source_id"], db=db)
 
         db.execute(
             "DELETE FROM notes WHERE id = ? AND user_id = ?", (note_id, user_id)
         )
+        ChangeLogRepository.record(user_id, "note", note_id, OP_DELETE, db=db)
         db.commit()
         return True
 
@@ -12,11 +12,15 @@ MUST NOT:
 
 Depends on:
   - db.get_db()
+  - pagination (keyset pages for GET /api/meals?limit=)
   - utils (now_iso)
+  - change_log_repo (records every write for /api/sync)
 """
 
 from ..db import get_db
+from ..pagination import keyset_sql, split_page
 from ..utils import now_iso
+from .change_log_repo import OP_DELETE, ChangeLogRepository
 
 
 def _sanitize_float(value, default=0.0):
@@ -51,6 +55,17 @@ class NutritionRepository:
             (user_id,),
         ).fetchall()
 
+    @staticmethod
+    def get_page(user_id, page, date_filter=None):
+        """One keyset page ordered by (date, id) DESC: (rows, next_cursor)."""
+        where, order, params, tail = keyset_sql("date", "id", page)
+        date_cond = " AND date = ?" if date_filter else ""
+        rows = get_db().execute(
+            "SELECT * FROM nutrition_entries WHERE user_id = ?" + date_cond + where + order,
+            [user_id] + ([date_filter] if date_filter else []) + params + tail,
+        ).fetchall()
+        return split_page(rows, page, "date")
+
     @staticmethod
     def get_by_id(meal_id, user_id):
         db = get_db()
@@ -89,8 +104,10 @@ class NutritionRepository:
                 created_at,
             ),
         )
+        meal_id = cursor.lastrowid
+        ChangeLogRepository.record(user_id, "meal", meal_id, db=db)
         db.commit()
-        return cursor.lastrowid
+        return meal_id
 
     @staticmethod
     def update(meal_id, user_id, *, name, meal_type, calories, protein,
@@ -99,7 +116,7 @@ class NutritionRepository:
         clean_name = (name or "").strip()
         if not clean_name:
             raise ValueError("Meal name is required")
-        db.execute(
+        result = db.execute(
             """
             UPDATE nutrition_entries
             SET name = ?, meal_type = ?, calories = ?, protein = ?, carbs = ?,
@@ -121,6 +138,8 @@ class NutritionRepository:
                 user_id,
             ),
         )
+        if result.rowcount:
+            ChangeLogRepository.record(user_id, "meal", meal_id, db=db)
         db.commit()
 
     @staticmethod
@@ -130,8 +149,11 @@ class NutritionRepository:
             "DELETE FROM nutrition_entries WHERE id = ? AND user_id = ?",
             (meal_id, user_id),
         )
+        deleted = result.rowcount > 0
+        if deleted:
+            ChangeLogRepository.record(user_id, "meal", meal_id, OP_DELETE, db=db)
         db.commit()
-        return result.rowcount > 0
+        return deleted
 
     @staticmethod
     def bulk_create(user_id, entries):
@@ -178,6 +200,7 @@ class NutritionRepository:
                     ),
                 )
                 ids.append(cursor.lastrowid)
+            ChangeLogRepository.record(user_id, "meal", ids, db=db)
             db.commit()
             return ids
         except Exception:
@@ -13,10 +13,12 @@ MUST NOT:
 Depends on:
   - db.get_db()
   - utils (now_iso)
+  - change_log_repo (records every write for /api/sync)
 """
 
 from ..db import get_db
 from ..utils import now_iso
+from .change_log_repo import OP_DELETE, ChangeLogRepository
 
 
 class ProjectRepository:
@@ -68,6 +70,7 @@ class ProjectRepository:
                         (project_id, st.strip(), idx, created_at, created_at),
                     )
 
+        ChangeLogRepository.record(user_id, "project", project_id, db=db)
         db.commit()
 
         project_row = db.execute(
@@ -99,6 +102,7 @@ class ProjectRepository:
             """,
             (name, description, due_date, status_val, now_iso(), project_id, user_id),
         )
+        ChangeLogRepository.record(user_id, "project", project_id, db=db)
         db.commit()
         return db.execute(
             "SELECT * FROM projects WHERE id = ? AND user_id = ?",
@@ -159,9 +163,20 @@ class ProjectRepository:
     @staticmethod
     def delete(project_id, user_id):
         db = get_db()
+        # Tasks in the project are detached (ON DELETE SET NULL).
+        task_ids = [
+            row["id"] for row in db.execute(
+                "SELECT id FROM tasks WHERE project_id = ? AND user_id = ?",
+                (project_id, user_id),
+            ).fetchall()
+        ]
         result = db.execute(
             "DELETE FROM projects WHERE id = ? AND user_id = ?",
             (project_id, user_id),
         )
+        deleted = result.rowcount > 0
+        if deleted:
+            ChangeLogRepository.record(user_id, "project", project_id, OP_DELETE, db=db)
+            ChangeLogRepository.record(user_id, "task", task_ids, db=db)
         db.commit()
-        return result.rowcount > 0
+        return deleted
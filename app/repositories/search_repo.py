@@ -0,0 +1,234 @@
+"""
+FILE: app/repositories/search_repo.py
+
+Responsibility:
+  Full-text search over a user's notes and tasks for GET /api/search,
+  ranked, with highlighted snippets. Uses the SQLite FTS5 tables kept in
+  sync by triggers (db.ensure_search_index) or the PostgreSQL tsvector GIN
+  indexes from schema_postgres.sql; falls back to LIKE on SQLite builds
+  without FTS5.
+
+MUST NOT:
+  - Import Flask request/response objects
+  - Write data
+
+Depends on:
+  - db.get_db(), db.search_backend()
+
+Notes:
+  Queries are reduced to word tokens (no user-supplied FTS syntax); every
+  token must match as a word prefix, so partially typed words already
+  match. Snippets are HTML-escaped with matches wrapped in
+  <mark>...</mark>.
+"""
+
+import html
+import re
+
+from ..db import get_db, search_backend
+
+MAX_TERMS = 8
+SNIPPET_WORDS = 12
+
+# Highlight sentinels (private-use code points) replaced after escaping.
+_HL_START = "\ue000"
+_HL_STOP = "\ue001"
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Must match the GIN index expressions in schema_postgres.sql.
+_PG_NOTE_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(n.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(n.content, '')), 'B'))"
+)
+_PG_TASK_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(t.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(t.description, '')), 'B'))"
+)
+_PG_HEADLINE_OPTIONS = (
+    f"StartSel={_HL_START}, StopSel={_HL_STOP}, "
+    f"MaxWords={SNIPPET_WORDS * 2}, MinWords={SNIPPET_WORDS // 2}, ShortWord=2"
+)
+
+
+def search_terms(query):
+    """Lower-cased word tokens of a free-text query (at most MAX_TERMS)."""
+    return _TOKEN_RE.findall(str(query or "").lower())[:MAX_TERMS]
+
+
+def _fts5_query(terms):
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _tsquery(terms):
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _like(term):
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _highlight(text):
+    """HTML-escape a snippet and turn the sentinels into <mark> tags."""
+    escaped = html.escape(text or "")
+    return escaped.replace(_HL_START, "<mark>").replace(_HL_STOP, "</mark>")
+
+
+def _plain_snippet(text, terms):
+    """Snippet for the LIKE fallback: text around the first matching term."""
+    text = text or ""
+    lowered = text.lower()
+    start = min((lowered.find(term) for term in terms if term in lowered), default=0)
+    begin = max(0, start - 40)
+    snippet = text[begin:begin + 160]
+    for term in sorted(set(terms), key=len, reverse=True):
+        snippet = re.sub(re.escape(term), lambda m: f"{_HL_START}{m.group(0)}{_HL_STOP}", snippet, flags=re.IGNORECASE)
+    return ("…" if begin else "") + snippet
+
+
+def note_match_clause(db, terms):
+    """(SQL, params) restricting notes aliased `n` to full-text matches, or None for LIKE."""
+    backend = search_backend(db)
+    if backend == "fts5":
+        return "n.id IN (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ?)", [_fts5_query(terms)]
+    if backend == "tsvector":
+        return f"{_PG_NOTE_VECTOR} @@ to_tsquery('simple', ?)", [_tsquery(terms)]
+    return None
+
+
+class SearchRepository:
+    """Ranked full-text search across notes and tasks."""
+
+    @staticmethod
+    def search_notes(user_id, terms, limit):
+        db = get_db()
+        backend = search_backend(db)
+        if backend == "fts5":
+            rows = db.execute(
+                f"""
+                SELECT n.id, n.title, n.updated_at,
+                       snippet(notes_fts, -1, ?, ?, '…', {SNIPPET_WORDS}) AS snippet,
+                       -bm25(notes_fts, 5.0, 1.0) AS score
+                FROM notes_fts
+                JOIN notes n ON n.id = notes_fts.rowid
+                WHERE notes_fts MATCH ? AND n.user_id = ?
+                ORDER BY score DESC
+                LIMIT ?
+                """,
+                (_HL_START, _HL_STOP, _fts5_query(terms), user_id, limit),
+            ).fetchall()
+        elif backend == "tsvector":
+            rows = db.execute(
+                f"""
+                SELECT id, title, updated_at, score,
+                       ts_headline('simple', content, q, ?) AS snippet
+                FROM (
+                    SELECT n.id, n.title, n.content, n.updated_at, q,
+                           ts_rank({_PG_NOTE_VECTOR}, q) AS score
+                    FROM notes n, to_tsquery('simple', ?) q
+                    WHERE n.user_id = ? AND {_PG_NOTE_VECTOR} @@ q
+                    ORDER BY score DESC
+                    LIMIT ?
+                ) top
+                ORDER BY score DESC
+                """,
+                (_PG_HEADLINE_OPTIONS, _tsquery(terms), user_id, limit),
+            ).fetchall()
+        else:
+            conds = " AND ".join(
+                "(n.title LIKE ? ESCAPE '\\' OR n.content LIKE ? ESCAPE '\\')" for _ in terms
+            )
+            params = [user_id]
+            for term in terms:
+                params.extend([_like(term), _like(term)])
+            rows = db.execute(
+                f"""
+                SELECT n.id, n.title, n.updated_at, n.content AS snippet, 0 AS score
+                FROM notes n
+                WHERE n.user_id = ? AND {conds}
+                ORDER BY n.updated_at DESC
+                LIMIT ?
+                """,
+                params + [limit],
+            ).fetchall()
+            rows = [dict(row, snippet=_plain_snippet(row["snippet"], terms)) for row in rows]
+
+        return [
+            {
+                "type": "note",
+                "id": row["id"],
+                "title": row["title"],
+                "snippet": _highlight(row["snippet"]),
+                "score": float(row["score"] or 0),
+                "updated_at": row["updated_at"],
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def search_tasks(user_id, terms, limit):
+        db = get_db()
+        backend = search_backend(db)
+        if backend == "fts5":
+            rows = db.execute(
+                f"""
+                SELECT t.id, t.title, t.date, t.completed,
+                       snippet(tasks_fts, -1, ?, ?, '…', {SNIPPET_WORDS}) AS snippet,
+                       -bm25(tasks_fts, 5.0, 1.0) AS score
+                FROM tasks_fts
+                JOIN tasks t ON t.id = tasks_fts.rowid
+                WHERE tasks_fts MATCH ? AND t.user_id = ?
+                ORDER BY score DESC
+                LIMIT ?
+                """,
+                (_HL_START, _HL_STOP, _fts5_query(terms), user_id, limit),
+            ).fetchall()
+        elif backend == "tsvector":
+            rows = db.execute(
+                f"""
+                SELECT id, title, date, completed, score,
+                       ts_headline('simple', title || ' ' || description, q, ?) AS snippet
+                FROM (
+                    SELECT t.id, t.title, t.description, t.date, t.completed, q,
+                           ts_rank({_PG_TASK_VECTOR}, q) AS score
+                    FROM tasks t, to_tsquery('simple', ?) q
+                    WHERE t.user_id = ? AND {_PG_TASK_VECTOR} @@ q
+                    ORDER BY score DESC
+                    LIMIT ?
+                ) top
+                ORDER BY score DESC
+                """,
+                (_PG_HEADLINE_OPTIONS, _tsquery(terms), user_id, limit),
+            ).fetchall()
+        else:
+            conds = " AND ".join(
+                "(t.title LIKE ? ESCAPE '\\' OR t.description LIKE ? ESCAPE '\\')" for _ in terms
+            )
+            params = [user_id]
+            for term in terms:
+                params.extend([_like(term), _like(term)])
+            rows = db.execute(
+                f"""
+                SELECT t.id, t.title, t.date, t.completed,
+                       t.title || ' ' || t.description AS snippet, 0 AS score
+                FROM tasks t
+                WHERE t.user_id = ? AND {conds}
+                ORDER BY t.date DESC, t.id DESC
+                LIMIT ?
+                """,
+                params + [limit],
+            ).fetchall()
+            rows = [dict(row, snippet=_plain_snippet(row["snippet"], terms)) for row in rows]
+
+        return [
+            {
+                "type": "task",
+                "id": row["id"],
+                "title": row["title"],
+                "snippet": _highlight(row["snippet"]),
+                "score": float(row["score"] or 0),
+                "date": row["date"],
+                "completed": bool(row["completed"]),
+            }
+            for row in rows
+        ]
@@ -12,7 +12,7 @@ MUST NOT:
 
 Depends on:
   - db.get_db()
-  - points_engine (evaluate_and_save, get_recent_activities,
+  - points_engine (evaluate_and_save, evaluate_range, get_recent_activities,
     check_achievements, level_progress, get_or_create_progress)
 """
 
@@ -23,6 +23,7 @@ from ..points_engine import (
     get_or_create_progress,
     check_achievements,
     evaluate_and_save,
+    evaluate_range,
     get_recent_activities,
     level_progress,
 )
@@ -36,6 +37,15 @@ class StreaksRepository:
         db = get_db()
         return evaluate_and_save(db, user_id, date, protein_goal)
 
+    @staticmethod
+    def recompute(user_id, start_date, end_date, protein_goal):
+        """Re-evaluate a date range in bulk (see points_engine.evaluate_range)."""
+        db = get_db()
+        result = evaluate_range(db, user_id, start_date, end_date, protein_goal)
+        lvl, xp_into, xp_needed, pct = level_progress(result["progress"]["total_points"])
+        result["progress"].update(xp_into_level=xp_into, xp_needed=xp_needed, level_pct=pct)
+        return result
+
     @staticmethod
     def full_progress(user_id, date, protein_goal):
         db = get_db()
@@ -318,3 +328,61 @@ class AnalyticsRepository:
             end_date,
             granularity=granularity,
         )
+
+    @staticmethod
+    def points_history(user_id, start_date, end_date, granularity="daily"):
+        """Points, valid days, tasks and protein per bucket from stats_snapshots.
+
+        Aggregated in SQL over the typed snapshot columns (covering index
+        idx_stats_user_date_points); daily buckets double as heatmap cells.
+        """
+        start_obj = AnalyticsRepository._parse_ymd(start_date)
+        end_obj = AnalyticsRepository._parse_ymd(end_date)
+        if not start_obj or not end_obj or start_obj > end_obj:
+            return []
+
+        mode = (granularity or "daily").strip().lower()
+        if mode not in {"daily", "weekly", "monthly"}:
+            mode = "daily"
+
+        rows = get_db().execute(
+            """
+            SELECT snapshot_date,
+                   SUM(total_points) AS points,
+                   SUM(valid_day) AS valid_days,
+                   SUM(tasks_completed) AS tasks_completed,
+                   SUM(total_protein) AS total_protein
+            FROM stats_snapshots
+            WHERE user_id = ?
+              AND snapshot_date BETWEEN ? AND ?
+            GROUP BY snapshot_date
+            """,
+            (user_id, start_date, end_date),
+        ).fetchall()
+
+        buckets = {}
+        day = start_obj
+        while day <= end_obj:
+            key = AnalyticsRepository._bucket_key(day, mode)
+            if key not in buckets:
+                buckets[key] = {
+                    "date": key,
+                    "granularity": mode,
+                    "points": 0,
+                    "valid_days": 0,
+                    "tasks_completed": 0,
+                    "total_protein": 0,
+                }
+            day += timedelta(days=1)
+
+        for row in rows:
+            day_obj = AnalyticsRepository._parse_ymd(row["snapshot_date"])
+            if not day_obj:
+                continue
+            bucket = buckets[AnalyticsRepository._bucket_key(day_obj, mode)]
+            bucket["points"] += int(row["points"] or 0)
+            bucket["valid_days"] += int(row["valid_days"] or 0)
+            bucket["tasks_completed"] += int(row["tasks_completed"] or 0)
+            bucket["total_protein"] = round(bucket["total_protein"] + float(row["total_protein"] or 0), 1)
+
+        return [buckets[k] for k in sorted(buckets.keys())]
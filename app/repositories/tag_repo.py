@@ -0,0 +1,69 @@
+"""
+FILE: app/repositories/tag_repo.py
+
+Responsibility:
+  Read access to entity_tags, the normalized tag index over notes and
+  tasks: tag filter clauses for the list queries and per-tag counts for
+  GET /api/tags.
+
+MUST NOT:
+  - Import Flask request/response objects
+  - Write data (entity_tags is maintained by triggers on notes and tasks,
+    see schema.sql / schema_postgres.sql and db.ensure_entity_tags)
+
+Depends on:
+  - db.get_db()
+
+Notes:
+  tags_json stays the source of truth for payloads; entity_tags holds one
+  row per (entity, id, tag), trimmed and lower-cased like
+  helpers.normalize_tags, indexed on (user_id, tag, entity, entity_id).
+"""
+
+from ..db import get_db
+
+ENTITIES = ("note", "task")
+
+
+def normalize_tag(tag):
+    return str(tag or "").strip().lower()
+
+
+def tag_filter_clause(entity, id_column, user_id, tag):
+    """(SQL, params) restricting `id_column` to rows of `entity` carrying `tag`."""
+    return (
+        f"{id_column} IN (SELECT et.entity_id FROM entity_tags et"
+        " WHERE et.user_id = ? AND et.tag = ? AND et.entity = ?)",
+        [user_id, normalize_tag(tag), entity],
+    )
+
+
+class TagRepository:
+    """Tag counts over the entity_tags index."""
+
+    @staticmethod
+    def counts(user_id, entity=None):
+        """[{tag, count, notes, tasks}] ordered by count, then tag."""
+        query = """
+            SELECT et.tag,
+                   COUNT(*) AS count,
+                   SUM(CASE WHEN et.entity = 'note' THEN 1 ELSE 0 END) AS notes,
+                   SUM(CASE WHEN et.entity = 'task' THEN 1 ELSE 0 END) AS tasks
+            FROM entity_tags et
+            WHERE et.user_id = ?
+        """
+        params = [user_id]
+        if entity:
+            query += " AND et.entity = ?"
+            params.append(entity)
+        query += " GROUP BY et.tag ORDER BY count DESC, et.tag"
+        rows = get_db().execute(query, params).fetchall()
+        return [
+            {
+                "tag": row["tag"],
+                "count": int(row["count"]),
+                "notes": int(row["notes"] or 0),
+                "tasks": int(row["tasks"] or 0),
+            }
+            for row in rows
+        ]
@@ -13,18 +13,51 @@ MUST NOT:
 
 Depends on:
   - db.get_db()
+  - pagination (keyset pages for GET /api/tasks?limit=)
+  - tag_repo (entity_tags index for ?tag=)
   - utils (now_iso, safe_int)
+  - change_log_repo (records every write for /api/sync)
 """
 
 import json
 from datetime import datetime
 
 from ..db import get_db
+from ..pagination import keyset_sql, split_page
 from ..utils import now_iso, safe_int
+from .change_log_repo import OP_DELETE, ChangeLogRepository
+from .tag_repo import tag_filter_clause
 
 VALID_RECURRENCE = frozenset({"none", "daily", "weekly", "weekdays"})
 _UNSET = object()
 
+# Task rows with their completed focus minutes; callers append ORDER BY.
+_TASK_LIST_QUERY = """
+    SELECT t.*,
+           COALESCE(f.total_focus, 0) as focus_time_spent
+    FROM tasks t
+    LEFT JOIN (
+        SELECT task_id, user_id, SUM(duration_actual) AS total_focus
+        FROM focus_sessions
+        WHERE completed = 1
+        GROUP BY task_id, user_id
+    ) f ON t.id = f.task_id AND f.user_id = t.user_id
+    WHERE t.user_id = ? {filters}
+"""
+
+
+def _task_filters(user_id, date_filter, tag):
+    """Extra WHERE conditions for _TASK_LIST_QUERY and their params."""
+    conds, params = [], []
+    if date_filter:
+        conds.append("t.date = ?")
+        params.append(date_filter)
+    if tag:
+        clause, tag_params = tag_filter_clause("task", "t.id", user_id, tag)
+        conds.append(clause)
+        params.extend(tag_params)
+    return "".join(f" AND {cond}" for cond in conds), params
+
 
 def _parse_ymd(value):
     try:
@@ -100,7 +133,7 @@ class TaskRepository:
             (user_id, target_date),
         ).fetchall()
 
-        created = 0
+        created_ids = []
         now = now_iso()
         for template in templates:
             anchor = _parse_ymd(template["date"])
@@ -122,7 +155,7 @@ class TaskRepository:
             if exists:
                 continue
 
-            db.execute(
+            cursor = db.execute(
                 """
                 INSERT INTO tasks
                 (user_id, project_id, title, description, tags_json, category,
@@ -150,37 +183,31 @@ class TaskRepository:
                     now,
                 ),
             )
-            created += 1
+            created_ids.append(cursor.lastrowid)
 
-        if created:
+        if created_ids:
+            ChangeLogRepository.record(user_id, "task", created_ids, db=db)
             db.commit()
-        return created
+        return len(created_ids)
 
     @staticmethod
-    def get_all(user_id, date_filter=None):
-        db = get_db()
-        q_base = """
-            SELECT t.*, 
-                   COALESCE(f.total_focus, 0) as focus_time_spent
-            FROM tasks t
-            LEFT JOIN (
-                SELECT task_id, user_id, SUM(duration_actual) AS total_focus
-                FROM focus_sessions
-                WHERE completed = 1
-                GROUP BY task_id, user_id
-            ) f ON t.id = f.task_id AND f.user_id = t.user_id
-            WHERE t.user_id = ? {date_cond}
-            ORDER BY t.id DESC
-        """
-        if date_filter:
-            return db.execute(
-                q_base.format(date_cond="AND t.date = ?"),
-                (user_id, date_filter),
-            ).fetchall()
-        return db.execute(
-            q_base.format(date_cond=""),
-            (user_id,),
+    def get_all(user_id, date_filter=None, tag=None):
+        filters, params = _task_filters(user_id, date_filter, tag)
+        return get_db().execute(
+            _TASK_LIST_QUERY.format(filters=filters) + " ORDER BY t.id DESC",
+            [user_id] + params,
+        ).fetchall()
+
+    @staticmethod
+    def get_page(user_id, page, date_filter=None, tag=None):
+        """One keyset page ordered by (date, id) DESC: (rows, next_cursor)."""
+        where, order, params, tail = keyset_sql("t.date", "t.id", page)
+        filters, filter_params = _task_filters(user_id, date_filter, tag)
+        rows = get_db().execute(
+            _TASK_LIST_QUERY.format(filters=filters) + where + order,
+            [user_id] + filter_params + params + tail,
         ).fetchall()
+        return split_page(rows, page, "date")
 
     @staticmethod
     def get_overdue(user_id, before_date, limit=10):
@@ -239,8 +266,10 @@ class TaskRepository:
                 created_at, created_at,
             ),
         )
+        task_id = cursor.lastrowid
+        ChangeLogRepository.record(user_id, "task", task_id, db=db)
         db.commit()
-        return cursor.lastrowid, created_at
+        return task_id, created_at
 
     @staticmethod
     def update(task_id, user_id, *, title, description, tags_json, category,
@@ -284,18 +313,29 @@ class TaskRepository:
                 task_id, user_id,
             ),
         )
+        ChangeLogRepository.record(user_id, "task", task_id, db=db)
         db.commit()
         return now
 
     @staticmethod
     def delete(task_id, user_id):
         db = get_db()
+        # Recurring instances go with their template (ON DELETE CASCADE).
+        instance_ids = [
+            row["id"] for row in db.execute(
+                "SELECT id FROM tasks WHERE recurrence_parent_id = ? AND user_id = ?",
+                (task_id, user_id),
+            ).fetchall()
+        ]
         result = db.execute(
             "DELETE FROM tasks WHERE id = ? AND user_id = ?",
             (task_id, user_id),
         )
+        deleted = result.rowcount > 0
+        if deleted:
+            ChangeLogRepository.record(user_id, "task", [task_id] + instance_ids, OP_DELETE, db=db)
         db.commit()
-        return result.rowcount > 0
+        return deleted
 
     @staticmethod
     def toggle_completed(task_id, user_id):
@@ -311,6 +351,7 @@ class TaskRepository:
             "UPDATE tasks SET completed = ?, updated_at = ? WHERE id = ? AND user_id = ?",
             (new_val, now_iso(), task_id, user_id),
         )
+        ChangeLogRepository.record(user_id, "task", task_id, db=db)
         db.commit()
         return db.execute("SELECT * FROM tasks WHERE id = ? AND user_id = ?", (task_id, user_id)).fetchone()
 
@@ -321,12 +362,13 @@ class NoteLinker:
     @staticmethod
     def create_linked_note(user_id, task_id, title, content, tags_json, created_at):
         db = get_db()
-        db.execute(
+        cursor = db.execute(
             """INSERT INTO notes
                (user_id, title, content, source_type, source_id, tags_json, created_at, updated_at)
                VALUES (?, ?, ?, 'task', ?, ?, ?, ?)""",
             (user_id, title, content, task_id, tags_json, created_at, created_at),
         )
+        ChangeLogRepository.record(user_id, "note", cursor.lastrowid, db=db)
         db.commit()
 
     @staticmethod
@@ -338,24 +380,33 @@ class NoteLinker:
             (task_id, user_id),
         ).fetchone()
         if existing:
+            note_id = existing["id"]
             db.execute(
                 "UPDATE notes SET title = ?, content = ?, tags_json = ?, updated_at = ? WHERE id = ?",
-                (title, content, tags_json, now, existing["id"]),
+                (title, content, tags_json, now, note_id),
             )
         else:
-            db.execute(
+            note_id = db.execute(
                 """INSERT INTO notes
                    (user_id, title, content, source_type, source_id, tags_json, created_at, updated_at)
                    VALUES (?, ?, ?, 'task', ?, ?, ?, ?)""",
                 (user_id, title, content, task_id, tags_json, now, now),
-            )
+            ).lastrowid
+        ChangeLogRepository.record(user_id, "note", note_id, db=db)
         db.commit()
 
     @staticmethod
     def delete_linked_note(user_id, task_id):
         db = get_db()
+        note_ids = [
+            row["id"] for row in db.execute(
+                "SELECT id FROM notes WHERE source_type = 'task' AND source_id = ? AND user_id = ?",
+                (task_id, user_id),
+            ).fetchall()
+        ]
         db.execute(
             "DELETE FROM notes WHERE source_type = 'task' AND source_id = ? AND user_id = ?",
             (task_id, user_id),
         )
+        ChangeLogRepository.record(user_id, "note", note_ids, OP_DELETE, db=db)
         db.commit()
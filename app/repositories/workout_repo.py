@@ -13,32 +13,56 @@ MUST NOT:
 
 Depends on:
   - db.get_db()
+  - pagination (keyset pages for GET /api/workouts?limit=)
   - utils (now_iso, safe_int)
+  - change_log_repo (records every write for /api/sync)
 """
 
 import json
 from datetime import datetime
 
 from ..db import get_db
+from ..pagination import keyset_sql, split_page
 from ..utils import now_iso, safe_int
+from .change_log_repo import OP_DELETE, ChangeLogRepository
+
+# List columns without exercises_json, for views that do not show exercises.
+_WORKOUT_LIGHT_COLUMNS = """
+    id, user_id, name, type, duration, calories_burned, intensity,
+    '[]' AS exercises_json, notes, completed, date, time, created_at, updated_at
+"""
 
 
 class WorkoutRepository:
     """Data-access object for the workouts table."""
 
     @staticmethod
-    def get_all(user_id, date_filter=None):
+    def get_all(user_id, date_filter=None, light=False):
+        """light=True skips exercises_json (rows carry an empty list instead)."""
         db = get_db()
+        columns = _WORKOUT_LIGHT_COLUMNS if light else "*"
         if date_filter:
             return db.execute(
-                "SELECT * FROM workouts WHERE user_id = ? AND date = ? ORDER BY id DESC",
+                f"SELECT {columns} FROM workouts WHERE user_id = ? AND date = ? ORDER BY id DESC",
                 (user_id, date_filter),
             ).fetchall()
         return db.execute(
-            "SELECT * FROM workouts WHERE user_id = ? ORDER BY id DESC",
+            f"SELECT {columns} FROM workouts WHERE user_id = ? ORDER BY id DESC",
             (user_id,),
         ).fetchall()
 
+    @staticmethod
+    def get_page(user_id, page, date_filter=None, light=False):
+        """One keyset page ordered by (date, id) DESC: (rows, next_cursor)."""
+        where, order, params, tail = keyset_sql("date", "id", page)
+        columns = _WORKOUT_LIGHT_COLUMNS if light else "*"
+        date_cond = " AND date = ?" if date_filter else ""
+        rows = get_db().execute(
+            f"SELECT {columns} FROM workouts WHERE user_id = ?" + date_cond + where + order,
+            [user_id] + ([date_filter] if date_filter else []) + params + tail,
+        ).fetchall()
+        return split_page(rows, page, "date")
+
     @staticmethod
     def get_by_id(workout_id, user_id):
         db = get_db()
@@ -82,9 +106,11 @@ class WorkoutRepository:
                 created_at,
             ),
         )
+        workout_id = cursor.lastrowid
+        ChangeLogRepository.record(user_id, "workout", workout_id, db=db)
         db.commit()
         return db.execute(
-            "SELECT * FROM workouts WHERE id = ? AND user_id = ?", (cursor.lastrowid, user_id)
+            "SELECT * FROM workouts WHERE id = ? AND user_id = ?", (workout_id, user_id)
         ).fetchone()
 
     @staticmethod
@@ -96,7 +122,7 @@ class WorkoutRepository:
             raise ValueError("Workout name is required")
         if not isinstance(exercises, list):
             exercises = []
-        db.execute(
+        result = db.execute(
             """
             UPDATE workouts
             SET name = ?, type = ?, duration = ?, calories_burned = ?,
@@ -119,6 +145,8 @@ class WorkoutRepository:
                 user_id,
             ),
         )
+        if result.rowcount:
+            ChangeLogRepository.record(user_id, "workout", workout_id, db=db)
         db.commit()
         return db.execute(
             "SELECT * FROM workouts WHERE id = ? AND user_id = ?", (workout_id, user_id)
@@ -131,8 +159,11 @@ class WorkoutRepository:
             "DELETE FROM workouts WHERE id = ? AND user_id = ?",
             (workout_id, user_id),
         )
+        deleted = result.rowcount > 0
+        if deleted:
+            ChangeLogRepository.record(user_id, "workout", workout_id, OP_DELETE, db=db)
         db.commit()
-        return result.rowcount > 0
+        return deleted
 
     @staticmethod
     def toggle_completed(workout_id, user_id):
@@ -148,6 +179,7 @@ class WorkoutRepository:
             "UPDATE workouts SET completed = ?, updated_at = ? WHERE id = ? AND user_id = ?",
             (new_val, now_iso(), workout_id, user_id),
         )
+        ChangeLogRepository.record(user_id, "workout", workout_id, db=db)
         db.commit()
         return db.execute(
             "SELECT * FROM workouts WHERE id = ? AND user_id = ?", (workout_id, user_id)
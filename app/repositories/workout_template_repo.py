@@ -11,6 +11,7 @@ MUST NOT:
 
 Depends on:
   - db.get_db()
+  - change_log_repo (materialized workouts are logged for GET /api/sync)
   - utils (now_iso, safe_int)
 """
 
@@ -19,6 +20,7 @@ from datetime import datetime
 
 from ..db import get_db
 from ..utils import now_iso, safe_int
+from .change_log_repo import ChangeLogRepository
 
 
 class WorkoutTemplateRepository:
@@ -156,6 +158,7 @@ class WorkoutTemplateRepository:
                 created_at,
             ),
         )
+        ChangeLogRepository.record(user_id, "workout", cursor.lastrowid, db=db)
         db.commit()
         return db.execute(
             "SELECT * FROM workouts WHERE id = ? AND user_id = ?",
@@ -0,0 +1,142 @@
+"""
+FILE: app/shared_goal_cache.py
+
+Responsibility:
+  In-memory cache of public shared-goal payloads, keyed by share token,
+  plus a per-token budget on database lookups. Repository writes call
+  invalidate_shared_goal(goal_id) so edits, progress and revocations show
+  up on the next view.
+
+MUST NOT:
+  - Import Flask, db, or route modules
+  - Hold anything that is not already public through the share link
+
+Depends on:
+  - config.py (SHARED_GOAL_CACHE_TTL_SECONDS, SHARED_GOAL_LOOKUPS_PER_MINUTE)
+
+Notes:
+  The cache is per process. Invalidation reaches the worker that handled
+  the write immediately; other workers converge within the TTL.
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+from .config import Config
+
+_BUDGET_WINDOW_SECONDS = 60.0
+
+
+class SharedGoalBudgetExceeded(Exception):
+    """Too many database lookups for one share token in the current window."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"shared goal lookup budget exceeded; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def payload_etag(payload):
+    """Strong validator for a JSON payload (stable key order)."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+class SharedGoalCache:
+    """Token -> (payload, etag) with TTL, negative caching and lookup budgets.
+
+    A payload of None records that the token is unknown or revoked, so
+    scans of random tokens do not reach the database every time.
+    """
+
+    def __init__(self, ttl_seconds=60, lookups_per_minute=30, max_entries=4096, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.lookups_per_minute = lookups_per_minute
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}      # token -> (expires_at, goal_id, payload, etag)
+        self._by_goal = {}      # goal_id -> token
+        self._budgets = {}      # token -> (window_start, lookups)
+        self.stats = {"hits": 0, "misses": 0, "throttled": 0, "invalidations": 0}
+
+    def get(self, token):
+        """Return (found, payload, etag). found=False means ask the database."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry and entry[0] > now:
+                self.stats["hits"] += 1
+                return True, entry[2], entry[3]
+            self.stats["misses"] += 1
+            return False, None, None
+
+    def charge_lookup(self, token):
+        """Count one database lookup for `token`; raise when over budget."""
+        if not self.lookups_per_minute:
+            return
+        now = self._clock()
+        with self._lock:
+            start, count = self._budgets.get(token, (now, 0))
+            if now - start >= _BUDGET_WINDOW_SECONDS:
+                start, count = now, 0
+            if count >= self.lookups_per_minute:
+                self.stats["throttled"] += 1
+                raise SharedGoalBudgetExceeded(_BUDGET_WINDOW_SECONDS - (now - start))
+            self._budgets[token] = (start, count + 1)
+            if len(self._budgets) > self.max_entries:
+                self._prune_budgets(now)
+
+    def set(self, token, goal_id, payload):
+        """Cache a payload (or None for a missing token); return its etag."""
+        etag = payload_etag(payload) if payload is not None else None
+        now = self._clock()
+        with self._lock:
+            if token not in self._entries and len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[token] = (now + self.ttl_seconds, goal_id, payload, etag)
+            if goal_id is not None:
+                self._by_goal[goal_id] = token
+        return etag
+
+    def invalidate_goal(self, goal_id):
+        with self._lock:
+            token = self._by_goal.pop(goal_id, None)
+            if token is not None:
+                self._entries.pop(token, None)
+                self.stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_goal.clear()
+            self._budgets.clear()
+
+    def _evict(self, now):
+        expired = [t for t, e in self._entries.items() if e[0] <= now]
+        victims = expired or [min(self._entries, key=lambda t: self._entries[t][0])]
+        for token in victims:
+            _, goal_id, _, _ = self._entries.pop(token)
+            if goal_id is not None and self._by_goal.get(goal_id) == token:
+                self._by_goal.pop(goal_id, None)
+
+    def _prune_budgets(self, now):
+        stale = [t for t, (start, _) in self._budgets.items() if now - start >= _BUDGET_WINDOW_SECONDS]
+        for token in stale:
+            self._budgets.pop(token, None)
+
+
+_cache = SharedGoalCache(
+    ttl_seconds=Config.SHARED_GOAL_CACHE_TTL_SECONDS,
+    lookups_per_minute=Config.SHARED_GOAL_LOOKUPS_PER_MINUTE,
+)
+
+
+def get_shared_goal_cache():
+    return _cache
+
+
+def invalidate_shared_goal(goal_id):
+    """Drop the cached public payload for a goal after it changes."""
+    _cache.invalidate_goal(goal_id)
@@ -0,0 +1,77 @@
+"""
+FILE: app/static_assets.py
+
+Responsibility:
+  Locate the output of scripts/build_static.py (static/dist): the asset
+  manifest, and the precompressed .br/.gz sibling of a file that best
+  matches the client's Accept-Encoding.
+
+MUST NOT:
+  - Import Flask, db, or route modules (web_bp sends the files)
+  - Build or minify assets (scripts/build_static.py owns that)
+
+Depends on:
+  - json, pathlib (standard library)
+"""
+
+import json
+import mimetypes
+import threading
+from pathlib import Path
+
+BUILD_DIR_NAME = "dist"
+MANIFEST_NAME = "manifest.json"
+# Preferred first; each maps to the suffix written by the build.
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+# Files in dist/ whose URL never changes; everything else is content-hashed.
+MUTABLE_BUILD_FILES = frozenset({"index.html", "sw.js", MANIFEST_NAME})
+
+_manifest_lock = threading.Lock()
+_manifest_cache = {}  # build dir -> (mtime_ns, manifest)
+
+
+def build_dir(static_dir):
+    return Path(static_dir) / BUILD_DIR_NAME
+
+
+def load_manifest(static_dir):
+    """Return the build manifest, or None when no build exists.
+
+    Re-read only when manifest.json changes, so a rebuild is picked up
+    without restarting the server.
+    """
+    path = build_dir(static_dir) / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _manifest_lock:
+        cached = _manifest_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        _manifest_cache[path] = (mtime, manifest)
+        return manifest
+
+
+def guess_mimetype(name):
+    mimetype, _ = mimetypes.guess_type(str(name))
+    return mimetype or "application/octet-stream"
+
+
+def pick_precompressed(path, quality):
+    """Choose the file to send for `path`.
+
+    `quality(encoding)` returns the client's q-value for an encoding (0 when
+    not accepted). Returns (file_path, content_encoding or None).
+    """
+    path = Path(path)
+    for encoding, suffix in PRECOMPRESSED:
+        if quality(encoding) > 0:
+            candidate = path.with_name(path.name + suffix)
+            if candidate.is_file():
+                return candidate, encoding
+    return path, None
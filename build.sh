@@ -13,4 +13,7 @@ pip install -r requirements.txt
 echo "==> Verifying psycopg2 installation..."
 python -c "import psycopg2; print(f'✓ psycopg2 {psycopg2.__version__} installed successfully')" || (echo "⚠ WARNING: psycopg2 installation failed" && false)
 
+echo "==> Building static assets..."
+python scripts/build_static.py
+
 echo "==> Build complete!"
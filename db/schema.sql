@@ -158,6 +158,20 @@ CREATE TABLE IF NOT EXISTS stats_snapshots (
   snapshot_date TEXT NOT NULL,
   streak_days INTEGER NOT NULL DEFAULT 0 CHECK (streak_days >= 0),
   payload_json TEXT NOT NULL DEFAULT '{}',
+  -- Typed copy of the day evaluation (points_engine.SNAPSHOT_COLUMNS) so
+  -- points, protein and task counts aggregate in SQL; payload_json keeps
+  -- the full evaluation for forward compatibility.
+  task_points INTEGER NOT NULL DEFAULT 0,
+  tasks_completed INTEGER NOT NULL DEFAULT 0,
+  total_tasks INTEGER NOT NULL DEFAULT 0,
+  protein_met INTEGER NOT NULL DEFAULT 0 CHECK (protein_met IN (0,1)),
+  total_protein REAL NOT NULL DEFAULT 0,
+  protein_goal REAL NOT NULL DEFAULT 0,
+  workout_done INTEGER NOT NULL DEFAULT 0 CHECK (workout_done IN (0,1)),
+  total_workouts INTEGER NOT NULL DEFAULT 0,
+  completed_workout_count INTEGER NOT NULL DEFAULT 0,
+  total_points INTEGER NOT NULL DEFAULT 0,
+  valid_day INTEGER NOT NULL DEFAULT 0 CHECK (valid_day IN (0,1)),
   created_at TEXT NOT NULL DEFAULT (CURRENT_TIMESTAMP),
   UNIQUE (user_id, snapshot_date),
   FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
@@ -221,6 +235,7 @@ CREATE TABLE IF NOT EXISTS goals (
   time_limit TEXT,
   notes TEXT NOT NULL DEFAULT '',
   card_image_url TEXT,
+  card_thumb_url TEXT,
   ai_prompt TEXT,
   status TEXT NOT NULL DEFAULT 'active' CHECK (status IN ('active','completed','archived')),
   is_shared INTEGER NOT NULL DEFAULT 0 CHECK (is_shared IN (0,1)),
@@ -231,6 +246,66 @@ CREATE TABLE IF NOT EXISTS goals (
   FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
+-- Per-user change feed for GET /api/sync; one row per (user, entity, id),
+-- written by the repositories. AUTOINCREMENT keeps seq from being reused.
+CREATE TABLE IF NOT EXISTS change_log (
+  seq INTEGER PRIMARY KEY AUTOINCREMENT,
+  user_id INTEGER NOT NULL,
+  entity TEXT NOT NULL,
+  entity_id INTEGER NOT NULL,
+  op TEXT NOT NULL CHECK (op IN ('upsert','delete')),
+  changed_at TEXT NOT NULL DEFAULT (CURRENT_TIMESTAMP),
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Replay results for POST /api/mutations, keyed by the client's idempotency
+-- key; expired rows are purged by the endpoint.
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  user_id INTEGER NOT NULL,
+  idempotency_key TEXT NOT NULL,
+  status INTEGER NOT NULL,
+  response_json TEXT,
+  created_at TEXT NOT NULL,
+  expires_at TEXT NOT NULL,
+  PRIMARY KEY (user_id, idempotency_key),
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Normalized copy of notes.tags_json / tasks.tags_json, one row per tag,
+-- maintained by the trg_*_tags_* triggers below. Serves tag filters and
+-- GET /api/tags counts from the (user_id, tag) index.
+CREATE TABLE IF NOT EXISTS entity_tags (
+  user_id INTEGER NOT NULL,
+  tag TEXT NOT NULL,
+  entity TEXT NOT NULL CHECK (entity IN ('note','task')),
+  entity_id INTEGER NOT NULL,
+  PRIMARY KEY (entity, entity_id, tag),
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Users finished by scripts/nightly_evaluate.py per run date, so an
+-- interrupted run resumes where it stopped.
+CREATE TABLE IF NOT EXISTS evaluation_checkpoints (
+  run_date TEXT NOT NULL,
+  user_id INTEGER NOT NULL,
+  completed_at TEXT NOT NULL,
+  PRIMARY KEY (run_date, user_id),
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Final weekly leaderboards (board = 'points' | 'streak'), written by
+-- repositories.leaderboard_repo.archive_week; week_start is the Monday.
+CREATE TABLE IF NOT EXISTS leaderboard_weekly (
+  week_start TEXT NOT NULL,
+  board TEXT NOT NULL CHECK (board IN ('points','streak')),
+  user_id INTEGER NOT NULL,
+  rank INTEGER NOT NULL,
+  score INTEGER NOT NULL,
+  created_at TEXT NOT NULL DEFAULT (CURRENT_TIMESTAMP),
+  PRIMARY KEY (week_start, board, user_id),
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
 CREATE INDEX IF NOT EXISTS idx_tasks_user_date ON tasks(user_id, date);
 CREATE INDEX IF NOT EXISTS idx_tasks_user_completed_date ON tasks(user_id, completed, date);
 CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project_id);
@@ -241,11 +316,69 @@ CREATE INDEX IF NOT EXISTS idx_workout_templates_user ON workout_templates(user_
 CREATE INDEX IF NOT EXISTS idx_nutrition_user_date ON nutrition_entries(user_id, date);
 CREATE INDEX IF NOT EXISTS idx_subtasks_project ON project_subtasks(project_id, completed);
 CREATE INDEX IF NOT EXISTS idx_stats_user_date ON stats_snapshots(user_id, snapshot_date);
+-- Covering indexes for points history per user and per-day rankings across users.
+CREATE INDEX IF NOT EXISTS idx_stats_user_date_points ON stats_snapshots(user_id, snapshot_date, total_points, valid_day);
+CREATE INDEX IF NOT EXISTS idx_stats_date_points ON stats_snapshots(snapshot_date, user_id, total_points);
+-- Leaderboard scans and archived boards in rank order.
+CREATE INDEX IF NOT EXISTS idx_user_progress_points ON user_progress(total_points, user_id);
+CREATE INDEX IF NOT EXISTS idx_user_progress_streak ON user_progress(current_streak, user_id);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_weekly_rank ON leaderboard_weekly(week_start, board, rank);
 CREATE INDEX IF NOT EXISTS idx_focus_user_date ON focus_sessions(user_id, date);
 CREATE INDEX IF NOT EXISTS idx_notes_user ON notes(user_id);
 CREATE INDEX IF NOT EXISTS idx_notes_source ON notes(source_type, source_id);
 CREATE INDEX IF NOT EXISTS idx_goals_user ON goals(user_id);
 CREATE INDEX IF NOT EXISTS idx_goals_share_token ON goals(share_token);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_change_log_entity ON change_log(user_id, entity, entity_id);
+CREATE INDEX IF NOT EXISTS idx_change_log_user_seq ON change_log(user_id, seq);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys(expires_at);
+-- Keyset pagination: (user_id, sort column, id) serves ORDER BY ... DESC, id DESC.
+CREATE INDEX IF NOT EXISTS idx_tasks_user_date_id ON tasks(user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_nutrition_user_date_id ON nutrition_entries(user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_workouts_user_date_id ON workouts(user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_focus_user_date_id ON focus_sessions(user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_notes_user_updated_id ON notes(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_goals_user_updated_id ON goals(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_entity_tags_user_tag ON entity_tags(user_id, tag, entity, entity_id);
+-- Full-text search tables (notes_fts, tasks_fts) are created by db.ensure_search_index().
+
+-- Keep entity_tags in step with tags_json (trimmed, lower-cased, deduplicated).
+CREATE TRIGGER IF NOT EXISTS trg_notes_tags_insert AFTER INSERT ON notes BEGIN
+  INSERT OR IGNORE INTO entity_tags (user_id, tag, entity, entity_id)
+  SELECT NEW.user_id, lower(trim(value)), 'note', NEW.id
+  FROM json_each(CASE WHEN json_valid(NEW.tags_json) THEN NEW.tags_json ELSE '[]' END)
+  WHERE type = 'text' AND trim(value) <> '';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_tags_update AFTER UPDATE OF tags_json, user_id ON notes BEGIN
+  DELETE FROM entity_tags WHERE entity = 'note' AND entity_id = OLD.id;
+  INSERT OR IGNORE INTO entity_tags (user_id, tag, entity, entity_id)
+  SELECT NEW.user_id, lower(trim(value)), 'note', NEW.id
+  FROM json_each(CASE WHEN json_valid(NEW.tags_json) THEN NEW.tags_json ELSE '[]' END)
+  WHERE type = 'text' AND trim(value) <> '';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notes_tags_delete AFTER DELETE ON notes BEGIN
+  DELETE FROM entity_tags WHERE entity = 'note' AND entity_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_tags_insert AFTER INSERT ON tasks BEGIN
+  INSERT OR IGNORE INTO entity_tags (user_id, tag, entity, entity_id)
+  SELECT NEW.user_id, lower(trim(value)), 'task', NEW.id
+  FROM json_each(CASE WHEN json_valid(NEW.tags_json) THEN NEW.tags_json ELSE '[]' END)
+  WHERE type = 'text' AND trim(value) <> '';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_tags_update AFTER UPDATE OF tags_json, user_id ON tasks BEGIN
+  DELETE FROM entity_tags WHERE entity = 'task' AND entity_id = OLD.id;
+  INSERT OR IGNORE INTO entity_tags (user_id, tag, entity, entity_id)
+  SELECT NEW.user_id, lower(trim(value)), 'task', NEW.id
+  FROM json_each(CASE WHEN json_valid(NEW.tags_json) THEN NEW.tags_json ELSE '[]' END)
+  WHERE type = 'text' AND trim(value) <> '';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_tags_delete AFTER DELETE ON tasks BEGIN
+  DELETE FROM entity_tags WHERE entity = 'task' AND entity_id = OLD.id;
+END;
 
 -- Enforce that task-linked notes reference a task owned by the same user.
 CREATE TRIGGER IF NOT EXISTS trg_notes_task_link_insert
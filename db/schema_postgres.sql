@@ -147,6 +147,20 @@ CREATE TABLE IF NOT EXISTS stats_snapshots (
   snapshot_date TEXT NOT NULL,
   streak_days INTEGER NOT NULL DEFAULT 0 CHECK (streak_days >= 0),
   payload_json TEXT NOT NULL DEFAULT '{}',
+  -- Typed copy of the day evaluation (points_engine.SNAPSHOT_COLUMNS) so
+  -- points, protein and task counts aggregate in SQL; payload_json keeps
+  -- the full evaluation for forward compatibility.
+  task_points INTEGER NOT NULL DEFAULT 0,
+  tasks_completed INTEGER NOT NULL DEFAULT 0,
+  total_tasks INTEGER NOT NULL DEFAULT 0,
+  protein_met INTEGER NOT NULL DEFAULT 0 CHECK (protein_met IN (0,1)),
+  total_protein REAL NOT NULL DEFAULT 0,
+  protein_goal REAL NOT NULL DEFAULT 0,
+  workout_done INTEGER NOT NULL DEFAULT 0 CHECK (workout_done IN (0,1)),
+  total_workouts INTEGER NOT NULL DEFAULT 0,
+  completed_workout_count INTEGER NOT NULL DEFAULT 0,
+  total_points INTEGER NOT NULL DEFAULT 0,
+  valid_day INTEGER NOT NULL DEFAULT 0 CHECK (valid_day IN (0,1)),
   created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
   UNIQUE (user_id, snapshot_date)
 );
@@ -206,6 +220,7 @@ CREATE TABLE IF NOT EXISTS goals (
   time_limit TEXT,
   notes TEXT NOT NULL DEFAULT '',
   card_image_url TEXT,
+  card_thumb_url TEXT,
   ai_prompt TEXT,
   status TEXT NOT NULL DEFAULT 'active' CHECK (status IN ('active','completed','archived')),
   is_shared INTEGER NOT NULL DEFAULT 0 CHECK (is_shared IN (0,1)),
@@ -215,6 +230,56 @@ CREATE TABLE IF NOT EXISTS goals (
   completed_at TEXT
 );
 
+-- Per-user change feed for GET /api/sync; one row per (user, entity, id),
+-- written by the repositories. BIGSERIAL hands out seq at insert time, so
+-- ChangeLogRepository.record() takes a per-user advisory lock to keep each
+-- user's entries committing in seq order.
+CREATE TABLE IF NOT EXISTS change_log (
+  seq BIGSERIAL PRIMARY KEY,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  entity TEXT NOT NULL,
+  entity_id INTEGER NOT NULL,
+  op TEXT NOT NULL CHECK (op IN ('upsert','delete')),
+  changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  idempotency_key TEXT NOT NULL,
+  status INTEGER NOT NULL,
+  response_json TEXT,
+  created_at TEXT NOT NULL,
+  expires_at TEXT NOT NULL,
+  PRIMARY KEY (user_id, idempotency_key)
+);
+
+-- Normalized copy of notes.tags_json / tasks.tags_json, maintained by
+-- sync_entity_tags() below.
+CREATE TABLE IF NOT EXISTS entity_tags (
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  tag TEXT NOT NULL,
+  entity TEXT NOT NULL CHECK (entity IN ('note','task')),
+  entity_id INTEGER NOT NULL,
+  PRIMARY KEY (entity, entity_id, tag)
+);
+
+CREATE TABLE IF NOT EXISTS evaluation_checkpoints (
+  run_date TEXT NOT NULL,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  completed_at TEXT NOT NULL,
+  PRIMARY KEY (run_date, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS leaderboard_weekly (
+  week_start TEXT NOT NULL,
+  board TEXT NOT NULL CHECK (board IN ('points','streak')),
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  rank INTEGER NOT NULL,
+  score INTEGER NOT NULL,
+  created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (week_start, board, user_id)
+);
+
 -- Indexes
 CREATE INDEX IF NOT EXISTS idx_tasks_user_date ON tasks(user_id, date);
 CREATE INDEX IF NOT EXISTS idx_tasks_user_completed_date ON tasks(user_id, completed, date);
@@ -226,11 +291,38 @@ CREATE INDEX IF NOT EXISTS idx_workout_templates_user ON workout_templates(user_
 CREATE INDEX IF NOT EXISTS idx_nutrition_user_date ON nutrition_entries(user_id, date);
 CREATE INDEX IF NOT EXISTS idx_subtasks_project ON project_subtasks(project_id, completed);
 CREATE INDEX IF NOT EXISTS idx_stats_user_date ON stats_snapshots(user_id, snapshot_date);
+-- Covering indexes for points history per user and per-day rankings across users.
+CREATE INDEX IF NOT EXISTS idx_stats_user_date_points ON stats_snapshots(user_id, snapshot_date, total_points, valid_day);
+CREATE INDEX IF NOT EXISTS idx_stats_date_points ON stats_snapshots(snapshot_date, user_id, total_points);
+-- Leaderboard scans and archived boards in rank order.
+CREATE INDEX IF NOT EXISTS idx_user_progress_points ON user_progress(total_points, user_id);
+CREATE INDEX IF NOT EXISTS idx_user_progress_streak ON user_progress(current_streak, user_id);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_weekly_rank ON leaderboard_weekly(week_start, board, rank);
 CREATE INDEX IF NOT EXISTS idx_focus_user_date ON focus_sessions(user_id, date);
 CREATE INDEX IF NOT EXISTS idx_notes_user ON notes(user_id);
 CREATE INDEX IF NOT EXISTS idx_notes_source ON notes(source_type, source_id);
 CREATE INDEX IF NOT EXISTS idx_goals_user ON goals(user_id);
 CREATE INDEX IF NOT EXISTS idx_goals_share_token ON goals(share_token);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_change_log_entity ON change_log(user_id, entity, entity_id);
+CREATE INDEX IF NOT EXISTS idx_change_log_user_seq ON change_log(user_id, seq);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys(expires_at);
+-- Keyset pagination: (user_id, sort column, id) serves ORDER BY ... DESC, id DESC.
+CREATE INDEX IF NOT EXISTS idx_tasks_user_date_id ON tasks(user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_nutrition_user_date_id ON nutrition_entries(user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_workouts_user_date_id ON workouts(user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_focus_user_date_id ON focus_sessions(user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_notes_user_updated_id ON notes(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_goals_user_updated_id ON goals(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_entity_tags_user_tag ON entity_tags(user_id, tag, entity, entity_id);
+-- Full-text search (/api/search): the expressions must match search_repo.py.
+CREATE INDEX IF NOT EXISTS idx_notes_search ON notes USING GIN (
+  (setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+   setweight(to_tsvector('simple', coalesce(content, '')), 'B'))
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_search ON tasks USING GIN (
+  (setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+   setweight(to_tsvector('simple', coalesce(description, '')), 'B'))
+);
 
 -- Enforce that task-linked notes reference a task owned by the same user.
 CREATE OR REPLACE FUNCTION check_notes_task_ownership() RETURNS TRIGGER AS $$
@@ -263,3 +355,51 @@ DO $$ BEGIN
       EXECUTE FUNCTION check_notes_task_ownership();
   END IF;
 END $$;
+
+-- Keep entity_tags in step with tags_json (trimmed, lower-cased, deduplicated).
+-- TG_ARGV[0] is the entity name ('note' or 'task').
+CREATE OR REPLACE FUNCTION sync_entity_tags() RETURNS TRIGGER AS $$
+DECLARE
+  tag_list JSONB;
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    DELETE FROM entity_tags WHERE entity = TG_ARGV[0] AND entity_id = OLD.id;
+  END IF;
+  IF TG_OP = 'DELETE' THEN
+    RETURN NULL;
+  END IF;
+  BEGIN
+    tag_list := NEW.tags_json::jsonb;
+  EXCEPTION WHEN others THEN
+    tag_list := '[]'::jsonb;
+  END;
+  IF jsonb_typeof(tag_list) = 'array' THEN
+    INSERT INTO entity_tags (user_id, tag, entity, entity_id)
+    SELECT DISTINCT NEW.user_id, lower(btrim(value)), TG_ARGV[0], NEW.id
+    FROM jsonb_array_elements_text(tag_list) AS value
+    WHERE btrim(value) <> ''
+    ON CONFLICT DO NOTHING;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$ BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'trg_notes_entity_tags'
+  ) THEN
+    CREATE TRIGGER trg_notes_entity_tags
+      AFTER INSERT OR DELETE OR UPDATE OF tags_json, user_id ON notes
+      FOR EACH ROW EXECUTE FUNCTION sync_entity_tags('note');
+  END IF;
+END $$;
+
+DO $$ BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'trg_tasks_entity_tags'
+  ) THEN
+    CREATE TRIGGER trg_tasks_entity_tags
+      AFTER INSERT OR DELETE OR UPDATE OF tags_json, user_id ON tasks
+      FOR EACH ROW EXECUTE FUNCTION sync_entity_tags('task');
+  END IF;
+END $$;
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization of a large task list.
+
+Builds N mapped tasks (mappers.map_task, as GET /api/tasks returns them)
+and times jsonify() under:
+
+  stdlib — Flask's DefaultJSONProvider (the previous behaviour)
+  fast   — app/json_provider.FastJSONProvider (orjson when installed)
+
+Both payloads are decoded and compared so the benchmark also checks that
+the two providers produce the same data.
+
+Usage:
+    python scripts/bench_json.py
+    python scripts/bench_json.py --tasks 20000 --rounds 10
+"""
+
+import argparse
+import datetime
+import decimal
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Importing the app package creates the app; keep it off the real database.
+_TMP_DIR = tempfile.mkdtemp(prefix="bench-json-")
+os.environ["DATABASE_URL"] = os.path.join(_TMP_DIR, "bench.sqlite")
+os.environ.setdefault("SEED_SHOWCASE_USERS_ON_STARTUP", "0")
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import HAS_ORJSON, FastJSONProvider
+from app.mappers import map_task
+
+
+def _task_rows(count):
+    base = datetime.date(2026, 1, 1)
+    for i in range(count):
+        day = (base + datetime.timedelta(days=i % 365)).isoformat()
+        yield {
+            "id": i + 1,
+            "project_id": (i % 40) or None,
+            "focus_time_spent": i % 90,
+            "title": f"Task {i}: review weekly training plan",
+            "description": "Check volume, sleep and nutrition targets for the coming week.",
+            "tags_json": '["health", "planning", "weekly"]',
+            "category": "health",
+            "priority": ("low", "medium", "high")[i % 3],
+            "completed": i % 2,
+            "date": day,
+            "time_spent": i % 120,
+            "note_content": "",
+            "note_saved_to_notes": 0,
+            "recurrence": "none",
+            "recurrence_parent_id": None,
+            "created_at": f"{day}T08:00:00",
+            "updated_at": f"{day}T09:30:00",
+        }
+
+
+def _time_jsonify(app, payload, rounds):
+    best = float("inf")
+    with app.app_context():
+        body = jsonify(payload).get_data()
+        for _ in range(rounds):
+            started = time.perf_counter()
+            jsonify(payload).get_data()
+            best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON providers on a task list payload.")
+    parser.add_argument("--tasks", type=int, default=5000, help="Tasks in the payload (default: 5000)")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed rounds, best is reported (default: 20)")
+    args = parser.parse_args()
+
+    tasks = [map_task(row) for row in _task_rows(args.tasks)]
+    # A PostgreSQL row would also carry native types.
+    tasks[0]["date"] = datetime.date(2026, 1, 1)
+    tasks[0]["time_spent"] = decimal.Decimal("12.5")
+    payload = {"tasks": tasks}
+
+    stdlib_app = Flask("bench-stdlib")
+    stdlib_app.json = DefaultJSONProvider(stdlib_app)
+    fast_app = Flask("bench-fast")
+    fast_app.json = FastJSONProvider(fast_app)
+
+    before, stdlib_body = _time_jsonify(stdlib_app, payload, args.rounds)
+    after, fast_body = _time_jsonify(fast_app, payload, args.rounds)
+
+    stdlib_tasks = json.loads(stdlib_body)["tasks"]
+    fast_tasks = json.loads(fast_body)["tasks"]
+    # The stdlib provider sends dates as RFC 822 and Decimals as strings;
+    # compare everything except the two native-typed fields.
+    same = stdlib_tasks[1:] == fast_tasks[1:]
+
+    print(f"jsonify {args.tasks} tasks, best of {args.rounds} (orjson: {'yes' if HAS_ORJSON else 'no'})")
+    print(f"  stdlib provider : {before * 1000:8.2f} ms  {len(stdlib_body) / 1024:8.1f} KiB")
+    print(f"  fast provider   : {after * 1000:8.2f} ms  {len(fast_body) / 1024:8.1f} KiB")
+    print(f"  speedup         : {before / after:8.2f}x")
+    print(f"  payloads match  : {'yes' if same else 'NO'}")
+    print(f"  native types    : date={fast_tasks[0]['date']!r} decimal={fast_tasks[0]['time_spent']!r}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark leaderboard rank queries.
+
+Fills a temporary SQLite database with N user_progress rows and compares
+answering "my rank" and a top-10 page:
+
+  sql        — COUNT(*) of users with more points, and ORDER BY ... LIMIT
+               against user_progress (with idx_user_progress_points)
+  in-memory  — leaderboard.Leaderboards loaded from the same rows
+               (indexable skip list: O(log n) rank, update and page seek)
+
+Also times one incremental score update and a full reload.
+
+Usage:
+    python scripts/bench_leaderboard.py
+    python scripts/bench_leaderboard.py --users 500000 --queries 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Importing the app package creates the app; keep it off the real database.
+_TMP_DIR = tempfile.mkdtemp(prefix="bench-leaderboard-")
+os.environ["DATABASE_URL"] = os.path.join(_TMP_DIR, "bench.sqlite")
+os.environ.setdefault("SEED_SHOWCASE_USERS_ON_STARTUP", "0")
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import app
+from app.db import get_db
+from app.leaderboard import Leaderboards
+from app.utils import now_iso
+
+
+def _fill(count, seed=7):
+    rng = random.Random(seed)
+    db = get_db()
+    now = now_iso()
+    db.executemany(
+        "INSERT INTO users (id, email, display_name, password_hash, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+        [(i, f"user{i}@example.com", f"User {i}", "x", now, now) for i in range(1, count + 1)],
+    )
+    db.executemany(
+        "INSERT INTO user_progress (user_id, total_points, current_streak, longest_streak, level) VALUES (?, ?, ?, ?, 1)",
+        [
+            (i, rng.randint(1, 50_000), streak, streak)
+            for i, streak in ((i, rng.randint(0, 60)) for i in range(1, count + 1))
+        ],
+    )
+    db.commit()
+
+
+def _timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQL vs in-memory leaderboard ranks.")
+    parser.add_argument("--users", type=int, default=100_000, help="user_progress rows (default: 100000)")
+    parser.add_argument("--queries", type=int, default=500, help="Rank lookups per case (default: 500)")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    with app.app_context():
+        _fill(args.users)
+        db = get_db()
+        rows = [
+            (r["user_id"], r["total_points"], r["current_streak"])
+            for r in db.execute("SELECT user_id, total_points, current_streak FROM user_progress").fetchall()
+        ]
+        points = {user_id: total for user_id, total, _ in rows}
+
+        started = time.perf_counter()
+        boards = Leaderboards(rebuild_seconds=0)
+        boards.load("2026-01-05", rows, [])
+        load_time = time.perf_counter() - started
+
+        probes = [rng.randint(1, args.users) for _ in range(args.queries)]
+        probe = iter(probes * 2)
+
+        def sql_rank():
+            user_id = next(probe)
+            db.execute(
+                "SELECT COUNT(*) AS n FROM user_progress WHERE total_points > ?", (points[user_id],)
+            ).fetchone()
+
+        sql_rank_time = _timed(sql_rank, args.queries)
+        memory_rank_time = _timed(lambda: boards.rank("points", "global", next(probe)), args.queries)
+
+        def sql_top():
+            db.execute(
+                "SELECT user_id, total_points FROM user_progress ORDER BY total_points DESC, user_id LIMIT 10"
+            ).fetchall()
+
+        sql_top_time = _timed(sql_top, 50)
+        memory_top_time = _timed(lambda: boards.top("points", "global", 10), 50)
+
+        def update():
+            user_id = rng.randint(1, args.users)
+            boards.record(user_id, total_points=rng.randint(1, 50_000), current_streak=rng.randint(0, 60),
+                          week_start=None, week_points=0, valid_days=0)
+
+        update_time = _timed(update, args.queries)
+
+    print(f"{args.users} users; full load {load_time * 1000:.0f} ms")
+    print(f"{'query':<12} {'sql ms':>10} {'memory ms':>10} {'speedup':>8}")
+    for name, sql_time, memory_time in (
+        ("my rank", sql_rank_time, memory_rank_time),
+        ("top 10", sql_top_time, memory_top_time),
+    ):
+        speedup = sql_time / memory_time if memory_time else float("inf")
+        print(f"{name:<12} {sql_time * 1000:10.3f} {memory_time * 1000:10.3f} {speedup:7.0f}x")
+    print(f"incremental update {update_time * 1000:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark row mapping for task and focus-session lists.
+
+Fills a temporary SQLite database with N tasks and N focus sessions for
+one user, loads them through the repositories' list queries, and times
+mapping the fetched rows (the query itself is not timed):
+
+  legacy   — the previous per-row mappers (try/except probing for optional
+             columns, dict(row) copies for focus_time_spent and the joined
+             session fields)
+  compiled — mappers.map_tasks / map_focus_sessions (column set inspected
+             once per result, one specialised function per column set)
+
+Usage:
+    python scripts/bench_mappers.py
+    python scripts/bench_mappers.py --rows 50000 --rounds 10
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Importing the app package creates the app; keep it off the real database.
+_TMP_DIR = tempfile.mkdtemp(prefix="bench-mappers-")
+os.environ["DATABASE_URL"] = os.path.join(_TMP_DIR, "bench.sqlite")
+os.environ.setdefault("SEED_SHOWCASE_USERS_ON_STARTUP", "0")
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import app
+from app.db import get_db
+from app.mappers import map_focus_sessions, map_tasks
+from app.repositories.focus_repo import FocusRepository
+from app.repositories.task_repo import TaskRepository
+from app.utils import now_iso
+
+DATE = "2026-01-15"
+TAGS = ("work", "health", "study", "deep", "errand", "weekly")
+
+
+def _legacy_map_task(row):
+    completed = bool(row["completed"])
+    completed_at = row["updated_at"] if completed else None
+    try:
+        tags = json.loads(row["tags_json"] or "[]")
+    except (TypeError, ValueError, KeyError):
+        tags = []
+    if not isinstance(tags, list):
+        tags = []
+    tags = [str(t).strip().lower() for t in tags if str(t).strip()]
+    try:
+        note_content = row["note_content"] or ""
+    except (IndexError, KeyError):
+        note_content = ""
+    try:
+        note_saved = bool(row["note_saved_to_notes"])
+    except (IndexError, KeyError):
+        note_saved = False
+    try:
+        recurrence = row["recurrence"] or "none"
+    except (IndexError, KeyError):
+        recurrence = "none"
+    try:
+        recurrence_parent_id = row["recurrence_parent_id"]
+    except (IndexError, KeyError):
+        recurrence_parent_id = None
+    try:
+        project_id = row["project_id"]
+    except (IndexError, KeyError):
+        project_id = None
+    try:
+        focus_time = dict(row).get("focus_time_spent", 0)
+    except (IndexError, KeyError, TypeError):
+        focus_time = 0
+    return {
+        "id": row["id"], "project_id": project_id, "focus_time_spent": focus_time,
+        "title": row["title"], "description": row["description"], "tags": tags,
+        "category": row["category"], "priority": row["priority"], "completed": completed,
+        "date": row["date"], "completed_at": completed_at, "completedAt": completed_at,
+        "time_spent": row["time_spent"], "note_content": note_content,
+        "note_saved_to_notes": note_saved, "recurrence": recurrence,
+        "recurrence_parent_id": recurrence_parent_id,
+        "created_at": row["created_at"], "updated_at": row["updated_at"],
+    }
+
+
+def _legacy_map_session(r):
+    return {
+        "id": r["id"], "mode": r["mode"], "durationPlanned": r["duration_planned"],
+        "durationActual": r["duration_actual"], "completed": bool(r["completed"]),
+        "label": r["label"], "date": r["date"], "startedAt": r["started_at"],
+        "endedAt": r["ended_at"], "taskId": dict(r).get("task_id"),
+        "projectId": dict(r).get("project_id"), "taskTitle": dict(r).get("task_title"),
+        "projectName": dict(r).get("project_name"),
+    }
+
+
+def _fill(count, seed=7):
+    rng = random.Random(seed)
+    db = get_db()
+    now = now_iso()
+    cur = db.execute(
+        "INSERT INTO users (email, display_name, password_hash, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+        ("bench@example.com", "Bench", "x", now, now),
+    )
+    user_id = cur.lastrowid
+    db.executemany(
+        """INSERT INTO tasks (user_id, title, description, tags_json, date, completed, created_at, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        [
+            (
+                user_id, f"Task {i}", "Bench task",
+                json.dumps(rng.sample(TAGS, rng.randint(0, 3))),
+                DATE, int(rng.random() < 0.3), now, now,
+            )
+            for i in range(count)
+        ],
+    )
+    db.executemany(
+        """INSERT INTO focus_sessions (user_id, mode, duration_planned, duration_actual, completed,
+                                       label, date, started_at, created_at)
+           VALUES (?, 'pomodoro', 25, 25, 1, ?, ?, ?, ?)""",
+        [(user_id, f"Session {i}", DATE, now, now) for i in range(count)],
+    )
+    db.commit()
+    return user_id
+
+
+def _best(fn, rounds):
+    best = float("inf")
+    result = fn()
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs compiled row mappers.")
+    parser.add_argument("--rows", type=int, default=10_000, help="Tasks and sessions to insert (default: 10000)")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds, best is reported (default: 5)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        user_id = _fill(args.rows)
+        task_rows = TaskRepository.get_all(user_id, DATE)
+        session_rows = FocusRepository.get_all(user_id, date_filter=DATE)
+
+        cases = (
+            ("tasks", task_rows, lambda rows: [_legacy_map_task(r) for r in rows], map_tasks),
+            ("focus sessions", session_rows, lambda rows: [_legacy_map_session(r) for r in rows], map_focus_sessions),
+        )
+        print(f"{'rows':<16} {'count':>7} {'legacy ms':>10} {'compiled ms':>12} {'speedup':>8}")
+        for name, rows, legacy, compiled in cases:
+            legacy_time, legacy_out = _best(lambda: legacy(rows), args.rounds)
+            compiled_time, compiled_out = _best(lambda: compiled(rows), args.rounds)
+            if legacy_out != compiled_out:
+                print(f"{name}: compiled output differs from legacy output")
+                return 1
+            speedup = legacy_time / compiled_time if compiled_time else float("inf")
+            print(
+                f"{name:<16} {len(rows):7d} {legacy_time * 1000:10.2f} "
+                f"{compiled_time * 1000:12.2f} {speedup:7.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
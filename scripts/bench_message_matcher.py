@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark food extraction + intent classification on a chat corpus.
+
+Compares the previous approach (re-sorting every food name per lookup and
+testing each keyword with `in`) against the phrase matcher used by
+app/ai_avatar.py, which scans each message once.
+
+Usage:
+    python scripts/bench_message_matcher.py
+    python scripts/bench_message_matcher.py --messages 20000 --seed 7
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ai_avatar import INDIAN_FOOD_ESTIMATES, INTENT_KEYWORDS, QTY_WORDS, _get_message_matcher, _scan_message
+from app.phrase_matcher import tokenize
+
+TEMPLATES = [
+    "had {q} {f} and {q} {f} for {meal}",
+    "I ate {f} with {f} at {meal}",
+    "log {q} {f}, {f} and {f}",
+    "remind me to buy {f} tomorrow",
+    "need to finish the report before the deadline",
+    "create project {word} launch",
+    "what should I eat after a workout?",
+    "how many calories in {q} {f}",
+    "{f}",
+    "feeling tired today, any tips to stay motivated?",
+]
+# Regression cases checked before timing: (message, intents that must be detected).
+EXPECTED_INTENTS = [
+    ("reminding myself to call mom", {"task"}),
+    ("reminded him about it", {"task"}),
+    ("logged it already", {"nutrition"}),
+    ("logging this now", {"nutrition"}),
+    ("drinking a lot today", {"nutrition"}),
+    ("had 3 eggs", {"nutrition"}),
+    ("price of a new phone", set()),
+]
+# Words that must fold to the same token, and words that must stay whole.
+SAME_TOKEN = [("puddings", "pudding"), ("rowings", "rowing"), ("logged", "log"), ("logging", "log")]
+UNFOLDED = ["speed", "breed", "string", "wedding", "evening", "need"]
+FILLER_WORDS = ["alpha", "budget", "garden", "portfolio", "sprint", "website"]
+MEALS = ["breakfast", "lunch", "dinner", "snack"]
+
+
+def build_corpus(count, seed):
+    rng = random.Random(seed)
+    foods = list(INDIAN_FOOD_ESTIMATES.keys())
+    quantities = ["1", "2", "3", "half", "two"] + [w for w in QTY_WORDS if len(w) > 2]
+    corpus = []
+    for _ in range(count):
+        template = rng.choice(TEMPLATES)
+        message = template
+        while "{f}" in message:
+            message = message.replace("{f}", rng.choice(foods), 1)
+        while "{q}" in message:
+            message = message.replace("{q}", rng.choice(quantities), 1)
+        message = message.replace("{meal}", rng.choice(MEALS)).replace("{word}", rng.choice(FILLER_WORDS))
+        corpus.append(message)
+    return corpus
+
+
+def legacy_scan(message):
+    """The pre-matcher logic: sorted() per call plus substring checks."""
+    lower = message.lower()
+    intents = {intent for intent, kws in INTENT_KEYWORDS.items() if any(kw in lower for kw in kws)}
+    foods = []
+    for key in sorted(INDIAN_FOOD_ESTIMATES.keys(), key=len, reverse=True):
+        if key in lower:
+            foods.append(key)
+    return intents, foods
+
+
+def matcher_scan(message):
+    intents, foods = _scan_message(message)
+    return intents, [m.payload[1] for m in foods]
+
+
+def check_expected():
+    """Return the EXPECTED_INTENTS cases the matcher gets wrong."""
+    failures = []
+    for message, expected in EXPECTED_INTENTS:
+        intents, _ = _scan_message(message)
+        if not expected <= intents or (not expected and intents):
+            failures.append((message, expected, intents))
+    return failures
+
+
+def _plural(word):
+    return word + "es" if word.endswith(("ch", "sh", "x", "o")) else word + "s"
+
+
+def _words(text):
+    return [word for word, _, _ in tokenize(text)]
+
+
+def check_tokens():
+    """Return token folding problems: plural vs singular phrases, SAME_TOKEN, UNFOLDED."""
+    failures = []
+    phrases = [kw for kws in INTENT_KEYWORDS.values() for kw in kws] + list(INDIAN_FOOD_ESTIMATES)
+    for phrase in phrases:
+        words = phrase.lower().split()
+        for i, word in enumerate(words):
+            if not word.isalpha() or word.endswith("s"):
+                continue
+            plural = " ".join(words[:i] + [_plural(word)] + words[i + 1:])
+            if _words(plural) != _words(phrase):
+                failures.append(f"{plural!r} -> {_words(plural)} but {phrase!r} -> {_words(phrase)}")
+    for left, right in SAME_TOKEN:
+        if _words(left) != _words(right):
+            failures.append(f"{left!r} -> {_words(left)} but {right!r} -> {_words(right)}")
+    for word in UNFOLDED:
+        if _words(word) != [word]:
+            failures.append(f"{word!r} -> {_words(word)}, expected it unchanged")
+    return failures
+
+
+def run(fn, corpus, rounds):
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for message in corpus:
+            fn(message)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the chat phrase matcher.")
+    parser.add_argument("--messages", type=int, default=10000, help="Corpus size (default: 10000)")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed rounds, best is reported (default: 3)")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus RNG seed")
+    args = parser.parse_args()
+
+    corpus = build_corpus(max(1, args.messages), args.seed)
+
+    started = time.perf_counter()
+    matcher = _get_message_matcher()
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"Matcher: {len(matcher)} phrases, built in {build_ms:.1f} ms")
+
+    failures = check_expected()
+    for message, expected, intents in failures:
+        print(f"  FAIL {message!r}: expected {sorted(expected)}, got {sorted(intents)}")
+    token_failures = check_tokens()
+    for problem in token_failures:
+        print(f"  FAIL {problem}")
+    if failures or token_failures:
+        return 1
+    print(f"Intent checks: {len(EXPECTED_INTENTS)} passed; token folding checks passed")
+
+    legacy = run(legacy_scan, corpus, args.rounds)
+    current = run(matcher_scan, corpus, args.rounds)
+    per_msg = lambda seconds: seconds / len(corpus) * 1e6
+
+    print(f"Corpus: {len(corpus)} messages, best of {args.rounds}")
+    print(f"  legacy substring scan : {legacy * 1000:8.1f} ms ({per_msg(legacy):6.1f} us/msg)")
+    print(f"  phrase matcher        : {current * 1000:8.1f} ms ({per_msg(current):6.1f} us/msg)")
+    print(f"  speedup               : {legacy / current:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark note search on a large SQLite database.
+
+Fills a temporary database with N notes for one user (the FTS5 triggers
+index them on insert) and times, per query:
+
+  like — the previous NoteRepository.get_all search
+         (title LIKE '%q%' OR content LIKE '%q%', full scan)
+  fts  — SearchRepository.search_notes (FTS5 MATCH, bm25 ranking, snippets)
+
+Queries include keystroke prefixes ("prot", "protein") since the search
+box queries as the user types.
+
+Usage:
+    python scripts/bench_search.py
+    python scripts/bench_search.py --notes 20000 --rounds 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Importing the app package creates the app; keep it off the real database.
+_TMP_DIR = tempfile.mkdtemp(prefix="bench-search-")
+os.environ["DATABASE_URL"] = os.path.join(_TMP_DIR, "bench.sqlite")
+os.environ.setdefault("SEED_SHOWCASE_USERS_ON_STARTUP", "0")
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import app
+from app.db import get_db, search_backend
+from app.repositories.search_repo import SearchRepository, search_terms
+from app.utils import now_iso
+
+WORDS = (
+    "protein oats chicken eggs rice salmon squat deadlift bench press interval "
+    "tempo recovery sleep hydration focus study review budget invoice meeting "
+    "project deadline journal gratitude planning weekly monthly stretch mobility "
+    "walk cycling swim yoga reading chapter lecture exam notes idea draft"
+).split()
+QUERIES = ("prot", "protein", "salmon rice", "deadline review", "zzzmissing")
+
+
+def _note_words(rng, vocabulary, count):
+    # Mostly a long tail of filler words, with the topic words mixed in,
+    # so queries match a realistic few percent of notes.
+    return " ".join(
+        rng.choice(WORDS) if rng.random() < 0.01 else vocabulary[int(rng.paretovariate(1.2)) % len(vocabulary)]
+        for _ in range(count)
+    )
+
+
+def _fill(count, seed=7):
+    rng = random.Random(seed)
+    vocabulary = [f"w{rng.getrandbits(32):08x}" for _ in range(20_000)]
+    db = get_db()
+    now = now_iso()
+    cur = db.execute(
+        "INSERT INTO users (email, display_name, password_hash, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+        ("bench@example.com", "Bench", "x", now, now),
+    )
+    user_id = cur.lastrowid
+    batch = []
+    for i in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(3))
+        content = _note_words(rng, vocabulary, rng.randint(40, 120))
+        batch.append((user_id, f"{title} {i}", content, now, now))
+        if len(batch) == 5000:
+            db.executemany(
+                "INSERT INTO notes (user_id, title, content, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+            batch = []
+    if batch:
+        db.executemany(
+            "INSERT INTO notes (user_id, title, content, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            batch,
+        )
+    db.commit()
+    return user_id
+
+
+def _like_search(user_id, query):
+    like = f"%{query}%"
+    return get_db().execute(
+        """
+        SELECT n.* FROM notes n
+        WHERE n.user_id = ? AND (n.title LIKE ? OR n.content LIKE ?)
+        ORDER BY n.updated_at DESC
+        """,
+        (user_id, like, like),
+    ).fetchall()
+
+
+def _best(fn, rounds):
+    best = float("inf")
+    result = fn()
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LIKE vs full-text note search.")
+    parser.add_argument("--notes", type=int, default=100_000, help="Notes to insert (default: 100000)")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds, best is reported (default: 5)")
+    parser.add_argument("--limit", type=int, default=20, help="Results per search (default: 20)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        db = get_db()
+        backend = search_backend(db)
+        started = time.perf_counter()
+        user_id = _fill(args.notes)
+        print(f"inserted {args.notes} notes in {time.perf_counter() - started:.1f}s (backend: {backend})")
+        if backend != "fts5":
+            print("FTS5 is not available in this SQLite build; nothing to compare.")
+            return 1
+
+        print(f"{'query':<18} {'like ms':>9} {'fts ms':>9} {'speedup':>8} {'like rows':>10} {'fts rows':>9}")
+        for query in QUERIES:
+            like_time, like_rows = _best(lambda: _like_search(user_id, query), args.rounds)
+            terms = search_terms(query)
+            fts_time, fts_rows = _best(
+                lambda: SearchRepository.search_notes(user_id, terms, args.limit), args.rounds
+            )
+            speedup = like_time / fts_time if fts_time else float("inf")
+            print(
+                f"{query:<18} {like_time * 1000:9.2f} {fts_time * 1000:9.2f} {speedup:7.1f}x "
+                f"{len(like_rows):10d} {len(fts_rows):9d}"
+            )
+        sample = SearchRepository.search_notes(user_id, search_terms("salmon rice"), 1)
+        if sample:
+            print(f"sample snippet: {sample[0]['snippet']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
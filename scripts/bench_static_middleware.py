@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark static-asset throughput through the Flask middleware.
+
+Runs the app against a throwaway SQLite database with a logged-in session
+cookie (as a browser would send on every asset request) and times:
+
+  before — the previous behaviour, re-created by a before_request hook that
+           validates the session on every request
+  after  — the route-aware middleware (static requests skip auth/DB work)
+
+Usage:
+    python scripts/bench_static_middleware.py
+    python scripts/bench_static_middleware.py --requests 5000 --path /styles.css
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Use a throwaway database before the app (and its Config) is imported.
+_TMP_DIR = tempfile.mkdtemp(prefix="bench-static-")
+os.environ["DATABASE_URL"] = os.path.join(_TMP_DIR, "bench.sqlite")
+os.environ.setdefault("SEED_SHOWCASE_USERS_ON_STARTUP", "0")
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask import g, request
+
+from app import create_app
+from app.auth import SESSION_COOKIE_NAME, create_session, hash_password, validate_session
+from app.db import get_db
+from app.utils import now_iso
+
+DEFAULT_PATHS = ["/styles.css", "/script.js", "/sw.js", "/manifest.json"]
+
+
+def _login(app):
+    with app.app_context():
+        db = get_db()
+        cursor = db.execute(
+            "INSERT INTO users (email, password_hash, display_name, created_at) VALUES (?, ?, ?, ?)",
+            ("bench@example.com", hash_password("bench-password-1"), "Bench", now_iso()),
+        )
+        db.commit()
+        return create_session(int(cursor.lastrowid))
+
+
+def _legacy_eager_auth():
+    """What inject_user_context used to do for every request."""
+    token = request.cookies.get(SESSION_COOKIE_NAME)
+    if token:
+        row = validate_session(token)
+        if row:
+            g.user_id = row["user_id"]
+
+
+def _time_requests(client, paths, count):
+    started = time.perf_counter()
+    for i in range(count):
+        response = client.get(paths[i % len(paths)])
+        response.close()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark static requests through the middleware.")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per run (default: 3000)")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed rounds, best is reported (default: 3)")
+    parser.add_argument("--path", action="append", help="Static path to request (repeatable)")
+    args = parser.parse_args()
+
+    app = create_app()
+    token = _login(app)
+    static_dir = Path(app.config["STATIC_DIR"])
+    paths = [p for p in (args.path or DEFAULT_PATHS) if (static_dir / p.lstrip("/")).is_file()]
+    if not paths:
+        print("No static files found to request.")
+        return 1
+
+    client = app.test_client()
+    client.set_cookie(SESSION_COOKIE_NAME, token)
+    client.get(paths[0]).close()  # warm up
+
+    after = min(_time_requests(client, paths, args.requests) for _ in range(args.rounds))
+
+    app.before_request_funcs.setdefault(None, []).insert(0, _legacy_eager_auth)
+    before = min(_time_requests(client, paths, args.requests) for _ in range(args.rounds))
+
+    rate = lambda seconds: args.requests / seconds
+    print(f"Static requests: {args.requests} x {args.rounds} rounds over {', '.join(paths)}")
+    print(f"  before (eager session lookup) : {rate(before):8.0f} req/s")
+    print(f"  after  (route-aware, lazy)    : {rate(after):8.0f} req/s")
+    print(f"  speedup                       : {before / after:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
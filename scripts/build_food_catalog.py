@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Build the packed food catalog used for local nutrition estimates.
+
+Reads a CSV with a header row containing at least:
+  name, calories, protein, carbs, fats
+and optionally:
+  serving, grams
+
+Values are per serving. The built-in INDIAN_FOOD_ESTIMATES are included
+first (unless --no-builtin), so CSV rows with the same name override them.
+
+The output is written to a temp file and atomically renamed into place, so
+running workers keep reading the old catalog until they restart.
+
+Usage:
+    python scripts/build_food_catalog.py foods.csv
+    python scripts/build_food_catalog.py foods.csv --output data/food_catalog.sqlite
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ai_avatar import INDIAN_FOOD_ESTIMATES
+from app.config import Config
+from app.food_catalog import write_catalog
+
+REQUIRED_COLUMNS = ("name", "calories", "protein", "carbs", "fats")
+
+
+def _to_float(value, default=0.0):
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return default
+
+
+def iter_csv_foods(csv_path, stats):
+    """Yield (name, estimate) pairs from the CSV, counting skipped rows."""
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        header = {str(h or "").strip().lower() for h in (reader.fieldnames or [])}
+        missing = [col for col in REQUIRED_COLUMNS if col not in header]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+        for raw in reader:
+            row = {str(k or "").strip().lower(): v for k, v in raw.items()}
+            name = str(row.get("name") or "").strip()
+            if not name:
+                stats["skipped"] += 1
+                continue
+            stats["read"] += 1
+            yield name, {
+                "calories": _to_float(row.get("calories")),
+                "protein": _to_float(row.get("protein")),
+                "carbs": _to_float(row.get("carbs")),
+                "fats": _to_float(row.get("fats")),
+                "serving": str(row.get("serving") or "").strip() or "1 serving",
+                "grams": _to_float(row.get("grams"), 100.0) or 100.0,
+            }
+
+
+def build_catalog(csv_path, output_path, *, include_builtin=True):
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    stats = {"read": 0, "skipped": 0}
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        with conn:
+            written = 0
+            if include_builtin:
+                written += write_catalog(conn, INDIAN_FOOD_ESTIMATES.items())
+            written += write_catalog(conn, iter_csv_foods(csv_path, stats))
+            total = conn.execute("SELECT COUNT(*) FROM foods").fetchone()[0]
+            conn.executemany(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)",
+                [
+                    ("source_csv", str(Path(csv_path).name)),
+                    ("built_at", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())),
+                    ("food_count", str(total)),
+                ],
+            )
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, output_path)
+    return {"written": written, "total": total, **stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the packed food catalog from a CSV file.")
+    parser.add_argument("csv", help="Path to the source CSV file")
+    parser.add_argument(
+        "--output",
+        default=str(Config.FOOD_CATALOG_FILE),
+        help=f"Catalog file to write (default: {Config.FOOD_CATALOG_FILE})",
+    )
+    parser.add_argument(
+        "--no-builtin",
+        action="store_true",
+        help="Do not include the built-in INDIAN_FOOD_ESTIMATES",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        print(f"ERROR: CSV not found: {args.csv}")
+        return 1
+
+    started = time.time()
+    try:
+        result = build_catalog(args.csv, args.output, include_builtin=not args.no_builtin)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    print(
+        f"Catalog written to {args.output}: {result['total']} foods "
+        f"({result['read']} CSV rows, {result['skipped']} skipped) "
+        f"in {time.time() - started:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
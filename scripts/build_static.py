@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Build fingerprinted, minified and precompressed static assets.
+
+Reads static/, writes static/dist/:
+  - every .js/.css file minified, renamed to <name>.<hash>.<ext>
+  - index.html with its local <script>/<link> references rewritten
+  - sw.js with SHELL_FILES pointing at the hashed files and a cache
+    version derived from the build
+  - manifest.json mapping source paths to hashed paths
+  - .gz and .br siblings for every text file (br needs the Brotli package)
+
+The server (app/static_assets.py, web_bp) serves static/dist when the
+manifest exists and falls back to the plain static/ files otherwise.
+
+Minification is deliberately conservative: comments are dropped and
+whitespace is collapsed, but newlines are kept so JavaScript automatic
+semicolon insertion behaves exactly as in the source.
+
+Usage:
+    python scripts/build_static.py
+    python scripts/build_static.py --check   # also run `node --check` on the output
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+# Keep in sync with app/static_assets.py (not imported: importing the app
+# package would create the Flask app and touch the database).
+BUILD_DIR_NAME = "dist"
+MANIFEST_NAME = "manifest.json"
+HASHED_SUFFIXES = {".js", ".css"}
+COMPRESSED_SUFFIXES = {".js", ".css", ".html", ".json", ".svg"}
+# Served at fixed URLs: the service worker's scope depends on its path.
+UNHASHED = {"sw.js"}
+HASH_LENGTH = 10
+
+# After these, a "/" starts a regular expression rather than a division.
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete",
+    "void", "throw", "yield", "await", "instanceof",
+}
+
+
+# ---------------------------------------------------------------------------
+# Minifiers
+# ---------------------------------------------------------------------------
+def minify_js(source):
+    """Drop comments and collapse whitespace outside strings/templates/regexes."""
+    out = []
+    i = 0
+    n = len(source)
+    # Stack of brace depths for `${ ... }` expressions inside template literals.
+    template_stack = []
+    last_sig = ""      # last significant (non-space) character emitted
+    last_word = ""     # last identifier emitted, for keyword checks
+
+    def emit_space(has_newline):
+        if not out:
+            return
+        if has_newline:
+            if out[-1].endswith(" "):
+                out[-1] = out[-1][:-1]
+            if not out[-1].endswith("\n"):
+                out.append("\n")
+        elif not out[-1].endswith((" ", "\n")):
+            out.append(" ")
+
+    def copy_template(start):
+        """Copy template text from `start` (after ` or }) up to ` or ${."""
+        j = start
+        while j < n:
+            ch = source[j]
+            if ch == "\\":
+                j += 2
+                continue
+            if ch == "`":
+                return j + 1, False
+            if ch == "$" and j + 1 < n and source[j + 1] == "{":
+                return j + 2, True
+            j += 1
+        return n, False
+
+    while i < n:
+        ch = source[i]
+
+        if ch in " \t\r\n\f\v":
+            j = i
+            while j < n and source[j] in " \t\r\n\f\v":
+                j += 1
+            emit_space("\n" in source[i:j])
+            i = j
+            continue
+
+        if ch == "/" and i + 1 < n and source[i + 1] == "/":
+            j = source.find("\n", i)
+            i = n if j < 0 else j
+            continue
+
+        if ch == "/" and i + 1 < n and source[i + 1] == "*":
+            j = source.find("*/", i + 2)
+            j = n if j < 0 else j + 2
+            emit_space("\n" in source[i:j])
+            i = j
+            continue
+
+        if ch in "'\"":
+            j = i + 1
+            while j < n and source[j] != ch:
+                if source[j] == "\\":
+                    j += 1
+                elif source[j] == "\n":
+                    break  # unterminated; copy as-is
+                j += 1
+            out.append(source[i:j + 1])
+            i = j + 1
+            last_sig, last_word = ch, ""
+            continue
+
+        if ch == "`":
+            j, opened = copy_template(i + 1)
+            out.append(source[i:j])
+            if opened:
+                template_stack.append(0)
+            i = j
+            last_sig, last_word = "`", ""
+            if opened:
+                last_sig = "{"
+            continue
+
+        if template_stack and ch in "{}":
+            if ch == "{":
+                template_stack[-1] += 1
+            elif template_stack[-1] == 0:
+                # End of a `${ ... }` expression: back to template text.
+                template_stack.pop()
+                j, opened = copy_template(i + 1)
+                out.append(source[i:j])
+                if opened:
+                    template_stack.append(0)
+                i = j
+                last_sig, last_word = ("{" if opened else "`"), ""
+                continue
+            else:
+                template_stack[-1] -= 1
+
+        if ch == "/" and (last_sig == "" or last_sig in _REGEX_PRECEDERS or last_word in _REGEX_KEYWORDS):
+            j = i + 1
+            in_class = False
+            while j < n:
+                c = source[j]
+                if c == "\\":
+                    j += 2
+                    continue
+                if c == "\n":
+                    break
+                if c == "[":
+                    in_class = True
+                elif c == "]":
+                    in_class = False
+                elif c == "/" and not in_class:
+                    j += 1
+                    while j < n and (source[j].isalnum() or source[j] in "_$"):
+                        j += 1  # flags
+                    break
+                j += 1
+            out.append(source[i:j])
+            i = j
+            last_sig, last_word = "/", ""
+            continue
+
+        if ch.isalnum() or ch in "_$":
+            j = i
+            while j < n and (source[j].isalnum() or source[j] in "_$"):
+                j += 1
+            word = source[i:j]
+            out.append(word)
+            i = j
+            last_sig, last_word = word[-1], word
+            continue
+
+        out.append(ch)
+        last_sig, last_word = ch, ""
+        i += 1
+
+    return "".join(out).strip() + "\n"
+
+
+_CSS_TOKEN_RE = re.compile(
+    r"""(?P<comment>/\*.*?\*/)|(?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(?P<space>\s+)""",
+    re.DOTALL,
+)
+
+
+def minify_css(source):
+    """Drop comments, collapse whitespace, trim it around { } ; , > and after :."""
+    parts = []
+    pos = 0
+    for match in _CSS_TOKEN_RE.finditer(source):
+        parts.append(source[pos:match.start()])
+        if match.group("string"):
+            parts.append(match.group("string"))
+        elif match.group("space"):
+            parts.append(" ")
+        # Comments are dropped outright: "a/**/.b" means "a.b", not "a .b".
+        pos = match.end()
+    parts.append(source[pos:])
+
+    text = "".join(parts)
+    # Re-split so string contents are never touched by the trims below.
+    pieces = re.split(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""", text)
+    for k in range(0, len(pieces), 2):
+        piece = re.sub(r" ?([{};,>]) ?", r"\1", pieces[k]).replace(": ", ":")
+        pieces[k] = re.sub(r" {2,}", " ", piece).replace(";}", "}")
+    return "".join(pieces).strip() + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def _hashed_name(rel_path, digest):
+    path = Path(rel_path)
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix())
+
+
+def _compress(path):
+    data = path.read_bytes()
+    written = []
+    gz_path = path.with_name(path.name + ".gz")
+    gz_path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(gz_path)
+    if brotli is not None:
+        br_path = path.with_name(path.name + ".br")
+        br_path.write_bytes(brotli.compress(data, quality=11))
+        written.append(br_path)
+    return written
+
+
+def _rewrite_html(html, files):
+    def replace(match):
+        attr, quote, ref = match.group(1), match.group(2), match.group(3)
+        key = ref.lstrip("/").split("?", 1)[0]
+        if key in files:
+            return f"{attr}={quote}/{BUILD_DIR_NAME}/{files[key]}{quote}"
+        return match.group(0)
+
+    return re.sub(r"""\b(src|href)=(["'])([^"'#:]+?)\2""", replace, html)
+
+
+def _rewrite_sw(sw_source, files, version):
+    match = re.search(r"const SHELL_FILES = \[(.*?)\];", sw_source, re.DOTALL)
+    if not match:
+        raise SystemExit("sw.js: SHELL_FILES array not found")
+    entries = re.findall(r"'([^']+)'", match.group(1))
+    shell = []
+    for entry in entries:
+        key = entry.lstrip("/")
+        shell.append(f"/{BUILD_DIR_NAME}/{files[key]}" if key in files else entry)
+    listing = "".join(f"\n  '{url}'," for url in shell)
+    sw_source = sw_source[:match.start()] + f"const SHELL_FILES = [{listing}\n];" + sw_source[match.end():]
+    # Tie cache names to the build so a new deploy prunes old shells.
+    return re.sub(r"const VER\s*=\s*'([^']*)';", lambda m: f"const VER         = '{m.group(1)}-{version}';", sw_source, count=1)
+
+
+def build(static_dir, check=False):
+    dist = static_dir / BUILD_DIR_NAME
+    if dist.exists():
+        shutil.rmtree(dist)
+    dist.mkdir(parents=True)
+
+    files = {}
+    sizes = {"source": 0, "minified": 0, "gzip": 0, "brotli": 0}
+    for src in sorted(static_dir.rglob("*")):
+        if not src.is_file() or dist in src.parents or src.suffix not in HASHED_SUFFIXES:
+            continue
+        rel = src.relative_to(static_dir).as_posix()
+        if rel in UNHASHED:
+            continue
+        text = src.read_text(encoding="utf-8")
+        minified = minify_js(text) if src.suffix == ".js" else minify_css(text)
+        data = minified.encode("utf-8")
+        hashed = _hashed_name(rel, _digest(data))
+        target = dist / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        files[rel] = hashed
+        sizes["source"] += len(text.encode("utf-8"))
+        sizes["minified"] += len(data)
+
+        if check and src.suffix == ".js":
+            result = subprocess.run(["node", "--check", str(target)], capture_output=True, text=True)
+            if result.returncode != 0:
+                raise SystemExit(f"node --check failed for {rel}:\n{result.stderr}")
+
+    version = _digest(json.dumps(files, sort_keys=True).encode("utf-8"))
+
+    index_html = (static_dir / "index.html").read_text(encoding="utf-8")
+    (dist / "index.html").write_text(_rewrite_html(index_html, files), encoding="utf-8")
+    sw_source = (static_dir / "sw.js").read_text(encoding="utf-8")
+    (dist / "sw.js").write_text(_rewrite_sw(sw_source, files, version), encoding="utf-8")
+
+    (dist / MANIFEST_NAME).write_text(
+        json.dumps({"version": version, "files": files}, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+
+    for path in sorted(dist.rglob("*")):
+        if path.is_file() and path.suffix in COMPRESSED_SUFFIXES:
+            for variant in _compress(path):
+                key = "gzip" if variant.suffix == ".gz" else "brotli"
+                if path.suffix in HASHED_SUFFIXES:
+                    sizes[key] += variant.stat().st_size
+
+    return files, version, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build hashed, minified, precompressed static assets.")
+    parser.add_argument("--static-dir", default=str(STATIC_DIR), help="Static source directory")
+    parser.add_argument("--check", action="store_true", help="Syntax-check minified JS with node")
+    args = parser.parse_args()
+
+    files, version, sizes = build(Path(args.static_dir), check=args.check)
+    kb = lambda b: b / 1024
+    print(f"Built {len(files)} assets into {BUILD_DIR_NAME}/ (version {version})")
+    print(f"  source   : {kb(sizes['source']):9.1f} KiB")
+    print(f"  minified : {kb(sizes['minified']):9.1f} KiB")
+    print(f"  gzip     : {kb(sizes['gzip']):9.1f} KiB")
+    if brotli is None:
+        print("  brotli   : skipped (pip install Brotli)")
+    else:
+        print(f"  brotli   : {kb(sizes['brotli']):9.1f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Local stub of the Gemini REST API for exercising app/gemini_client.py.
+
+Serves:
+    POST /v1beta/models/<model>:generateContent
+    POST /v1beta/models/<model>:streamGenerateContent?alt=sse
+
+Failure injection:
+    --fail-first N     answer the first N requests with --fail-status
+    --fail-status CODE HTTP status for injected failures (default: 503)
+    --latency SECONDS  sleep before every response
+
+Point the app at it with:
+    GEMINI_API_KEY=stub GEMINI_API_ENDPOINT=http://localhost:8765 python run.py
+
+Or run the built-in checks (retries, deadlines, circuit breaker) against a
+stub started in-process; these do not need the Gemini SDK:
+    python scripts/gemini_stub_server.py --self-check
+
+Usage:
+    python scripts/gemini_stub_server.py --port 8765 --fail-first 2
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.gemini_client import CircuitBreaker, GeminiClientManager, GeminiUnavailable
+
+DEFAULT_REPLY = {
+    "intent": "general_chat",
+    "intent_confidence": "high",
+    "status": "chat_response",
+    "message": "Hello from the Gemini stub server.",
+}
+
+
+class StubState:
+    def __init__(self, *, fail_first=0, fail_status=503, latency=0.0, reply=None):
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.latency = latency
+        self.reply = json.dumps(reply or DEFAULT_REPLY)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def next_request(self):
+        with self.lock:
+            self.requests += 1
+            return self.requests
+
+
+def make_handler(state):
+    class GeminiStubHandler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):  # keep the console quiet
+            pass
+
+        def _send_json(self, status, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            try:
+                self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client gave up (deadline checks)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            number = state.next_request()
+            if state.latency:
+                time.sleep(state.latency)
+
+            if number <= state.fail_first:
+                self._send_json(state.fail_status, {
+                    "error": {"code": state.fail_status, "message": "injected failure", "status": "UNAVAILABLE"}
+                })
+                return
+
+            path = self.path.split("?", 1)[0]
+            if path.endswith(":generateContent"):
+                self._send_json(200, _candidate(state.reply))
+            elif path.endswith(":streamGenerateContent"):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                try:
+                    for start in range(0, len(state.reply), 16):
+                        chunk = _candidate(state.reply[start:start + 16])
+                        self.wfile.write(f"data: {json.dumps(chunk)}\r\n\r\n".encode("utf-8"))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            else:
+                self._send_json(404, {"error": {"code": 404, "message": "not found"}})
+
+    return GeminiStubHandler
+
+
+def _candidate(text):
+    return {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": text}]},
+            "finishReason": "STOP",
+            "index": 0,
+        }]
+    }
+
+
+def start_stub(state, port=0):
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Self-check: drive GeminiClientManager over HTTP without the SDK
+# ---------------------------------------------------------------------------
+
+class StubHTTPError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class _StubResponse:
+    def __init__(self, text):
+        self.text = text
+        self.candidates = [text]
+
+
+class RestModel:
+    """Minimal generate_content() over plain HTTP, shaped like the SDK's."""
+
+    def __init__(self, base_url, name):
+        self.url = f"{base_url}/v1beta/models/{name}:generateContent"
+
+    def generate_content(self, contents, request_options=None, stream=False):
+        timeout = (request_options or {}).get("timeout", 10)
+        body = json.dumps({"contents": [{"parts": [{"text": str(contents)}]}]}).encode("utf-8")
+        req = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                data = json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            raise StubHTTPError(e.code) from None
+        except urllib.error.URLError as e:
+            if isinstance(e.reason, TimeoutError):
+                raise TimeoutError(str(e.reason)) from None
+            raise ConnectionError(str(e.reason)) from None
+        text = data["candidates"][0]["content"]["parts"][0]["text"]
+        return iter([_StubResponse(text)]) if stream else _StubResponse(text)
+
+
+def _manager_for(server, **kwargs):
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    kwargs.setdefault("breaker", CircuitBreaker(3, 60))
+    return GeminiClientManager(
+        model_name="stub-model",
+        backoff_base=0.01,
+        backoff_cap=0.05,
+        model_factory=lambda name: RestModel(base_url, name),
+        **kwargs,
+    )
+
+
+def self_check():
+    results = []
+
+    def check(name, condition, detail=""):
+        results.append(condition)
+        print(f"  [{'PASS' if condition else 'FAIL'}] {name}{' — ' + detail if detail else ''}")
+
+    print("Gemini client self-check against local stub")
+
+    # 1. Transient failures are retried and succeed within max_retries.
+    state = StubState(fail_first=2, fail_status=503)
+    server = start_stub(state)
+    try:
+        manager = _manager_for(server, timeout=5, max_retries=2)
+        response = manager.generate("hello")
+        check("retries transient 503s", json.loads(response.text)["status"] == "chat_response",
+              f"attempts={state.requests}, retries={manager.stats['retries']}")
+        check("model handle is cached", manager.model() is manager.model())
+    finally:
+        server.shutdown()
+
+    # 2. Non-transient errors are not retried.
+    state = StubState(fail_first=5, fail_status=400)
+    server = start_stub(state)
+    try:
+        manager = _manager_for(server, timeout=5, max_retries=3)
+        try:
+            manager.generate("hello")
+            check("400 is not retried", False, "call unexpectedly succeeded")
+        except StubHTTPError:
+            check("400 is not retried", state.requests == 1, f"attempts={state.requests}")
+    finally:
+        server.shutdown()
+
+    # 3. Per-call deadline bounds a slow upstream.
+    state = StubState(latency=1.0)
+    server = start_stub(state)
+    try:
+        manager = _manager_for(server, timeout=0.3, max_retries=0)
+        started = time.monotonic()
+        try:
+            manager.generate("hello")
+            check("deadline enforced", False, "call unexpectedly succeeded")
+        except (TimeoutError, ConnectionError, OSError):
+            elapsed = time.monotonic() - started
+            check("deadline enforced", elapsed < 0.9, f"gave up after {elapsed:.2f}s")
+    finally:
+        server.shutdown()
+
+    # 4. Persistent failure opens the breaker; calls then short-circuit.
+    state = StubState(fail_first=100, fail_status=503)
+    server = start_stub(state)
+    try:
+        manager = _manager_for(server, timeout=5, max_retries=1, breaker=CircuitBreaker(3, 60))
+        for _ in range(3):
+            try:
+                manager.generate("hello")
+            except (StubHTTPError, GeminiUnavailable):
+                pass
+        before = state.requests
+        try:
+            manager.generate("hello")
+            check("breaker short-circuits", False, "call unexpectedly succeeded")
+        except GeminiUnavailable:
+            check("breaker short-circuits", state.requests == before and manager.breaker.state == "open",
+                  f"upstream requests={before}, short_circuited={manager.stats['short_circuited']}")
+    finally:
+        server.shutdown()
+
+    # 5. Half-open trial closes the breaker once upstream recovers.
+    state = StubState(fail_first=2, fail_status=503)
+    server = start_stub(state)
+    try:
+        manager = _manager_for(server, timeout=5, max_retries=0, breaker=CircuitBreaker(2, 0.2))
+        for _ in range(2):
+            try:
+                manager.generate("hello")
+            except StubHTTPError:
+                pass
+        time.sleep(0.25)
+        manager.generate("hello")
+        check("breaker recovers after reset timeout", manager.breaker.state == "closed")
+    finally:
+        server.shutdown()
+
+    # 6. A call that exhausts its retries counts as one breaker failure.
+    state = StubState(fail_first=100, fail_status=503)
+    server = start_stub(state)
+    try:
+        manager = _manager_for(server, timeout=5, max_retries=2, breaker=CircuitBreaker(3, 60))
+        try:
+            manager.generate("hello")
+        except StubHTTPError:
+            pass
+        check("retries count as one failure", manager.breaker.state == "closed" and state.requests == 3,
+              f"attempts={state.requests}, state={manager.breaker.state}")
+    finally:
+        server.shutdown()
+
+    # 7. A stream abandoned during the half-open trial frees the trial.
+    state = StubState(fail_first=1, fail_status=503)
+    server = start_stub(state)
+    try:
+        manager = _manager_for(server, timeout=5, max_retries=0, breaker=CircuitBreaker(1, 0.2))
+        try:
+            manager.generate("hello")
+        except StubHTTPError:
+            pass
+        time.sleep(0.25)
+        chunks = manager.stream("hello")
+        next(chunks)
+        chunks.close()  # client disconnected before the stream finished
+        manager.generate("hello")
+        check("abandoned stream releases half-open trial", manager.breaker.state == "closed")
+    except GeminiUnavailable as e:
+        check("abandoned stream releases half-open trial", False, str(e))
+    finally:
+        server.shutdown()
+
+    passed = sum(1 for ok in results if ok)
+    print(f"{passed}/{len(results)} checks passed")
+    return 0 if passed == len(results) else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Gemini REST API stub.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-first", type=int, default=0, help="Fail the first N requests")
+    parser.add_argument("--fail-status", type=int, default=503, help="HTTP status for injected failures")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep per request")
+    parser.add_argument("--self-check", action="store_true", help="Run client checks against an in-process stub")
+    args = parser.parse_args()
+
+    if args.self_check:
+        return self_check()
+
+    state = StubState(fail_first=args.fail_first, fail_status=args.fail_status, latency=args.latency)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(state))
+    print(f"Gemini stub listening on http://127.0.0.1:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
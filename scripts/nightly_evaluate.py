@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Nightly streak/points evaluation for every user.
+
+Evaluates "yesterday" for all users who have not evaluated it themselves,
+plus any days since each user's latest snapshot (bounded by
+--max-gap-days), so current_streak and totals stay fresh for users who
+did not open the app. Days that already have a snapshot are never
+re-scored, and gap days use the protein goal stored on the user's latest
+snapshot (the server keeps no other per-user goal). Meant for cron:
+
+    15 0 * * *  cd /srv/fittrack && python scripts/nightly_evaluate.py
+
+Users are split into chunks and spread across a process pool (PostgreSQL;
+SQLite defaults to one inline worker since it has a single writer); each
+worker holds its own DB connection and evaluates a chunk with
+points_engine.evaluate_range() inside one transaction (one savepoint per
+user), so snapshots are written and committed in batches. Finished users
+are recorded in evaluation_checkpoints in the same transaction: rerunning
+after a crash skips them and resumes where the run stopped. Finally the
+weekly leaderboards for the week containing the evaluated day are
+(re)archived into leaderboard_weekly, so Sunday's run leaves the final board.
+
+Usage:
+    python scripts/nightly_evaluate.py
+    python scripts/nightly_evaluate.py --date 2026-03-01 --workers 8 --chunk-size 100
+    python scripts/nightly_evaluate.py --restart   # ignore checkpoints for this date
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import app
+from app.db import discard_inherited_pool, get_db, single_transaction
+from app.points_engine import DEFAULT_PROTEIN_GOAL, evaluate_range
+from app.repositories.leaderboard_repo import LeaderboardRepository, week_bounds
+from app.utils import now_iso
+
+_worker_context = None
+
+
+def _parse_ymd(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _plan(db, target, max_gap_days, restart, default_goal):
+    """Users with days still to evaluate for `target`, ordered by user id.
+
+    Only days after a user's latest snapshot are evaluated: days the user
+    already evaluated in the app (with their own protein goal) are never
+    re-scored. Gap days reuse the protein goal stored on that latest
+    snapshot; users without one get `default_goal`.
+
+    Returns ([(user_id, start_date, protein_goal)], skipped) where skipped
+    counts users passed over as {"evaluated", "signed_up_later",
+    "checkpointed"}.
+    """
+    checkpoint_filter = "" if restart else (
+        " AND NOT EXISTS (SELECT 1 FROM evaluation_checkpoints c"
+        " WHERE c.run_date = ? AND c.user_id = u.id)"
+    )
+    target_str = target.strftime("%Y-%m-%d")
+    params = [target_str] + ([] if restart else [target_str])
+    rows = db.execute(
+        f"""
+        SELECT u.id, u.created_at, s.snapshot_date AS latest, s.protein_goal
+        FROM users u
+        LEFT JOIN stats_snapshots s ON s.user_id = u.id AND s.snapshot_date = (
+            SELECT MAX(s2.snapshot_date) FROM stats_snapshots s2
+            WHERE s2.user_id = u.id AND s2.snapshot_date <= ?
+        )
+        WHERE 1 = 1{checkpoint_filter}
+        ORDER BY u.id
+        """,
+        params,
+    ).fetchall()
+
+    earliest = target - timedelta(days=max_gap_days - 1)
+    checkpointed = 0 if restart else db.execute(
+        "SELECT COUNT(*) AS n FROM evaluation_checkpoints WHERE run_date = ?", (target_str,)
+    ).fetchone()["n"]
+    plan, skipped = [], {"evaluated": 0, "signed_up_later": 0, "checkpointed": int(checkpointed or 0)}
+    for row in rows:
+        try:
+            created = _parse_ymd(str(row["created_at"] or "")[:10])
+        except ValueError:
+            created = earliest
+        if created > target:
+            skipped["signed_up_later"] += 1
+            continue
+        if row["latest"] and row["latest"] >= target_str:
+            skipped["evaluated"] += 1
+            continue
+        start = _parse_ymd(row["latest"]) + timedelta(days=1) if row["latest"] else created
+        start = min(max(start, earliest, created), target)
+        stored_goal = float(row["protein_goal"] or 0) if row["latest"] else 0
+        plan.append((row["id"], start.strftime("%Y-%m-%d"), stored_goal if stored_goal > 0 else default_goal))
+    return plan, skipped
+
+
+def _init_worker():
+    """Give each worker process its own app context and DB connection."""
+    global _worker_context
+    discard_inherited_pool(app)
+    _worker_context = app.app_context()
+    _worker_context.push()
+
+
+def _evaluate_chunk(chunk, run_date):
+    """Evaluate one chunk in a single transaction; returns (done, [(user_id, error)])."""
+    done, failed = 0, []
+    with single_transaction() as db:
+        for user_id, start, protein_goal in chunk:
+            try:
+                with db.savepoint():
+                    evaluate_range(db, user_id, start, run_date, protein_goal)
+                    db.execute(
+                        """INSERT INTO evaluation_checkpoints (run_date, user_id, completed_at)
+                           VALUES (?, ?, ?)
+                           ON CONFLICT(run_date, user_id) DO UPDATE SET completed_at = excluded.completed_at""",
+                        (run_date, user_id, now_iso()),
+                    )
+                done += 1
+            except Exception as exc:  # one bad user must not sink the chunk
+                failed.append((user_id, f"{type(exc).__name__}: {exc}"))
+    return done, failed
+
+
+def _run_chunk(args):
+    return _evaluate_chunk(*args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate yesterday (and gaps) for every user.")
+    parser.add_argument("--date", help="Day to evaluate, YYYY-MM-DD (default: yesterday)")
+    parser.add_argument("--workers", type=int,
+                        help="Worker processes (default: CPU count on PostgreSQL, 1 on SQLite; 1 runs inline)")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Users per transaction (default: 50)")
+    parser.add_argument("--max-gap-days", type=int, default=30,
+                        help="Catch up at most this many days per user (default: 30)")
+    parser.add_argument("--protein-goal", type=float, default=DEFAULT_PROTEIN_GOAL,
+                        help="Protein goal in grams for users with no stored goal yet "
+                             f"(default: {DEFAULT_PROTEIN_GOAL})")
+    parser.add_argument("--restart", action="store_true", help="Ignore checkpoints for this date")
+    parser.add_argument("--keep-checkpoints-days", type=int, default=14,
+                        help="Delete checkpoints older than this many days (default: 14)")
+    args = parser.parse_args()
+
+    try:
+        target = _parse_ymd(args.date) if args.date else date.today() - timedelta(days=1)
+    except ValueError:
+        parser.error("--date must use YYYY-MM-DD")
+    run_date = target.strftime("%Y-%m-%d")
+    if args.workers is None:
+        # SQLite has a single writer, so extra processes only queue on its lock.
+        is_postgres = app.config["DB_CONFIG"]["type"] == "postgresql"
+        args.workers = (os.cpu_count() or 2) if is_postgres else 1
+    workers = max(1, args.workers)
+    chunk_size = max(1, args.chunk_size)
+
+    with app.app_context():
+        db = get_db()
+        cutoff = (target - timedelta(days=max(1, args.keep_checkpoints_days))).strftime("%Y-%m-%d")
+        db.execute("DELETE FROM evaluation_checkpoints WHERE run_date < ?", (cutoff,))
+        db.commit()
+        plan, skipped = _plan(db, target, max(1, args.max_gap_days), args.restart, args.protein_goal)
+
+    if not plan:
+        reasons = [
+            f"{count} {label}"
+            for label, count in (
+                ("already evaluated", skipped["evaluated"]),
+                (f"signed up after {run_date}", skipped["signed_up_later"]),
+                ("checkpointed", skipped["checkpointed"]),
+            )
+            if count
+        ]
+        print(f"[nightly] {run_date}: nothing to do ({', '.join(reasons) or 'no users'})")
+        return 0
+
+    chunks = [plan[i:i + chunk_size] for i in range(0, len(plan), chunk_size)]
+    tasks = [(chunk, run_date) for chunk in chunks]
+    print(f"[nightly] {run_date}: {len(plan)} users in {len(chunks)} chunks, {workers} workers")
+
+    started = time.perf_counter()
+    done, failures = 0, []
+
+    def report(result):
+        nonlocal done
+        chunk_done, chunk_failed = result
+        done += chunk_done
+        failures.extend(chunk_failed)
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed else 0.0
+        print(f"[nightly] {done}/{len(plan)} users, {len(failures)} failed, {rate:.1f} users/sec")
+
+    if workers == 1:
+        with app.app_context():
+            for task in tasks:
+                report(_run_chunk(task))
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+            for future in as_completed([pool.submit(_run_chunk, task) for task in tasks]):
+                report(future.result())
+
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed else 0.0
+    print(f"[nightly] finished {done} users in {elapsed:.1f}s ({rate:.1f} users/sec)")
+
+    week_start, _ = week_bounds(run_date)
+    with app.app_context():
+        archived = LeaderboardRepository.archive_week(week_start)
+    print(f"[nightly] archived weekly leaderboards for {week_start} ({archived} rows)")
+    for user_id, error in failures[:20]:
+        print(f"[nightly][error] user {user_id}: {error}")
+    if len(failures) > 20:
+        print(f"[nightly][error] ... {len(failures) - 20} more")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1075,17 +1075,22 @@ def _seed_stats_and_progress(db, user_id, progress, user_profile):
         }
         db.execute(
             """
-            INSERT INTO stats_snapshots (user_id, snapshot_date, streak_days, payload_json, created_at)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO stats_snapshots (user_id, snapshot_date, streak_days, payload_json,
+                                         tasks_completed, total_protein, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(user_id, snapshot_date) DO UPDATE SET
                 streak_days = excluded.streak_days,
-                payload_json = excluded.payload_json
+                payload_json = excluded.payload_json,
+                tasks_completed = excluded.tasks_completed,
+                total_protein = excluded.total_protein
             """,
             (
                 user_id,
                 snapshot_date,
                 max(0, progress["current_streak"] - day_offset),
                 json.dumps(payload),
+                payload["tasks_completed"],
+                payload["protein_consumed"],
                 now,
             ),
         )
@@ -793,11 +793,7 @@ const goalsHandler = {
     }
 
     try {
-      const response = await fetch('/api/goals', {
-        method: 'GET',
-        headers: { 'Content-Type': 'application/json' },
-        credentials: 'include'
-      });
+      const response = await ApiClient.get('/goals');
 
       if (response.status === 401 || response.status === 403) {
         this.goalsState.goals = [];
@@ -806,7 +802,7 @@ const goalsHandler = {
       }
 
       if (response.ok) {
-        const data = await response.json();
+        const data = response.data || {};
         this.goalsState.goals = data.goals || [];
         this.renderGoals();
       }
@@ -866,7 +862,7 @@ const goalsHandler = {
 
     const bgImg = card.querySelector('.card-image');
     if (bgImg) {
-      bgImg.src = goal.card_image_url || 'https://via.placeholder.com/800x600/e0e7ff/6366f1?text=Goal';
+      bgImg.src = goal.card_thumb_url || goal.card_image_url || 'https://via.placeholder.com/800x600/e0e7ff/6366f1?text=Goal';
       bgImg.alt = goal.title;
     }
 
@@ -895,7 +891,7 @@ const goalsHandler = {
       badge.textContent = goal.status === 'completed' ? 'Completed' : goal.status === 'archived' ? 'Archived' : 'Active';
     }
 
-    const imageUrl = goal.card_image_url || null;
+    const imageUrl = goal.card_thumb_url || goal.card_image_url || null;
     setTimeout(() => {
       crCardSystem.initGoalCanvas(goalId, imageUrl, goal.current_progress, {
         title: goal.title,
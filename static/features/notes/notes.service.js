@@ -40,7 +40,7 @@ var _notes = window._notes || {
     }
   }
 
-  function _buildCollectionUrl() {
+  function _collectionEndpoint() {
     var params = new URLSearchParams();
     if (_notes.filter && _notes.filter !== 'all') {
       params.set('source_type', _notes.filter);
@@ -48,7 +48,7 @@ var _notes = window._notes || {
     if (_notes.searchQuery) {
       params.set('search', _notes.searchQuery);
     }
-    return '/api/notes' + (params.toString() ? '?' + params.toString() : '');
+    return '/notes' + (params.toString() ? '?' + params.toString() : '');
   }
 
   window.NotesService = {
@@ -59,9 +59,9 @@ var _notes = window._notes || {
     apiFetch: _apiFetch,
 
     reload: async function () {
-      var data = await _apiFetch(_buildCollectionUrl());
-      if (Array.isArray(data)) {
-        _notes.items = data;
+      var res = await ApiClient.get(_collectionEndpoint());
+      if (res.ok && Array.isArray(res.data)) {
+        _notes.items = res.data;
       }
       _sync();
       return _notes.items.slice();
@@ -161,6 +161,19 @@ var _notes = window._notes || {
     return window.NotesService.apiFetch(url, opts);
   };
 
+  // Apply /api/sync note changes without refetching. A filtered or searched
+  // list is reloaded instead, since changed notes may no longer match.
+  window.applyNoteSyncChanges = function applyNoteSyncChanges(changes) {
+    if ((_notes.filter && _notes.filter !== 'all') || _notes.searchQuery) {
+      return window.NotesService.reload();
+    }
+    _notes.items = window.OfflineQueue.mergeSyncChanges(_notes.items, changes).sort(function (a, b) {
+      return String(b.updated_at || '').localeCompare(String(a.updated_at || ''));
+    });
+    _sync();
+    return _notes.items.slice();
+  };
+
   window.loadNotes = function loadNotes() {
     return window.NotesService.reload();
   };
@@ -58,16 +58,13 @@ window.AuthModule = (() => {
     return _jsonSafe(res);
   }
 
-  async function _get(url) {
-    const res = await fetch(url, { credentials: 'same-origin' });
-    return _jsonSafe(res);
-  }
-
   // ── Public API ───────────────────────────────────────────
 
   async function checkSession() {
     try {
-      const data = await _get('/api/auth/me');
+      // Through ApiClient so a boot prefetch of /api/auth/me is reused.
+      const res = await ApiClient.request('/auth/me', { quiet: true });
+      const data = res.data || {};
       if (data.ok && data.user) {
         _currentUser = data.user;
         return data.user;
@@ -446,7 +446,24 @@ function applyAuthUserContext(user) {
 window.applyAuthUserContext = applyAuthUserContext;
 
 
+// Endpoints loadActiveUserDataViews() reads through ApiClient.get(); one
+// POST /api/batch covers them. Query strings must match the loaders exactly.
+// (/api/data and /api/projects are not read by the client: projects live in
+// localStorage.)
+function bootPrefetchEndpoints() {
+  return [
+    '/sync', '/tasks', '/meals', '/workouts',
+    streaksProgressEndpoint(), '/goals', '/notes', focusSessionsEndpoint(),
+    '/analytics/summary', monthlyChartEndpoint()
+  ];
+}
+
 async function loadActiveUserDataViews() {
+  await ApiClient.prefetch(bootPrefetchEndpoints()).catch(() => false);
+  // Cursor first, so anything written while the lists load is replayed later.
+  if (window.OfflineQueue && typeof OfflineQueue.markSynced === 'function') {
+    await OfflineQueue.markSynced();
+  }
   loadTaskEnhancements();
   loadSavedMeals();
   loadCalendarImportantDates();
@@ -457,6 +474,10 @@ async function loadActiveUserDataViews() {
   await loadTasks();
   await loadMeals();
   await loadWorkoutsForPage();
+  // These ran before sign-in (nothing to load yet); load them for this user.
+  if (typeof goalsHandler !== 'undefined') await goalsHandler.loadGoals();
+  if (window.NotesService) await NotesService.reload();
+  _focusLoadSessions();
   updateStatisticsForActiveUser();
   renderStatistics();
   refreshStreaksAfterChange();
@@ -506,6 +527,8 @@ window._authAfterShowApp = function _authAfterShowApp(user) {
 };
 
 async function bootstrapSession() {
+  // A signed-in reload gets the session and the boot data in one round trip.
+  await ApiClient.prefetch(['/auth/me'].concat(bootPrefetchEndpoints())).catch(() => false);
   const user = await AuthModule.checkSession();
   const isOnboarded = !!(user && user.onboarding?.profileEssentialsCompletedAt);
   
@@ -1282,35 +1305,48 @@ async function loadTasks() {
   try {
     taskUiState.layout = loadTaskLayoutPreference();
     renderTaskViewToggleState();
-    const response = await fetch('/api/tasks', { credentials: 'same-origin' });
+    const response = await ApiClient.get('/tasks');
     if (!response.ok) throw new Error('Failed to load tasks');
-    const tasks = await response.json();
-    taskUiState.tasks = (Array.isArray(tasks) ? tasks : []).map(t => {
-      const ext = getTaskEnhancement(t.id);
-      return {
-        ...t,
-        description: t.description || '',
-        subtasks: Array.isArray(ext.subtasks) ? ext.subtasks : [],
-        tags: normalizeTaskTags(Array.isArray(t.tags) ? t.tags : ext.tags),
-        completedAt: t.completedAt || null,
-        eisenhowerQuadrant: isValidEisenhowerQuadrant(String(t.eisenhowerQuadrant || '').toLowerCase())
-          ? String(t.eisenhowerQuadrant || '').toLowerCase()
-          : (isValidEisenhowerQuadrant(String(ext.eisenhowerQuadrant || '').toLowerCase()) ? String(ext.eisenhowerQuadrant || '').toLowerCase() : '')
-      };
-    });
-    renderTasks(taskUiState.tasks);
-    if (typeof renderCalendar === 'function') renderCalendar();
-    if (typeof renderProfileDynamicStats === 'function') renderProfileDynamicStats();
-    refreshDashboardMetrics();
-    updateStatisticsForActiveUser();
-    renderStatistics();
-    if (typeof syncToAppState === 'function') syncToAppState('tasks');
+    const tasks = response.data;
+    taskUiState.tasks = (Array.isArray(tasks) ? tasks : []).map(normalizeLoadedTask);
+    renderLoadedTasks();
   } catch (err) {
     console.error('Error loading tasks:', err);
     taskUiState.tasks = [];
     renderTasks(taskUiState.tasks);
   }
 }
+
+function normalizeLoadedTask(t) {
+  const ext = getTaskEnhancement(t.id);
+  return {
+    ...t,
+    description: t.description || '',
+    subtasks: Array.isArray(ext.subtasks) ? ext.subtasks : [],
+    tags: normalizeTaskTags(Array.isArray(t.tags) ? t.tags : ext.tags),
+    completedAt: t.completedAt || null,
+    eisenhowerQuadrant: isValidEisenhowerQuadrant(String(t.eisenhowerQuadrant || '').toLowerCase())
+      ? String(t.eisenhowerQuadrant || '').toLowerCase()
+      : (isValidEisenhowerQuadrant(String(ext.eisenhowerQuadrant || '').toLowerCase()) ? String(ext.eisenhowerQuadrant || '').toLowerCase() : '')
+  };
+}
+
+function renderLoadedTasks() {
+  renderTasks(taskUiState.tasks);
+  if (typeof renderCalendar === 'function') renderCalendar();
+  if (typeof renderProfileDynamicStats === 'function') renderProfileDynamicStats();
+  refreshDashboardMetrics();
+  updateStatisticsForActiveUser();
+  renderStatistics();
+  if (typeof syncToAppState === 'function') syncToAppState('tasks');
+}
+
+// Apply /api/sync task changes (upserts and tombstones) without refetching.
+function applyTaskSyncChanges(changes) {
+  taskUiState.tasks = OfflineQueue.mergeSyncChanges(taskUiState.tasks, changes, normalizeLoadedTask);
+  renderLoadedTasks();
+}
+window.applyTaskSyncChanges = applyTaskSyncChanges;
 async function addTask(title, priority, dueDate, repeat, tags = [], noteContent = '', saveToNotes = false) {
   try {
     // dueDate is a YYYY-MM-DD string (day-level only)
@@ -3846,7 +3882,7 @@ async function loadMeals() {
   const requestId = ++mealsLoadRequestId;
   try {
     let meals;
-    const response = await fetch('/api/meals', { credentials: 'same-origin' });
+    const response = await ApiClient.get('/meals');
     if (!response.ok) {
       if (isAuthFailureStatus(response.status)) {
         if (requestId !== mealsLoadRequestId) return;
@@ -3855,7 +3891,7 @@ async function loadMeals() {
       }
       throw new Error('Failed to load meals');
     }
-    meals = await response.json();
+    meals = response.data;
     if (requestId !== mealsLoadRequestId) return;
     nutritionState.entries = Array.isArray(meals) ? meals : [];
   } catch (err) {
@@ -3863,6 +3899,10 @@ async function loadMeals() {
     if (requestId !== mealsLoadRequestId) return;
     nutritionState.entries = [];
   }
+  renderLoadedMeals();
+}
+
+function renderLoadedMeals() {
   renderNutritionUI();
   refreshDashboardMetrics();
   updateStatisticsForActiveUser();
@@ -3870,6 +3910,14 @@ async function loadMeals() {
   refreshStreaksAfterChange();
   if (typeof syncToAppState === 'function') syncToAppState('meals');
 }
+
+// Apply /api/sync meal changes (upserts and tombstones) without refetching.
+function applyMealSyncChanges(changes) {
+  ++mealsLoadRequestId; // a full load still in flight would overwrite the merge
+  nutritionState.entries = OfflineQueue.mergeSyncChanges(nutritionState.entries, changes);
+  renderLoadedMeals();
+}
+window.applyMealSyncChanges = applyMealSyncChanges;
 function resetNutritionForm() {
   const form = document.getElementById('nutrition-form');
   if (form) form.reset();
@@ -4449,12 +4497,12 @@ async function refreshDashboardMetrics() {
   try {
     let summary;
     let workouts;
-    const summaryRes = await fetch('/api/analytics/summary', { credentials: 'same-origin' });
-    const workoutsRes = await fetch('/api/workouts', { credentials: 'same-origin' });
+    const summaryRes = await ApiClient.get('/analytics/summary');
+    const workoutsRes = await ApiClient.get('/workouts');
     if (isAuthFailureStatus(summaryRes.status) || isAuthFailureStatus(workoutsRes.status)) return;
     if (!summaryRes.ok || !workoutsRes.ok) return;
-    summary = await summaryRes.json();
-    workouts = await workoutsRes.json();
+    summary = summaryRes.data;
+    workouts = workoutsRes.data;
     const tasks = taskUiState.tasks || [];
 
     const completedTasks = tasks.filter(t => t.completed).length;
@@ -4984,22 +5032,30 @@ function _normalizeDayEval(day) {
 /**
  * Fetch streaks/points data from the API (non-demo mode).
  */
+function streaksProgressEndpoint() {
+  return `/streaks/progress?protein_goal=${nutritionState.baseGoals.protein || 140}`;
+}
+
 async function streakFetchFromApi() {
   try {
     if (!hasAuthenticatedUserContext()) return null;
     const proteinGoal = nutritionState.baseGoals.protein || 140;
-    // Trigger server-side evaluation first
-    const evalRes = await fetch('/api/streaks/evaluate', { credentials: 'same-origin', method: 'POST',
-      headers: { 'Content-Type': 'application/json'},
-      body: JSON.stringify({ protein_goal: proteinGoal }),
-    });
-    if (isAuthFailureStatus(evalRes.status)) return null;
-    if (!evalRes.ok) throw new Error('Failed to evaluate streaks');
+    const progressEndpoint = streaksProgressEndpoint();
+    // Trigger server-side evaluation first. A prefetched progress copy was
+    // evaluated by the server when it was built, so it needs no second pass.
+    if (!ApiClient.isPrefetched(progressEndpoint)) {
+      const evalRes = await fetch('/api/streaks/evaluate', { credentials: 'same-origin', method: 'POST',
+        headers: { 'Content-Type': 'application/json'},
+        body: JSON.stringify({ protein_goal: proteinGoal }),
+      });
+      if (isAuthFailureStatus(evalRes.status)) return null;
+      if (!evalRes.ok) throw new Error('Failed to evaluate streaks');
+    }
     // Then fetch progress
-    const res = await fetch(`/api/streaks/progress?protein_goal=${proteinGoal}`, { credentials: 'same-origin' });
+    const res = await ApiClient.get(progressEndpoint);
     if (isAuthFailureStatus(res.status)) return null;
     if (!res.ok) throw new Error('Failed to fetch streaks progress');
-    const data = await res.json();
+    const data = res.data;
     // Normalize server snake_case keys â†’ camelCase for renderStreaksUI
     if (data && data.day) data.day = _normalizeDayEval(data.day);
     return data;
@@ -6089,7 +6145,7 @@ function formatWorkoutDate(value) {
 async function loadWorkoutsForPage() {
   try {
     let rows;
-    const res = await fetch('/api/workouts', { credentials: 'same-origin' });
+    const res = await ApiClient.get('/workouts');
     if (!res.ok) {
       if (isAuthFailureStatus(res.status)) {
         workoutState.workouts = [];
@@ -6097,30 +6153,45 @@ async function loadWorkoutsForPage() {
       }
       throw new Error('Failed to load workouts');
     }
-    rows = await res.json();
-    workoutState.workouts = (Array.isArray(rows) ? rows : []).map((w, index) => {
-      const meta = workoutMeta(w.id);
-      return {
-        ...w,
-        id: Number(w?.id) || (Date.now() + index),
-        name: String(w?.name || 'Workout'),
-        date: String(w?.date || dateStr()),
-        completed: !!w?.completed,
-        muscleGroup: meta.muscleGroup || '',
-        estimatedDuration: meta.estimatedDuration || (Number(w?.duration) || 60),
-        exercises: Array.isArray(w.exercises) ? w.exercises : []
-      };
-    });
+    rows = res.data;
+    workoutState.workouts = (Array.isArray(rows) ? rows : []).map(normalizeLoadedWorkout);
   } catch (err) {
     console.error('Error loading workouts:', err);
     workoutState.workouts = [];
   }
+  renderLoadedWorkouts();
+}
+
+function normalizeLoadedWorkout(w, index = 0) {
+  const meta = workoutMeta(w.id);
+  return {
+    ...w,
+    id: Number(w?.id) || (Date.now() + index),
+    name: String(w?.name || 'Workout'),
+    date: String(w?.date || dateStr()),
+    completed: !!w?.completed,
+    muscleGroup: meta.muscleGroup || '',
+    estimatedDuration: meta.estimatedDuration || (Number(w?.duration) || 60),
+    exercises: Array.isArray(w.exercises) ? w.exercises : []
+  };
+}
+
+function renderLoadedWorkouts() {
   renderWorkoutPage();
   refreshDashboardMetrics();
   updateStatisticsForActiveUser();
   renderStatistics();
   if (typeof syncToAppState === 'function') syncToAppState('workouts');
 }
+
+// Apply /api/sync workout changes (upserts and tombstones) without refetching.
+function applyWorkoutSyncChanges(changes) {
+  workoutState.workouts = OfflineQueue.mergeSyncChanges(
+    workoutState.workouts, changes, w => normalizeLoadedWorkout(w)
+  );
+  renderLoadedWorkouts();
+}
+window.applyWorkoutSyncChanges = applyWorkoutSyncChanges;
 function weekBounds(offsetWeeks = 0) {
   const now = new Date();
   const start = new Date(now);
@@ -7304,6 +7375,16 @@ function renderNutritionAreaChart() {
     window.setTimeout(() => area.classList.add('is-revealed'), 320);
   });
 }
+function monthlyChartEndpoint() {
+  // Last 90 days, daily buckets.
+  const endDate = new Date();
+  const startDate = new Date();
+  startDate.setDate(endDate.getDate() - 89); // 90 days window
+
+  const fmt = d => d.toISOString().split('T')[0]; // → "2026-01-01"
+  return `/analytics/weekly?start_date=${fmt(startDate)}&end_date=${fmt(endDate)}&granularity=daily`;
+}
+
 async function renderMonthlyLineChart() {
   const svg = document.getElementById('statistics-monthly-svg');
   const labels = document.getElementById('statistics-monthly-labels');
@@ -7317,18 +7398,9 @@ async function renderMonthlyLineChart() {
   }
 
   // ── 1. Fetch real data from API (last 90 days) ──────────────
-  const endDate = new Date();
-  const startDate = new Date();
-  startDate.setDate(endDate.getDate() - 89); // 90 days window
-
-  const fmt = d => d.toISOString().split('T')[0]; // → "2026-01-01"
-
   let rows = [];
   try {
-    const res = await fetch(
-      `/api/analytics/weekly?start_date=${fmt(startDate)}&end_date=${fmt(endDate)}&granularity=daily`,
-      { credentials: 'same-origin' }
-    );
+    const res = await ApiClient.get(monthlyChartEndpoint());
     if (isAuthFailureStatus(res.status)) {
       svg.innerHTML = `<text x="50%" y="50%" text-anchor="middle" fill="#94a3b8">Sign in to view progress</text>`;
       labels.innerHTML = '';
@@ -7336,7 +7408,7 @@ async function renderMonthlyLineChart() {
       return;
     }
     if (!res.ok) throw new Error('Failed to fetch');
-    rows = await res.json();
+    rows = res.data;
   } catch (err) {
     console.warn('Progress chart: API error', err);
     svg.innerHTML = `<text x="50%" y="50%" text-anchor="middle" fill="#94a3b8">No data available</text>`;
@@ -9771,11 +9843,13 @@ function _buildMentorPromptString(ctx) {
   lines.push('');
   lines.push('--- TASKS ---');
   lines.push(`Tasks completed today: ${ctx.tasks.completed}/${ctx.tasks.total}`);
+  const _more = (n) => (n > 0 ? ` (+${n} more)` : '');
   if (ctx.tasks.overdue.length > 0) {
-    lines.push(`Overdue tasks (${ctx.tasks.overdue.length}): ${ctx.tasks.overdue.map(t => t.title).join(', ')}`);
+    const overdueCount = ctx.tasks.overdue_count || ctx.tasks.overdue.length;
+    lines.push(`Overdue tasks (${overdueCount}): ${ctx.tasks.overdue.map(t => t.title).join(', ')}${_more(ctx.tasks.overdue_more)}`);
   }
   if (ctx.tasks.upcoming.length > 0) {
-    lines.push(`Remaining today: ${ctx.tasks.upcoming.map(t => `${t.title} [${t.priority}]`).join(', ')}`);
+    lines.push(`Remaining today: ${ctx.tasks.upcoming.map(t => `${t.title} [${t.priority}]`).join(', ')}${_more(ctx.tasks.upcoming_more)}`);
   }
   lines.push('');
   lines.push('--- NUTRITION ---');
@@ -9791,7 +9865,7 @@ function _buildMentorPromptString(ctx) {
   } else {
     lines.push(`Workouts: ${ctx.workouts.completed}/${ctx.workouts.total} completed`);
     if (ctx.workouts.pending_names.length > 0) {
-      lines.push(`Pending: ${ctx.workouts.pending_names.join(', ')}`);
+      lines.push(`Pending: ${ctx.workouts.pending_names.join(', ')}${_more(ctx.workouts.pending_more)}`);
     }
   }
 
@@ -9824,6 +9898,72 @@ Rules:
 - Address the user by first name.
 - Use line breaks between thoughts for readability.`;
 
+/**
+ * POST a chat payload to /api/ai/chat/stream and read the SSE reply.
+ * onDelta(textSoFar) is called as partial text arrives.
+ * Falls back to /api/ai/chat when the browser cannot read response streams.
+ * Resolves to { ok, data } where data is the final payload.
+ */
+async function _aiStreamChat(payload, onDelta) {
+  const init = { credentials: 'same-origin', method: 'POST',
+    headers: { 'Content-Type': 'application/json'},
+    body: JSON.stringify(payload)
+  };
+
+  if (typeof TextDecoder === 'undefined' || typeof ReadableStream === 'undefined') {
+    const response = await fetch('/api/ai/chat', init);
+    let data = {};
+    try { data = await response.json(); } catch (_) { data = {}; }
+    return { ok: response.ok, data };
+  }
+
+  const response = await fetch('/api/ai/chat/stream', init);
+  const contentType = response.headers.get('Content-Type') || '';
+  if (!response.ok || !response.body || !contentType.includes('text/event-stream')) {
+    let data = {};
+    try { data = await response.json(); } catch (_) { data = {}; }
+    return { ok: false, data };
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let text = '';
+  let result = null;
+
+  const handleEvent = (raw) => {
+    let event = 'message';
+    const dataLines = [];
+    raw.split('\n').forEach((line) => {
+      if (line.startsWith('event:')) event = line.slice(6).trim();
+      else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+    });
+    if (!dataLines.length) return;
+    let data;
+    try { data = JSON.parse(dataLines.join('\n')); } catch (_) { return; }
+    if (event === 'delta' && data && data.text) {
+      text += data.text;
+      if (onDelta) onDelta(text);
+    } else if (event === 'result') {
+      result = data;
+    }
+  };
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let sep;
+    while ((sep = buffer.indexOf('\n\n')) >= 0) {
+      handleEvent(buffer.slice(0, sep));
+      buffer = buffer.slice(sep + 2);
+    }
+  }
+  if (buffer.trim()) handleEvent(buffer);
+
+  return { ok: result !== null, data: result || {} };
+}
+
 /**
  * Generate the mentor message " calls Gemini with real context.
  * Falls back to a structured local message if Gemini is unavailable.
@@ -9863,18 +10003,23 @@ async function generateMentorMessage() {
       }
     };
 
-    const response = await fetch('/api/ai/chat', { credentials: 'same-origin', method: 'POST',
-      headers: { 'Content-Type': 'application/json'},
-      body: JSON.stringify(payload)
+    // Stream the reply so the check-in appears as it is written
+    let streamBody = null;
+    const { ok, data } = await _aiStreamChat(payload, (partial) => {
+      if (!streamBody) {
+        if (container && container.lastChild) container.removeChild(container.lastChild);
+        _aiAddMessage('<div class="mentor-message"><div class="mentor-header"><span class="mentor-icon">🔥</span> <strong>Daily Check-in</strong></div><div class="mentor-body"></div></div>', 'bot');
+        streamBody = container ? container.lastChild.querySelector('.mentor-body') : null;
+        if (!streamBody) return;
+      }
+      streamBody.innerHTML = _aiMarkdown(partial);
+      container.scrollTop = container.scrollHeight;
     });
 
-    let data = {};
-    try { data = await response.json(); } catch (_) { data = {}; }
-
-    // Remove typing indicator
+    // Remove typing indicator / partial reply; the final payload is authoritative
     if (container && container.lastChild) container.removeChild(container.lastChild);
 
-    if (response.ok && data.status === 'chat_response' && data.message) {
+    if (ok && data.status === 'chat_response' && data.message) {
       _aiAddMessage(`<div class="mentor-message"><div class="mentor-header"><span class="mentor-icon">🔥</span> <strong>Daily Check-in</strong></div><div class="mentor-body">${_aiMarkdown(data.message)}</div></div>`, 'bot');
     } else {
       // Gemini failed " render structured local fallback
@@ -10780,6 +10925,10 @@ function _focusLogSession(completed, actualMinutes) {
   if (typeof syncToAppState === 'function') syncToAppState('focus');
 }
 
+function focusSessionsEndpoint() {
+  return `/focus/sessions?date=${new Date().toISOString().slice(0, 10)}`;
+}
+
 function _focusLoadSessions() {
   const today = new Date().toISOString().slice(0, 10);
 
@@ -10795,11 +10944,8 @@ function _focusLoadSessions() {
       _focusUpdateSummary();
       return;
     }
-    fetch(`/api/focus/sessions?date=${today}`, { credentials: 'same-origin' })
-      .then((r) => {
-        if (isAuthFailureStatus(r.status)) return [];
-        return r.json();
-      })
+    ApiClient.get(focusSessionsEndpoint())
+      .then((res) => (res.ok ? res.data : []))
       .then(data => {
         _focus.sessions = data || [];
         _focusRenderSessions();
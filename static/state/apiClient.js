@@ -27,20 +27,19 @@
    * @param {string}  opts.method   — HTTP verb (default GET)
    * @param {Object}  [opts.body]   — JSON-serializable body
    * @param {Object}  [opts.params] — URL query parameters
+   * @param {boolean} [opts.quiet]  — don't log non-2xx responses (expected 401s)
    * @returns {Promise<{ok: boolean, data: *, status: number, error: string|null}>}
    */
   async function request(endpoint, opts) {
     opts = opts || {};
     var method = (opts.method || 'GET').toUpperCase();
-    var url = BASE + endpoint;
+    var url = buildUrl(endpoint, opts.params);
 
-    // Append query params
-    if (opts.params) {
-      var qs = Object.keys(opts.params)
-        .filter(function (k) { return opts.params[k] != null; })
-        .map(function (k) { return encodeURIComponent(k) + '=' + encodeURIComponent(opts.params[k]); })
-        .join('&');
-      if (qs) url += '?' + qs;
+    if (method === 'GET') {
+      var hit = takePrefetched(url);
+      if (hit) return { ok: true, data: hit.body, status: 200, error: null };
+    } else if (endpoint !== '/batch') {
+      clearPrefetched(); // a write; /batch only runs GETs
     }
 
     var fetchOpts = {
@@ -61,7 +60,7 @@
 
       if (!res.ok) {
         var errMsg = (data && data.error) || ('HTTP ' + res.status);
-        console.error('[ApiClient] ' + method + ' ' + url + ' → ' + res.status, errMsg);
+        if (!opts.quiet) console.error('[ApiClient] ' + method + ' ' + url + ' → ' + res.status, errMsg);
         return { ok: false, data: data, status: res.status, error: errMsg };
       }
 
@@ -72,11 +71,77 @@
     }
   }
 
+  function buildUrl(endpoint, params) {
+    var url = BASE + endpoint;
+    if (params) {
+      var qs = Object.keys(params)
+        .filter(function (k) { return params[k] != null; })
+        .map(function (k) { return encodeURIComponent(k) + '=' + encodeURIComponent(params[k]); })
+        .join('&');
+      if (qs) url += (url.indexOf('?') === -1 ? '?' : '&') + qs;
+    }
+    return url;
+  }
+
+  // ── Batched Prefetch ───────────────────────────────────────
+  //
+  // prefetch() loads several GET endpoints through one POST /api/batch and
+  // holds each 200 body for a short time. The next get() of the exact same
+  // URL is answered from that copy (once). Any write made through this
+  // client drops the copies; code writing with raw fetch() calls
+  // clearPrefetched() (offlineQueue does it for every mutation).
+
+  var PREFETCH_TTL_MS = 10000;
+  var _prefetched = {};
+
+  function heldCopy(url) {
+    var hit = _prefetched[url];
+    return hit && hit.expires > Date.now() ? hit : null;
+  }
+
+  function takePrefetched(url) {
+    var hit = heldCopy(url);
+    delete _prefetched[url];
+    return hit;
+  }
+
+  function isPrefetched(endpoint, params) {
+    return !!heldCopy(buildUrl(endpoint, params));
+  }
+
+  function clearPrefetched() {
+    _prefetched = {};
+  }
+
+  async function batch(requests) {
+    var res = await request('/batch', { method: 'POST', body: { requests: requests } });
+    return res.ok && res.data ? res.data.responses : null;
+  }
+
+  async function prefetch(endpoints) {
+    var urls = endpoints
+      .map(function (endpoint) { return buildUrl(endpoint); })
+      .filter(function (url) { return !heldCopy(url); });
+    if (!urls.length) return true;
+    // Best effort: a signed-out 401 here just means every get() goes out.
+    var res = await request('/batch', { method: 'POST', body: { requests: urls }, quiet: true });
+    var responses = res.ok && res.data ? res.data.responses : null;
+    if (!Array.isArray(responses)) return false;
+    var expires = Date.now() + PREFETCH_TTL_MS;
+    responses.forEach(function (item) {
+      if (item.status === 200) {
+        _prefetched[item.path] = { body: item.body, etag: item.etag, expires: expires };
+      }
+    });
+    return true;
+  }
+
   // ── Convenience Methods ────────────────────────────────────
 
   window.ApiClient = {
     /**
-     * GET request.
+     * GET request. Served from a prefetch()ed copy of the same URL if one
+     * is held.
      * @param {string} endpoint
      * @param {Object} [params] — query params
      */
@@ -125,7 +190,32 @@
      * @param {string} endpoint
      * @param {Object} opts
      */
-    request: request
+    request: request,
+
+    /**
+     * Run several GET requests in one round trip (POST /api/batch).
+     * @param {Array<string|Object>} requests — paths, or {id, path, etag}
+     * @returns {Promise<Array|null>} per-item {id, path, status, etag, body}
+     */
+    batch: batch,
+
+    /**
+     * Batch-load GET endpoints so the next get() of each URL is local.
+     * Endpoints already held are skipped.
+     * @param {string[]} endpoints — as passed to get(), e.g. '/tasks'
+     * @returns {Promise<boolean>}
+     */
+    prefetch: prefetch,
+
+    /**
+     * True if get(endpoint, params) would be answered from a prefetched copy.
+     * @param {string} endpoint
+     * @param {Object} [params]
+     */
+    isPrefetched: isPrefetched,
+
+    /** Drop every prefetched copy (after a write made outside this client). */
+    clearPrefetched: clearPrefetched
   };
 
 })();
@@ -5,9 +5,25 @@
   'use strict';
 
   const QUEUE_KEY = 'ft_offline_queue_v1';
+  const SYNC_CURSOR_KEY = 'ft_sync_cursor_v1';
+  const SYNC_MAX_PAGES = 20;
+  // Entities /api/sync reports -> global function that applies their changes
+  // to the loaded list. Projects are kept in localStorage on the client, so
+  // server-side project changes have nothing to update; unknown entities
+  // fall back to loadActiveUserDataViews().
+  const SYNC_APPLIERS = {
+    task: 'applyTaskSyncChanges',
+    meal: 'applyMealSyncChanges',
+    workout: 'applyWorkoutSyncChanges',
+    note: 'applyNoteSyncChanges',
+    project: null
+  };
   const MAX_QUEUE_ITEMS = 250;
   const NEVER_QUEUE = ['/api/ai/', '/api/auth/'];
   const TRANSIENT_STATUS = new Set([408, 425, 429]);
+  // Queued writes under these paths are replayed together via POST /api/mutations.
+  const BULK_REPLAY_PREFIXES = ['/api/tasks', '/api/meals', '/api/workouts', '/api/notes', '/api/focus/sessions'];
+  const BULK_REPLAY_MAX = 100;
 
   let _memoryQueue = [];
   let _warnedPersistenceFailure = false;
@@ -203,6 +219,92 @@
     return status >= 500 || TRANSIENT_STATUS.has(status);
   }
 
+  function _isBulkReplayable(item) {
+    const url = typeof item.url === 'string' ? item.url.split('?')[0] : '';
+    return BULK_REPLAY_PREFIXES.some(function (prefix) {
+      return url === prefix || url.indexOf(prefix + '/') === 0;
+    });
+  }
+
+  function _rememberCreatedId(item, payload, tempTaskIdMap) {
+    if (_isTaskCreate(item) && item.meta && item.meta.tempTaskId && payload && payload.id != null) {
+      tempTaskIdMap[item.meta.tempTaskId] = payload.id;
+    }
+  }
+
+  // Replay one queued item; resolves to 'synced', 'retry' or 'drop'.
+  async function _replayOne(item, tempTaskIdMap) {
+    const requestUrl = _replaceQueuedTaskTempId(item.url, tempTaskIdMap);
+    const requestBody = _replaceQueuedTaskTempId(item.body, tempTaskIdMap);
+
+    try {
+      const res = await _originalFetch(requestUrl, {
+        method: item.method,
+        credentials: 'same-origin',
+        headers: Object.assign({ 'Content-Type': 'application/json' }, _normalizeHeaders(item.headers)),
+        body: requestBody
+      });
+
+      if (res.ok) {
+        const payload = await res.clone().json().catch(function () { return null; });
+        _rememberCreatedId(item, payload, tempTaskIdMap);
+        return 'synced';
+      }
+      if (_shouldRetryStatus(res.status)) {
+        _debugWarn('[OfflineQueue] Keeping item for retry; status', res.status, item.url);
+        return 'retry';
+      }
+      _debugWarn('[OfflineQueue] Dropping item; non-retryable status', res.status, item.url);
+      return 'drop';
+    } catch (_networkErr) {
+      return 'retry';
+    }
+  }
+
+  // Replay a run of items with one POST /api/mutations (one transaction,
+  // idempotent per item id). Resolves to one outcome per item, or null when
+  // the server cannot take the batch and the items must be sent one by one.
+  async function _replayBulk(items, tempTaskIdMap) {
+    const mutations = items.map(function (item) {
+      const mutation = {
+        key: item.id,
+        method: item.method,
+        path: _replaceQueuedTaskTempId(item.url, tempTaskIdMap),
+        body: _safeParseJson(_replaceQueuedTaskTempId(item.body, tempTaskIdMap))
+      };
+      if (item.meta && item.meta.tempTaskId) mutation.tempId = item.meta.tempTaskId;
+      return mutation;
+    });
+    const retryAll = items.map(function () { return 'retry'; });
+
+    let res;
+    try {
+      res = await _originalFetch('/api/mutations', {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ mutations: mutations })
+      });
+    } catch (_networkErr) {
+      return retryAll;
+    }
+    if (!res.ok) return _shouldRetryStatus(res.status) ? retryAll : null;
+
+    const payload = await res.json().catch(function () { return null; });
+    const results = payload && Array.isArray(payload.results) ? payload.results : null;
+    if (!results || results.length !== items.length) return retryAll;
+
+    return results.map(function (result, i) {
+      if (result.status >= 200 && result.status < 300) {
+        _rememberCreatedId(items[i], result.body, tempTaskIdMap);
+        return 'synced';
+      }
+      if (_shouldRetryStatus(result.status)) return 'retry';
+      _debugWarn('[OfflineQueue] Dropping item; non-retryable status', result.status, items[i].url);
+      return 'drop';
+    });
+  }
+
   async function _flush() {
     const queue = _loadQueue();
     if (!queue.length) return 0;
@@ -211,35 +313,26 @@
     const tempTaskIdMap = {};
     let synced = 0;
 
-    for (let i = 0; i < queue.length; i++) {
-      const item = queue[i];
-      const requestUrl = _replaceQueuedTaskTempId(item.url, tempTaskIdMap);
-      const requestBody = _replaceQueuedTaskTempId(item.body, tempTaskIdMap);
+    function record(item, outcome) {
+      if (outcome === 'synced') synced++;
+      else if (outcome === 'retry') failures.push(item);
+    }
 
-      try {
-        const res = await _originalFetch(requestUrl, {
-          method: item.method,
-          credentials: 'same-origin',
-          headers: Object.assign({ 'Content-Type': 'application/json' }, _normalizeHeaders(item.headers)),
-          body: requestBody
-        });
-
-        if (res.ok) {
-          synced++;
-          if (_isTaskCreate(item) && item.meta && item.meta.tempTaskId) {
-            const payload = await res.clone().json().catch(function () { return null; });
-            if (payload && payload.id != null) {
-              tempTaskIdMap[item.meta.tempTaskId] = payload.id;
-            }
-          }
-        } else if (_shouldRetryStatus(res.status)) {
-          failures.push(item);
-          _debugWarn('[OfflineQueue] Keeping item for retry; status', res.status, item.url);
-        } else {
-          _debugWarn('[OfflineQueue] Dropping item; non-retryable status', res.status, item.url);
-        }
-      } catch (_networkErr) {
-        failures.push(item);
+    let i = 0;
+    while (i < queue.length) {
+      if (!_isBulkReplayable(queue[i])) {
+        const item = queue[i++];
+        record(item, await _replayOne(item, tempTaskIdMap));
+        continue;
+      }
+
+      const run = [];
+      while (i < queue.length && run.length < BULK_REPLAY_MAX && _isBulkReplayable(queue[i])) {
+        run.push(queue[i++]);
+      }
+      const outcomes = await _replayBulk(run, tempTaskIdMap);
+      for (let j = 0; j < run.length; j++) {
+        record(run[j], outcomes ? outcomes[j] : await _replayOne(run[j], tempTaskIdMap));
       }
     }
 
@@ -261,6 +354,7 @@
         !NEVER_QUEUE.some(function (prefix) { return url.indexOf(prefix) === 0; })
       );
 
+      if (isMutation && window.ApiClient) ApiClient.clearPrefetched();
       if (!isMutation || !isSameOriginApi) return _originalFetch(url, options);
 
       if (!navigator.onLine) {
@@ -298,6 +392,100 @@
     });
   }
 
+  function _syncCursorKey() {
+    const user = typeof AuthModule !== 'undefined' ? AuthModule.currentUser : null;
+    return SYNC_CURSOR_KEY + ':' + (user && user.id != null ? String(user.id) : 'anon');
+  }
+
+  function _readSyncCursor() {
+    try {
+      return localStorage.getItem(_syncCursorKey());
+    } catch (_err) {
+      return null;
+    }
+  }
+
+  function _writeSyncCursor(cursor) {
+    try {
+      localStorage.setItem(_syncCursorKey(), String(cursor));
+    } catch (_err) {}
+  }
+
+  async function _fetchSyncPage(cursor) {
+    const res = await ApiClient.get('/sync', cursor != null ? { since: cursor } : null);
+    if (!res.ok) throw new Error('sync failed: ' + res.status);
+    return res.data;
+  }
+
+  // Record the server's current change cursor; called right before the lists
+  // are loaded so later changes are replayed by _pullChanges().
+  async function markSynced() {
+    try {
+      const page = await _fetchSyncPage(null);
+      if (page && page.cursor != null) _writeSyncCursor(page.cursor);
+    } catch (_err) {
+      _debugWarn('[OfflineQueue] Could not read sync cursor');
+    }
+  }
+
+  // Walk /api/sync from the stored cursor. Resolves to the changes (latest
+  // per row), or null when everything must be reloaded.
+  async function _pullChanges() {
+    let cursor = _readSyncCursor();
+    if (cursor == null) return null;
+    const latest = new Map();
+    for (let page = 0; page < SYNC_MAX_PAGES; page++) {
+      const body = await _fetchSyncPage(cursor);
+      cursor = body.cursor;
+      _writeSyncCursor(cursor);
+      if (body.full_sync) return null;
+      (body.changes || []).forEach(function (change) {
+        latest.set(change.entity + ':' + change.id, change);
+      });
+      if (!body.has_more) return Array.from(latest.values());
+    }
+    return null;
+  }
+
+  // Merge /api/sync changes into a list of rows with ids: upserts replace (or
+  // append) the row built from change.data, tombstones drop it.
+  function mergeSyncChanges(list, changes, normalize) {
+    const byId = new Map();
+    (Array.isArray(list) ? list : []).forEach(function (row) {
+      byId.set(String(row && row.id), row);
+    });
+    changes.forEach(function (change) {
+      const key = String(change.id);
+      if (change.op === 'delete' || !change.data) {
+        byId.delete(key);
+      } else {
+        byId.set(key, normalize ? normalize(change.data) : change.data);
+      }
+    });
+    return Array.from(byId.values());
+  }
+
+  async function _applyChanges(changes) {
+    if (changes === null) {
+      if (typeof loadActiveUserDataViews === 'function') await loadActiveUserDataViews();
+      return;
+    }
+    if (!changes.length) return;
+    const byEntity = {};
+    for (const change of changes) {
+      if (!Object.prototype.hasOwnProperty.call(SYNC_APPLIERS, change.entity)) {
+        if (typeof loadActiveUserDataViews === 'function') await loadActiveUserDataViews();
+        return;
+      }
+      (byEntity[change.entity] = byEntity[change.entity] || []).push(change);
+    }
+    for (const entity of Object.keys(byEntity)) {
+      const apply = SYNC_APPLIERS[entity] ? window[SYNC_APPLIERS[entity]] : null;
+      if (typeof apply === 'function') await apply(byEntity[entity]);
+    }
+    if (typeof refreshStreaksAfterChange === 'function') refreshStreaksAfterChange();
+  }
+
   function _createBanner() {
     _banner = document.createElement('div');
     _banner.id = 'offline-banner';
@@ -360,6 +548,10 @@
     await new Promise(function (resolve) { setTimeout(resolve, 1200); });
     const synced = await _flush();
     _hideBanner();
+    // Apply only the rows that changed while offline (here or on another
+    // device) instead of refetching everything.
+    const changes = await _pullChanges().catch(function () { return null; });
+    setTimeout(function () { _applyChanges(changes); }, 900);
 
     if (synced > 0) {
       _toast(
@@ -367,9 +559,6 @@
         'success',
         { title: 'Back Online' }
       );
-      setTimeout(function () {
-        if (typeof loadActiveUserDataViews === 'function') loadActiveUserDataViews();
-      }, 900);
       return;
     }
 
@@ -392,5 +581,5 @@
     });
   }
 
-  window.OfflineQueue = { init: init };
+  window.OfflineQueue = { init: init, markSynced: markSynced, mergeSyncChanges: mergeSyncChanges };
 })();